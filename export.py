@@ -0,0 +1,74 @@
+"""Export Jira issues, status transitions or stage periods to CSV, Arrow or Parquet.
+
+Uses the same credentials (JIRA_URL, JIRA_EMAIL, JIRA_API_TOKEN, or an
+instance from JIRA_INSTANCES) and the same fetch and timeline logic as
+proxy.py, e.g.
+
+    python export.py --board ABC --table stage_periods --format parquet
+"""
+
+import argparse
+import sys
+
+import proxy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--board", help="Project key to export")
+    parser.add_argument("--jql", default="ORDER BY created DESC", help="JQL query")
+    parser.add_argument(
+        "--table", choices=sorted(proxy.EXPORT_TABLES), default="issues"
+    )
+    parser.add_argument("--format", choices=sorted(proxy.EXPORT_FORMATS), default="csv")
+    parser.add_argument(
+        "--instance",
+        default=proxy.DEFAULT_JIRA_INSTANCE,
+        help="Jira instance to export from (see JIRA_INSTANCES)",
+    )
+    parser.add_argument("--max-results", type=int, help="Stop after this many issues")
+    parser.add_argument(
+        "--include-weekends",
+        action="store_true",
+        help="Count weekends in stage period durations",
+    )
+    parser.add_argument(
+        "--output", help="Output file (default: <board>-<table>.<extension>)"
+    )
+    args = parser.parse_args()
+
+    instance = proxy.JIRA_INSTANCES.get(args.instance)
+    if instance is None:
+        sys.exit(f"Unknown Jira instance: {args.instance}")
+    if not instance.credentials["email"] or not instance.credentials["api_token"]:
+        sys.exit("Set JIRA_EMAIL and JIRA_API_TOKEN to export from Jira")
+
+    format_error = proxy.check_export_format(args.format)
+    if format_error:
+        sys.exit(format_error)
+
+    extension = proxy.EXPORT_FORMATS[args.format][1]
+    output = args.output or f"{args.board or 'jira'}-{args.table}.{extension}"
+    proxy.run_for_instance(instance, export, args, output)
+    print(f"Wrote {args.table} to {output}")
+
+
+def export(args, output):
+    """Fetch the issues and write the export (for the current Jira instance)"""
+    issues = proxy.iter_sharded_search_issues(
+        proxy.get_jira_headers(),
+        proxy.build_project_jql(args.jql, args.board),
+        proxy.EXPORT_FIELDS,
+        expand=["changelog"] if args.table != "issues" else None,
+        max_issues=args.max_results,
+    )
+
+    with open(output, "wb") as f:
+        for chunk in proxy.iter_export_chunks(
+            args.table, args.format, issues, not args.include_weekends
+        ):
+            f.write(chunk)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,552 @@
+"""Load-test the proxy by replaying dashboard sessions against a fake Jira.
+
+Starts a local fake Jira with configurable latency, points the proxy at it
+(in-process, or an already running proxy with --proxy-url) and replays what
+the dashboard does when a user opens it and picks a board, at increasing
+concurrency, e.g.
+
+    python loadtest.py --concurrency 1,4,16,64 --duration 20 --jira-latency-ms 150
+
+Reports p50/p95/p99 latency and throughput for each route, and the first
+concurrency level at which the error rate goes over --max-error-rate.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+LOADTEST_STATUSES = ["To Do", "In Progress", "Code Review", "In QA", "Done"]
+
+# Fields the dashboard asks for in its ticket search
+DASHBOARD_SEARCH_FIELDS = (
+    "summary,status,priority,created,updated,reporter,assignee,"
+    "resolutiondate,labels,issuelinks"
+)
+
+
+def make_fake_issues(project, count, seed):
+    """Generate issues with a status changelog, oldest first"""
+    rnd = random.Random(seed)
+    base = datetime.datetime(2025, 1, 6, 9, tzinfo=datetime.timezone.utc)
+    issues = []
+    for i in range(count):
+        created = base + datetime.timedelta(hours=rnd.randint(0, 24 * 500))
+        moment = created
+        histories = []
+        stage = 0
+        while stage < len(LOADTEST_STATUSES) - 1 and rnd.random() < 0.8:
+            moment += datetime.timedelta(hours=rnd.randint(1, 120))
+            histories.append(
+                {
+                    "id": str(len(histories) + 1),
+                    "created": moment.isoformat(),
+                    "author": {"displayName": f"Dev {rnd.randint(1, 8)}"},
+                    "items": [
+                        {
+                            "field": "status",
+                            "fromString": LOADTEST_STATUSES[stage],
+                            "toString": LOADTEST_STATUSES[stage + 1],
+                        }
+                    ],
+                }
+            )
+            stage += 1
+        status = LOADTEST_STATUSES[stage]
+        links = []
+        if i and rnd.random() < 0.2:
+            links.append(
+                {
+                    "type": {
+                        "name": "Blocks",
+                        "inward": "is blocked by",
+                        "outward": "blocks",
+                    },
+                    "outwardIssue": {"key": f"{project}-{rnd.randint(1, i)}"},
+                }
+            )
+        issues.append(
+            {
+                "id": str(10000 + i),
+                "key": f"{project}-{i + 1}",
+                "fields": {
+                    "summary": f"{project} issue {i + 1}",
+                    "status": {
+                        "name": status,
+                        "statusCategory": {
+                            "key": "done" if status == "Done" else "indeterminate"
+                        },
+                    },
+                    "priority": {"name": rnd.choice(["Low", "Medium", "High"])},
+                    "created": created.isoformat(),
+                    "updated": moment.isoformat(),
+                    "resolutiondate": moment.isoformat() if status == "Done" else None,
+                    "assignee": {"displayName": f"Dev {rnd.randint(1, 8)}"},
+                    "reporter": {"displayName": "PM"},
+                    "labels": [],
+                    "issuelinks": links,
+                    "customfield_10016": rnd.choice([1, 2, 3, 5, 8, None]),
+                },
+                "changelog": {"histories": histories},
+            }
+        )
+    # Jira lists a link on both of its issues
+    by_key = {issue["key"]: issue for issue in issues}
+    for issue in issues:
+        for link in list(issue["fields"]["issuelinks"]):
+            if "outwardIssue" in link:
+                blocked = by_key[link["outwardIssue"]["key"]]
+                blocked["fields"]["issuelinks"].append(
+                    {"type": link["type"], "inwardIssue": {"key": issue["key"]}}
+                )
+    issues.sort(key=lambda issue: issue["fields"]["created"])
+    return issues
+
+
+class FakeJira:
+    """Just enough of the Jira Cloud REST API to serve the dashboard routes"""
+
+    def __init__(self, projects, issues_per_project, latency, jitter, seed=1):
+        self.latency = latency
+        self.jitter = jitter
+        self.issues = {
+            project: make_fake_issues(project, issues_per_project, seed + index)
+            for index, project in enumerate(projects)
+        }
+        self.by_key = {
+            issue["key"]: issue
+            for project_issues in self.issues.values()
+            for issue in project_issues
+        }
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def delay(self):
+        with self.lock:
+            self.calls += 1
+        pause = self.latency + random.uniform(-self.jitter, self.jitter)
+        if pause > 0:
+            time.sleep(pause)
+
+    def search(self, jql):
+        """Issues matching the project and created-date clauses of ``jql``"""
+        project = re.search(r"project\s*=\s*\"?(\w+)", jql)
+        if project:
+            issues = self.issues.get(project.group(1), [])
+        else:
+            issues = [
+                i for project_issues in self.issues.values() for i in project_issues
+            ]
+        for operator, value in re.findall(r'created\s*(>=|<)\s*"([^"]+)"', jql):
+            bound = datetime.datetime.strptime(value, "%Y/%m/%d %H:%M").replace(
+                tzinfo=datetime.timezone.utc
+            )
+            issues = [
+                issue
+                for issue in issues
+                if (
+                    datetime.datetime.fromisoformat(issue["fields"]["created"]) >= bound
+                )
+                == (operator == ">=")
+            ]
+        # Issues are kept oldest first, which also stands in for key order
+        order = re.search(r"ORDER BY\s+\w+\s*(ASC|DESC)?", jql, re.IGNORECASE)
+        if not order or (order.group(1) or "ASC").upper() == "DESC":
+            issues = issues[::-1]
+        return issues
+
+    def boards(self):
+        return [
+            {"id": index + 1, "name": f"{project} board", "type": "scrum"}
+            for index, project in enumerate(self.issues)
+        ]
+
+    def sprints(self):
+        start = datetime.datetime(2025, 1, 6, tzinfo=datetime.timezone.utc)
+        return [
+            {
+                "id": number + 1,
+                "name": f"Sprint {number + 1}",
+                "state": "active" if number == 11 else "closed",
+                "startDate": (start + datetime.timedelta(weeks=2 * number)).isoformat(),
+                "endDate": (
+                    start + datetime.timedelta(weeks=2 * number + 2)
+                ).isoformat(),
+            }
+            for number in range(12)
+        ]
+
+    def handle_get(self, path, query):
+        if path == "/rest/api/3/serverInfo":
+            return 200, {"version": "1001.0.0-SNAPSHOT", "deploymentType": "Cloud"}
+        if path == "/rest/api/3/field":
+            return 200, [
+                {"id": "summary", "name": "Summary", "schema": {"type": "string"}},
+                {
+                    "id": "customfield_10016",
+                    "name": "Story Points",
+                    "schema": {"type": "number"},
+                },
+            ]
+        if path == "/rest/agile/1.0/board":
+            boards = self.boards()
+            project = query.get("projectKeyOrId", [None])[0]
+            if project:
+                boards = [b for b in boards if b["name"] == f"{project} board"]
+            start_at = int(query.get("startAt", ["0"])[0])
+            max_results = int(query.get("maxResults", ["50"])[0])
+            page = boards[start_at : start_at + max_results]
+            return 200, {
+                "values": page,
+                "total": len(boards),
+                "startAt": start_at,
+                "isLast": start_at + max_results >= len(boards),
+            }
+        if re.fullmatch(r"/rest/agile/1.0/board/\d+/sprint", path):
+            return 200, {"values": self.sprints(), "isLast": True}
+        match = re.fullmatch(r"/rest/api/3/issue/([\w-]+)", path)
+        if match:
+            issue = self.by_key.get(match.group(1))
+            if issue is None:
+                return 404, {"errorMessages": ["Issue does not exist"]}
+            return 200, issue
+        if path == "/rest/api/3/search":
+            return self.handle_post(
+                path,
+                {
+                    "jql": query.get("jql", [""])[0],
+                    "startAt": int(query.get("startAt", ["0"])[0]),
+                    "maxResults": int(query.get("maxResults", ["50"])[0]),
+                },
+            )
+        return 404, {"errorMessages": [f"No fake for GET {path}"]}
+
+    def handle_post(self, path, body):
+        if path == "/rest/api/3/search/approximate-count":
+            return 200, {"count": len(self.search(body.get("jql", "")))}
+        if path == "/rest/api/3/search/jql":
+            issues = self.search(body.get("jql", ""))
+            start_at = int(body.get("nextPageToken") or 0)
+            max_results = int(body.get("maxResults", 50))
+            page = {"issues": issues[start_at : start_at + max_results]}
+            if start_at + max_results < len(issues):
+                page["nextPageToken"] = str(start_at + max_results)
+            else:
+                page["isLast"] = True
+            return 200, page
+        if path == "/rest/api/3/search":
+            issues = self.search(body.get("jql", ""))
+            start_at = int(body.get("startAt", 0))
+            max_results = int(body.get("maxResults", 50))
+            return 200, {
+                "issues": issues[start_at : start_at + max_results],
+                "total": len(issues),
+                "startAt": start_at,
+                "maxResults": max_results,
+            }
+        return 404, {"errorMessages": [f"No fake for POST {path}"]}
+
+    def serve(self, host="127.0.0.1", port=0):
+        """Start serving in a daemon thread and return the server"""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def respond(self, status, data):
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                fake.delay()
+                url = urlparse(self.path)
+                self.respond(*fake.handle_get(url.path, parse_qs(url.query)))
+
+            def do_POST(self):
+                fake.delay()
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                self.respond(*fake.handle_post(urlparse(self.path).path, body))
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def start_proxy(jira_url):
+    """Run proxy.py in-process against ``jira_url`` and return its base URL"""
+    os.environ["JIRA_URL"] = jira_url
+    os.environ.setdefault("JIRA_EMAIL", "loadtest@example.com")
+    os.environ.setdefault("JIRA_API_TOKEN", "loadtest")
+    os.environ.pop("JIRA_INSTANCES", None)
+    os.environ.pop("SNAPSHOT_PATH", None)
+
+    from werkzeug.serving import make_server
+
+    import proxy
+
+    server = make_server("127.0.0.1", 0, proxy.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def run_session(http, proxy_url, project, history_calls, timeout, record):
+    """Replay one dashboard visit: load the page, then pick ``project``"""
+
+    def call(route, path, params=None):
+        started = time.perf_counter()
+        try:
+            response = http.get(proxy_url + path, params=params, timeout=timeout)
+            ok = response.status_code < 400
+            data = response.json() if ok else None
+        except (requests.RequestException, ValueError):
+            ok, data = False, None
+        record(route, time.perf_counter() - started, ok)
+        return data
+
+    call("/bootstrap", "/bootstrap")
+    call("/proxy/board-sprints", "/proxy/board-sprints", {"board": project})
+    call("/proxy/serverInfo", "/proxy/serverInfo")
+    search = call(
+        "/proxy/search",
+        "/proxy/search",
+        {
+            "jql": f"project = {project} ORDER BY created DESC",
+            "maxResults": 100,
+            "fields": DASHBOARD_SEARCH_FIELDS,
+            "expand": "changelog",
+        },
+    )
+    call(
+        "/proxy/resolution-metrics",
+        "/proxy/resolution-metrics",
+        {
+            "jql": "ORDER BY key ASC",
+            "maxResults": 200,
+            "board": project,
+            "excludeWeekends": "true",
+            "minTimeThreshold": 0.167,
+        },
+    )
+    keys = [issue["key"] for issue in (search or {}).get("issues", [])]
+    for key in random.sample(keys, min(history_calls, len(keys))):
+        call("/proxy/issue-history/<key>", f"/proxy/issue-history/{key}")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(
+        0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+def run_level(proxy_url, concurrency, args):
+    """Run ``concurrency`` simulated users for ``args.duration`` seconds"""
+    samples = {}
+    lock = threading.Lock()
+
+    def record(route, seconds, ok):
+        with lock:
+            samples.setdefault(route, []).append((seconds, ok))
+
+    stop_at = time.monotonic() + args.duration
+
+    def user(number):
+        rnd = random.Random(number)
+        with requests.Session() as http:
+            while time.monotonic() < stop_at:
+                project = rnd.choice(args.projects)
+                run_session(
+                    http, proxy_url, project, args.history_calls, args.timeout, record
+                )
+                if args.think_ms:
+                    time.sleep(args.think_ms / 1000)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(user, range(concurrency)))
+    elapsed = time.monotonic() - started
+
+    routes = {}
+    for route, route_samples in sorted(samples.items()):
+        latencies = sorted(seconds for seconds, _ in route_samples)
+        errors = sum(1 for _, ok in route_samples if not ok)
+        routes[route] = {
+            "requests": len(route_samples),
+            "errors": errors,
+            "throughput": round(len(route_samples) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        }
+    total = sum(route["requests"] for route in routes.values())
+    errors = sum(route["errors"] for route in routes.values())
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput": round(total / elapsed, 2),
+        "routes": routes,
+    }
+
+
+def print_level(level):
+    print(
+        f"\nconcurrency {level['concurrency']}: {level['requests']} requests in "
+        f"{level['seconds']}s ({level['throughput']}/s), "
+        f"error rate {level['error_rate']:.2%}"
+    )
+    print(
+        f"  {'route':<28} {'reqs':>6} {'errs':>5} {'req/s':>8}"
+        f" {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for route, stats in level["routes"].items():
+        print(
+            f"  {route:<28} {stats['requests']:>6} {stats['errors']:>5}"
+            f" {stats['throughput']:>8} {stats['p50_ms']:>9}"
+            f" {stats['p95_ms']:>9} {stats['p99_ms']:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--proxy-url",
+        help="Test an already running proxy (point its JIRA_URL at the fake "
+        "Jira, see --jira-port) instead of starting one in-process",
+    )
+    parser.add_argument(
+        "--jira-port", type=int, default=0, help="Port for the fake Jira"
+    )
+    parser.add_argument(
+        "--jira-latency-ms",
+        type=float,
+        default=100,
+        help="Fake Jira response time per call",
+    )
+    parser.add_argument(
+        "--jira-jitter-ms",
+        type=float,
+        default=50,
+        help="Random +/- spread on the fake Jira response time",
+    )
+    parser.add_argument(
+        "--projects",
+        default="ABC,XYZ,OPS",
+        type=lambda value: value.split(","),
+        help="Comma-separated project keys users pick from",
+    )
+    parser.add_argument(
+        "--issues", type=int, default=500, help="Fake issues per project"
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="1,2,4,8,16",
+        type=lambda value: [int(level) for level in value.split(",")],
+        help="Comma-separated numbers of simultaneous users to step through",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=15, help="Seconds per concurrency level"
+    )
+    parser.add_argument(
+        "--history-calls",
+        type=int,
+        default=5,
+        help="Issue history lookups per session (ticket detail views)",
+    )
+    parser.add_argument(
+        "--think-ms", type=float, default=0, help="Pause between sessions"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=60, help="Client timeout per request"
+    )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=0.01,
+        help="Stop once a level's error rate goes over this fraction",
+    )
+    parser.add_argument(
+        "--log-level", default="ERROR", help="Log level for the in-process proxy"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    fake = FakeJira(
+        args.projects,
+        args.issues,
+        args.jira_latency_ms / 1000,
+        args.jira_jitter_ms / 1000,
+    )
+    jira_server = fake.serve(port=args.jira_port)
+    jira_url = f"http://127.0.0.1:{jira_server.server_port}"
+
+    proxy_url = args.proxy_url
+    if proxy_url:
+        proxy_url = proxy_url.rstrip("/")
+    else:
+        proxy_url = start_proxy(jira_url)
+        for name in ("", "werkzeug"):
+            logging.getLogger(name).setLevel(args.log_level.upper())
+
+    if not args.json:
+        print(f"Fake Jira at {jira_url}, proxy at {proxy_url}")
+
+    levels = []
+    breaking_point = None
+    for concurrency in args.concurrency:
+        level = run_level(proxy_url, concurrency, args)
+        levels.append(level)
+        if not args.json:
+            print_level(level)
+        if level["error_rate"] > args.max_error_rate:
+            breaking_point = concurrency
+            break
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "levels": levels,
+                    "max_error_rate": args.max_error_rate,
+                    "breaking_concurrency": breaking_point,
+                    "jira_calls": fake.calls,
+                },
+                indent=2,
+            )
+        )
+    elif breaking_point is None:
+        print(
+            f"\nError rate stayed at or under {args.max_error_rate:.2%} "
+            f"up to {args.concurrency[-1]} users ({fake.calls} fake Jira calls)"
+        )
+    else:
+        print(
+            f"\nError rate went over {args.max_error_rate:.2%} "
+            f"at {breaking_point} users ({fake.calls} fake Jira calls)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,65 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, send_from_directory
+from flask.json import JSONEncoder
 import requests
+from requests.structures import CaseInsensitiveDict
 from flask_cors import CORS
+import atexit
 import base64
+import codecs
+import hashlib
+import hmac
+import csv
+import gzip
+import importlib.util
+import io
 import logging
+import math
+import mmap
+import operator
 import os
+import pickle
+import queue
 import json
+import multiprocessing
+import random
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from itertools import accumulate, chain, compress, islice, repeat
 from datetime import datetime, timezone, timedelta
+from urllib.parse import parse_qsl, urlsplit
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+
+# Origin the dashboard is served from
+FRONTEND_ORIGIN = "http://localhost:8000"
+
 # CORS(app)  # Enable CORS for all routes - Replaced with specific origin
-CORS(app, origins="http://localhost:8000")  # Allow requests from the frontend
+CORS(
+    app,
+    origins=FRONTEND_ORIGIN,  # Allow requests from the frontend
+    expose_headers=[
+        "X-Deadline-Seconds",
+        "X-Deadline-Remaining",
+        "X-Partial-Result",
+        "X-Served-Stale",
+        "X-Jira-Circuit",
+        "X-Jira-Timeouts",
+        "X-Jira-Instance",
+        "X-Profile-Id",
+    ],
+)
 
 # Hardcoded credentials - in a real app these would come from env vars or a secure store
 JIRA_CREDENTIALS = {
@@ -22,6 +68,20 @@ JIRA_CREDENTIALS = {
     "api_token": os.environ.get("JIRA_API_TOKEN", ""),
 }
 
+# More Jira sites served by this process, selected per request with the
+# X-Jira-Instance header or ?instance= parameter, as JSON, e.g.
+# JIRA_INSTANCES='{"acme": {"jira_url": "https://acme.atlassian.net",
+# "email": "...", "api_token": "...", "max_concurrent": 4}}'
+# The site configured above is always available as "default"
+JIRA_INSTANCES_CONFIG = json.loads(os.environ.get("JIRA_INSTANCES", "{}"))
+
+# Instance used by requests that don't name one
+DEFAULT_JIRA_INSTANCE = os.environ.get("DEFAULT_JIRA_INSTANCE", "default")
+
+# Jira calls in flight at once per instance (and its connection pool size),
+# unless the instance sets its own max_concurrent
+JIRA_MAX_CONCURRENT = int(os.environ.get("JIRA_MAX_CONCURRENT", 10))
+
 # Aging thresholds in hours for different statuses
 AGING_THRESHOLDS = {
     "In Progress": int(
@@ -41,1387 +101,6843 @@ AGING_THRESHOLDS = {
 }
 
 
-@app.route("/config", methods=["GET"])
-def get_config():
-    """Return backend configuration including Jira URL (but not credentials)"""
-    return jsonify({"jira_url": JIRA_CREDENTIALS["jira_url"]})
+# Issues requested per page when paging through Jira searches
+SEARCH_PAGE_SIZE = int(os.environ.get("SEARCH_PAGE_SIZE", 100))
 
+# Jira search API: "jql" (POST /rest/api/3/search/jql, paged with
+# nextPageToken), "offset" (POST /rest/api/3/search, paged with startAt) or
+# "auto" (jql, falling back to offset on servers without it)
+JIRA_SEARCH_API = os.environ.get("JIRA_SEARCH_API", "auto").lower()
 
-@app.route("/aging-thresholds", methods=["GET"])
-def get_aging_thresholds():
-    """Return the configured aging thresholds for different statuses"""
-    return jsonify(AGING_THRESHOLDS)
+# Bytes read at a time from streamed Jira responses
+STREAM_CHUNK_SIZE = int(os.environ.get("STREAM_CHUNK_SIZE", 64 * 1024))
 
+# Searches matching at least this many issues are fetched as parallel
+# created-date shards instead of being paged through from the start
+SHARD_MIN_ISSUES = int(os.environ.get("SHARD_MIN_ISSUES", 2000))
 
-@app.route("/proxy/serverInfo", methods=["GET"])
-def proxy_server_info():
-    """Check connection to Jira server using backend credentials"""
-    try:
-        # Use backend credentials
-        jira_url = JIRA_CREDENTIALS["jira_url"]
-        email = JIRA_CREDENTIALS["email"]
-        api_token = JIRA_CREDENTIALS["api_token"]
+# Issues aimed for in each shard
+SHARD_TARGET_ISSUES = int(os.environ.get("SHARD_TARGET_ISSUES", 1000))
 
-        if not email or not api_token:
-            logger.error("Jira credentials not configured in backend")
-            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+# Shards fetched at the same time (1 disables sharding)
+SHARD_MAX_WORKERS = int(os.environ.get("SHARD_MAX_WORKERS", 4))
 
-        # Create auth header
-        auth_header = (
-            f"Basic {base64.b64encode(f'{email}:{api_token}'.encode()).decode()}"
-        )
+# Issues a shard being fetched may hold ahead of the one being read; a shard
+# waits for the consumer once its buffer is full (about one shard's worth
+# by default, so only oversized shards wait)
+SHARD_BUFFER_ISSUES = int(os.environ.get("SHARD_BUFFER_ISSUES", 1000))
 
-        # Prepare headers for Jira
-        jira_headers = {
-            "Authorization": auth_header,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+# Upper bound on the count probes used to size the shards of one search
+SHARD_MAX_PROBES = int(os.environ.get("SHARD_MAX_PROBES", 64))
 
-        # According to Jira REST API v3 docs, the proper endpoint is /rest/api/3/serverInfo
-        full_url = f"{jira_url}/rest/api/3/serverInfo"
-        logger.debug(f"Making serverInfo request to: {full_url}")
-        logger.debug(f"With headers: {jira_headers}")
+# Named groups of projects for the aggregate metrics, e.g.
+# JIRA_PORTFOLIOS='{"platform": ["CORE", "API"], "growth": ["WEB", "APP"]}'
+PORTFOLIOS = json.loads(os.environ.get("JIRA_PORTFOLIOS", "{}"))
 
-        response = requests.get(full_url, headers=jira_headers)
+# Wall-clock budget (seconds) for a whole aggregate metrics request
+AGGREGATE_DEADLINE_SECONDS = float(os.environ.get("AGGREGATE_DEADLINE_SECONDS", 30))
 
-        # Log response details for debugging
-        logger.debug(f"Jira serverInfo response status: {response.status_code}")
-        logger.debug(f"Jira serverInfo response headers: {response.headers}")
-        logger.debug(f"Jira serverInfo response content: {response.content[:500]}...")
+# Maximum number of projects fetched from Jira at the same time
+AGGREGATE_MAX_WORKERS = int(os.environ.get("AGGREGATE_MAX_WORKERS", 8))
 
-        # Try to parse the response as JSON, but first check if we received JSON
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" not in content_type and response.content:
-            logger.error(f"Received non-JSON response: {content_type}")
-            return (
-                jsonify(
-                    {
-                        "error": f"Received non-JSON response from Jira: {content_type}",
-                        "details": response.text,
-                    }
-                ),
-                response.status_code,
-            )
+# Worker processes for the CPU-bound metrics analysis (0 or 1 runs it in-process)
+METRICS_WORKERS = int(os.environ.get("METRICS_WORKERS", os.cpu_count() or 1))
 
-        try:
-            if response.content:
-                response_data = response.json()
-            else:
-                response_data = {"message": "Empty response from Jira"}
-        except ValueError:
-            logger.error(
-                f"Failed to parse serverInfo response as JSON: {response.text}"
-            )
-            return (
-                jsonify(
-                    {"error": "Failed to parse Jira response", "details": response.text}
-                ),
-                500,
-            )
+# Issues analyzed per chunk; chunks are the unit of work sent to the pool
+METRICS_CHUNK_SIZE = int(os.environ.get("METRICS_CHUNK_SIZE", 1000))
 
-        if response.status_code >= 400:
-            logger.error(f"Jira API error: {response.status_code} - {response_data}")
-            return (
-                jsonify(
-                    {
-                        "error": f"Jira API returned {response.status_code}",
-                        "details": response_data,
-                    }
-                ),
-                response.status_code,
-            )
+# Below this many issues the analysis always runs in-process
+METRICS_PARALLEL_MIN_ISSUES = int(os.environ.get("METRICS_PARALLEL_MIN_ISSUES", 2000))
 
-        return jsonify(response_data), response.status_code
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error connecting to Jira: {str(e)}")
-        return jsonify({"error": f"Failed to connect to Jira: {str(e)}"}), 500
+# Report p50/p85/p95 stage durations from a quantile sketch unless a request
+# says otherwise with ?percentiles=
+METRICS_PERCENTILES = os.environ.get("METRICS_PERCENTILES", "false").lower() == "true"
 
+# Size of the quantile sketches behind the percentiles; rank error is about
+# 1.7/k of the durations counted (see QuantileSketch)
+QUANTILE_SKETCH_K = int(os.environ.get("QUANTILE_SKETCH_K", 200))
 
-@app.route("/proxy/<path:path>", methods=["GET", "POST"])
-def proxy(path):
-    try:
-        # Use backend credentials
-        jira_url = JIRA_CREDENTIALS["jira_url"]
-        email = JIRA_CREDENTIALS["email"]
-        api_token = JIRA_CREDENTIALS["api_token"]
+# Ping-pong score from which an issue is flagged as ping-ponging
+PING_PONG_THRESHOLD = int(os.environ.get("PING_PONG_THRESHOLD", 2))
 
-        if not email or not api_token:
-            logger.error("Jira credentials not configured in backend")
-            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+# Churn score (backward workflow transitions) from which an issue is flagged
+CHURN_THRESHOLD = int(os.environ.get("CHURN_THRESHOLD", 3))
 
-        # Create auth header
-        auth_header = (
-            f"Basic {base64.b64encode(f'{email}:{api_token}'.encode()).decode()}"
-        )
+# Upper bound on the issues fetched to recompute trend buckets
+TREND_MAX_ISSUES = int(os.environ.get("TREND_MAX_ISSUES", 5000))
 
-        # Construct the full URL - Use API v3 instead of v2
-        full_url = f"{jira_url}/rest/api/3/{path}"
-        logger.debug(f"Making request to: {full_url}")
+# Monte Carlo runs per delivery forecast, by default and at most
+FORECAST_SIMULATIONS = int(os.environ.get("FORECAST_SIMULATIONS", 10000))
+FORECAST_MAX_SIMULATIONS = int(os.environ.get("FORECAST_MAX_SIMULATIONS", 20000))
 
-        # Prepare headers for Jira
-        jira_headers = {
-            "Authorization": auth_header,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+# Most week sequences a forecast precomputes, so one draw covers several weeks
+FORECAST_MAX_BLOCKS = int(os.environ.get("FORECAST_MAX_BLOCKS", 32768))
 
-        # Get params from request, excluding jira_url which we now get from backend
-        params = {k: v for k, v in request.args.items() if k != "jira_url"}
+# Finished weeks of throughput a forecast samples from, by default and at most
+FORECAST_HISTORY_WEEKS = int(os.environ.get("FORECAST_HISTORY_WEEKS", 12))
+FORECAST_MAX_HISTORY_WEEKS = int(os.environ.get("FORECAST_MAX_HISTORY_WEEKS", 104))
 
-        # Log the headers being sent
-        logger.debug(f"Proxying request to {full_url} with headers: {jira_headers}")
+# Furthest ahead (weeks) a forecast looks
+FORECAST_MAX_WEEKS = int(os.environ.get("FORECAST_MAX_WEEKS", 260))
 
-        # Special handling for the search endpoint which requires JQL in the request body
-        json_data = None
-        if path == "search":
-            # For the search endpoint, we need to pass JQL in the request body
-            jql = params.pop("jql", "")
+# Upper bound on the resolved issues fetched for a throughput history
+FORECAST_MAX_ISSUES = int(os.environ.get("FORECAST_MAX_ISSUES", 10000))
 
-            # If no JQL provided, use a default sorting
-            if not jql:
-                jql = "ORDER BY created DESC"
+# Upper bound on the issues fetched for a cumulative flow diagram
+CFD_MAX_ISSUES = int(os.environ.get("CFD_MAX_ISSUES", 20000))
 
-            max_results = params.pop(
-                "maxResults", 100
-            )  # Increase from 50 to 100 (JIRA API maximum)
+# How long (seconds) a cumulative flow diagram is served from cache
+CFD_CACHE_SECONDS = int(os.environ.get("CFD_CACHE_SECONDS", 300))
 
-            # Check if we need to filter by a specific board/project
-            board = params.pop("board", None)
+# How long (seconds) Jira's field definitions are cached
+FIELD_CACHE_SECONDS = int(os.environ.get("FIELD_CACHE_SECONDS", 3600))
 
-            # If board is specified, add it to the JQL query
-            if board:
-                logger.debug(f"Filtering by board/project: {board}")
-                if "ORDER BY" in jql:
-                    # Insert project filter before ORDER BY, fixing the syntax
-                    order_part = jql.split("ORDER BY")
-                    jql = f"project = {board} AND {order_part[0].strip()} ORDER BY {order_part[1].strip()}"
-                else:
-                    # Append project filter to existing JQL
-                    jql = f"{jql} AND project = {board}"
+# How long (seconds) the board list is served from cache
+BOARD_CACHE_SECONDS = int(os.environ.get("BOARD_CACHE_SECONDS", 300))
 
-            logger.debug(f"Using JQL query: {jql}")
+# Bootstrap responses at least this large (bytes) are gzipped for clients
+# that accept it
+BOOTSTRAP_GZIP_MIN_BYTES = int(os.environ.get("BOOTSTRAP_GZIP_MIN_BYTES", 1024))
 
-            # Extract fields from request parameters if provided
-            fields_param = params.pop(
-                "fields",
-                "summary,status,priority,created,updated,reporter,assignee,resolutiondate,labels,issuelinks",
-            )
-            # Ensure fields_list is correctly formatted as a list of strings
-            if isinstance(fields_param, str):
-                fields_list = fields_param.split(
-                    ","
-                )  # Convert comma-separated string to list for JIRA API
-            else:
-                fields_list = fields_param
+# Story point field ID, for sites where it can't be found by name
+STORY_POINT_FIELD_ID = os.environ.get("STORY_POINT_FIELD_ID", "")
 
-            # Ensure we have expanded changelog for status history
-            expand = params.pop("expand", "changelog")
-            if isinstance(expand, str):
-                expand = expand.split(",")
+# Names the story point field goes by, matched case-insensitively
+STORY_POINT_FIELD_NAMES = ["Story Points", "Story Point Estimate"]
 
-            # Add startAt parameter (required by JIRA API)
-            start_at = params.pop("startAt", 0)
+# How long (seconds) a board's velocity is served from cache
+VELOCITY_CACHE_SECONDS = int(os.environ.get("VELOCITY_CACHE_SECONDS", 600))
 
-            json_data = {
-                "jql": jql,
-                "startAt": int(start_at),
-                "maxResults": int(max_results),
-                "fields": fields_list,
-                "expand": expand,
-            }
+# Sprints whose issues are fetched at the same time for the velocity
+VELOCITY_MAX_WORKERS = int(os.environ.get("VELOCITY_MAX_WORKERS", 8))
 
-            logger.debug(f"Search request body: {json_data}")
-        elif request.is_json:
-            json_data = request.get_json()
+# Upper bound on the issues fetched for a single sprint
+VELOCITY_MAX_ISSUES_PER_SPRINT = int(
+    os.environ.get("VELOCITY_MAX_ISSUES_PER_SPRINT", 1000)
+)
 
-        # Forward the request to Jira
-        response = requests.request(
-            method="POST" if path == "search" else request.method,
-            url=full_url,
-            headers=jira_headers,
-            params=params,
-            json=json_data,
-            verify=True,  # Enable SSL verification
-        )
+# Rows per Parquet row group / Arrow record batch in exports
+EXPORT_BATCH_ROWS = int(os.environ.get("EXPORT_BATCH_ROWS", 5000))
 
-        logger.debug(f"Jira response status: {response.status_code}")
-        logger.debug(f"Jira response headers: {response.headers}")
-        logger.debug(
-            f"Jira response text: {response.text[:500]}..."
-        )  # Log first 500 chars of response
+# How long (seconds) fetched issues are kept in the issue store; with the
+# Jira webhook configured this can be much longer
+ISSUE_STORE_TTL_SECONDS = int(os.environ.get("ISSUE_STORE_TTL_SECONDS", 300))
 
-        # Try to parse the response as JSON
-        try:
-            response_data = response.json()
-        except ValueError:
-            logger.error(f"Failed to parse response as JSON: {response.text}")
-            return (
-                jsonify(
-                    {"error": "Failed to parse Jira response", "details": response.text}
-                ),
-                500,
-            )
+# Upper bound on the issues kept in the issue store
+ISSUE_STORE_MAX_ISSUES = int(os.environ.get("ISSUE_STORE_MAX_ISSUES", 100000))
 
-        if response.status_code >= 400:
-            logger.error(f"Jira API error: {response.status_code} - {response_data}")
-            return (
-                jsonify(
-                    {
-                        "error": f"Jira API returned {response.status_code}",
-                        "details": response_data,
-                    }
-                ),
-                response.status_code,
-            )
+# Fraction of its aging threshold from which an open issue is reported as
+# nearly aging
+AGING_NEAR_FRACTION = float(os.environ.get("AGING_NEAR_FRACTION", 0.75))
 
-        return jsonify(response_data), response.status_code
+# How long (seconds) a project's aging index is used before its open issues
+# are fetched again
+AGING_INDEX_REFRESH_SECONDS = int(os.environ.get("AGING_INDEX_REFRESH_SECONDS", 300))
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request error: {str(e)}")
-        return jsonify({"error": f"Request failed: {str(e)}"}), 500
-    except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
-        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+# Upper bound on the open issues fetched to refresh a project's aging index
+AGING_MAX_ISSUES = int(os.environ.get("AGING_MAX_ISSUES", 5000))
 
+# Issue link types read as dependencies, whose outward direction means
+# "blocks" (comma-separated names)
+DEPENDENCY_LINK_TYPES = [
+    name.strip().lower()
+    for name in os.environ.get("DEPENDENCY_LINK_TYPES", "Blocks").split(",")
+    if name.strip()
+]
 
-@app.route("/proxy/board-sprints", methods=["GET"])
-def get_board_sprints():
-    """Get sprints for a specific board"""
-    try:
-        # Use backend credentials
-        jira_url = JIRA_CREDENTIALS["jira_url"]
-        email = JIRA_CREDENTIALS["email"]
-        api_token = JIRA_CREDENTIALS["api_token"]
+# How long (seconds) a project's dependency graph and cycle-time estimates
+# are used before its issues are fetched again
+DEPENDENCY_REFRESH_SECONDS = int(os.environ.get("DEPENDENCY_REFRESH_SECONDS", 300))
 
-        if not email or not api_token:
-            logger.error("Jira credentials not configured in backend")
-            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+# Upper bound on the (most recently updated) issues fetched to refresh a
+# project's dependency graph
+DEPENDENCY_MAX_ISSUES = int(os.environ.get("DEPENDENCY_MAX_ISSUES", 5000))
 
-        # Get board parameter
-        board = request.args.get("board")
-        if not board:
-            return jsonify({"error": "Board parameter is required"}), 400
+# How long (seconds) the rows and sort indexes behind /proxy/tickets are used
+# before the query is fetched again
+TICKET_TABLE_CACHE_SECONDS = int(os.environ.get("TICKET_TABLE_CACHE_SECONDS", 300))
 
-        # Create auth header
-        auth_header = (
-            f"Basic {base64.b64encode(f'{email}:{api_token}'.encode()).decode()}"
-        )
+# Upper bound on the issues in one ticket table
+TICKET_TABLE_MAX_ISSUES = int(os.environ.get("TICKET_TABLE_MAX_ISSUES", 50000))
 
-        # Prepare headers for Jira
-        jira_headers = {
-            "Authorization": auth_header,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+# Ticket table rows returned per page by default, and at most
+TICKET_PAGE_SIZE = int(os.environ.get("TICKET_PAGE_SIZE", 100))
+TICKET_MAX_PAGE_SIZE = int(os.environ.get("TICKET_MAX_PAGE_SIZE", 1000))
 
-        logger.debug(f"Fetching sprints for board: {board}")
+# How long (seconds) resolution metrics are served from cache
+METRICS_CACHE_SECONDS = int(os.environ.get("METRICS_CACHE_SECONDS", 60))
 
-        # First, find all boards associated with this project
-        boards_url = f"{jira_url}/rest/agile/1.0/board?projectKeyOrId={board}"
-        boards_response = requests.get(boards_url, headers=jira_headers)
+# File the proxy's caches are saved to and restored from on startup, so a
+# restart doesn't start cold (empty disables snapshots)
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH", "")
 
-        if boards_response.status_code >= 400:
-            logger.error(
-                f"Error fetching boards: {boards_response.status_code} - {boards_response.text}"
-            )
-            return (
-                jsonify(
-                    {"error": f"Failed to fetch boards: {boards_response.status_code}"}
-                ),
-                boards_response.status_code,
-            )
+# How often (seconds) the snapshot is written
+SNAPSHOT_INTERVAL_SECONDS = int(os.environ.get("SNAPSHOT_INTERVAL_SECONDS", 300))
 
-        boards_data = boards_response.json()
+# How long (seconds) restored entries that expired while the proxy was down
+# are still served as fresh, before they are fetched again
+SNAPSHOT_STALE_GRACE_SECONDS = int(os.environ.get("SNAPSHOT_STALE_GRACE_SECONDS", 120))
 
-        if not boards_data.get("values") or len(boards_data.get("values", [])) == 0:
-            logger.warning(f"No boards found for project: {board}")
-            return (
-                jsonify(
-                    {
-                        "sprints": [],
-                        "message": f"No boards found for project {board}. This project may not have an Agile board configured.",
-                    }
-                ),
-                200,
-            )
+# SQLite file every worker process on the host shares as a second cache tier
+# under its in-process caches (empty disables it)
+SHARED_CACHE_PATH = os.environ.get("SHARED_CACHE_PATH", "")
 
-        # Try each board in sequence until we find one with sprints
-        all_sprints = []
-        boards_checked = 0
-        boards_with_sprints = 0
+# How often (seconds) a worker applies the invalidations other workers made
+# in the shared cache to its in-process caches
+SHARED_CACHE_RECHECK_SECONDS = float(os.environ.get("SHARED_CACHE_RECHECK_SECONDS", 5))
 
-        for board_info in boards_data.get("values", []):
-            board_id = board_info.get("id")
-            board_name = board_info.get("name")
+# Size (bytes) of the cached values the shared cache holds before it evicts
+# the least recently used ones
+SHARED_CACHE_MAX_BYTES = int(
+    os.environ.get("SHARED_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+)
 
-            if not board_id:
-                continue
+# Secret that /webhooks/jira checks X-Hub-Signature HMACs against
+JIRA_WEBHOOK_SECRET = os.environ.get("JIRA_WEBHOOK_SECRET", "")
 
-            boards_checked += 1
-            logger.debug(f"Checking board: {board_name} (ID: {board_id}) for sprints")
+# Token accepted as /webhooks/jira's ?token= parameter, for webhooks that
+# can't be registered with a secret. Never the same value as
+# JIRA_WEBHOOK_SECRET: query strings end up in access logs. With neither set
+# the route is disabled
+JIRA_WEBHOOK_TOKEN = os.environ.get("JIRA_WEBHOOK_TOKEN", "")
 
-            # Fetch sprints for this board
-            sprints_url = f"{jira_url}/rest/agile/1.0/board/{board_id}/sprint?state=active,closed,future"
-            sprints_response = requests.get(sprints_url, headers=jira_headers)
+# Secret that profiles a request when sent as its X-Profile header or
+# ?profile= parameter (empty disables profiling)
+PROFILE_SECRET = os.environ.get("PROFILE_SECRET", "")
 
-            # Skip this board if there's an error
-            if sprints_response.status_code >= 400:
-                logger.warning(
-                    f"Error fetching sprints for board {board_name} (ID: {board_id}): {sprints_response.status_code}"
-                )
-                continue
+# Directory the profiles of profiled requests are written to
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
 
-            sprints_data = sprints_response.json()
-            sprints_for_board = sprints_data.get("values", [])
+# Seconds between stack samples of a profiled request
+PROFILE_INTERVAL_SECONDS = float(os.environ.get("PROFILE_INTERVAL_SECONDS", 0.001))
 
-            if len(sprints_for_board) > 0:
-                boards_with_sprints += 1
-                logger.debug(
-                    f"Found {len(sprints_for_board)} sprints for board {board_name}"
-                )
+# Allocation sites listed in a profile's allocation statistics
+PROFILE_TOP_ALLOCATIONS = int(os.environ.get("PROFILE_TOP_ALLOCATIONS", 25))
 
-                # Extract sprint info
-                for sprint in sprints_for_board:
-                    sprint_info = {
-                        "id": sprint.get("id"),
-                        "name": sprint.get("name"),
-                        "state": sprint.get("state"),
-                        "startDate": sprint.get("startDate"),
-                        "endDate": sprint.get("endDate"),
-                        "boardName": board_name,  # Add board name for reference
-                    }
-                    all_sprints.append(sprint_info)
+# Slowest Jira calls listed individually in a response's Server-Timing header
+SERVER_TIMING_MAX_CALLS = int(os.environ.get("SERVER_TIMING_MAX_CALLS", 10))
 
-        # Provide a helpful message if we checked boards but found no sprints
-        if boards_checked > 0 and len(all_sprints) == 0:
-            logger.warning(
-                f"Checked {boards_checked} boards for project {board} but found no sprints"
+# Jira traffic mode: "live", "record" (live, saving every exchange to the
+# cassette directory) or "replay" (served from the cassette directory only)
+JIRA_TRAFFIC_MODE = os.environ.get("JIRA_TRAFFIC_MODE", "live").lower()
+
+# Directory holding recorded Jira request/response pairs
+JIRA_CASSETTE_DIR = os.environ.get("JIRA_CASSETTE_DIR", "cassettes")
+
+# Simulated latency in replay mode: seconds per response, or "recorded" to
+# wait as long as the original call took
+JIRA_REPLAY_LATENCY = os.environ.get("JIRA_REPLAY_LATENCY", "0")
+
+# Connect and read timeouts (seconds) for every Jira call
+JIRA_CONNECT_TIMEOUT = float(os.environ.get("JIRA_CONNECT_TIMEOUT", 5))
+JIRA_READ_TIMEOUT = float(os.environ.get("JIRA_READ_TIMEOUT", 30))
+
+# Wall-clock budget (seconds) for the Jira calls made while serving a request
+REQUEST_DEADLINE_SECONDS = float(os.environ.get("REQUEST_DEADLINE_SECONDS", 25))
+
+# Per-route budgets keyed by Flask endpoint name (null for none), e.g.
+# JIRA_ROUTE_DEADLINES='{"get_resolution_metrics": 40, "get_velocity": 15}'
+ROUTE_DEADLINES = {
+    "get_aggregate_resolution_metrics": AGGREGATE_DEADLINE_SECONDS,
+    # Exports stream for as long as they take
+    "export_issues": None,
+    **json.loads(os.environ.get("JIRA_ROUTE_DEADLINES", "{}")),
+}
+
+# No new Jira call is started this close (seconds) to a request's deadline,
+# leaving time to answer with what has been fetched so far
+DEADLINE_MARGIN_SECONDS = float(os.environ.get("DEADLINE_MARGIN_SECONDS", 1))
+
+# Consecutive failed Jira calls that open the circuit breaker, and how long
+# (seconds) it stays open before a trial call is let through
+JIRA_CIRCUIT_FAILURES = int(os.environ.get("JIRA_CIRCUIT_FAILURES", 5))
+JIRA_CIRCUIT_RESET_SECONDS = float(os.environ.get("JIRA_CIRCUIT_RESET_SECONDS", 30))
+
+# Replayed traffic doesn't need real credentials
+if JIRA_TRAFFIC_MODE == "replay":
+    JIRA_CREDENTIALS["email"] = JIRA_CREDENTIALS["email"] or "replay@localhost"
+    JIRA_CREDENTIALS["api_token"] = JIRA_CREDENTIALS["api_token"] or "replay"
+
+
+class JiraAPIError(Exception):
+    """Raised when Jira answers an upstream call with an error status"""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class JiraUnavailableError(JiraAPIError):
+    """Raised instead of calling Jira while the circuit breaker is open"""
+
+    def __init__(self, message="Jira is failing; not calling it for now"):
+        super().__init__(503, message)
+
+
+class DeadlineExceededError(JiraUnavailableError):
+    """Raised instead of calling Jira when the request's deadline is (nearly) up"""
+
+    def __init__(self, message="Request deadline reached before calling Jira"):
+        JiraAPIError.__init__(self, 504, message)
+
+
+class RequestBudget:
+    """Deadline for the Jira calls made on behalf of one request, and how it went.
+
+    Also carries the Jira instance the request is for, so worker threads
+    started with run_with_budget call (and cache for) the same site.
+    """
+
+    def __init__(self, seconds=None, instance=None):
+        self.seconds = seconds
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+        self.instance = instance
+        # Set when Jira paging stopped early because the deadline was near
+        self.partial = False
+        # Set when an expired cache entry was served because Jira was unavailable
+        self.stale = False
+        # RequestProfile when the request is being profiled
+        self.profile = None
+        # Server-Timing phases: seconds and counts per phase, and each Jira call
+        self.started = time.perf_counter()
+        self.timings = {}
+        self.counts = {}
+        self.jira_calls = []
+        self._timing_lock = threading.Lock()
+        # Phases are only timed on the thread serving the request, one at a
+        # time, so they never overlap and never add up to more than total
+        self.thread = threading.get_ident()
+        self.timing_phase = False
+
+    def add_timing(self, phase, seconds):
+        with self._timing_lock:
+            self.timings[phase] = self.timings.get(phase, 0) + seconds
+
+    def begin_phase(self):
+        """Whether to time a phase starting now: not in worker threads or inside another phase"""
+        if self.thread != threading.get_ident() or self.timing_phase:
+            return False
+        self.timing_phase = True
+        return True
+
+    def end_phase(self, phase, seconds):
+        self.timing_phase = False
+        self.add_timing(phase, seconds)
+
+    def add_count(self, name, count):
+        with self._timing_lock:
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    def add_jira_call(self, method, url, seconds):
+        with self._timing_lock:
+            self.jira_calls.append((method.upper(), urlsplit(url).path, seconds))
+
+    def server_timing(self):
+        """The Server-Timing header value for the request so far"""
+        with self._timing_lock:
+            timings = dict(self.timings)
+            counts = dict(self.counts)
+            calls = list(self.jira_calls)
+        metrics = []
+        if calls:
+            total = sum(seconds for _, _, seconds in calls)
+            plural = "" if len(calls) == 1 else "s"
+            metrics.append(
+                f'jira;dur={total * 1000:.1f};desc="{len(calls)} call{plural}"'
             )
-            return (
-                jsonify(
-                    {
-                        "sprints": [],
-                        "message": f"No sprints found for any of the {boards_checked} boards in project {board}.",
-                    }
-                ),
-                200,
+            slowest = sorted(
+                enumerate(calls, 1), key=lambda call: call[1][2], reverse=True
             )
+            for number, (method, path, seconds) in sorted(
+                slowest[:SERVER_TIMING_MAX_CALLS]
+            ):
+                metrics.append(
+                    f'jira-{number};dur={seconds * 1000:.1f};desc="{method} {path}"'
+                )
+        for phase in ("decode", "analysis", "serialize"):
+            if phase in timings:
+                metrics.append(f"{phase};dur={timings[phase] * 1000:.1f}")
+        for name, count in counts.items():
+            metrics.append(f'{name};desc="{count}"')
+        metrics.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(metrics)
 
-        # Helper function for safe sorting with None values
-        def safe_sort_key(sprint):
-            # If startDate is None or empty, use a minimum date string for sorting
-            start_date = sprint.get("startDate")
-            if not start_date:
-                return "0000-00-00T00:00:00.000Z"  # Minimum date string for sorting
-            return start_date
+    def remaining(self):
+        return self.deadline - time.monotonic()
 
-        # Sort all sprints by start date (descending) with safe handling of None values
-        all_sprints.sort(key=safe_sort_key, reverse=True)
+
+_upstream = threading.local()
+
+
+def current_budget():
+    """The RequestBudget of the request being served by this thread, if any"""
+    return getattr(_upstream, "budget", None)
+
+
+def add_server_timing(phase, seconds):
+    """Add time spent in a phase (decode, analysis, ...) to the current request's Server-Timing"""
+    budget = current_budget()
+    if budget is not None:
+        budget.add_timing(phase, seconds)
+
+
+def add_server_count(name, count):
+    """Add to a count (issues, pages) reported in the current request's Server-Timing"""
+    budget = current_budget()
+    if budget is not None:
+        budget.add_count(name, count)
+
+
+@contextmanager
+def server_timing(phase):
+    """Time a block as part of a Server-Timing phase of the current request"""
+    budget = current_budget()
+    if budget is None or not budget.begin_phase():
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        budget.end_phase(phase, time.perf_counter() - started)
+
+
+def iter_timed_consumer(items, phase="analysis"):
+    """Yield from ``items``, timing what the consumer does with each one as ``phase``"""
+    budget = current_budget()
+    if budget is None:
+        yield from items
+        return
+    for item in items:
+        timed = budget.begin_phase()
+        started = time.perf_counter()
+        try:
+            yield item
+        finally:
+            if timed:
+                budget.end_phase(phase, time.perf_counter() - started)
+
+
+def iter_timed_producer(items, phase="decode"):
+    """Yield from ``items``, timing how long each one takes to produce as ``phase``"""
+    budget = current_budget()
+    items = iter(items)
+    while True:
+        timed = budget is not None and budget.begin_phase()
+        started = time.perf_counter()
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        finally:
+            if timed:
+                budget.end_phase(phase, time.perf_counter() - started)
+        yield item
+
+
+def decode_json_response(response):
+    """``response.json()``, timed as the current request's decode phase"""
+    with server_timing("decode"):
+        return response.json()
+
+
+class TimedJSONEncoder(JSONEncoder):
+    """Flask's JSON encoder, timing jsonify as the request's serialize phase"""
+
+    def encode(self, o):
+        with server_timing("serialize"):
+            return super().encode(o)
+
+
+app.json_encoder = TimedJSONEncoder
+
+
+def run_with_budget(budget, fn, *args, **kwargs):
+    """Call fn (in a worker thread) under the budget of the request that started it"""
+    previous = current_budget()
+    _upstream.budget = budget
+    profile = budget.profile if budget is not None else None
+    if profile is not None:
+        profile.add_thread()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _upstream.budget = previous
+        if profile is not None:
+            profile.remove_thread()
+
+
+def iter_with_budget(budget, items):
+    """Iterate ``items`` under ``budget``, for response bodies streamed after the request's teardown.
+
+    Flask tears the request down before it iterates a streamed body, so
+    without this later Jira calls would run without the request's budget
+    (and for the default instance instead of the requested one).
+    """
+    items = iter(items)
+    try:
+        while True:
+            try:
+                item = run_with_budget(budget, next, items)
+            except StopIteration:
+                return
+            yield item
+    finally:
+        # A download cut short closes this generator; pass that on
+        close = getattr(items, "close", None)
+        if close is not None:
+            run_with_budget(budget, close)
+
+
+def stack_label(frame):
+    """Collapsed-stack frame name: function (file:first line)"""
+    code = frame.f_code
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+class RequestProfile:
+    """Sampled stacks and allocation statistics of one request.
+
+    A sampler thread records the stacks of the request's thread, and of the
+    worker threads it hands work to with run_with_budget, every
+    PROFILE_INTERVAL_SECONDS, while tracemalloc traces allocations (unless
+    ``allocations`` is false, as tracing slows allocation-heavy requests
+    several times over). Only one request is profiled at a time; tracemalloc
+    is process-wide, so allocations made by concurrent requests count too.
+    """
+
+    _active = threading.Lock()
+
+    def __init__(self, interval=PROFILE_INTERVAL_SECONDS, allocations=True):
+        self.interval = interval
+        # Only stop tracemalloc at the end if it was started for this request
+        self.trace_allocations = allocations and not tracemalloc.is_tracing()
+        self.request_thread = threading.get_ident()
+        self.threads = {self.request_thread: 1}
+        self.stacks = Counter()
+        self.samples = 0
+        self.allocations = None
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(
+            target=self._sample, name="request-profiler", daemon=True
+        )
+
+    @classmethod
+    def start(cls, allocations=True):
+        """Start profiling the current thread's request, or None if another one is"""
+        if not cls._active.acquire(blocking=False):
+            return None
+        profile = cls(allocations=allocations)
+        profile.started = time.perf_counter()
+        if profile.trace_allocations:
+            tracemalloc.start()
+        profile._sampler.start()
+        return profile
+
+    def add_thread(self):
+        ident = threading.get_ident()
+        self.threads[ident] = self.threads.get(ident, 0) + 1
+
+    def remove_thread(self):
+        ident = threading.get_ident()
+        if self.threads.get(ident, 0) > 1:
+            self.threads[ident] -= 1
+        else:
+            self.threads.pop(ident, None)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            self.samples += 1
+            for ident in list(self.threads):
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    stack.append(stack_label(frame))
+                    frame = frame.f_back
+                if stack:
+                    stack.append(
+                        "request" if ident == self.request_thread else "worker"
+                    )
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        """Stop sampling and tracing, and collect the allocation statistics"""
+        self._stop.set()
+        self._sampler.join()
+        self.seconds = time.perf_counter() - self.started
+        if not self.trace_allocations:
+            RequestProfile._active.release()
+            return
+        try:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            )
+        finally:
+            tracemalloc.stop()
+            RequestProfile._active.release()
+        self.allocations = {
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "top": [
+                {
+                    "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "bytes": stat.size,
+                    "blocks": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[:PROFILE_TOP_ALLOCATIONS]
+            ],
+        }
+
+    def write(self, directory, name):
+        """Write ``<name>.folded`` (flamegraph.pl / speedscope input) and ``<name>.json``"""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{name}.folded"), "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(os.path.join(directory, f"{name}.json"), "w") as f:
+            json.dump(
+                {
+                    "seconds": round(self.seconds, 6),
+                    "interval_seconds": self.interval,
+                    "samples": self.samples,
+                    "allocations": self.allocations,
+                },
+                f,
+                indent=2,
+            )
+
+
+def profile_requested():
+    """Whether the current request carries the profiling secret"""
+    token = request.headers.get("X-Profile") or request.args.get("profile")
+    return bool(PROFILE_SECRET and token) and hmac.compare_digest(token, PROFILE_SECRET)
+
+
+def upstream_partial():
+    """Whether the current request's Jira results were cut short by its deadline"""
+    budget = current_budget()
+    return budget is not None and budget.partial
+
+
+def upstream_timeout(timeout=None):
+    """(connect, read) timeout for a Jira call, capped by the current request's deadline"""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect, read = JIRA_CONNECT_TIMEOUT, JIRA_READ_TIMEOUT
+        if timeout is not None:
+            connect, read = min(connect, timeout), min(read, timeout)
+
+    budget = current_budget()
+    if budget is not None and budget.deadline is not None:
+        remaining = budget.remaining()
+        if remaining <= DEADLINE_MARGIN_SECONDS:
+            raise DeadlineExceededError()
+        connect, read = min(connect, remaining), min(read, remaining)
+    return connect, read
+
+
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures instead of piling up on them.
+
+    "closed": calls go through. After ``failure_threshold`` consecutive
+    failures it turns "open" and calls are refused for ``reset_seconds``.
+    Then it is "half-open": one trial call is let through, and its outcome
+    closes the circuit again or re-opens it.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at < self.reset_seconds:
+                return "open"
+            return "half-open"
+
+    def allow(self):
+        """Whether a call may go through now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            if self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(
+                        f"Opening the Jira circuit breaker after {self._failures} failed calls"
+                    )
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+def get_jira_headers():
+    """Build the headers for Jira API calls from the backend credentials"""
+    email = jira_credentials()["email"]
+    api_token = jira_credentials()["api_token"]
+    auth_header = f"Basic {base64.b64encode(f'{email}:{api_token}'.encode()).decode()}"
+    return {
+        "Authorization": auth_header,
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+
+
+class JiraSession(requests.Session):
+    """Session used for every Jira call, with optional record/replay of the traffic.
+
+    In "record" mode each exchange is also written to the cassette directory,
+    one JSON file per distinct request. In "replay" mode responses come from
+    those files only, so the proxy runs offline against real-shaped data.
+    Requests are matched on method, path, query and JSON body; the Jira host
+    and credentials are not part of the match.
+    """
+
+    def __init__(
+        self,
+        mode="live",
+        cassette_dir="cassettes",
+        replay_latency="0",
+        circuit=None,
+        max_concurrent=None,
+    ):
+        super().__init__()
+        if mode not in ("live", "record", "replay"):
+            raise ValueError(f"Unknown Jira traffic mode: {mode}")
+        self.mode = mode
+        self.cassette_dir = cassette_dir
+        self.replay_latency = replay_latency
+        self.circuit = circuit or CircuitBreaker()
+        # Calls beyond max_concurrent wait for a slot (up to the request's
+        # deadline) instead of opening more connections
+        self._slots = None
+        if max_concurrent:
+            self._slots = threading.BoundedSemaphore(max_concurrent)
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_concurrent)
+            self.mount("https://", adapter)
+            self.mount("http://", adapter)
+        if mode == "record":
+            os.makedirs(cassette_dir, exist_ok=True)
+
+    def request(self, method, url, params=None, json=None, timeout=None, **kwargs):
+        # Every call gets connect/read timeouts bounded by the request's deadline
+        timeout = upstream_timeout(timeout)
+        if self.mode == "replay":
+            started = time.monotonic()
+            response = self._replay(method, url, params, json)
+            budget = current_budget()
+            if budget is not None:
+                budget.add_jira_call(method, url, time.monotonic() - started)
+            return response
+
+        # The slot is taken first: a half-open circuit's trial call must not
+        # be claimed by a call that then gives up waiting for a slot
+        if self._slots is not None:
+            budget = current_budget()
+            wait_seconds = None
+            if budget is not None and budget.deadline is not None:
+                wait_seconds = max(budget.remaining() - DEADLINE_MARGIN_SECONDS, 0)
+            if not self._slots.acquire(timeout=wait_seconds):
+                raise DeadlineExceededError(
+                    "Request deadline reached waiting for a Jira connection"
+                )
+
+        if not self.circuit.allow():
+            if self._slots is not None:
+                self._slots.release()
+            raise JiraUnavailableError()
+
+        started = time.monotonic()
+        try:
+            response = super().request(
+                method, url, params=params, json=json, timeout=timeout, **kwargs
+            )
+        except requests.exceptions.RequestException:
+            self.circuit.record_failure()
+            raise
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+            budget = current_budget()
+            if budget is not None:
+                budget.add_jira_call(method, url, time.monotonic() - started)
+        # Rate limiting and server errors count against Jira, other errors don't
+        if response.status_code >= 500 or response.status_code == 429:
+            self.circuit.record_failure()
+        else:
+            self.circuit.record_success()
+
+        if self.mode == "record":
+            self._record(
+                method, url, params, json, response, time.monotonic() - started
+            )
+        return response
+
+    def cassette_path(self, method, url, params, body):
+        """Path of the cassette file for a request"""
+        parsed_url = urlsplit(url)
+        query = parse_qsl(parsed_url.query) + sorted((params or {}).items())
+        request_id = json.dumps(
+            [method.upper(), parsed_url.path, sorted(map(list, query)), body],
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(request_id.encode()).hexdigest()[:24]
+        name = parsed_url.path.strip("/").replace("/", "_")[-80:]
+        return os.path.join(self.cassette_dir, f"{method.upper()}_{name}_{digest}.json")
+
+    def _record(self, method, url, params, body, response, elapsed):
+        path = self.cassette_path(method, url, params, body)
+        cassette = {
+            "request": {
+                "method": method.upper(),
+                "path": urlsplit(url).path,
+                "query": urlsplit(url).query,
+                "params": params,
+                "json": body,
+            },
+            "response": {
+                "status_code": response.status_code,
+                "headers": dict(response.headers),
+                "body": response.content.decode("utf-8", errors="replace"),
+            },
+            "elapsed": round(elapsed, 4),
+        }
+        # Write to a temporary file first so replays never see half a cassette
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cassette, f, indent=1)
+        os.replace(tmp_path, path)
+        logger.debug(f"Recorded {method.upper()} {url} to {path}")
+
+    def _replay(self, method, url, params, body):
+        path = self.cassette_path(method, url, params, body)
+        try:
+            with open(path) as f:
+                cassette = json.load(f)
+        except FileNotFoundError:
+            logger.error(f"No recording for {method.upper()} {url} (expected {path})")
+            raise requests.exceptions.ConnectionError(
+                f"No recorded response for {method.upper()} {urlsplit(url).path}"
+            )
+
+        if self.replay_latency == "recorded":
+            time.sleep(cassette.get("elapsed", 0))
+        elif float(self.replay_latency) > 0:
+            time.sleep(float(self.replay_latency))
+
+        recorded = cassette["response"]
+        response = requests.Response()
+        response.status_code = recorded["status_code"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        # The recorded body is already decoded, so drop any transfer encoding
+        response.headers.pop("Content-Encoding", None)
+        response._content = recorded["body"].encode("utf-8")
+        # Mark the body as read so iter_content() serves it for streamed calls
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.url = url
+        return response
+
+
+class JiraInstance:
+    """One Jira site: its credentials, session (connection pool and concurrency
+    limit), circuit breaker and the search API it supports.
+
+    Cache entries are namespaced by the instance name.
+    """
+
+    def __init__(self, name, credentials, max_concurrent=JIRA_MAX_CONCURRENT):
+        self.name = name
+        self.credentials = credentials
+        self.circuit = CircuitBreaker(JIRA_CIRCUIT_FAILURES, JIRA_CIRCUIT_RESET_SECONDS)
+        # Each named instance keeps its recordings in a subdirectory
+        cassette_dir = JIRA_CASSETTE_DIR
+        if name != "default":
+            cassette_dir = os.path.join(JIRA_CASSETTE_DIR, name)
+        self.session = JiraSession(
+            JIRA_TRAFFIC_MODE,
+            cassette_dir,
+            JIRA_REPLAY_LATENCY,
+            circuit=self.circuit,
+            max_concurrent=max_concurrent,
+        )
+        # Search API in use; "auto" until the first search finds out
+        self.search_api = JIRA_SEARCH_API
+
+
+def load_jira_instances():
+    """The default instance plus those configured in JIRA_INSTANCES, by name"""
+    instances = {"default": JiraInstance("default", JIRA_CREDENTIALS)}
+    for name, config in JIRA_INSTANCES_CONFIG.items():
+        credentials = {
+            "jira_url": config.get("jira_url", "").rstrip("/"),
+            "email": config.get("email", ""),
+            "api_token": config.get("api_token", ""),
+        }
+        if JIRA_TRAFFIC_MODE == "replay":
+            credentials["email"] = credentials["email"] or "replay@localhost"
+            credentials["api_token"] = credentials["api_token"] or "replay"
+        instances[name] = JiraInstance(
+            name, credentials, int(config.get("max_concurrent", JIRA_MAX_CONCURRENT))
+        )
+    if DEFAULT_JIRA_INSTANCE not in instances:
+        raise ValueError(f"Unknown DEFAULT_JIRA_INSTANCE: {DEFAULT_JIRA_INSTANCE}")
+    return instances
+
+
+JIRA_INSTANCES = load_jira_instances()
+
+# The default instance's circuit breaker and session
+JIRA_CIRCUIT = JIRA_INSTANCES["default"].circuit
+jira_session = JIRA_INSTANCES["default"].session
+
+
+def current_instance():
+    """The Jira instance the request being served by this thread is for"""
+    budget = current_budget()
+    if budget is not None and budget.instance is not None:
+        return budget.instance
+    return JIRA_INSTANCES[DEFAULT_JIRA_INSTANCE]
+
+
+def current_instance_name():
+    return current_instance().name
+
+
+def jira_credentials():
+    """Credentials (jira_url, email, api_token) of the current Jira instance"""
+    return current_instance().credentials
+
+
+def run_for_instance(instance, fn, *args, **kwargs):
+    """Call fn outside a request as if serving one for ``instance``"""
+    return run_with_budget(RequestBudget(instance=instance), fn, *args, **kwargs)
+
+
+class SharedCache:
+    """Key-value store in a SQLite file, shared by the worker processes on a host.
+
+    Keys and tags are strings and values are pickled. Every write is one
+    transaction, so other processes see an entry whole or not at all.
+    Expiry times are wall-clock times (processes don't share a monotonic
+    clock), and expired entries are kept for stale fallbacks like
+    TTLCache's. Once the stored values add up to more than ``max_bytes``,
+    the least recently used entries are evicted; values over a quarter of
+    that aren't stored at all. Keys are prefixed with ``version``, so
+    entries written in another layout are never read and just age out.
+
+    Tag invalidations and clears are also appended to a log, which workers
+    poll every ``recheck_seconds`` to drop the same entries from their
+    in-process caches.
+
+    A failing store is logged and treated as a miss: the in-process caches
+    above it keep working.
+    """
+
+    # A read refreshes an entry's last use at most this often (seconds),
+    # sparing the file a write on every hit
+    touch_seconds = 60
+
+    # How long (seconds) invalidations stay in the log
+    invalidation_log_seconds = 24 * 3600
+
+    def __init__(self, path, max_bytes, version=1, recheck_seconds=5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version
+        self.recheck_seconds = recheck_seconds
+        self._local = threading.local()
+        with self._transaction() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY,"
+                " value BLOB, expires_at REAL, accessed REAL, size INTEGER)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS tags (tag TEXT, key TEXT,"
+                " PRIMARY KEY (tag, key)) WITHOUT ROWID"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS tags_key ON tags (key)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS invalidations"
+                " (id INTEGER PRIMARY KEY AUTOINCREMENT, tag TEXT, at REAL)"
+            )
+
+    def _connection(self):
+        # One connection per thread, and a new one after a fork
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _key(self, key):
+        return f"{self.version}:{key}"
+
+    @staticmethod
+    def _delete(db, keys):
+        db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+        db.executemany("DELETE FROM tags WHERE key = ?", [(key,) for key in keys])
+
+    def get(self, key):
+        """(value, wall-clock expiry or None) stored under key, or None"""
+        key = self._key(key)
+        try:
+            db = self._connection()
+            row = db.execute(
+                "SELECT value, expires_at, accessed FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            blob, expires_at, accessed = row
+            value = pickle.loads(blob)
+        except Exception as e:
+            logger.warning(f"Shared cache read of {key} failed: {str(e)}")
+            return None
+        now = time.time()
+        if now - accessed >= self.touch_seconds:
+            try:
+                db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            except sqlite3.Error as e:
+                logger.debug(f"Could not mark {key} as used: {str(e)}")
+        return value, expires_at
+
+    def set(self, key, value, expires_at=None, tags=()):
+        """Store value under key, replacing any entry there; False if it wasn't stored"""
+        key = self._key(key)
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(blob) > self.max_bytes // 4:
+                logger.debug(f"Not sharing {key}: {len(blob)} bytes is too large")
+                return False
+            with self._transaction() as db:
+                self._delete(db, [key])
+                db.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, expires_at, time.time(), len(blob)),
+                )
+                db.executemany(
+                    "INSERT OR IGNORE INTO tags VALUES (?, ?)",
+                    [(self._key(tag), key) for tag in tags],
+                )
+                self._evict(db, key)
+            return True
+        except Exception as e:
+            logger.warning(f"Shared cache write of {key} failed: {str(e)}")
+            return False
+
+    def _evict(self, db, keep):
+        """Evict least recently used entries, except ``keep``, until under max_bytes"""
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        while total > self.max_bytes:
+            oldest = db.execute(
+                "SELECT key, size FROM entries WHERE key != ? ORDER BY accessed LIMIT 8",
+                (keep,),
+            ).fetchall()
+            if not oldest:
+                break
+            self._delete(db, [key for key, _ in oldest])
+            total -= sum(size for _, size in oldest)
+
+    def pop(self, key):
+        try:
+            with self._transaction() as db:
+                self._delete(db, [self._key(key)])
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache delete of {key} failed: {str(e)}")
+
+    def _log_invalidations(self, db, tags):
+        now = time.time()
+        db.executemany(
+            "INSERT INTO invalidations (tag, at) VALUES (?, ?)",
+            [(self._key(tag), now) for tag in tags],
+        )
+        db.execute(
+            "DELETE FROM invalidations WHERE at < ?",
+            (now - self.invalidation_log_seconds,),
+        )
+
+    def invalidate_tags(self, tags):
+        """Drop every entry stored with any of the given tags, returning how many"""
+        try:
+            with self._transaction() as db:
+                keys = {
+                    key
+                    for tag in tags
+                    for (key,) in db.execute(
+                        "SELECT key FROM tags WHERE tag = ?", (self._key(tag),)
+                    )
+                }
+                self._delete(db, keys)
+                self._log_invalidations(db, tags)
+            return len(keys)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache invalidation failed: {str(e)}")
+            return 0
+
+    def clear(self, prefix):
+        """Drop every entry whose key starts with ``prefix``, logged as the tag ``prefix*``"""
+        start = self._key(prefix)
+        try:
+            with self._transaction() as db:
+                keys = [
+                    key
+                    for (key,) in db.execute(
+                        "SELECT key FROM entries WHERE key >= ? AND key < ?",
+                        (start, start + "\uffff"),
+                    )
+                ]
+                self._delete(db, keys)
+                self._log_invalidations(db, [f"{prefix}*"])
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache clear of {prefix} failed: {str(e)}")
+
+    def invalidations_since(self, last_id):
+        """(newest id, tags invalidated after ``last_id``); no tags when ``last_id`` is None"""
+        try:
+            db = self._connection()
+            if last_id is None:
+                (newest,) = db.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM invalidations"
+                ).fetchone()
+                return newest, []
+            rows = db.execute(
+                "SELECT id, tag FROM invalidations WHERE id > ? ORDER BY id",
+                (last_id,),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read shared cache invalidations: {str(e)}")
+            return last_id, []
+        prefix = self._key("")
+        tags = [tag[len(prefix) :] for _, tag in rows if tag.startswith(prefix)]
+        return (rows[-1][0] if rows else last_id), tags
+
+
+class TTLCache:
+    """Small thread-safe in-process cache with optional expiry and LRU eviction.
+
+    Expired entries are kept until they are evicted or replaced, so they can
+    still be served with ``allow_stale`` when Jira is unavailable. With a
+    ``namespace`` function, keys and tags are scoped to whatever it returns
+    when they are used (the current Jira instance, for the proxy's caches).
+
+    With a ``shared`` SharedCache, entries are also written to it under
+    ``name`` and local misses are looked up there, so worker processes
+    reuse each other's results. Invalidation, ``pop`` and ``clear`` reach
+    both tiers, and invalidations made by other workers are applied locally
+    within the shared cache's ``recheck_seconds``.
+    """
+
+    def __init__(
+        self, ttl_seconds=None, max_entries=1024, namespace=None, shared=None, name=None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.shared = shared
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Last shared invalidation applied here, and when the log was read
+        self._last_invalidation = None
+        self._synced_at = None
+
+    def _key(self, key):
+        return key if self.namespace is None else (self.namespace(), key)
+
+    def _shared_key(self, key):
+        # Namespaced keys are tuples of strings; their repr is the same in every process
+        return f"{self.name}:{key!r}"
+
+    def _sync_invalidations(self):
+        """Apply the invalidations other workers logged in the shared tier"""
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._synced_at is not None
+                and now - self._synced_at < self.shared.recheck_seconds
+            ):
+                return
+            self._synced_at = now
+            last_invalidation = self._last_invalidation
+        newest, tags = self.shared.invalidations_since(last_invalidation)
+        prefix = f"{self.name}:"
+        tags = {tag for tag in tags if tag.startswith(prefix)}
+        with self._lock:
+            self._last_invalidation = newest
+            if not tags:
+                return
+            if f"{prefix}*" in tags:
+                self._entries.clear()
+                return
+            # Entries set here after the invalidation are dropped too; the
+            # shared tier still has them
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if any(self._shared_key(tag) in tags for tag in entry[2])
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def _store(self, key, value, expires_at, tags):
+        with self._lock:
+            self._entries[key] = (value, expires_at, tags)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key, default=None, allow_stale=False):
+        key = self._key(key)
+        if self.shared is not None:
+            self._sync_invalidations()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if allow_stale or expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return value
+        if self.shared is None:
+            return default
+
+        stored = self.shared.get(self._shared_key(key))
+        if stored is None:
+            return default
+        (value, tags), expires_at = stored
+        if expires_at is not None:
+            seconds_left = expires_at - time.time()
+            if seconds_left <= 0 and not allow_stale:
+                return default
+            expires_at = time.monotonic() + seconds_left
+        self._store(key, value, expires_at, tags)
+        return value
+
+    def set(self, key, value, ttl_seconds=None, tags=()):
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds else None
+        key = self._key(key)
+        tags = frozenset(self._key(tag) for tag in tags)
+        self._store(key, value, expires_at, tags)
+        if self.shared is not None:
+            self.shared.set(
+                self._shared_key(key),
+                (value, tags),
+                time.time() + ttl_seconds if ttl_seconds else None,
+                [self._shared_key(tag) for tag in tags],
+            )
+
+    def pop(self, key, default=None):
+        key = self._key(key)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if self.shared is not None:
+            self.shared.pop(self._shared_key(key))
+        return default if entry is None else entry[0]
+
+    def invalidate_tags(self, tags):
+        """Drop every entry set with any of the given tags, returning how many"""
+        tags = {self._key(tag) for tag in tags}
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[2] & tags]
+            for key in stale:
+                del self._entries[key]
+        if self.shared is None:
+            return len(stale)
+        shared_stale = self.shared.invalidate_tags(
+            [self._shared_key(tag) for tag in tags]
+        )
+        # The shared tier usually holds this worker's entries too
+        return max(len(stale), shared_stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.shared is not None:
+            self.shared.clear(f"{self.name}:")
+
+    def export_entries(self):
+        """Entries as (key, value, seconds left or None, tags), least recent first.
+
+        Keys and tags include their namespace.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value, None if expires_at is None else expires_at - now, tags)
+                for key, (value, expires_at, tags) in self._entries.items()
+            ]
+
+    def restore_entries(self, entries, elapsed=0, grace_seconds=0):
+        """Load exported entries as the least recently used ones.
+
+        ``elapsed`` seconds are taken off each entry's time left; entries
+        that have run out get ``grace_seconds`` (or stay expired with 0).
+        Keys set since startup are newer and are kept. Returns the restored
+        keys.
+        """
+        now = time.monotonic()
+        restored = []
+        with self._lock:
+            for key, value, seconds_left, tags in reversed(entries):
+                if key in self._entries:
+                    continue
+                if seconds_left is None:
+                    expires_at = None
+                else:
+                    seconds_left -= elapsed
+                    if seconds_left <= 0:
+                        seconds_left = grace_seconds
+                    expires_at = now + seconds_left
+                self._entries[key] = (value, expires_at, tags)
+                self._entries.move_to_end(key, last=False)
+                restored.append(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return restored
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def make_cache_key(*parts):
+    """Build a stable string cache key from JSON-serializable parts"""
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+def project_cache_tag(board):
+    """Tag for cache entries computed from one project, or from any project"""
+    return board or "*"
+
+
+def issue_project_key(issue_key):
+    """Project key of an issue key such as ABC-123"""
+    return issue_key.rsplit("-", 1)[0]
+
+
+class IssueStore:
+    """Issues (with full changelog) the proxy has fetched, kept current by webhooks.
+
+    Entries hold the raw Jira issue and its status changes, oldest first.
+    Listeners are called as ``listener(event, issue_key, entry)`` with event
+    "upsert" or "delete" (entry is None for deletes).
+    """
+
+    def __init__(self, ttl_seconds=None, max_issues=100000, namespace=None):
+        self._cache = TTLCache(
+            ttl_seconds=ttl_seconds, max_entries=max_issues, namespace=namespace
+        )
+        self._listeners = []
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self, event, issue_key, entry):
+        for listener in self._listeners:
+            try:
+                listener(event, issue_key, entry)
+            except Exception as e:
+                logger.error(f"Issue store listener failed for {issue_key}: {str(e)}")
+
+    def get(self, issue_key):
+        return self._cache.get(issue_key)
+
+    def upsert(self, issue):
+        entry = {"issue": issue, "status_changes": get_issue_status_changes(issue)}
+        self._cache.set(issue["key"], entry)
+        self._notify("upsert", issue["key"], entry)
+        return entry
+
+    def apply_change(self, issue, history):
+        """Apply a webhook delta to a stored issue; returns False if it isn't stored.
+
+        Issues the store hasn't seen are left alone rather than stored with a
+        partial changelog, so their timelines are never wrong.
+        """
+        entry = self.get(issue["key"])
+        if entry is None:
+            return False
+
+        stored = entry["issue"]
+        updated = {
+            **stored,
+            "fields": {**stored.get("fields", {}), **issue.get("fields", {})},
+        }
+        histories = list(stored.get("changelog", {}).get("histories", []))
+        if history and all(h.get("id") != history.get("id") for h in histories):
+            histories.append(history)
+        updated["changelog"] = {**stored.get("changelog", {}), "histories": histories}
+        self.upsert(updated)
+        return True
+
+    def delete(self, issue_key):
+        existed = self._cache.pop(issue_key) is not None
+        self._notify("delete", issue_key, None)
+        return existed
+
+    def export_entries(self):
+        return self._cache.export_entries()
+
+    def restore_entries(self, entries, elapsed=0, grace_seconds=0):
+        """Restore exported entries, telling listeners about each one"""
+        restored = self._cache.restore_entries(entries, elapsed, grace_seconds)
+        entries_by_key = {key: value for key, value, _, _ in entries}
+        for key in restored:
+            if self._cache.namespace is None:
+                self._notify("upsert", key, entries_by_key[key])
+                continue
+            # Listeners run as if for the instance the issue belongs to
+            instance_name, issue_key = key
+            instance = JIRA_INSTANCES.get(instance_name)
+            if instance is not None:
+                run_for_instance(
+                    instance, self._notify, "upsert", issue_key, entries_by_key[key]
+                )
+        return restored
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class AgingIndex:
+    """Each open issue's current status and when it entered it, by project.
+
+    Kept current from the issue store's timelines, so finding a project's
+    aging tickets is a lookup rather than one history fetch per ticket.
+    Issues leave the index when they are done or deleted. Projects are
+    those of the current Jira instance.
+    """
+
+    def __init__(self):
+        self._projects = {}
+        self._refreshed_at = {}
+        self._lock = threading.Lock()
+
+    def on_store_event(self, event, issue_key, entry):
+        record = aging_record(entry) if event == "upsert" else None
+        with self._lock:
+            issues = self._projects.setdefault(
+                (current_instance_name(), issue_project_key(issue_key)), {}
+            )
+            if record is None:
+                issues.pop(issue_key, None)
+            else:
+                issues[issue_key] = record
+
+    def project_issues(self, project):
+        with self._lock:
+            return list(
+                self._projects.get((current_instance_name(), project), {}).values()
+            )
+
+    def is_fresh(self, project, max_age_seconds):
+        with self._lock:
+            refreshed_at = self._refreshed_at.get((current_instance_name(), project))
+        return (
+            refreshed_at is not None
+            and time.monotonic() - refreshed_at < max_age_seconds
+        )
+
+    def mark_refreshed(self, project, open_keys=None):
+        """Record a refresh of a project; ``open_keys`` (when complete) drops the rest"""
+        project = (current_instance_name(), project)
+        with self._lock:
+            if open_keys is not None:
+                issues = self._projects.get(project, {})
+                for issue_key in set(issues) - set(open_keys):
+                    del issues[issue_key]
+            self._refreshed_at[project] = time.monotonic()
+
+
+def dependency_node(key, fields):
+    """Graph node of an issue from its fields (or a linked issue's summary fields)"""
+    status = fields.get("status") or {}
+    status_name = status.get("name", "Unknown")
+    stage = map_status_to_stage(status_name, {})
+    return {
+        "key": key,
+        "summary": fields.get("summary"),
+        "status": status_name,
+        "stage": stage,
+        "done": stage == "Done"
+        or status.get("statusCategory", {}).get("key") == "done",
+    }
+
+
+def issue_dependency_links(issue):
+    """(linked issue, this issue blocks it) for each dependency link of an issue"""
+    for link in issue.get("fields", {}).get("issuelinks") or []:
+        if (link.get("type") or {}).get(
+            "name", ""
+        ).lower() not in DEPENDENCY_LINK_TYPES:
+            continue
+        if link.get("outwardIssue"):
+            yield link["outwardIssue"], True
+        elif link.get("inwardIssue"):
+            yield link["inwardIssue"], False
+
+
+class DependencyGraph:
+    """Which issues block which, from issue links, kept current from the issue store.
+
+    An issue's links list every dependency it takes part in, so each stored
+    issue that came with ``issuelinks`` replaces the edges it touches; stored
+    issues fetched without them only update their node. Linked issues that
+    aren't stored get a node from the summary Jira embeds in the link.
+    Analyses are cached until the graph next changes. Graphs are those of
+    the current Jira instance.
+    """
+
+    def __init__(self):
+        self._graphs = {}
+        self._refreshed = {}
+        self._analyses = {}
+        self._lock = threading.Lock()
+
+    def _graph(self):
+        return self._graphs.setdefault(
+            current_instance_name(),
+            {"nodes": {}, "blocks": {}, "blocked_by": {}, "version": 0},
+        )
+
+    def _unlink(self, graph, issue_key):
+        for blocked in graph["blocks"].pop(issue_key, ()):
+            graph["blocked_by"].get(blocked, set()).discard(issue_key)
+        for blocker in graph["blocked_by"].pop(issue_key, ()):
+            graph["blocks"].get(blocker, set()).discard(issue_key)
+
+    def on_store_event(self, event, issue_key, entry):
+        with self._lock:
+            graph = self._graph()
+            graph["version"] += 1
+            if event != "upsert":
+                graph["nodes"].pop(issue_key, None)
+                self._unlink(graph, issue_key)
+                return
+
+            issue = entry["issue"]
+            fields = issue.get("fields", {})
+            graph["nodes"][issue_key] = dependency_node(issue_key, fields)
+            if "issuelinks" not in fields:
+                return
+
+            self._unlink(graph, issue_key)
+            for linked, blocks in issue_dependency_links(issue):
+                linked_key = linked.get("key")
+                if not linked_key:
+                    continue
+                node = graph["nodes"].get(linked_key)
+                if node is None or node.get("linked_only"):
+                    node = dependency_node(linked_key, linked.get("fields") or {})
+                    graph["nodes"][linked_key] = {**node, "linked_only": True}
+                blocker, blocked = (
+                    (issue_key, linked_key) if blocks else (linked_key, issue_key)
+                )
+                graph["blocks"].setdefault(blocker, set()).add(blocked)
+                graph["blocked_by"].setdefault(blocked, set()).add(blocker)
+
+    def is_fresh(self, project, max_age_seconds):
+        with self._lock:
+            refreshed = self._refreshed.get((current_instance_name(), project))
+        return (
+            refreshed is not None
+            and time.monotonic() - refreshed["at"] < max_age_seconds
+        )
+
+    def mark_refreshed(self, project, stage_hours):
+        """Record a refresh of a project and its average hours per cycle-time stage"""
+        with self._lock:
+            self._refreshed[(current_instance_name(), project)] = {
+                "at": time.monotonic(),
+                "stage_hours": stage_hours,
+            }
+
+    def has_project(self, project):
+        with self._lock:
+            return any(
+                issue_project_key(key) == project for key in self._graph()["nodes"]
+            )
+
+    def analyze(self, project):
+        """Blocked chains, critical path and top blockers of a project's open issues.
+
+        Cached until the graph changes or the project is refreshed.
+        """
+        instance_name = current_instance_name()
+        with self._lock:
+            graph = self._graph()
+            refreshed = self._refreshed.get((instance_name, project)) or {}
+            version = (graph["version"], refreshed.get("at"))
+            cached = self._analyses.get((instance_name, project))
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            analysis = analyze_dependencies(
+                graph, project, refreshed.get("stage_hours") or {}
+            )
+            self._analyses[(instance_name, project)] = (version, analysis)
+            return analysis
+
+
+# Stages whose average time makes up an issue's remaining cycle time, in order
+CYCLE_TIME_STAGES = ["In Progress", "Code Review", "QA"]
+
+
+def remaining_cycle_hours(stage, stage_hours):
+    """Estimated hours left for an open issue: the average of its stage and every later one"""
+    if stage == "Done":
+        return 0
+    stages = CYCLE_TIME_STAGES
+    if stage in CYCLE_TIME_STAGES:
+        stages = CYCLE_TIME_STAGES[CYCLE_TIME_STAGES.index(stage) :]
+    return sum(stage_hours.get(name, 0) for name in stages)
+
+
+def analyze_dependencies(graph, project, stage_hours):
+    """Analyze the open dependencies around a project's issues in O(issues + links).
+
+    Takes every open issue of the project plus the open issues connected to
+    them through open blockers, orders them topologically and runs one pass
+    in each direction: the longest chain and most estimated work ahead of
+    each issue (for blocked chains and the critical path), and behind it
+    (for top blockers). Issues on or behind a dependency cycle can't be
+    ordered and are reported separately.
+    """
+    nodes = graph["nodes"]
+
+    def is_open(key):
+        node = nodes.get(key)
+        return node is not None and not node["done"]
+
+    def open_neighbours(edges, key):
+        return [other for other in edges.get(key, ()) if is_open(other)]
+
+    # Open issues connected to the project's open issues
+    scope = {key for key in nodes if issue_project_key(key) == project and is_open(key)}
+    queue = deque(scope)
+    while queue:
+        key = queue.popleft()
+        for edges in (graph["blocks"], graph["blocked_by"]):
+            for other in open_neighbours(edges, key):
+                if other not in scope:
+                    scope.add(other)
+                    queue.append(other)
+
+    blockers = {key: open_neighbours(graph["blocked_by"], key) for key in scope}
+    blocked = {key: open_neighbours(graph["blocks"], key) for key in scope}
+    hours = {
+        key: remaining_cycle_hours(nodes[key]["stage"], stage_hours) for key in scope
+    }
+
+    # Kahn's algorithm; whatever is left over is on or behind a cycle
+    waiting = {key: len(blockers[key]) for key in scope}
+    order = [key for key in scope if not waiting[key]]
+    for key in order:
+        for other in blocked[key]:
+            waiting[other] -= 1
+            if not waiting[other]:
+                order.append(other)
+    unordered = sorted(scope - set(order), key=ticket_key_order)
+
+    # Forward: longest chain and most work up to and including each issue
+    chain, chain_from = {}, {}
+    finish, finish_from = {}, {}
+    for key in order:
+        ahead = blockers[key]
+        chain_from[key] = max(ahead, key=lambda b: chain[b], default=None)
+        finish_from[key] = max(ahead, key=lambda b: (finish[b], chain[b]), default=None)
+        chain[key] = 1 + (chain[chain_from[key]] if ahead else 0)
+        finish[key] = hours[key] + (finish[finish_from[key]] if ahead else 0)
+
+    # Backward: longest chain and most work waiting behind each issue
+    behind, behind_hours = {}, {}
+    for key in reversed(order):
+        behind[key], behind_hours[key] = 0, 0
+        for other in blocked[key]:
+            if other in behind:
+                behind[key] = max(behind[key], behind[other] + 1)
+                behind_hours[key] = max(
+                    behind_hours[key], behind_hours[other] + hours[other]
+                )
+
+    def summary(key):
+        node = nodes[key]
+        return {
+            "key": key,
+            "summary": node["summary"],
+            "status": node["status"],
+            "stage": node["stage"],
+            "estimated_hours": round(hours[key], 2),
+        }
+
+    def walk_back(key, previous):
+        path = []
+        while key is not None:
+            path.append(summary(key))
+            key = previous[key]
+        return path[::-1]
+
+    # A chain ends at a blocked issue that isn't itself blocking anything open
+    chains = [
+        walk_back(key, chain_from)
+        for key in sorted(
+            (key for key in order if chain[key] > 1 and not blocked[key]),
+            key=lambda key: (-chain[key], ticket_key_order(key)),
+        )
+    ]
+
+    critical_end = max(order, key=lambda key: (finish[key], chain[key]), default=None)
+    critical_path = [] if critical_end is None else walk_back(critical_end, finish_from)
+
+    top_blockers = sorted(
+        (
+            {
+                **summary(key),
+                "blocks_open": len(blocked[key]),
+                "longest_chain_behind": behind[key],
+                "hours_behind": round(behind_hours[key], 2),
+            }
+            for key in order
+            if blocked[key]
+        ),
+        key=lambda blocker: (
+            -blocker["hours_behind"],
+            -blocker["blocks_open"],
+            ticket_key_order(blocker["key"]),
+        ),
+    )
+
+    return {
+        "open_issues": len(scope),
+        "dependencies": sum(len(blocked[key]) for key in scope),
+        "stage_hours": stage_hours,
+        "chains": chains,
+        "critical_path": {
+            "issues": critical_path,
+            "length": len(critical_path),
+            "estimated_hours": (
+                0 if critical_end is None else round(finish[critical_end], 2)
+            ),
+        },
+        "top_blockers": top_blockers,
+        "cycles": unordered,
+    }
+
+
+# Threshold used for statuses only recognized by their workflow stage
+AGING_STAGE_THRESHOLDS = {
+    "In Progress": "In Progress",
+    "Code Review": "In Review",
+    "QA": "In QA",
+}
+
+
+def aging_threshold_hours(status_name):
+    """The AGING_THRESHOLDS entry for a status, or None if it isn't monitored.
+
+    Matches exactly, then case-insensitively by name, then by workflow stage,
+    like the dashboard's risk analysis.
+    """
+    if status_name in AGING_THRESHOLDS:
+        return AGING_THRESHOLDS[status_name]
+    for name, hours in AGING_THRESHOLDS.items():
+        if name.lower() in status_name.lower():
+            return hours
+    stage = map_status_to_stage(status_name, {})
+    return AGING_THRESHOLDS.get(AGING_STAGE_THRESHOLDS.get(stage))
+
+
+def aging_record(entry):
+    """Aging index record of an issue store entry, or None if the issue is done"""
+    issue = entry["issue"]
+    fields = issue.get("fields", {})
+    status = fields.get("status") or {}
+    status_name = status.get("name", "Unknown")
+    stage = map_status_to_stage(status_name, {})
+    if stage == "Done" or status.get("statusCategory", {}).get("key") == "done":
+        return None
+
+    # The issue entered its current status with the last change to it, or
+    # was created in it
+    entered = fields.get("created")
+    for change in reversed(entry["status_changes"]):
+        if change["to"] == status_name:
+            entered = change["date"]
+            break
+    if not entered:
+        return None
+
+    return {
+        "key": issue["key"],
+        "summary": fields.get("summary"),
+        "status": status_name,
+        "stage": stage,
+        "entered_at": parse_jira_datetime(entered),
+        "threshold_hours": aging_threshold_hours(status_name),
+    }
+
+
+ISSUE_STORE = IssueStore(
+    ttl_seconds=ISSUE_STORE_TTL_SECONDS,
+    max_issues=ISSUE_STORE_MAX_ISSUES,
+    namespace=current_instance_name,
+)
+
+AGING_INDEX = AgingIndex()
+ISSUE_STORE.subscribe(AGING_INDEX.on_store_event)
+
+DEPENDENCY_GRAPH = DependencyGraph()
+ISSUE_STORE.subscribe(DEPENDENCY_GRAPH.on_store_event)
+
+# Bump when the layout of a shared cache's keys or values changes; entries
+# of other versions are ignored
+SHARED_CACHE_VERSION = 1
+
+SHARED_CACHE = (
+    SharedCache(
+        SHARED_CACHE_PATH,
+        SHARED_CACHE_MAX_BYTES,
+        SHARED_CACHE_VERSION,
+        SHARED_CACHE_RECHECK_SECONDS,
+    )
+    if SHARED_CACHE_PATH
+    else None
+)
+
+METRICS_CACHE = TTLCache(
+    ttl_seconds=METRICS_CACHE_SECONDS,
+    max_entries=256,
+    namespace=current_instance_name,
+    shared=SHARED_CACHE,
+    name="metrics",
+)
+
+# Finished trend buckets never change, so they only leave the cache by eviction
+TREND_BUCKET_CACHE = TTLCache(
+    max_entries=5000,
+    namespace=current_instance_name,
+    shared=SHARED_CACHE,
+    name="trend_buckets",
+)
+
+# Throughput histories and forecasts, keyed by the day they were made for
+FORECAST_CACHE = TTLCache(
+    ttl_seconds=24 * 3600,
+    max_entries=256,
+    namespace=current_instance_name,
+    shared=SHARED_CACHE,
+    name="forecast",
+)
+
+CFD_CACHE = TTLCache(
+    ttl_seconds=CFD_CACHE_SECONDS,
+    max_entries=100,
+    namespace=current_instance_name,
+    shared=SHARED_CACHE,
+    name="cfd",
+)
+
+FIELD_CACHE = TTLCache(
+    ttl_seconds=FIELD_CACHE_SECONDS,
+    max_entries=16,
+    namespace=current_instance_name,
+    shared=SHARED_CACHE,
+    name="fields",
+)
+
+BOARD_CACHE = TTLCache(
+    ttl_seconds=BOARD_CACHE_SECONDS,
+    max_entries=16,
+    namespace=current_instance_name,
+    shared=SHARED_CACHE,
+    name="boards",
+)
+
+VELOCITY_CACHE = TTLCache(
+    ttl_seconds=VELOCITY_CACHE_SECONDS,
+    max_entries=256,
+    namespace=current_instance_name,
+    shared=SHARED_CACHE,
+    name="velocity",
+)
+
+TICKET_TABLE_CACHE = TTLCache(
+    ttl_seconds=TICKET_TABLE_CACHE_SECONDS,
+    max_entries=32,
+    namespace=current_instance_name,
+    shared=SHARED_CACHE,
+    name="tickets",
+)
+
+# Bump when the layout of a snapshotted cache's keys or values changes;
+# snapshots of other versions are ignored
+SNAPSHOT_VERSION = 1
+
+# Caches saved in the snapshot by section name, in the order they are
+# restored (small, often-used ones first)
+SNAPSHOT_SECTIONS = {
+    "fields": FIELD_CACHE,
+    "boards": BOARD_CACHE,
+    "metrics": METRICS_CACHE,
+    "velocity": VELOCITY_CACHE,
+    "cfd": CFD_CACHE,
+    "trend_buckets": TREND_BUCKET_CACHE,
+    "issues": ISSUE_STORE,
+}
+
+
+def write_snapshot(path):
+    """Save the snapshotted caches to ``path``, replacing it atomically.
+
+    The file is a one-line JSON header (version, write time and the byte
+    range of each section) followed by one pickle per section, so sections
+    can be restored one at a time straight from a memory map.
+    """
+    blobs = {
+        name: pickle.dumps(cache.export_entries(), protocol=pickle.HIGHEST_PROTOCOL)
+        for name, cache in SNAPSHOT_SECTIONS.items()
+    }
+    sections = {}
+    offset = 0
+    for name, blob in blobs.items():
+        sections[name] = [offset, len(blob)]
+        offset += len(blob)
+    header = json.dumps(
+        {"version": SNAPSHOT_VERSION, "written_at": time.time(), "sections": sections}
+    ).encode()
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header + b"\n")
+        for blob in blobs.values():
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    logger.debug(f"Wrote {offset} byte snapshot to {path}")
+
+
+def restore_snapshot(data, path):
+    """Restore the sections of a snapshot held in ``data`` (bytes or a memory map)"""
+    header_end = data.find(b"\n")
+    header = json.loads(data[:header_end])
+    if header.get("version") != SNAPSHOT_VERSION:
+        logger.warning(
+            f"Ignoring snapshot {path} with version {header.get('version')}, expected {SNAPSHOT_VERSION}"
+        )
+        return 0
+
+    restored = 0
+    elapsed = max(time.time() - header["written_at"], 0)
+    body = memoryview(data)[header_end + 1 :]
+    try:
+        for name, cache in SNAPSHOT_SECTIONS.items():
+            if name not in header["sections"]:
+                continue
+            offset, length = header["sections"][name]
+            entries = pickle.loads(body[offset : offset + length])
+            keys = cache.restore_entries(entries, elapsed, SNAPSHOT_STALE_GRACE_SECONDS)
+            restored += len(keys)
+            logger.debug(f"Restored {len(keys)} {name} entries from {path}")
+            queue_snapshot_refreshes(name, entries, keys, elapsed)
+    finally:
+        body.release()
+    return restored
+
+
+def load_snapshot(path):
+    """Restore the caches saved by write_snapshot, returning the entries restored.
+
+    Entries keep whatever time they had left, less the time since the
+    snapshot was written. Those that ran out meanwhile are served for
+    SNAPSHOT_STALE_GRACE_SECONDS while they are recomputed in the background
+    (fields, boards and metrics; see queue_snapshot_refreshes), and are still
+    available as stale fallbacks after that. The file is memory-mapped
+    rather than read where possible.
+    """
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return 0
+
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            data = f.read()
+        try:
+            restored = restore_snapshot(data, path)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    logger.info(f"Restored {restored} cache entries from snapshot {path}")
+    return restored
+
+
+# Route whose deadline applies when a restored entry of a snapshot section
+# is recomputed, for the sections that are (the others are refetched by
+# the next request that needs them)
+SNAPSHOT_REFRESH_ROUTES = {
+    "fields": "get_fields",
+    "boards": "get_boards",
+    "metrics": "get_resolution_metrics",
+}
+
+_snapshot_refreshes = queue.Queue()
+_snapshot_refresh_thread = None
+_snapshot_refresh_lock = threading.Lock()
+
+
+def queue_snapshot_refreshes(name, entries, restored_keys, elapsed):
+    """Queue the restored entries of a section that expired while the proxy was down.
+
+    They are recomputed one at a time by a background thread, most recently
+    used first, while the restored values are served.
+    """
+    global _snapshot_refresh_thread
+    if name not in SNAPSHOT_REFRESH_ROUTES:
+        return 0
+    restored_keys = set(restored_keys)
+    expired = [
+        (name, key, tags)
+        for key, _, seconds_left, tags in reversed(entries)
+        if key in restored_keys and seconds_left is not None and seconds_left <= elapsed
+    ]
+    if not expired:
+        return 0
+    with _snapshot_refresh_lock:
+        if _snapshot_refresh_thread is None:
+            _snapshot_refresh_thread = threading.Thread(
+                target=run_snapshot_refreshes, name="snapshot-refreshes", daemon=True
+            )
+            _snapshot_refresh_thread.start()
+    for refresh in expired:
+        _snapshot_refreshes.put(refresh)
+    logger.info(f"Refreshing {len(expired)} expired {name} entries in the background")
+    return len(expired)
+
+
+def run_snapshot_refreshes():
+    """Recompute queued snapshot entries forever (in a thread)"""
+    while True:
+        name, key, tags = _snapshot_refreshes.get()
+        try:
+            refresh_snapshot_entry(name, key, tags)
+        except Exception as e:
+            logger.warning(f"Could not refresh restored {name} entry {key}: {str(e)}")
+        finally:
+            _snapshot_refreshes.task_done()
+
+
+def refresh_snapshot_entry(name, key, tags):
+    """Recompute one restored entry for its Jira instance, under its route's deadline"""
+    # The snapshotted caches are namespaced by Jira instance
+    instance_name, key = key
+    instance = JIRA_INSTANCES.get(instance_name)
+    if instance is None:
+        return
+    seconds = ROUTE_DEADLINES.get(
+        SNAPSHOT_REFRESH_ROUTES[name], REQUEST_DEADLINE_SECONDS
+    )
+    budget = RequestBudget(None if seconds is None else float(seconds), instance)
+    run_with_budget(
+        budget, recompute_snapshot_entry, name, key, [tag for _, tag in tags]
+    )
+
+
+def recompute_snapshot_entry(name, key, tags):
+    """Recompute and cache one fields, boards or metrics entry with the functions that made it"""
+    jira_headers = get_jira_headers()
+    if name == "fields" and key == "fields":
+        get_jira_fields(jira_headers, refresh=True)
+    elif name == "fields" and key == "story_point_field":
+        get_story_point_field(jira_headers, refresh=True)
+    elif name == "boards" and key == "boards":
+        fetch_board_catalog(jira_headers, refresh=True)
+    elif name == "metrics":
+        parts = json.loads(key)
+        if parts[0] != "metrics":
+            return
+        _, jql, max_results, exclude_weekends, min_time_threshold, percentiles = parts
+        metrics = compute_resolution_metrics(
+            jql, max_results, exclude_weekends, min_time_threshold, percentiles
+        )
+        # Results cut short by the deadline are left to the next request
+        if not upstream_partial():
+            METRICS_CACHE.set(key, metrics, tags=tags)
+
+
+def run_snapshots(path, interval_seconds, restored):
+    """Restore the snapshot, then write a new one every interval (in a thread)"""
+    try:
+        load_snapshot(path)
+    except Exception as e:
+        logger.error(f"Could not restore snapshot {path}: {str(e)}")
+    restored.set()
+
+    while True:
+        time.sleep(interval_seconds)
+        try:
+            write_snapshot(path)
+        except Exception as e:
+            logger.error(f"Could not write snapshot {path}: {str(e)}")
+
+
+def start_snapshots(path=SNAPSHOT_PATH, interval_seconds=SNAPSHOT_INTERVAL_SECONDS):
+    """Restore the caches in the background and keep saving them.
+
+    Requests are served straight away; until a section has been restored
+    they fall through to Jira as usual. A final snapshot is written at exit,
+    unless the old one hasn't been restored yet.
+    """
+    if not path:
+        return None
+    restored = threading.Event()
+    thread = threading.Thread(
+        target=run_snapshots,
+        args=(path, interval_seconds, restored),
+        name="cache-snapshots",
+        daemon=True,
+    )
+    thread.start()
+
+    def write_final_snapshot():
+        if not restored.is_set():
+            return
+        try:
+            write_snapshot(path)
+        except Exception as e:
+            logger.error(f"Could not write snapshot {path}: {str(e)}")
+
+    atexit.register(write_final_snapshot)
+    return thread
+
+
+@app.before_request
+def start_request_budget():
+    """Pick the request's Jira instance and give it a deadline for its Jira calls"""
+    instance_name = (
+        request.headers.get("X-Jira-Instance")
+        or request.args.get("instance")
+        or DEFAULT_JIRA_INSTANCE
+    )
+    instance = JIRA_INSTANCES.get(instance_name)
+    if instance is None:
+        _upstream.budget = None
+        return jsonify({"error": f"Unknown Jira instance: {instance_name}"}), 404
+
+    seconds = ROUTE_DEADLINES.get(request.endpoint, REQUEST_DEADLINE_SECONDS)
+    _upstream.budget = RequestBudget(
+        None if seconds is None else float(seconds), instance
+    )
+    if PROFILE_SECRET and request.endpoint != "get_profile" and profile_requested():
+        _upstream.budget.profile = RequestProfile.start(
+            request.args.get("profileAllocations", "true").lower() == "true"
+        )
+        if _upstream.budget.profile is None:
+            logger.warning("Not profiling request: another request is being profiled")
+
+
+@app.after_request
+def add_upstream_headers(response):
+    """Report the request's deadline, partial or stale results and the circuit state"""
+    budget = current_budget()
+    if budget is not None:
+        if budget.deadline is not None:
+            response.headers["X-Deadline-Seconds"] = f"{budget.seconds:g}"
+            response.headers["X-Deadline-Remaining"] = (
+                f"{max(budget.remaining(), 0):.3f}"
+            )
+        if budget.partial:
+            response.headers["X-Partial-Result"] = "deadline"
+        if budget.stale:
+            response.headers["X-Served-Stale"] = "true"
+    response.headers["X-Jira-Instance"] = current_instance_name()
+    response.headers["X-Jira-Circuit"] = current_instance().circuit.state
+    response.headers["X-Jira-Timeouts"] = (
+        f"connect={JIRA_CONNECT_TIMEOUT:g}, read={JIRA_READ_TIMEOUT:g}"
+    )
+    if budget is not None:
+        response.headers["Server-Timing"] = budget.server_timing()
+        response.headers["Timing-Allow-Origin"] = FRONTEND_ORIGIN
+    if budget is not None and budget.profile is not None:
+        profile, budget.profile = budget.profile, None
+        profile.stop()
+        name = (
+            f"{datetime.now():%Y%m%d-%H%M%S}-{request.endpoint}-{os.urandom(3).hex()}"
+        )
+        try:
+            profile.write(PROFILE_DIR, name)
+            response.headers["X-Profile-Id"] = name
+        except OSError as e:
+            logger.error(f"Could not write profile {name}: {str(e)}")
+    return response
+
+
+@app.teardown_request
+def end_request_budget(exc):
+    budget = current_budget()
+    if budget is not None and budget.profile is not None:
+        budget.profile.stop()
+    _upstream.budget = None
+
+
+def serve_stale_or_error(cache, cache_key, error):
+    """Answer with an expired cache entry when Jira is unavailable, or with the error"""
+    stale = cache.get(cache_key, allow_stale=True)
+    if stale is None:
+        return jsonify({"error": str(error)}), error.status_code
+
+    logger.warning(f"Serving stale cached data for {cache_key}: {str(error)}")
+    budget = current_budget()
+    if budget is not None:
+        budget.stale = True
+    return jsonify(stale), 200
+
+
+@app.route("/config", methods=["GET"])
+def get_config():
+    """Return backend configuration including Jira URL (but not credentials)"""
+    return jsonify({"jira_url": jira_credentials()["jira_url"]})
+
+
+@app.route("/instances", methods=["GET"])
+def get_instances():
+    """List the Jira instances this proxy serves (without their credentials)"""
+    return jsonify(
+        {
+            "default": DEFAULT_JIRA_INSTANCE,
+            "instances": [
+                {
+                    "name": instance.name,
+                    "jira_url": instance.credentials["jira_url"],
+                    "circuit": instance.circuit.state,
+                }
+                for instance in JIRA_INSTANCES.values()
+            ],
+        }
+    )
+
+
+@app.route("/profiles/<profile_id>", methods=["GET"])
+def get_profile(profile_id):
+    """Download a request profile: collapsed stacks, or ?format=json for the allocations"""
+    if not PROFILE_SECRET or not profile_requested():
+        return jsonify({"error": "Profiling is disabled or the secret is wrong"}), 403
+
+    profile_format = request.args.get("format", "folded")
+    if profile_format not in ("folded", "json"):
+        return jsonify({"error": "format must be folded or json"}), 400
+    filename = f"{profile_id}.{profile_format}"
+    if not os.path.isfile(os.path.join(PROFILE_DIR, filename)):
+        return jsonify({"error": f"No profile {profile_id}"}), 404
+    return send_from_directory(
+        os.path.abspath(PROFILE_DIR),
+        filename,
+        mimetype="text/plain" if profile_format == "folded" else "application/json",
+    )
+
+
+@app.route("/aging-thresholds", methods=["GET"])
+def get_aging_thresholds():
+    """Return the configured aging thresholds for different statuses"""
+    return jsonify(AGING_THRESHOLDS)
+
+
+@app.route("/proxy/serverInfo", methods=["GET"])
+def proxy_server_info():
+    """Check connection to Jira server using backend credentials"""
+    try:
+        # Use backend credentials
+        jira_url = jira_credentials()["jira_url"]
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        # Create auth header
+        auth_header = (
+            f"Basic {base64.b64encode(f'{email}:{api_token}'.encode()).decode()}"
+        )
+
+        # Prepare headers for Jira
+        jira_headers = {
+            "Authorization": auth_header,
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+
+        # According to Jira REST API v3 docs, the proper endpoint is /rest/api/3/serverInfo
+        full_url = f"{jira_url}/rest/api/3/serverInfo"
+        logger.debug(f"Making serverInfo request to: {full_url}")
+        logger.debug(f"With headers: {jira_headers}")
+
+        response = current_instance().session.get(full_url, headers=jira_headers)
+
+        # Log response details for debugging
+        logger.debug(f"Jira serverInfo response status: {response.status_code}")
+        logger.debug(f"Jira serverInfo response headers: {response.headers}")
+        logger.debug(f"Jira serverInfo response content: {response.content[:500]}...")
+
+        # Try to parse the response as JSON, but first check if we received JSON
+        content_type = response.headers.get("Content-Type", "")
+        if "application/json" not in content_type and response.content:
+            logger.error(f"Received non-JSON response: {content_type}")
+            return (
+                jsonify(
+                    {
+                        "error": f"Received non-JSON response from Jira: {content_type}",
+                        "details": response.text,
+                    }
+                ),
+                response.status_code,
+            )
+
+        try:
+            if response.content:
+                response_data = decode_json_response(response)
+            else:
+                response_data = {"message": "Empty response from Jira"}
+        except ValueError:
+            logger.error(
+                f"Failed to parse serverInfo response as JSON: {response.text}"
+            )
+            return (
+                jsonify(
+                    {"error": "Failed to parse Jira response", "details": response.text}
+                ),
+                500,
+            )
+
+        if response.status_code >= 400:
+            logger.error(f"Jira API error: {response.status_code} - {response_data}")
+            return (
+                jsonify(
+                    {
+                        "error": f"Jira API returned {response.status_code}",
+                        "details": response_data,
+                    }
+                ),
+                response.status_code,
+            )
+
+        return jsonify(response_data), response.status_code
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error connecting to Jira: {str(e)}")
+        return jsonify({"error": f"Failed to connect to Jira: {str(e)}"}), 500
+
+
+def check_jira_health(jira_headers, timeout=None):
+    """Summarize the connection to Jira as {"ok", "circuit", ...}, without raising.
+
+    While the circuit breaker is open Jira isn't called at all; otherwise
+    serverInfo is fetched and its version reported.
+    """
+    instance = current_instance()
+    health = {"ok": False, "circuit": instance.circuit.state}
+    try:
+        response = instance.session.get(
+            f"{jira_credentials()['jira_url']}/rest/api/3/serverInfo",
+            headers=jira_headers,
+            timeout=timeout,
+        )
+        if response.status_code >= 400:
+            health["error"] = f"Jira API returned {response.status_code}"
+        else:
+            server_info = decode_json_response(response)
+            health["ok"] = True
+            health["version"] = server_info.get("version")
+            health["deploymentType"] = server_info.get("deploymentType")
+    except JiraAPIError as e:
+        health["error"] = str(e)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        health["error"] = f"Failed to connect to Jira: {str(e)}"
+    health["circuit"] = instance.circuit.state
+    return health
+
+
+def iter_response_body(response):
+    """Relay a streamed Jira response body chunk by chunk, closing it at the end"""
+    try:
+        yield from response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    finally:
+        response.close()
+
+
+@app.route("/proxy/<path:path>", methods=["GET", "POST"])
+def proxy(path):
+    try:
+        # Use backend credentials
+        jira_url = jira_credentials()["jira_url"]
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        # Create auth header
+        auth_header = (
+            f"Basic {base64.b64encode(f'{email}:{api_token}'.encode()).decode()}"
+        )
+
+        # Construct the full URL - Use API v3 instead of v2
+        full_url = f"{jira_url}/rest/api/3/{path}"
+        logger.debug(f"Making request to: {full_url}")
+
+        # Prepare headers for Jira
+        jira_headers = {
+            "Authorization": auth_header,
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+
+        # Get params from request, excluding jira_url which we now get from backend
+        params = {
+            k: v
+            for k, v in request.args.items()
+            if k not in ("jira_url", "instance", "profile", "profileAllocations")
+        }
+
+        # Log the headers being sent
+        logger.debug(f"Proxying request to {full_url} with headers: {jira_headers}")
+
+        # Special handling for the search endpoint which requires JQL in the request body
+        json_data = None
+        if path == "search":
+            # For the search endpoint, we need to pass JQL in the request body
+            jql = params.pop("jql", "")
+
+            # If no JQL provided, use a default sorting
+            if not jql:
+                jql = "ORDER BY created DESC"
+
+            max_results = params.pop(
+                "maxResults", 100
+            )  # Increase from 50 to 100 (JIRA API maximum)
+
+            # Check if we need to filter by a specific board/project
+            board = params.pop("board", None)
+
+            # If board is specified, add it to the JQL query
+            if board:
+                logger.debug(f"Filtering by board/project: {board}")
+                if "ORDER BY" in jql:
+                    # Insert project filter before ORDER BY, fixing the syntax
+                    order_part = jql.split("ORDER BY")
+                    jql = f"project = {board} AND {order_part[0].strip()} ORDER BY {order_part[1].strip()}"
+                else:
+                    # Append project filter to existing JQL
+                    jql = f"{jql} AND project = {board}"
+
+            logger.debug(f"Using JQL query: {jql}")
+
+            # Extract fields from request parameters if provided
+            fields_param = params.pop(
+                "fields",
+                "summary,status,priority,created,updated,reporter,assignee,resolutiondate,labels,issuelinks",
+            )
+            # Ensure fields_list is correctly formatted as a list of strings
+            if isinstance(fields_param, str):
+                fields_list = fields_param.split(
+                    ","
+                )  # Convert comma-separated string to list for JIRA API
+            else:
+                fields_list = fields_param
+
+            # Ensure we have expanded changelog for status history
+            expand = params.pop("expand", "changelog")
+            if isinstance(expand, str):
+                expand = expand.split(",")
+
+            # Pages are fetched from the token-paged search (pass the
+            # response's nextPageToken for the next one). A startAt offset
+            # still goes to the offset search, as does everything once the
+            # server turned out not to have the token-paged one
+            start_at = int(params.pop("startAt", 0))
+            page_token = params.pop("nextPageToken", None)
+            offset_search = {
+                "jql": jql,
+                "startAt": start_at,
+                "maxResults": int(max_results),
+                "fields": fields_list,
+                "expand": expand,
+            }
+            if start_at or current_instance().search_api == "offset":
+                json_data = offset_search
+            else:
+                full_url = f"{jira_url}/rest/api/3/search/jql"
+                json_data = {
+                    "jql": jql,
+                    "maxResults": int(max_results),
+                    "fields": fields_list,
+                    "expand": ",".join(expand),
+                }
+                if page_token:
+                    json_data["nextPageToken"] = page_token
+
+            logger.debug(f"Search request body: {json_data}")
+        elif request.is_json:
+            json_data = request.get_json()
+
+        # Forward the request to Jira
+        response = current_instance().session.request(
+            method="POST" if path == "search" else request.method,
+            url=full_url,
+            headers=jira_headers,
+            params=params,
+            json=json_data,
+            verify=True,  # Enable SSL verification
+            stream=True,
+        )
+
+        instance = current_instance()
+        searching = path == "search" and full_url.endswith("/search/jql")
+        if searching and instance.search_api == "auto":
+            if response.status_code in (404, 405, 410):
+                response.close()
+                logger.info(
+                    f"Falling back to startAt paging: /rest/api/3/search/jql returned {response.status_code}"
+                )
+                instance.search_api = "offset"
+                response = instance.session.post(
+                    f"{jira_url}/rest/api/3/search",
+                    headers=jira_headers,
+                    params=params,
+                    json=offset_search,
+                    stream=True,
+                )
+            elif response.status_code < 400:
+                instance.search_api = "jql"
+
+        logger.debug(f"Jira response status: {response.status_code}")
+        logger.debug(f"Jira response headers: {response.headers}")
+
+        # Successful JSON responses (e.g. large search pages with changelogs)
+        # are relayed as they arrive instead of being decoded here
+        content_type = response.headers.get("Content-Type", "")
+        if response.status_code < 400 and content_type.startswith("application/json"):
+            return Response(
+                iter_response_body(response),
+                status=response.status_code,
+                content_type=content_type,
+            )
+
+        # Try to parse the response as JSON
+        try:
+            response_data = decode_json_response(response)
+        except ValueError:
+            logger.error(f"Failed to parse response as JSON: {response.text}")
+            return (
+                jsonify(
+                    {"error": "Failed to parse Jira response", "details": response.text}
+                ),
+                500,
+            )
+        finally:
+            response.close()
+
+        if response.status_code >= 400:
+            logger.error(f"Jira API error: {response.status_code} - {response_data}")
+            return (
+                jsonify(
+                    {
+                        "error": f"Jira API returned {response.status_code}",
+                        "details": response_data,
+                    }
+                ),
+                response.status_code,
+            )
+
+        return jsonify(response_data), response.status_code
+
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
+def fetch_project_sprints(jira_headers, board, timeout=None):
+    """Collect the sprints of every Agile board of a project, newest first"""
+    jira_url = jira_credentials()["jira_url"]
+
+    logger.debug(f"Fetching sprints for board: {board}")
+
+    # First, find all boards associated with this project
+    boards_url = f"{jira_url}/rest/agile/1.0/board?projectKeyOrId={board}"
+    boards_response = current_instance().session.get(
+        boards_url, headers=jira_headers, timeout=timeout
+    )
+
+    if boards_response.status_code >= 400:
+        logger.error(
+            f"Error fetching boards: {boards_response.status_code} - {boards_response.text}"
+        )
+        raise JiraAPIError(
+            boards_response.status_code,
+            f"Failed to fetch boards: {boards_response.status_code}",
+        )
+
+    boards = decode_json_response(boards_response).get("values") or []
+
+    # Try each board in sequence until we find one with sprints
+    all_sprints = []
+    boards_checked = 0
+    boards_with_sprints = 0
+
+    for board_info in boards:
+        board_id = board_info.get("id")
+        board_name = board_info.get("name")
+
+        if not board_id:
+            continue
+
+        boards_checked += 1
+        logger.debug(f"Checking board: {board_name} (ID: {board_id}) for sprints")
+
+        # Fetch sprints for this board
+        sprints_url = f"{jira_url}/rest/agile/1.0/board/{board_id}/sprint?state=active,closed,future"
+        sprints_response = current_instance().session.get(
+            sprints_url, headers=jira_headers, timeout=timeout
+        )
+
+        # Skip this board if there's an error
+        if sprints_response.status_code >= 400:
+            logger.warning(
+                f"Error fetching sprints for board {board_name} (ID: {board_id}): {sprints_response.status_code}"
+            )
+            continue
+
+        sprints_data = decode_json_response(sprints_response)
+        sprints_for_board = sprints_data.get("values", [])
+
+        if len(sprints_for_board) > 0:
+            boards_with_sprints += 1
+            logger.debug(
+                f"Found {len(sprints_for_board)} sprints for board {board_name}"
+            )
+
+            # Extract sprint info
+            for sprint in sprints_for_board:
+                sprint_info = {
+                    "id": sprint.get("id"),
+                    "name": sprint.get("name"),
+                    "state": sprint.get("state"),
+                    "startDate": sprint.get("startDate"),
+                    "endDate": sprint.get("endDate"),
+                    "completeDate": sprint.get("completeDate"),
+                    "boardId": board_id,
+                    "boardName": board_name,  # Add board name for reference
+                }
+                all_sprints.append(sprint_info)
+
+    # Helper function for safe sorting with None values
+    def safe_sort_key(sprint):
+        # If startDate is None or empty, use a minimum date string for sorting
+        start_date = sprint.get("startDate")
+        if not start_date:
+            return "0000-00-00T00:00:00.000Z"  # Minimum date string for sorting
+        return start_date
+
+    # Sort all sprints by start date (descending) with safe handling of None values
+    all_sprints.sort(key=safe_sort_key, reverse=True)
+
+    return {
+        "sprints": all_sprints,
+        "boardsFound": len(boards),
+        "boardsChecked": boards_checked,
+        "boardsWithSprints": boards_with_sprints,
+    }
+
+
+@app.route("/proxy/board-sprints", methods=["GET"])
+def get_board_sprints():
+    """Get sprints for a specific board"""
+    try:
+        # Use backend credentials
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        # Get board parameter
+        board = request.args.get("board")
+        if not board:
+            return jsonify({"error": "Board parameter is required"}), 400
+
+        project_sprints = fetch_project_sprints(get_jira_headers(), board)
+        all_sprints = project_sprints["sprints"]
+        boards_checked = project_sprints["boardsChecked"]
+        boards_with_sprints = project_sprints["boardsWithSprints"]
+
+        if project_sprints["boardsFound"] == 0:
+            logger.warning(f"No boards found for project: {board}")
+            return (
+                jsonify(
+                    {
+                        "sprints": [],
+                        "message": f"No boards found for project {board}. This project may not have an Agile board configured.",
+                    }
+                ),
+                200,
+            )
+
+        # Provide a helpful message if we checked boards but found no sprints
+        if boards_checked > 0 and len(all_sprints) == 0:
+            logger.warning(
+                f"Checked {boards_checked} boards for project {board} but found no sprints"
+            )
+            return (
+                jsonify(
+                    {
+                        "sprints": [],
+                        "message": f"No sprints found for any of the {boards_checked} boards in project {board}.",
+                    }
+                ),
+                200,
+            )
+
+        logger.info(
+            f"Returning {len(all_sprints)} sprints from {boards_with_sprints} boards (out of {boards_checked} checked) for project {board}"
+        )
+
+        return (
+            jsonify(
+                {
+                    "sprints": all_sprints,
+                    "boardsChecked": boards_checked,
+                    "boardsWithSprints": boards_with_sprints,
+                }
+            ),
+            200,
+        )
+
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        import traceback
+
+        logger.error(traceback.format_exc())  # Add stack trace for better debugging
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
+@app.route("/proxy/issue-history/<issue_key>", methods=["GET"])
+def get_issue_history(issue_key):
+    """Get detailed status and transition history for a specific issue"""
+    try:
+        # Use backend credentials
+        jira_url = jira_credentials()["jira_url"]
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        # Serve from the issue store when the issue was fetched recently or is
+        # kept current by webhooks
+        stored = ISSUE_STORE.get(issue_key)
+        if stored is not None:
+            logger.debug(f"Serving issue history for {issue_key} from the issue store")
+            issue_data = stored["issue"]
+        else:
+            # Create auth header
+            auth_header = (
+                f"Basic {base64.b64encode(f'{email}:{api_token}'.encode()).decode()}"
+            )
+
+            # Prepare headers for Jira
+            jira_headers = {
+                "Authorization": auth_header,
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            }
+
+            # Get the issue detail with changelog to analyze history
+            issue_url = f"{jira_url}/rest/api/3/issue/{issue_key}?expand=changelog"
+            logger.debug(f"Getting issue history for {issue_key} from {issue_url}")
+
+            response = current_instance().session.get(issue_url, headers=jira_headers)
+
+            if response.status_code >= 400:
+                logger.error(
+                    f"Error fetching issue history: {response.status_code} - {response.text}"
+                )
+                return (
+                    jsonify(
+                        {
+                            "error": f"Failed to fetch issue history: {response.status_code}"
+                        }
+                    ),
+                    response.status_code,
+                )
+
+            issue_data = decode_json_response(response)
+            ISSUE_STORE.upsert(issue_data)
+
+        analysis_started = time.perf_counter()
+
+        # Extract just the status changes from the changelog
+        status_changes = []
+        status_durations = {}
+        current_status = None
+        last_status_change_date = None
+
+        # First, get creation date as the starting point
+        created_date = issue_data.get("fields", {}).get("created")
+        if created_date:
+            # Get initial status if available (usually "To Do" or equivalent)
+            initial_status = issue_data.get("fields", {}).get("status", {}).get("name")
+            if initial_status:
+                current_status = initial_status
+                last_status_change_date = created_date
+
+                # Add the initial status to the status changes
+                status_changes.append(
+                    {
+                        "date": created_date,
+                        "from": None,
+                        "to": initial_status,
+                        "fromCategory": None,
+                        "toCategory": initial_status,
+                    }
+                )
+
+        # Build a chronological list of all status transitions
+        all_status_transitions = []
+
+        # Go through each changelog entry to find status changes
+        changelog_entries = issue_data.get("changelog", {}).get("histories", [])
+        for entry in changelog_entries:
+            created = entry.get("created")
+            author = entry.get("author", {}).get("displayName", "Unknown")
+
+            for item in entry.get("items", []):
+                field = item.get("field")
+
+                if field == "status":
+                    from_status = item.get("fromString")
+                    to_status = item.get("toString")
+
+                    # Add this transition to our chronological list
+                    all_status_transitions.append(
+                        {
+                            "date": created,
+                            "from": from_status,
+                            "to": to_status,
+                            "author": author,
+                        }
+                    )
+
+                    # Add this status change to our list
+                    status_changes.append(
+                        {
+                            "date": created,
+                            "from": from_status,
+                            "to": to_status,
+                            "author": author,
+                            "fromCategory": from_status,
+                            "toCategory": to_status,
+                        }
+                    )
+
+        # Sort transitions chronologically
+        all_status_transitions.sort(key=lambda x: x["date"])
+
+        # Now process transitions to calculate durations
+        status_periods = {}  # Track periods spent in each status
+        now = datetime.now(timezone.utc)
+
+        # Initialize with the first status if we have it
+        if current_status and last_status_change_date:
+            current_period_start = datetime.fromisoformat(
+                last_status_change_date.replace("Z", "+00:00")
+            )
+            current_period_status = current_status
+        else:
+            # If we don't have initial status, we can't calculate durations accurately
+            return jsonify(
+                {
+                    "key": issue_key,
+                    "summary": issue_data.get("fields", {}).get(
+                        "summary", "No summary"
+                    ),
+                    "status_changes": status_changes,
+                    "status_durations": {},
+                    "error": "Unable to determine initial status",
+                    "current_status": issue_data.get("fields", {})
+                    .get("status", {})
+                    .get("name"),
+                    "created": created_date,
+                    "resolution_date": issue_data.get("fields", {}).get(
+                        "resolutiondate"
+                    ),
+                }
+            )
+
+        # Process each transition to calculate time in each status
+        for transition in all_status_transitions:
+            transition_date = datetime.fromisoformat(
+                transition["date"].replace("Z", "+00:00")
+            )
+            from_status = transition["from"]
+            to_status = transition["to"]
+
+            # Calculate duration in previous status
+            duration_hours = (
+                transition_date - current_period_start
+            ).total_seconds() / 3600
+
+            # Add to periods for this status
+            if current_period_status not in status_periods:
+                status_periods[current_period_status] = []
+
+            status_periods[current_period_status].append(
+                {
+                    "start": current_period_start,
+                    "end": transition_date,
+                    "duration_hours": duration_hours,
+                }
+            )
+
+            # Update for next period
+            current_period_start = transition_date
+            current_period_status = to_status
+
+        # Add the final period (from last transition to now)
+        duration_hours = (now - current_period_start).total_seconds() / 3600
+        if current_period_status not in status_periods:
+            status_periods[current_period_status] = []
+
+        status_periods[current_period_status].append(
+            {
+                "start": current_period_start,
+                "end": now,
+                "duration_hours": duration_hours,
+                "is_current": True,
+            }
+        )
+
+        # Calculate aggregated durations for each status
+        for status, periods in status_periods.items():
+            total_hours = sum(period["duration_hours"] for period in periods)
+            current_period = next(
+                (period for period in periods if period.get("is_current", False)), None
+            )
+
+            status_durations[status] = {
+                "total_hours": total_hours,
+                "count": len(periods),
+                "average_hours": total_hours / len(periods),
+                "periods": periods,
+            }
+
+            # Add current_duration only if this is the current status
+            if current_period:
+                status_durations[status]["current_duration"] = current_period[
+                    "duration_hours"
+                ]
+                status_durations[status]["continuous_time"] = current_period[
+                    "duration_hours"
+                ]
+
+                # Log especially long durations in important statuses
+                if (
+                    status in ["In Progress", "In Review", "In QA"]
+                    and current_period["duration_hours"] >= 72
+                ):
+                    logger.warning(
+                        f"Issue {issue_key} has been in {status} continuously for {round(current_period['duration_hours'], 2)} hours (3+ days)"
+                    )
+
+        # Prepare response with relevant data
+        result = {
+            "key": issue_key,
+            "summary": issue_data.get("fields", {}).get("summary", "No summary"),
+            "status_changes": status_changes,
+            "status_durations": status_durations,
+            "current_status": current_period_status,
+            "created": created_date,
+            "resolution_date": issue_data.get("fields", {}).get("resolutiondate"),
+        }
+
+        add_server_timing("analysis", time.perf_counter() - analysis_started)
+        return jsonify(result)
+    except Exception as e:
+        logger.error(f"Error processing issue history: {str(e)}")
+        return jsonify({"error": f"Error processing issue history: {str(e)}"}), 500
+
+
+# Workflow stages tracked by the cycle time metrics and the Jira status names
+# that belong to each of them
+WORKFLOW_STAGES = {
+    "To Do": ["TO DO", "To Do", "Backlog", "Open", "New", "Product Backlog"],
+    "In Progress": [
+        "IN PROGRESS",
+        "In Progress",
+        "Development",
+        "Implementing",
+        "Dev",
+        "Coding",
+    ],
+    "Code Review": [
+        "IN REVIEW",
+        "In Review",
+        "Code Review",
+        "Review",
+        "Reviewing",
+        "PR Review",
+        "Ready for Review",
+    ],
+    "QA": ["IN QA", "In QA", "QA", "Testing", "Validation", "Test"],
+    "Done": ["DONE", "Done", "Closed", "Resolved", "Completed", "Fixed"],
+}
+
+# Keep track of workflow stage order for churn detection
+WORKFLOW_ORDER = {
+    "To Do": 1,
+    "In Progress": 2,
+    "Code Review": 3,
+    "QA": 4,
+    "Done": 5,
+}
+
+# Issue fields needed to rebuild status timelines
+METRICS_FIELDS = ["created", "resolutiondate", "status", "updated", "summary"]
+
+
+def split_jql_order(jql):
+    """Split a JQL query into its condition and its ORDER BY clause (without the keywords)"""
+    if "ORDER BY" in jql:
+        order_part = jql.split("ORDER BY")
+        return order_part[0].strip(), order_part[1].strip()
+    return jql.strip(), ""
+
+
+def restrict_jql(jql, clause):
+    """Add a condition to a JQL query, keeping its ORDER BY clause"""
+    condition, order_by = split_jql_order(jql)
+    order_by = f" ORDER BY {order_by}" if order_by else ""
+
+    # A query that is only an ORDER BY has no condition to combine with
+    if not condition:
+        return f"{clause}{order_by}"
+    return f"{clause} AND ({condition}){order_by}"
+
+
+def build_project_jql(jql, board):
+    """Restrict a JQL query to a single project, keeping its ORDER BY clause"""
+    if not board:
+        return jql
+    return restrict_jql(jql, f"project = {board}")
+
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array_items(byte_chunks, array_key, meta):
+    """Parse a JSON object incrementally, yielding the items of one of its arrays.
+
+    ``byte_chunks`` is the raw body (e.g. ``response.iter_content()``). Items
+    of the ``array_key`` member are decoded and yielded one at a time as soon
+    as they are complete, so only about one item is held in memory. Every
+    other top-level member is stored in ``meta`` as it is parsed; members that
+    come after the array are only there once the generator is exhausted.
+    """
+    chunks = iter(byte_chunks)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    exhausted = False
+
+    def read_more():
+        nonlocal buffer, pos, exhausted
+        # Drop what's been parsed, then at least double what's left so a
+        # large value isn't re-decoded from its start for every chunk
+        buffer = buffer[pos:]
+        pos = 0
+        target = max(2 * len(buffer), STREAM_CHUNK_SIZE)
+        while not exhausted and len(buffer) < target:
+            chunk = next(chunks, None)
+            if chunk is None:
+                buffer += decoder.decode(b"", final=True)
+                exhausted = True
+            else:
+                buffer += decoder.decode(chunk)
+
+    def peek():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if exhausted:
+                raise ValueError("Unexpected end of JSON response")
+            read_more()
+
+    def expect(char):
+        nonlocal pos
+        if peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {pos} of JSON response")
+        pos += 1
+
+    def decode_value():
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(buffer, pos)
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(buffer) or exhausted:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            read_more()
+
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        key = decode_value()
+        expect(":")
+        if key == array_key:
+            expect("[")
+            if peek() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield decode_value()
+                    separator = peek()
+                    pos += 1
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise ValueError(
+                            f"Malformed {array_key} array in JSON response"
+                        )
+        else:
+            meta[key] = decode_value()
+
+        separator = peek()
+        pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError("Malformed JSON object in response")
+
+
+class SearchAPIUnavailable(Exception):
+    """Raised when Jira doesn't have the token-paged search API"""
+
+
+def iter_search_issues(
+    jira_headers,
+    jql,
+    fields,
+    expand=None,
+    max_issues=None,
+    timeout=None,
+    allow_partial=True,
+):
+    """Page through a Jira search, yielding one issue at a time.
+
+    Uses the token-paged search API (fetched by a worker thread while the
+    issues are consumed) unless JIRA_SEARCH_API or the server only allows
+    startAt offsets. Either way about one page of issues is held at a time.
+    Issues fetched with their changelog and timeline fields are also put in
+    the issue store. When the deadline comes after the first page, the
+    issues just stop and the request is marked partial; without
+    ``allow_partial`` DeadlineExceededError is raised instead.
+    """
+    instance = current_instance()
+    if instance.search_api != "offset":
+        try:
+            yield from iter_timed_consumer(
+                iter_token_search_issues(
+                    jira_headers,
+                    jql,
+                    fields,
+                    expand,
+                    max_issues,
+                    timeout,
+                    allow_partial,
+                )
+            )
+            return
+        except SearchAPIUnavailable as e:
+            logger.info(f"Falling back to startAt paging: {str(e)}")
+            instance.search_api = "offset"
+
+    yield from iter_timed_consumer(
+        iter_offset_search_issues(
+            jira_headers, jql, fields, expand, max_issues, timeout, allow_partial
+        )
+    )
+
+
+class FeedClosed:
+    """Put in an IssueFeed after its last issue, with the error if the worker failed"""
+
+    def __init__(self, error=None):
+        self.error = error
+
+
+class IssueFeed:
+    """Issues handed from a worker thread to the request thread through a bounded queue.
+
+    The worker put()s each issue and then close()s the feed, with the error
+    if it failed; iterating the feed yields the issues and then re-raises
+    that error. put() waits while the queue is full and returns False once
+    ``stopped`` is set, so the worker gives up when the consumer has.
+    """
+
+    def __init__(self, max_issues, stopped):
+        self.stopped = stopped
+        self._queue = queue.Queue(maxsize=max_issues)
+
+    def put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def close(self, error=None):
+        self.put(FeedClosed(error))
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, FeedClosed):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+
+
+def fetch_token_search_page(
+    jira_headers, jql, fields, expand, page_size, put, page_token=None, timeout=None
+):
+    """Fetch one page of the token-paged search, passing each issue to ``put`` as it's parsed.
+
+    Returns (number of issues, next page token); the token is None on the
+    last page, or if ``put`` returned False to stop early.
+    """
+    search_body = {"jql": jql, "maxResults": page_size, "fields": fields}
+    if expand:
+        search_body["expand"] = ",".join(expand)
+    if page_token:
+        search_body["nextPageToken"] = page_token
+
+    logger.debug(f"Search request body: {search_body}")
+    search_response = current_instance().session.post(
+        f"{jira_credentials()['jira_url']}/rest/api/3/search/jql",
+        headers=jira_headers,
+        json=search_body,
+        timeout=timeout,
+        stream=True,
+    )
+
+    page_meta = {}
+    count = 0
+    try:
+        auto_detecting = current_instance().search_api == "auto"
+        if auto_detecting and search_response.status_code in (404, 405, 410):
+            raise SearchAPIUnavailable(
+                f"/rest/api/3/search/jql returned {search_response.status_code}"
+            )
+        if search_response.status_code >= 400:
+            logger.error(
+                f"Error searching issues: {search_response.status_code} - {search_response.text}"
+            )
+            raise JiraAPIError(
+                search_response.status_code,
+                f"Failed to fetch issues: {search_response.status_code}",
+            )
+
+        for issue in iter_timed_producer(
+            iter_json_array_items(
+                search_response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+                "issues",
+                page_meta,
+            )
+        ):
+            if not put(issue):
+                return count, None
+            count += 1
+    finally:
+        search_response.close()
+
+    add_server_count("pages", 1)
+    add_server_count("issues", count)
+
+    if page_meta.get("isLast"):
+        return count, None
+    return count, page_meta.get("nextPageToken")
+
+
+def iter_token_search_issues(
+    jira_headers,
+    jql,
+    fields,
+    expand=None,
+    max_issues=None,
+    timeout=None,
+    allow_partial=True,
+):
+    """Page through a Jira search with nextPageToken, yielding one issue at a time.
+
+    The pages are fetched and parsed by a worker thread that hands issues
+    over as they come off the wire, through a queue of at most
+    SEARCH_PAGE_SIZE issues, so Jira I/O overlaps with the caller's analysis
+    while no more than about one page is held at a time.
+    """
+    instance = current_instance()
+    keep_in_store = "changelog" in (expand or []) and set(METRICS_FIELDS) <= set(fields)
+
+    def page_size(fetched):
+        if max_issues is None:
+            return SEARCH_PAGE_SIZE
+        return min(SEARCH_PAGE_SIZE, max_issues - fetched)
+
+    if max_issues is not None and max_issues <= 0:
+        return
+
+    budget = current_budget()
+    # Set when the consumer stops, so the worker doesn't wait on a full feed
+    stopped = threading.Event()
+    feed = IssueFeed(SEARCH_PAGE_SIZE, stopped)
+
+    def fetch_pages():
+        fetched = 0
+        page_token = None
+        try:
+            while True:
+                try:
+                    count, page_token = fetch_token_search_page(
+                        jira_headers,
+                        jql,
+                        fields,
+                        expand,
+                        page_size(fetched),
+                        feed.put,
+                        page_token,
+                        timeout,
+                    )
+                except DeadlineExceededError:
+                    if not fetched or not allow_partial:
+                        raise
+                    # Out of time: finish with the pages already read
+                    logger.warning(
+                        f"Deadline reached after {fetched} issues, returning partial results for: {jql}"
+                    )
+                    budget.partial = True
+                    break
+                if instance.search_api == "auto":
+                    instance.search_api = "jql"
+                fetched += count
+                if not count or not page_token or page_size(fetched) <= 0:
+                    break
+        except Exception as e:
+            feed.close(e)
+        else:
+            feed.close()
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.submit(run_with_budget, budget, fetch_pages)
+    try:
+        for issue in feed:
+            if keep_in_store:
+                ISSUE_STORE.upsert(issue)
+            yield issue
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_offset_search_issues(
+    jira_headers,
+    jql,
+    fields,
+    expand=None,
+    max_issues=None,
+    timeout=None,
+    allow_partial=True,
+):
+    """Page through a Jira search with startAt offsets, yielding one issue at a time.
+
+    Each page is streamed and parsed incrementally, so issues reach the caller
+    as they come off the wire and a page is never held in memory as a whole.
+    Issues fetched with their changelog and timeline fields are also put in
+    the issue store.
+    """
+    search_url = f"{jira_credentials()['jira_url']}/rest/api/3/search"
+    start_at = 0
+    keep_in_store = "changelog" in (expand or []) and set(METRICS_FIELDS) <= set(fields)
+
+    while max_issues is None or start_at < max_issues:
+        page_size = SEARCH_PAGE_SIZE
+        if max_issues is not None:
+            page_size = min(page_size, max_issues - start_at)
+
+        search_body = {
+            "jql": jql,
+            "maxResults": page_size,
+            "startAt": start_at,
+            "fields": fields,
+            "expand": expand or [],
+        }
+
+        logger.debug(f"Search request body: {search_body}")
+        try:
+            search_response = current_instance().session.post(
+                search_url,
+                headers=jira_headers,
+                json=search_body,
+                timeout=timeout,
+                stream=True,
+            )
+        except DeadlineExceededError:
+            if not start_at or not allow_partial:
+                raise
+            # Out of time: finish with the pages already read
+            logger.warning(
+                f"Deadline reached after {start_at} issues, returning partial results for: {jql}"
+            )
+            current_budget().partial = True
+            break
+
+        page_meta = {}
+        page_count = 0
+        try:
+            if search_response.status_code >= 400:
+                logger.error(
+                    f"Error searching issues: {search_response.status_code} - {search_response.text}"
+                )
+                raise JiraAPIError(
+                    search_response.status_code,
+                    f"Failed to fetch issues: {search_response.status_code}",
+                )
+
+            for issue in iter_timed_producer(
+                iter_json_array_items(
+                    search_response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+                    "issues",
+                    page_meta,
+                )
+            ):
+                page_count += 1
+                if keep_in_store:
+                    ISSUE_STORE.upsert(issue)
+                yield issue
+        finally:
+            search_response.close()
+
+        add_server_count("pages", 1)
+        add_server_count("issues", page_count)
+
+        # Jira may return fewer issues than requested, so advance by what came back
+        start_at += page_count
+        if not page_count or start_at >= page_meta.get("total", 0):
+            break
+
+
+def count_search_issues(jira_headers, jql, timeout=None):
+    """Ask Jira how many issues match a JQL query without fetching any of them"""
+    search_response = current_instance().session.post(
+        f"{jira_credentials()['jira_url']}/rest/api/3/search",
+        headers=jira_headers,
+        json={"jql": jql, "maxResults": 0, "fields": ["key"]},
+        timeout=timeout,
+    )
+
+    # Servers that have retired the offset search only offer an approximate count
+    if search_response.status_code in (404, 410):
+        condition, _ = split_jql_order(jql)
+        search_response = current_instance().session.post(
+            f"{jira_credentials()['jira_url']}/rest/api/3/search/approximate-count",
+            headers=jira_headers,
+            json={"jql": condition},
+            timeout=timeout,
+        )
+        if search_response.status_code < 400:
+            return decode_json_response(search_response).get("count", 0)
+
+    if search_response.status_code >= 400:
+        logger.error(
+            f"Error counting issues: {search_response.status_code} - {search_response.text}"
+        )
+        raise JiraAPIError(
+            search_response.status_code,
+            f"Failed to count issues: {search_response.status_code}",
+        )
+
+    return decode_json_response(search_response).get("total", 0)
+
+
+def find_oldest_created(jira_headers, jql, timeout=None):
+    """Creation time of the oldest issue matching a JQL query, or None if none match"""
+    condition, _ = split_jql_order(jql)
+    for issue in iter_search_issues(
+        jira_headers,
+        f"{condition} ORDER BY created ASC".strip(),
+        ["created"],
+        max_issues=1,
+        timeout=timeout,
+    ):
+        return parse_jira_datetime(issue["fields"]["created"])
+    return None
+
+
+def shard_clause(start, end):
+    """JQL condition for the issues created in [start, end); None means unbounded"""
+    conditions = []
+    if start is not None:
+        conditions.append(f'created >= "{start:%Y/%m/%d %H:%M}"')
+    if end is not None:
+        conditions.append(f'created < "{end:%Y/%m/%d %H:%M}"')
+    return " AND ".join(conditions)
+
+
+def plan_search_shards(jira_headers, jql, total, timeout=None):
+    """Split a JQL query into disjoint created-date ranges of about SHARD_TARGET_ISSUES issues.
+
+    Starts from equal-width ranges between the oldest issue and now, then
+    halves ranges whose count probe comes back over twice the target
+    (ranges can't get narrower than JQL's one-minute date precision), up to
+    SHARD_MAX_PROBES probes. Returns ``(start, end)`` pairs, oldest first;
+    the first and last are open-ended, so the shards cover every matching
+    issue whatever timezone Jira reads the dates in.
+    """
+    oldest = find_oldest_created(jira_headers, jql, timeout)
+    if oldest is None:
+        return [(None, None)]
+
+    minute = timedelta(minutes=1)
+    low = oldest.replace(second=0, microsecond=0)
+    high = datetime.now(timezone.utc).replace(second=0, microsecond=0) + minute
+    pieces = min(-(-total // SHARD_TARGET_ISSUES), SHARD_MAX_PROBES // 2)
+    step = (high - low) / max(pieces, 1)
+    bounds = sorted(
+        {(low + step * i).replace(second=0, microsecond=0) for i in range(1, pieces)}
+    )
+    if not bounds:
+        return [(None, None)]
+    shards = list(zip([None] + bounds, bounds + [None]))
+
+    budget = current_budget()
+    counts = {}
+    probes = 0
+    with ThreadPoolExecutor(max_workers=SHARD_MAX_WORKERS) as executor:
+        while True:
+            uncounted = [shard for shard in shards if shard not in counts]
+            if not uncounted or probes + len(uncounted) > SHARD_MAX_PROBES:
+                break
+            probes += len(uncounted)
+            counted = executor.map(
+                lambda shard: run_with_budget(
+                    budget,
+                    count_search_issues,
+                    jira_headers,
+                    restrict_jql(jql, shard_clause(*shard)),
+                    timeout,
+                ),
+                uncounted,
+            )
+            counts.update(zip(uncounted, counted))
+
+            # Halve the ranges that came back too large
+            refined = []
+            for start, end in shards:
+                middle = (start or low) + ((end or high) - (start or low)) / 2
+                middle = middle.replace(second=0, microsecond=0)
+                if counts[(start, end)] > 2 * SHARD_TARGET_ISSUES and (
+                    start or low
+                ) < middle < (end or high):
+                    refined.extend([(start, middle), (middle, end)])
+                else:
+                    refined.append((start, end))
+            if len(refined) == len(shards):
+                break
+            shards = refined
+
+    # Ranges with nothing in them don't need a search
+    shards = [shard for shard in shards if counts.get(shard, 1)]
+    logger.debug(
+        f"Planned {len(shards)} created-date shards for {total} issues with {probes} count probes"
+    )
+    return shards or [(None, None)]
+
+
+def iter_sharded_search_issues(
+    jira_headers, jql, fields, expand=None, max_issues=None, timeout=None
+):
+    """Like iter_search_issues, but fetches large results as parallel created-date shards.
+
+    Deep startAt paging gets slower the further it goes, so queries matching
+    at least SHARD_MIN_ISSUES issues are split by plan_search_shards and up
+    to SHARD_MAX_WORKERS shards are fetched at a time. Issues come out shard
+    by shard in created order (newest shard first for ``ORDER BY created
+    DESC``), in the query's own order within a shard, without duplicates.
+    When the deadline stops a shard, the issues stop where that shard was
+    cut short (a partial result, as with serial paging). Smaller queries, and capped
+    queries whose cap depends on another order, are paged through as usual.
+    """
+    _, order_by = split_jql_order(jql)
+    order_terms = order_by.split(",")[0].split()
+    created_order = bool(order_terms) and order_terms[0].lower() == "created"
+
+    total = None
+    if SHARD_MAX_WORKERS > 1 and (max_issues is None or max_issues >= SHARD_MIN_ISSUES):
+        total = count_search_issues(jira_headers, jql, timeout)
+    if (
+        total is None
+        or total < SHARD_MIN_ISSUES
+        or (max_issues is not None and max_issues < total and not created_order)
+    ):
+        yield from iter_search_issues(
+            jira_headers, jql, fields, expand, max_issues, timeout
+        )
+        return
+
+    shards = plan_search_shards(jira_headers, jql, total, timeout)
+    if created_order and order_terms[-1].upper() == "DESC":
+        shards.reverse()
+    logger.debug(f"Fetching {total} issues in {len(shards)} shards for: {jql}")
+
+    # Set when the consumer stops, so shards blocked on a full buffer give up
+    stopped = threading.Event()
+
+    def fetch_shard(shard, feed):
+        try:
+            for issue in iter_search_issues(
+                jira_headers,
+                restrict_jql(jql, shard_clause(*shard)),
+                fields,
+                expand,
+                timeout=timeout,
+                # A shard cut short raises, so the consumer stops right there
+                allow_partial=False,
+            ):
+                if not feed.put(issue):
+                    return
+        except Exception as e:
+            feed.close(e)
+        else:
+            feed.close()
+
+    budget = current_budget()
+    executor = ThreadPoolExecutor(max_workers=SHARD_MAX_WORKERS)
+
+    def start(shard):
+        feed = IssueFeed(SHARD_BUFFER_ISSUES, stopped)
+        executor.submit(run_with_budget, budget, fetch_shard, shard, feed)
+        return feed
+
+    try:
+        # Shards are read in order while the next ones fill bounded buffers,
+        # so at most SHARD_MAX_WORKERS buffers of issues are held at a time
+        remaining = iter(shards)
+        pending = deque(start(shard) for shard in islice(remaining, SHARD_MAX_WORKERS))
+        seen = set()
+        while pending:
+            feed = pending.popleft()
+            for shard in islice(remaining, 1):
+                pending.append(start(shard))
+            try:
+                for issue in iter_timed_consumer(iter(feed)):
+                    if issue["key"] in seen:
+                        continue
+                    seen.add(issue["key"])
+                    yield issue
+                    if max_issues is not None and len(seen) >= max_issues:
+                        return
+            except DeadlineExceededError:
+                if not seen:
+                    raise
+                # Out of time: finish with the shards already read
+                logger.warning(
+                    f"Deadline reached after {len(seen)} issues, returning partial results for: {jql}"
+                )
+                budget.partial = True
+                return
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_metrics_issues(jira_headers, jql, max_results, timeout=None):
+    """Stream the issues (with changelog) analyzed by the resolution metrics"""
+    return iter_sharded_search_issues(
+        jira_headers,
+        jql,
+        METRICS_FIELDS,
+        expand=["changelog"],
+        max_issues=max_results,
+        timeout=timeout,
+    )
+
+
+def calculate_working_hours(start_time, end_time, exclude_weekends=True):
+    """Calculate working hours between two datetime objects, optionally excluding weekends"""
+    if not exclude_weekends:
+        # Simple calculation if we don't need to exclude weekends
+        return (end_time - start_time).total_seconds() / 3600
+
+    # More efficient calculation to exclude weekends
+    total_seconds = 0
+
+    # Calculate whole days first
+    current_date = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    end_date = end_time.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # Add partial day at the beginning
+    if start_time.weekday() < 5:  # Weekday (0-4 is Monday to Friday)
+        # Add hours from start time until end of day
+        seconds_in_first_day = (
+            current_date + timedelta(days=1) - start_time
+        ).total_seconds()
+        total_seconds += seconds_in_first_day
+
+    # Add whole days in between
+    current_date += timedelta(days=1)
+    while current_date < end_date:
+        if current_date.weekday() < 5:  # Weekday
+            total_seconds += 24 * 3600  # Add full day in seconds
+        current_date += timedelta(days=1)
+
+    # Add partial day at the end
+    if end_time.weekday() < 5:  # Weekday
+        # Add hours from start of day until end time
+        seconds_in_last_day = (end_time - end_date).total_seconds()
+        total_seconds += seconds_in_last_day
+
+    return total_seconds / 3600
+
+
+def map_status_to_stage(status_name, status_stage_map):
+    """Map a Jira status name to its workflow stage, remembering the result"""
+    stage = status_stage_map.get(status_name)
+    if stage:
+        return stage
+
+    for stage, status_list in WORKFLOW_STAGES.items():
+        if status_name in status_list or any(
+            s.lower() in status_name.lower() for s in status_list
+        ):
+            status_stage_map[status_name] = stage
+            return stage
+
+    # Still not found
+    status_stage_map[status_name] = "Other"
+    return "Other"
+
+
+def is_backward_transition(from_stage, to_stage):
+    """Whether a stage transition moves backwards in the workflow (churn), ignoring 'Other' and same-stage"""
+    return (
+        from_stage != to_stage
+        and from_stage != "Other"
+        and to_stage != "Other"
+        and WORKFLOW_ORDER.get(to_stage, 0) < WORKFLOW_ORDER.get(from_stage, 0)
+    )
+
+
+# Backward stage transitions broken out in the churn details
+CHURN_TRANSITION_TYPES = {
+    ("In Progress", "To Do"): "in_progress_to_to_do",
+    ("Code Review", "In Progress"): "in_review_to_in_progress",
+    ("QA", "Code Review"): "in_qa_to_in_review",
+    ("QA", "In Progress"): "in_qa_to_in_progress",
+}
+
+
+def churn_transition_type(from_stage, to_stage):
+    """Churn details key of a backward stage transition, or None if it isn't broken out"""
+    if from_stage == "Done":
+        return "done_to_any"
+    return CHURN_TRANSITION_TYPES.get((from_stage, to_stage))
+
+
+def new_churn_details():
+    """Zeroed counts for every kind of backward transition in the churn details"""
+    return dict.fromkeys([*CHURN_TRANSITION_TYPES.values(), "done_to_any"], 0)
+
+
+def analyze_issue_transitions(status_changes, status_stage_map):
+    """Ping-pong and churn analysis of one issue's status changes, in a single pass.
+
+    The ping-pong score is the dashboard's: consecutive statuses form a
+    transition, and each direction of a status pair scores (once) when it is
+    first seen after its reverse. Churn counts backward workflow-stage
+    transitions, the same way as the resolution metrics.
+    """
+    transition_counts = {}
+    reversed_pairs = set()
+    ping_pong_transitions = []
+    ping_pong_score = 0
+    churn_details = new_churn_details()
+    churn_transitions = []
+
+    previous_status = None
+    for change in status_changes:
+        from_stage = map_status_to_stage(change["from"], status_stage_map)
+        to_stage = map_status_to_stage(change["to"], status_stage_map)
+        if is_backward_transition(from_stage, to_stage):
+            churn_transitions.append(
+                {"from_stage": from_stage, "to_stage": to_stage, "date": change["date"]}
+            )
+            churn_type = churn_transition_type(from_stage, to_stage)
+            if churn_type:
+                churn_details[churn_type] += 1
+
+        status = change["to"]
+        if previous_status is not None:
+            pair = (previous_status, status)
+            reverse = (status, previous_status)
+            transition_counts[pair] = transition_counts.get(pair, 0) + 1
+            if reverse in transition_counts and reverse not in reversed_pairs:
+                reversed_pairs.add(reverse)
+                ping_pong_transitions.append(f"{status} -> {previous_status}")
+                ping_pong_score += min(
+                    transition_counts[pair], transition_counts[reverse]
+                )
+        previous_status = status
+
+    return {
+        "ping_pong_score": ping_pong_score,
+        "ping_pong_transitions": ping_pong_transitions,
+        "churn_score": len(churn_transitions),
+        "churn_details": churn_details,
+        "churn_transitions": churn_transitions,
+        "transition_count": len(status_changes),
+    }
+
+
+def get_issue_status_changes(issue):
+    """Return the status transitions recorded in an issue's changelog, oldest first"""
+    status_changes = []
+    for history in issue.get("changelog", {}).get("histories", []):
+        for item in history.get("items", []):
+            if item.get("field") == "status":
+                status_changes.append(
+                    {
+                        "date": history.get("created"),
+                        "from": item.get("fromString"),
+                        "to": item.get("toString"),
+                        "author": history.get("author", {}).get("displayName"),
+                    }
+                )
+    status_changes.sort(key=lambda x: x["date"])
+    return status_changes
+
+
+def parse_jira_datetime(value):
+    """Parse a Jira timestamp into an aware datetime"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class QuantileSketch:
+    """Mergeable, bounded-memory quantile sketch (KLL).
+
+    Values land in a stack of compactors; when a level fills up it is sorted
+    and every other value (starting at a random offset) is promoted to the
+    level above with twice the weight. Level capacities shrink by 2/3 going
+    down from the top, so the sketch holds about 3k values however many are
+    added. Until the first compaction the sketch is exact. After that a
+    quantile's rank is off by about 1.7/k of the count with high probability
+    (about 0.9% for the default k=200), and merging sketches of disjoint sets
+    keeps the same bound. The random offsets are seeded, so the same values
+    in the same order always give the same answers.
+    """
+
+    def __init__(self, k=None):
+        self.k = k or QUANTILE_SKETCH_K
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.compactors = []
+        self.size = 0
+        self.max_size = 0
+        self._rng = random.Random(0)
+        self._grow()
+
+    def _capacity(self, height):
+        depth = len(self.compactors) - height - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _grow(self):
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _compress(self):
+        for height, items in enumerate(self.compactors):
+            if len(items) < self._capacity(height):
+                continue
+            if height + 1 == len(self.compactors):
+                self._grow()
+            items.sort()
+            # An odd value out stays at this level
+            kept = [items.pop()] if len(items) % 2 else []
+            self.compactors[height + 1].extend(items[self._rng.randint(0, 1) :: 2])
+            self.compactors[height] = kept
+            break
+        self.size = sum(len(items) for items in self.compactors)
+
+    def add(self, value):
+        """Add one value"""
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.compactors[0].append(value)
+        self.size += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def merge(self, other):
+        """Fold another sketch (of a disjoint set of values) into this one"""
+        if not other.count:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for height, items in enumerate(other.compactors):
+            self.compactors[height].extend(items)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.size = sum(len(items) for items in self.compactors)
+        while self.size >= self.max_size:
+            self._compress()
+        return self
+
+    @property
+    def exact(self):
+        """Whether no values have been compacted away yet"""
+        return len(self.compactors) == 1
+
+    def quantiles(self, fractions):
+        """Estimate the values at the given fractions (0-1) of the sorted values"""
+        if not self.count:
+            return [None for _ in fractions]
+        weighted = sorted(
+            (value, 1 << height)
+            for height, items in enumerate(self.compactors)
+            for value in items
+        )
+        results = []
+        for fraction in fractions:
+            if fraction <= 0:
+                results.append(self.min)
+                continue
+            if fraction >= 1:
+                results.append(self.max)
+                continue
+            target = fraction * self.count
+            seen = 0
+            for value, weight in weighted:
+                seen += weight
+                if seen >= target:
+                    break
+            results.append(value)
+        return results
+
+
+# Percentiles reported from the stage duration sketches
+STAGE_PERCENTILES = {"p50": 0.5, "p85": 0.85, "p95": 0.95}
+
+
+def new_metrics_accumulator(percentiles=False):
+    """Create an empty accumulator for the resolution metrics of a set of issues.
+
+    With ``percentiles``, each stage also gets a quantile sketch of its
+    closed durations so p50/p85/p95 can be reported without keeping them all.
+    """
+    acc = {
+        "total_issues": 0,
+        # Track all status names encountered
+        "all_status_names": set(),
+        "status_stage_map": {},  # Maps actual status names to our stages
+        # Track time spent in each stage by each issue
+        "stage_data": {
+            stage: {
+                "tickets": set(),  # Unique tickets that entered this stage
+                "open_tickets": set(),  # Tickets currently in this stage
+                "closed_tickets": set(),  # Tickets that were in this stage but have moved on
+                "total_hours": 0,  # Total hours across all durations
+                "open_hours": 0,  # Hours in currently open periods
+                "closed_hours": 0,  # Hours in closed periods
+                "durations_count": 0,  # All periods in this stage
+                "open_durations_count": 0,  # Currently open periods
+                "closed_durations_count": 0,  # Closed periods
+            }
+            for stage in WORKFLOW_STAGES.keys()
+        },
+        # Track current status distribution
+        "current_status_counts": {
+            **{stage: 0 for stage in WORKFLOW_STAGES.keys()},
+            "Other": 0,
+        },
+        # Track churn metrics
+        "churn_metrics": {
+            "total_churn": 0,  # Total number of backward transitions
+            "tickets_with_churn": 0,  # Number of tickets with any backward transitions
+            "churn_details": {  # Counts of different types of backward transitions
+                "in_progress_to_to_do": 0,
+                "in_review_to_in_progress": 0,
+                "in_qa_to_in_review": 0,
+                "in_qa_to_in_progress": 0,
+                "done_to_any": 0,
+            },
+            "tickets_by_score": {  # Tickets grouped by churn score range
+                "1-5": 0,
+                "6-10": 0,
+                "11-20": 0,
+                "21+": 0,
+            },
+            "tickets_with_scores": {},  # Dictionary of ticket keys to their churn scores
+        },
+    }
+    if percentiles:
+        for data in acc["stage_data"].values():
+            data["closed_sketch"] = QuantileSketch()
+    return acc
+
+
+def accumulate_issue_metrics(acc, issue, exclude_weekends, min_time_threshold, now):
+    """Add the stage durations, current status and churn of one issue to an accumulator"""
+    all_status_names = acc["all_status_names"]
+    status_stage_map = acc["status_stage_map"]
+    stage_data = acc["stage_data"]
+    churn_metrics = acc["churn_metrics"]
+
+    acc["total_issues"] += 1
+
+    issue_key = issue.get("key")
+    changelog = issue.get("changelog", {}).get("histories", [])
+    created_date = issue.get("fields", {}).get("created")
+    current_status_name = (
+        issue.get("fields", {}).get("status", {}).get("name", "Unknown")
+    )
+
+    # Track all status names
+    all_status_names.add(current_status_name)
+
+    # Find current workflow stage (only recognized stages are counted as such)
+    current_stage = map_status_to_stage(current_status_name, status_stage_map)
+    acc["current_status_counts"][current_stage] += 1
+
+    # Process status changes to collect all transitions and calculate churn
+    all_issue_status_changes = []  # Store all status changes chronologically
+    status_transitions_for_churn = []  # Store stage transitions for churn calculation
+    issue_churn_count = 0
+
+    for history in changelog:
+        history_date = history.get("created")
+        for item in history.get("items", []):
+            if item.get("field") == "status":
+                from_status = item.get("fromString")
+                to_status = item.get("toString")
+
+                # Add to chronological list
+                all_issue_status_changes.append(
+                    {"date": history_date, "from": from_status, "to": to_status}
+                )
+
+                # Track the status names
+                all_status_names.add(from_status)
+                all_status_names.add(to_status)
+
+                # Map statuses to workflow stages for churn detection
+                from_stage = map_status_to_stage(from_status, status_stage_map)
+                to_stage = map_status_to_stage(to_status, status_stage_map)
+
+                # Add to churn transition list
+                status_transitions_for_churn.append(
+                    {
+                        "from_stage": from_stage,
+                        "to_stage": to_stage,
+                        "date": history_date,
+                    }
+                )
+
+                # Detect churn (backward workflow transitions, ignoring 'Other' and same-stage)
+                if is_backward_transition(from_stage, to_stage):
+                    issue_churn_count += 1
+                    # This is a backward transition (churn)
+                    churn_type = churn_transition_type(from_stage, to_stage)
+                    if churn_type:
+                        churn_metrics["churn_details"][churn_type] += 1
+
+    # Sort all status changes by date
+    all_issue_status_changes.sort(key=lambda x: x["date"])
+
+    # Reconstruct the stage history for calculating durations
+    status_history = []
+
+    if not all_issue_status_changes:
+        # No status changes recorded, use the current status as the initial one
+        initial_status = current_status_name
+        initial_stage = status_stage_map.get(initial_status, "Other")
+        logger.debug(
+            f"Issue {issue_key} has no status changes in changelog. Using current status '{initial_status}' ({initial_stage}) as initial."
+        )
+    else:
+        # Use the 'from' status of the first recorded change
+        initial_status = all_issue_status_changes[0].get("from")
+        if initial_status:
+            initial_stage = map_status_to_stage(initial_status, status_stage_map)
+            logger.debug(
+                f"Determined initial status for {issue_key} as '{initial_status}' ({initial_stage}) from first changelog entry."
+            )
+        else:
+            # Fallback if first 'from' is None (should be rare)
+            initial_status = "Unknown Initial"
+            initial_stage = "Other"
+            logger.warning(
+                f"Could not determine initial status for {issue_key} from first changelog entry (from=None). Defaulting to 'Unknown Initial'."
+            )
+
+    # Add the initial state at creation time
+    if not created_date:
+        logger.warning(
+            f"Issue {issue_key} missing creation date. Cannot accurately track time."
+        )
+        return  # Skip issues without creation date
+
+    status_history.append(
+        {"stage": initial_stage, "status": initial_status, "date": created_date}
+    )
+
+    # Add all subsequent states from the sorted changes
+    for change in all_issue_status_changes:
+        to_status = change.get("to")
+        status_history.append(
+            {
+                "stage": map_status_to_stage(to_status, status_stage_map),
+                "status": to_status,
+                "date": change.get("date"),
+            }
+        )
+
+    # Calculate time spent in each stage
+    for i, entry in enumerate(status_history):
+        stage = entry["stage"]
+
+        # Skip 'Other' stage for duration calculations
+        if stage == "Other":
+            continue
+
+        # Start time is this entry's date
+        start_time_str = entry["date"]
+        if not start_time_str:  # Skip if date is missing
+            logger.warning(
+                f"Missing date for history entry in {issue_key}. Skipping duration calculation for this period."
+            )
+            continue
+        start_time = datetime.fromisoformat(start_time_str.replace("Z", "+00:00"))
+
+        # End time is next entry's date or current time
+        if i < len(status_history) - 1:
+            end_time_str = status_history[i + 1]["date"]
+            if not end_time_str:  # Skip if date is missing
+                logger.warning(
+                    f"Missing date for next history entry in {issue_key}. Skipping duration calculation."
+                )
+                continue
+            end_time = datetime.fromisoformat(end_time_str.replace("Z", "+00:00"))
+            is_open = False
+        else:
+            # Current time if this is the latest status
+            end_time = now
+            is_open = True
+
+        # Ensure end_time is after start_time
+        if end_time < start_time:
+            logger.warning(
+                f"End time {end_time} is before start time {start_time} for stage '{stage}' in {issue_key}. Skipping duration calculation for this invalid period."
+            )
+            continue  # Skip this invalid period
+
+        # Calculate duration in hours, potentially excluding weekends
+        duration_hours = calculate_working_hours(start_time, end_time, exclude_weekends)
+
+        # Only record if duration is positive and meets minimum threshold
+        if duration_hours >= min_time_threshold:
+            data = stage_data[stage]
+            # This issue was in this stage
+            data["tickets"].add(issue_key)
+
+            # Track open vs closed periods
+            if is_open:
+                data["open_tickets"].add(issue_key)
+                data["open_durations_count"] += 1
+                data["open_hours"] += duration_hours
+            else:
+                data["closed_tickets"].add(issue_key)
+                data["closed_durations_count"] += 1
+                data["closed_hours"] += duration_hours
+                if "closed_sketch" in data:
+                    data["closed_sketch"].add(duration_hours)
+
+            # Add to all durations
+            data["durations_count"] += 1
+            data["total_hours"] += duration_hours
+
+    # Update churn count based on the calculated issue_churn_count
+    if issue_churn_count > 0:
+        churn_metrics["tickets_with_churn"] += 1
+        churn_metrics["total_churn"] += issue_churn_count
+
+        # Track churn score
+        churn_metrics["tickets_with_scores"][issue_key] = {
+            "score": issue_churn_count,
+            "transitions": status_transitions_for_churn,
+        }
+
+        # Count ticket in the appropriate score range bucket
+        if issue_churn_count <= 5:
+            churn_metrics["tickets_by_score"]["1-5"] += 1
+        elif issue_churn_count <= 10:
+            churn_metrics["tickets_by_score"]["6-10"] += 1
+        elif issue_churn_count <= 20:
+            churn_metrics["tickets_by_score"]["11-20"] += 1
+        else:
+            churn_metrics["tickets_by_score"]["21+"] += 1
+
+
+def merge_metrics_accumulators(accumulators):
+    """Merge accumulators of disjoint issue sets into a single accumulator"""
+    merged = new_metrics_accumulator()
+    for acc in accumulators:
+        merged["total_issues"] += acc["total_issues"]
+        merged["all_status_names"] |= acc["all_status_names"]
+        for status, stage in acc["status_stage_map"].items():
+            merged["status_stage_map"].setdefault(status, stage)
+
+        for stage, data in acc["stage_data"].items():
+            merged_data = merged["stage_data"][stage]
+            for key, value in data.items():
+                if isinstance(value, set):
+                    merged_data[key] |= value
+                elif isinstance(value, QuantileSketch):
+                    merged_data.setdefault(key, QuantileSketch(value.k)).merge(value)
+                else:
+                    merged_data[key] += value
+
+        for stage, count in acc["current_status_counts"].items():
+            merged["current_status_counts"][stage] += count
+
+        churn = acc["churn_metrics"]
+        merged_churn = merged["churn_metrics"]
+        merged_churn["total_churn"] += churn["total_churn"]
+        merged_churn["tickets_with_churn"] += churn["tickets_with_churn"]
+        for key in ("churn_details", "tickets_by_score"):
+            for bucket, count in churn[key].items():
+                merged_churn[key][bucket] += count
+        merged_churn["tickets_with_scores"].update(churn["tickets_with_scores"])
+
+    return merged
+
+
+def finalize_resolution_metrics(acc, exclude_weekends, min_time_threshold):
+    """Turn an accumulator into the metrics returned by the resolution metrics routes"""
+    status_stage_map = acc["status_stage_map"]
+    all_status_names = acc["all_status_names"]
+
+    # Build a mapping of statuses found but not categorized (excluding 'Other')
+    uncategorized_statuses = [
+        status
+        for status, stage in status_stage_map.items()
+        if stage == "Other" and status != "Unknown Initial"
+    ]
+
+    # Log all workflow steps found
+    logger.info(f"All status names found: {sorted(list(all_status_names))}")
+    logger.info(f"Final Status stage mapping: {status_stage_map}")
+    logger.info(f"Uncategorized statuses mapped to 'Other': {uncategorized_statuses}")
+
+    # Calculate metrics for each stage (excluding 'Other')
+    stage_metrics = {}
+    for stage, data in acc["stage_data"].items():
+        if stage == "Other":
+            continue  # Skip 'Other' stage in final metrics
+
+        stage_metrics[stage] = {
+            # Tickets
+            "tickets_count": len(data["tickets"]),
+            "open_tickets_count": len(data["open_tickets"]),
+            "closed_tickets_count": len(data["closed_tickets"]),
+            # Hours
+            "total_hours": round(data["total_hours"], 2),
+            "open_hours": round(data["open_hours"], 2),
+            "closed_hours": round(data["closed_hours"], 2),
+            # Averages
+            "avg_per_ticket": (
+                round(data["total_hours"] / len(data["tickets"]), 2)
+                if data["tickets"]
+                else 0
+            ),
+            "avg_per_closed_ticket": (
+                round(data["closed_hours"] / len(data["closed_tickets"]), 2)
+                if data["closed_tickets"]
+                else 0
+            ),
+            "avg_per_open_ticket": (
+                round(data["open_hours"] / len(data["open_tickets"]), 2)
+                if data["open_tickets"]
+                else 0
+            ),
+            # Occurrences
+            "count": data["durations_count"],
+            "average_hours": (
+                round(data["total_hours"] / data["durations_count"], 2)
+                if data["durations_count"]
+                else 0
+            ),
+            # Include complete data counts
+            "durations_count": data["durations_count"],
+            "open_durations_count": data["open_durations_count"],
+            "closed_durations_count": data["closed_durations_count"],
+        }
+
+        sketch = data.get("closed_sketch")
+        if sketch is not None:
+            values = sketch.quantiles(STAGE_PERCENTILES.values())
+            stage_metrics[stage]["closed_percentiles"] = {
+                name: round(value, 2) if value is not None else None
+                for name, value in zip(STAGE_PERCENTILES, values)
+            }
+            stage_metrics[stage]["closed_percentiles_exact"] = sketch.exact
+
+    # Build the complete metrics object
+    return {
+        "total_issues": acc["total_issues"],
+        "current_status": acc["current_status_counts"],
+        "stage_metrics": stage_metrics,
+        "calculation_params": {
+            "exclude_weekends": exclude_weekends,
+            "min_time_threshold": min_time_threshold,
+        },
+        "workflow_info": {
+            "all_statuses": sorted(list(all_status_names)),
+            "uncategorized_statuses": uncategorized_statuses,
+            "status_mapping": status_stage_map,
+        },
+        "churn_metrics": acc["churn_metrics"],
+    }
+
+
+def accumulate_issue_chunk(
+    issues, exclude_weekends, min_time_threshold, now, percentiles=False
+):
+    """Accumulate the resolution metrics of one chunk of issues.
+
+    Module-level so it can be pickled and run in the metrics process pool.
+    """
+    acc = new_metrics_accumulator(percentiles)
+    for issue in issues:
+        accumulate_issue_metrics(acc, issue, exclude_weekends, min_time_threshold, now)
+    return acc
+
+
+_metrics_pool = None
+_metrics_pool_lock = threading.Lock()
+
+
+def get_metrics_process_pool():
+    """Return the shared process pool for the metrics analysis, creating it on first use"""
+    global _metrics_pool
+    with _metrics_pool_lock:
+        if _metrics_pool is None:
+            # Spawn rather than fork: the Flask server is multi-threaded and a
+            # forked child could inherit locks held by other request threads
+            _metrics_pool = ProcessPoolExecutor(
+                max_workers=METRICS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started metrics process pool with {METRICS_WORKERS} workers")
+        return _metrics_pool
+
+
+def reset_metrics_process_pool():
+    """Drop a broken metrics process pool so the next call starts a fresh one"""
+    global _metrics_pool
+    with _metrics_pool_lock:
+        if _metrics_pool is not None:
+            _metrics_pool.shutdown(wait=False, cancel_futures=True)
+        _metrics_pool = None
+
+
+def analyze_issues_for_metrics(
+    issues, exclude_weekends, min_time_threshold, percentiles=False
+):
+    """Accumulate the resolution metrics of an iterable of issues.
+
+    The issues are consumed as they arrive (normally straight off a streamed
+    Jira search) and split into fixed-size chunks that are accumulated
+    separately and merged in order. Chunks are accumulated inline, one issue
+    at a time, until METRICS_PARALLEL_MIN_ISSUES issues have been seen; after
+    that (unless METRICS_WORKERS <= 1) each further chunk is sent to the
+    metrics process pool while the next one is read, with at most
+    METRICS_WORKERS chunks in flight. Chunk boundaries don't
+    depend on where the chunks run, so every path returns exactly the same
+    result.
+    """
+    # Current timestamp for calculating open durations, shared by every chunk
+    now = datetime.now(timezone.utc)
+
+    issues = iter(issues)
+    partials = []
+    # (index in partials, future, chunk) of the chunks in the pool, oldest
+    # first; a chunk is kept until its result is in, so it can be redone
+    # inline if the pool breaks
+    pending = deque()
+    issues_seen = 0
+    use_pool = False
+
+    def collect_oldest(pool_ok):
+        """Put the oldest pool chunk's result in place; returns whether the pool still works"""
+        index, future, chunk = pending.popleft()
+        if pool_ok:
+            try:
+                partials[index] = future.result()
+                return True
+            except BrokenProcessPool as e:
+                logger.error(
+                    f"Metrics process pool failed, analyzing serially: {str(e)}"
+                )
+                reset_metrics_process_pool()
+        partials[index] = accumulate_issue_chunk(
+            chunk, exclude_weekends, min_time_threshold, now, percentiles
+        )
+        return False
+
+    while True:
+        if use_pool:
+            chunk = list(islice(issues, METRICS_CHUNK_SIZE))
+            if not chunk:
+                break
+            issues_seen += len(chunk)
+            try:
+                future = get_metrics_process_pool().submit(
+                    accumulate_issue_chunk,
+                    chunk,
+                    exclude_weekends,
+                    min_time_threshold,
+                    now,
+                    percentiles,
+                )
+            except BrokenProcessPool as e:
+                logger.error(
+                    f"Metrics process pool failed, analyzing serially: {str(e)}"
+                )
+                reset_metrics_process_pool()
+                use_pool = False
+                while pending:
+                    collect_oldest(False)
+                partials.append(
+                    accumulate_issue_chunk(
+                        chunk, exclude_weekends, min_time_threshold, now, percentiles
+                    )
+                )
+                continue
+
+            pending.append((len(partials), future, chunk))
+            partials.append(None)
+            # At most METRICS_WORKERS chunks are held in flight, so memory
+            # doesn't grow with the size of the search
+            while len(pending) > METRICS_WORKERS:
+                if not collect_oldest(True):
+                    use_pool = False
+                    while pending:
+                        collect_oldest(False)
+            continue
+
+        acc = new_metrics_accumulator(percentiles)
+        chunk_size = 0
+        for issue in islice(issues, METRICS_CHUNK_SIZE):
+            accumulate_issue_metrics(
+                acc, issue, exclude_weekends, min_time_threshold, now
+            )
+            chunk_size += 1
+        if not chunk_size:
+            break
+        partials.append(acc)
+        issues_seen += chunk_size
+
+        if METRICS_WORKERS > 1 and issues_seen >= METRICS_PARALLEL_MIN_ISSUES:
+            logger.debug(
+                f"Analyzed {issues_seen} issues inline, sending further chunks to the metrics process pool"
+            )
+            use_pool = True
+
+    # Waiting for the last pool chunks is waiting for their analysis (the
+    # earlier waits happen while the issues are consumed, so already count)
+    with server_timing("analysis"):
+        pool_ok = True
+        while pending:
+            pool_ok = collect_oldest(pool_ok)
+
+    if len(partials) == 1:
+        return partials[0]
+    return merge_metrics_accumulators(partials)
+
+
+def compute_resolution_metrics(
+    jql, max_results, exclude_weekends, min_time_threshold, percentiles=False
+):
+    """Fetch the issues of a query (with changelog) and compute their resolution metrics"""
+    # Stream all issues with changelog to analyze status durations
+    issues = iter_metrics_issues(get_jira_headers(), jql, max_results)
+    acc = analyze_issues_for_metrics(
+        issues, exclude_weekends, min_time_threshold, percentiles
+    )
+
+    logger.debug(f"Analyzed {acc['total_issues']} issues")
+    return finalize_resolution_metrics(acc, exclude_weekends, min_time_threshold)
+
+
+@app.route("/proxy/resolution-metrics", methods=["GET"])
+def get_resolution_metrics():
+    """Calculate average cycle times between key workflow states for all tickets"""
+    try:
+        # Use backend credentials
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        # Get query parameters - we'll analyze ALL tickets now, not just done ones
+        jql = request.args.get("jql", "ORDER BY created DESC")
+        max_results = int(
+            request.args.get("maxResults", "200")
+        )  # Increased to get more data
+        board = request.args.get("board")
+
+        # Get optional filtering parameters
+        exclude_weekends = request.args.get("excludeWeekends", "true").lower() == "true"
+        min_time_threshold = float(
+            request.args.get("minTimeThreshold", "0.167")
+        )  # Default to 10 minutes (0.167 hours)
+        percentiles = (
+            request.args.get("percentiles", str(METRICS_PERCENTILES)).lower() == "true"
+        )
+
+        # If board is specified, add it to the JQL query
+        if board:
+            logger.debug(f"Filtering by board/project: {board}")
+            jql = build_project_jql(jql, board)
+
+        logger.debug(f"Using JQL query for metrics: {jql}")
+        logger.debug(
+            f"Configuration: exclude_weekends={exclude_weekends}, min_time_threshold={min_time_threshold}"
+        )
+
+        cache_key = make_cache_key(
+            "metrics",
+            jql,
+            max_results,
+            exclude_weekends,
+            min_time_threshold,
+            percentiles,
+        )
+        cached = METRICS_CACHE.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Serving metrics for {jql} from cache")
+            return jsonify(cached), 200
+
+        metrics = compute_resolution_metrics(
+            jql, max_results, exclude_weekends, min_time_threshold, percentiles
+        )
+        stage_metrics = metrics["stage_metrics"]
+
+        logger.debug(f"Calculated cycle time metrics: {metrics}")
+        logger.info(f"Stage metrics data structure: {stage_metrics}")
+        # Log a sample of the data to check structure
+        if stage_metrics:
+            sample_stage = next(iter(stage_metrics))
+            logger.info(
+                f"Sample stage '{sample_stage}' data: {stage_metrics[sample_stage]}"
+            )
+
+        # Results cut short by the deadline are returned but not cached
+        if not upstream_partial():
+            METRICS_CACHE.set(cache_key, metrics, tags=[project_cache_tag(board)])
+        return jsonify(metrics), 200
+
+    except JiraUnavailableError as e:
+        return serve_stale_or_error(METRICS_CACHE, cache_key, e)
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error fetching issues: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error in get_resolution_metrics: {str(e)}")
+        import traceback
+
+        logger.error(traceback.format_exc())
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
+def resolve_aggregate_projects(payload):
+    """Work out the project keys requested for an aggregate metrics call.
+
+    Projects can be given as a list (or comma-separated string) under
+    ``projects``, or as a ``portfolio``: either the name of one of the
+    configured JIRA_PORTFOLIOS or an inline ``{"name": ..., "projects": [...]}``.
+    """
+    projects = payload.get("projects") or []
+    portfolio = payload.get("portfolio")
+    portfolio_name = None
+
+    if isinstance(projects, str):
+        projects = projects.split(",")
+
+    if portfolio:
+        if isinstance(portfolio, dict):
+            portfolio_name = portfolio.get("name")
+            portfolio_projects = portfolio.get("projects", [])
+        else:
+            portfolio_name = portfolio
+            if portfolio not in PORTFOLIOS:
+                raise ValueError(f"Unknown portfolio: {portfolio}")
+            portfolio_projects = PORTFOLIOS[portfolio]
+        projects = list(projects) + list(portfolio_projects)
+
+    # Keep the requested order but drop blanks and duplicates
+    seen = set()
+    keys = []
+    for project in projects:
+        key = str(project).strip()
+        if key and key not in seen:
+            seen.add(key)
+            keys.append(key)
+    return keys, portfolio_name
+
+
+def fetch_project_metrics_accumulator(
+    project,
+    jql,
+    max_results,
+    exclude_weekends,
+    min_time_threshold,
+    deadline,
+    percentiles=False,
+):
+    """Fetch and analyze one project's issues for the aggregate metrics"""
+    remaining = None
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Deadline reached before fetching {project}")
+
+    issues = iter_metrics_issues(
+        get_jira_headers(),
+        build_project_jql(jql, project),
+        max_results,
+        timeout=remaining,
+    )
+    acc = analyze_issues_for_metrics(
+        issues, exclude_weekends, min_time_threshold, percentiles
+    )
+    logger.debug(f"Analyzed {acc['total_issues']} issues in project {project}")
+    return acc
+
+
+@app.route("/proxy/resolution-metrics/aggregate", methods=["GET", "POST"])
+def get_aggregate_resolution_metrics():
+    """Calculate resolution metrics for several projects at once, plus org-level totals"""
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        # Parameters can come from the query string or, for long project
+        # lists and inline portfolios, from a JSON body
+        payload = dict(request.args.items())
+        if request.method == "POST" and request.is_json:
+            payload.update(request.get_json() or {})
+
+        try:
+            projects, portfolio_name = resolve_aggregate_projects(payload)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if not projects:
+            return (
+                jsonify(
+                    {"error": "A projects list or portfolio parameter is required"}
+                ),
+                400,
+            )
+
+        jql = payload.get("jql", "ORDER BY created DESC")
+        max_results = int(payload.get("maxResults", 200))
+        exclude_weekends = str(payload.get("excludeWeekends", "true")).lower() == "true"
+        min_time_threshold = float(payload.get("minTimeThreshold", 0.167))
+        percentiles = (
+            str(payload.get("percentiles", METRICS_PERCENTILES)).lower() == "true"
+        )
+        budget = current_budget()
+        # A client may shorten the route's deadline, never extend it
+        deadline_seconds = budget.seconds
+        if payload.get("deadline") is not None:
+            try:
+                requested = float(payload["deadline"])
+            except (TypeError, ValueError):
+                return jsonify({"error": "deadline must be a number of seconds"}), 400
+            if requested <= 0:
+                return jsonify({"error": "deadline must be positive"}), 400
+            if deadline_seconds is None or requested < deadline_seconds:
+                deadline_seconds = requested
+
+        logger.debug(
+            f"Aggregating metrics for {len(projects)} projects with a {deadline_seconds}s deadline: {projects}"
+        )
+
+        started = time.monotonic()
+        deadline = None
+        if deadline_seconds is not None:
+            deadline = started + deadline_seconds
+            # The workers' Jira calls share the request's (possibly shortened) deadline
+            budget.seconds = deadline_seconds
+            budget.deadline = deadline
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(AGGREGATE_MAX_WORKERS, len(projects)))
+        )
+        futures = {
+            executor.submit(
+                run_with_budget,
+                budget,
+                fetch_project_metrics_accumulator,
+                project,
+                jql,
+                max_results,
+                exclude_weekends,
+                min_time_threshold,
+                deadline,
+                percentiles,
+            ): project
+            for project in projects
+        }
+        done, not_done = wait(futures, timeout=deadline_seconds)
+        # Don't hold the response for stragglers; their upstream calls are
+        # bounded by the same deadline so the workers free up shortly
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        accumulators = {}
+        failed = {}
+        for future in done:
+            project = futures[future]
+            try:
+                accumulators[project] = future.result()
+            except JiraAPIError as e:
+                failed[project] = {"error": str(e), "status": e.status_code}
+            except (requests.exceptions.Timeout, TimeoutError):
+                failed[project] = {"error": "Deadline exceeded", "status": 504}
+            except requests.exceptions.RequestException as e:
+                failed[project] = {"error": f"Request failed: {str(e)}", "status": 500}
+            except Exception as e:
+                logger.error(f"Unexpected error aggregating {project}: {str(e)}")
+                failed[project] = {
+                    "error": f"Unexpected error: {str(e)}",
+                    "status": 500,
+                }
+
+        timed_out = [futures[future] for future in not_done]
+        for project in timed_out:
+            failed[project] = {"error": "Deadline exceeded", "status": 504}
+
+        # Report projects in the order they were requested
+        completed = [project for project in projects if project in accumulators]
+        project_metrics = {
+            project: finalize_resolution_metrics(
+                accumulators[project], exclude_weekends, min_time_threshold
+            )
+            for project in completed
+        }
+        org_metrics = finalize_resolution_metrics(
+            merge_metrics_accumulators(accumulators[p] for p in completed),
+            exclude_weekends,
+            min_time_threshold,
+        )
+
+        if failed:
+            logger.warning(f"Aggregate metrics incomplete, failed projects: {failed}")
+
+        result = {
+            "portfolio": portfolio_name,
+            "projects": project_metrics,
+            "org": org_metrics,
+            "completed": completed,
+            "failed": {
+                project: failed[project] for project in projects if project in failed
+            },
+            "partial": bool(failed) or budget.partial,
+            "deadline_seconds": deadline_seconds,
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+        }
+        return jsonify(result), 200
+
+    except Exception as e:
+        logger.error(f"Unexpected error in get_aggregate_resolution_metrics: {str(e)}")
+        import traceback
+
+        logger.error(traceback.format_exc())
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
+def build_week_buckets(now, horizon):
+    """Calendar weeks (Monday 00:00 UTC) ending with the current, still open week"""
+    week_start = (now - timedelta(days=now.weekday())).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    buckets = []
+    for weeks_back in range(horizon - 1, -1, -1):
+        start = week_start - timedelta(weeks=weeks_back)
+        end = start + timedelta(weeks=1)
+        buckets.append(
+            {
+                "label": start.date().isoformat(),
+                "start": start,
+                "end": end,
+                "closed": end <= now,
+            }
+        )
+    return buckets
+
+
+def build_sprint_buckets(sprints, horizon, now):
+    """The last started sprints of a project, oldest first, as trend buckets"""
+    started = [
+        sprint
+        for sprint in sprints
+        if sprint.get("state") in ("active", "closed") and sprint.get("startDate")
+    ]
+    started.sort(key=lambda sprint: sprint["startDate"])
+
+    buckets = []
+    for sprint in started[-horizon:]:
+        start = parse_jira_datetime(sprint["startDate"])
+        end_date = sprint.get("completeDate") or sprint.get("endDate")
+        end = parse_jira_datetime(end_date) if end_date else now
+        closed = sprint.get("state") == "closed"
+        if not closed:
+            # Work keeps landing in an active sprint after its planned end
+            end = max(end, now)
+        buckets.append(
+            {
+                "label": sprint.get("name"),
+                "sprint_id": sprint.get("id"),
+                "start": start,
+                "end": end,
+                "closed": closed,
+            }
+        )
+    return buckets
+
+
+def new_trend_bucket():
+    """Create an empty accumulator for one trend period"""
+    return {
+        "throughput_tickets": set(),
+        "churn": 0,
+        "churn_tickets": set(),
+        "stages": {
+            stage: {"count": 0, "total_hours": 0} for stage in WORKFLOW_STAGES.keys()
+        },
+    }
+
+
+def accumulate_issue_trend(
+    trend_buckets,
+    bucket_starts,
+    bucket_ends,
+    issue,
+    status_stage_map,
+    exclude_weekends,
+    min_time_threshold,
+):
+    """Add one issue's transitions to the trend buckets they end in.
+
+    ``trend_buckets`` maps bucket index to accumulator and only holds the
+    buckets being recomputed; events landing in any other bucket are skipped.
+    """
+    issue_key = issue.get("key")
+    fields = issue.get("fields", {})
+    created_date = fields.get("created")
+    if not created_date:
+        return
+
+    status_changes = get_issue_status_changes(issue)
+    if status_changes:
+        initial_status = status_changes[0].get("from") or "Unknown Initial"
+    else:
+        initial_status = fields.get("status", {}).get("name", "Unknown")
+
+    period_start = parse_jira_datetime(created_date)
+    period_stage = map_status_to_stage(initial_status, status_stage_map)
+
+    for change in status_changes:
+        if not change["date"]:
+            continue
+        changed_at = parse_jira_datetime(change["date"])
+        to_stage = map_status_to_stage(change["to"], status_stage_map)
+
+        index = bisect_right(bucket_starts, changed_at) - 1
+        if index >= 0 and changed_at < bucket_ends[index] and index in trend_buckets:
+            bucket = trend_buckets[index]
+
+            # The period in the previous stage ends with this transition
+            if period_stage != "Other" and changed_at >= period_start:
+                duration_hours = calculate_working_hours(
+                    period_start, changed_at, exclude_weekends
+                )
+                if duration_hours >= min_time_threshold:
+                    bucket["stages"][period_stage]["count"] += 1
+                    bucket["stages"][period_stage]["total_hours"] += duration_hours
+
+            if to_stage == "Done" and period_stage != "Done":
+                bucket["throughput_tickets"].add(issue_key)
+
+            if change["from"]:
+                from_stage = map_status_to_stage(change["from"], status_stage_map)
+                if is_backward_transition(from_stage, to_stage):
+                    bucket["churn"] += 1
+                    bucket["churn_tickets"].add(issue_key)
+
+        period_start = changed_at
+        period_stage = to_stage
+
+
+def finalize_trend_bucket(bucket_info, trend_bucket):
+    """Turn a trend bucket accumulator into its JSON representation"""
+    result = {
+        "label": bucket_info["label"],
+        "start": bucket_info["start"].isoformat(),
+        "end": bucket_info["end"].isoformat(),
+        "closed": bucket_info["closed"],
+        "throughput": len(trend_bucket["throughput_tickets"]),
+        "churn": {
+            "total": trend_bucket["churn"],
+            "tickets": len(trend_bucket["churn_tickets"]),
+        },
+        "stage_metrics": {
+            stage: {
+                "count": data["count"],
+                "total_hours": round(data["total_hours"], 2),
+                "average_hours": (
+                    round(data["total_hours"] / data["count"], 2)
+                    if data["count"]
+                    else 0
+                ),
+            }
+            for stage, data in trend_bucket["stages"].items()
+        },
+    }
+    if "sprint_id" in bucket_info:
+        result["sprint_id"] = bucket_info["sprint_id"]
+    return result
+
+
+@app.route("/proxy/resolution-metrics/trend", methods=["GET"])
+def get_resolution_metrics_trend():
+    """Per-week or per-sprint stage durations, throughput and churn over a horizon.
+
+    Transitions are bucketed by the time they happen, so a stage period counts
+    towards the period in which it ended. Buckets that are over never change
+    and are served from TREND_BUCKET_CACHE; only the issues updated since the
+    oldest uncached bucket are fetched and analyzed.
+    """
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        board = request.args.get("board")
+        jql = build_project_jql(request.args.get("jql", "ORDER BY created DESC"), board)
+        period = request.args.get("period", "week")
+        max_results = int(request.args.get("maxResults", TREND_MAX_ISSUES))
+        exclude_weekends = request.args.get("excludeWeekends", "true").lower() == "true"
+        min_time_threshold = float(request.args.get("minTimeThreshold", "0.167"))
+
+        if period not in ("week", "sprint"):
+            return jsonify({"error": "period must be 'week' or 'sprint'"}), 400
+        if period == "sprint" and not board:
+            return (
+                jsonify({"error": "Board parameter is required for sprint trends"}),
+                400,
+            )
+
+        horizon = int(request.args.get("horizon", 12 if period == "week" else 6))
+        if horizon < 1:
+            return jsonify({"error": "horizon must be at least 1"}), 400
+
+        jira_headers = get_jira_headers()
+        now = datetime.now(timezone.utc)
+
+        if period == "week":
+            buckets = build_week_buckets(now, horizon)
+        else:
+            sprints = fetch_project_sprints(jira_headers, board)["sprints"]
+            buckets = build_sprint_buckets(sprints, horizon, now)
+
+        # Serve closed buckets from the cache, recompute everything else
+        cache_keys = [
+            make_cache_key(
+                "trend",
+                jql,
+                exclude_weekends,
+                min_time_threshold,
+                bucket["start"].isoformat(),
+                bucket["end"].isoformat(),
+            )
+            for bucket in buckets
+        ]
+        results = [
+            TREND_BUCKET_CACHE.get(key) if bucket["closed"] else None
+            for bucket, key in zip(buckets, cache_keys)
+        ]
+        stale = [index for index, result in enumerate(results) if result is None]
+
+        issues_analyzed = 0
+        truncated = False
+        if stale:
+            trend_buckets = {index: new_trend_bucket() for index in stale}
+            bucket_starts = [bucket["start"] for bucket in buckets]
+            bucket_ends = [bucket["end"] for bucket in buckets]
+
+            # Anything that changed inside a stale bucket was updated after it
+            # started; the extra day covers JQL dates being in the user's timezone
+            since = min(buckets[index]["start"] for index in stale) - timedelta(days=1)
+            trend_jql = restrict_jql(jql, f'updated >= "{since:%Y/%m/%d %H:%M}"')
+            logger.debug(
+                f"Recomputing {len(stale)} of {len(buckets)} trend buckets with JQL: {trend_jql}"
+            )
+
+            status_stage_map = {}
+            for issue in iter_search_issues(
+                jira_headers,
+                trend_jql,
+                METRICS_FIELDS,
+                expand=["changelog"],
+                max_issues=max_results,
+            ):
+                issues_analyzed += 1
+                accumulate_issue_trend(
+                    trend_buckets,
+                    bucket_starts,
+                    bucket_ends,
+                    issue,
+                    status_stage_map,
+                    exclude_weekends,
+                    min_time_threshold,
+                )
+            # Hitting the cap means some issues may be missing from the buckets
+            truncated = issues_analyzed >= max_results or upstream_partial()
+
+            for index in stale:
+                results[index] = finalize_trend_bucket(
+                    buckets[index], trend_buckets[index]
+                )
+                if buckets[index]["closed"] and not truncated:
+                    TREND_BUCKET_CACHE.set(
+                        cache_keys[index],
+                        results[index],
+                        tags=[project_cache_tag(board)],
+                    )
 
         logger.info(
-            f"Returning {len(all_sprints)} sprints from {boards_with_sprints} boards (out of {boards_checked} checked) for project {board}"
+            f"Trend for {jql}: {len(buckets) - len(stale)} cached and {len(stale)} recomputed buckets from {issues_analyzed} issues"
         )
 
         return (
             jsonify(
                 {
-                    "sprints": all_sprints,
-                    "boardsChecked": boards_checked,
-                    "boardsWithSprints": boards_with_sprints,
+                    "period": period,
+                    "horizon": horizon,
+                    "buckets": [
+                        dict(result, cached=index not in stale)
+                        for index, result in enumerate(results)
+                    ],
+                    "issues_analyzed": issues_analyzed,
+                    "truncated": truncated,
+                    "calculation_params": {
+                        "exclude_weekends": exclude_weekends,
+                        "min_time_threshold": min_time_threshold,
+                    },
                 }
             ),
             200,
         )
 
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
     except requests.exceptions.RequestException as e:
-        logger.error(f"Request error: {str(e)}")
+        logger.error(f"Request error fetching trend issues: {str(e)}")
         return jsonify({"error": f"Request failed: {str(e)}"}), 500
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
+        logger.error(f"Unexpected error in get_resolution_metrics_trend: {str(e)}")
+        import traceback
+
+        logger.error(traceback.format_exc())
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
+def fetch_weekly_throughput(jira_headers, board, weeks, now):
+    """Issues resolved in each of the last ``weeks`` finished weeks, oldest first"""
+    buckets = build_week_buckets(now, weeks + 1)[:-1]
+    starts = [bucket["start"] for bucket in buckets]
+    # The extra day covers JQL dates being in the user's timezone
+    since = starts[0] - timedelta(days=1)
+    jql = restrict_jql(
+        build_project_jql("ORDER BY resolutiondate ASC", board),
+        f'resolutiondate >= "{since:%Y/%m/%d %H:%M}"',
+    )
+
+    counts = [0] * weeks
+    for issue in iter_search_issues(
+        jira_headers, jql, ["resolutiondate"], max_issues=FORECAST_MAX_ISSUES
+    ):
+        resolved = issue.get("fields", {}).get("resolutiondate")
+        if not resolved:
+            continue
+        resolved_at = parse_jira_datetime(resolved)
+        index = bisect_right(starts, resolved_at) - 1
+        if 0 <= index < weeks and resolved_at < buckets[index]["end"]:
+            counts[index] += 1
+    return [
+        {"week": bucket["label"], "throughput": count}
+        for bucket, count in zip(buckets, counts)
+    ]
+
+
+def simulation_blocks(weekly_throughput):
+    """Every sequence of ``size`` weeks drawn from the history, as running totals.
+
+    Drawing one of these sequences at random is the same as drawing each of
+    its weeks at random, so a simulation advances ``size`` weeks per draw.
+    ``size`` is as large as FORECAST_MAX_BLOCKS sequences allow. Returns
+    ``(size, blocks)``.
+    """
+    size = 1
+    while (
+        size < FORECAST_MAX_WEEKS
+        and len(weekly_throughput) ** (size + 1) <= FORECAST_MAX_BLOCKS
+    ):
+        size += 1
+    blocks = [()]
+    for _ in range(size):
+        blocks = [block + (week,) for block in blocks for week in weekly_throughput]
+    return size, [list(accumulate(block)) for block in blocks]
+
+
+def forecast_completion_weeks(weekly_throughput, items, simulations, rng):
+    """Weeks needed to finish ``items`` at each STAGE_PERCENTILES confidence (None past FORECAST_MAX_WEEKS).
+
+    All simulations draw their next block of weeks at once and are added up
+    with map; a simulation drops out in the block it reaches ``items``, when
+    the week it got there is looked up in the block's running totals.
+    """
+    if items <= 0:
+        return dict.fromkeys(STAGE_PERCENTILES, 0)
+
+    size, blocks = simulation_blocks(weekly_throughput)
+    block_totals = [block[-1] for block in blocks]
+    enough = max(STAGE_PERCENTILES.values()) * simulations
+    # Simulations finishing in each week, and the totals of those still going
+    finished_in = Counter()
+    running = [0] * simulations
+    weeks = 0
+    while running and weeks < FORECAST_MAX_WEEKS:
+        if simulations - len(running) >= enough:
+            break
+        drawn = rng.choices(range(len(blocks)), k=len(running))
+        totals = list(map(operator.add, running, map(block_totals.__getitem__, drawn)))
+        short = list(map(operator.lt, totals, repeat(items)))
+        for start, index in compress(zip(running, drawn), map(operator.not_, short)):
+            finished_in[weeks + 1 + bisect_left(blocks[index], items - start)] += 1
+        running = list(compress(totals, short))
+        weeks += size
+
+    weeks_needed = dict.fromkeys(STAGE_PERCENTILES)
+    pending = sorted(STAGE_PERCENTILES.items(), key=lambda item: item[1])
+    finished = 0
+    for week in sorted(finished_in):
+        if week > FORECAST_MAX_WEEKS:
+            break
+        finished += finished_in[week]
+        while pending and finished / simulations >= pending[0][1]:
+            weeks_needed[pending.pop(0)[0]] = week
+    return weeks_needed
+
+
+def forecast_items_by(weekly_throughput, weeks, simulations, rng):
+    """Items done within ``weeks`` weeks at each STAGE_PERCENTILES confidence"""
+    if weeks <= 0:
+        return dict.fromkeys(STAGE_PERCENTILES, 0)
+
+    size, blocks = simulation_blocks(weekly_throughput)
+    whole, rest = divmod(weeks, size)
+    block_totals = [block[-1] for block in blocks]
+    done = [0] * simulations
+    for _ in range(whole):
+        done = list(map(operator.add, done, rng.choices(block_totals, k=simulations)))
+    if rest:
+        # The first ``rest`` weeks of a random block are ``rest`` random weeks
+        partial_totals = [block[rest - 1] for block in blocks]
+        done = list(map(operator.add, done, rng.choices(partial_totals, k=simulations)))
+    done.sort()
+    # At confidence p, a fraction p of the simulations did at least this much
+    return {
+        name: done[int((1 - confidence) * (simulations - 1))]
+        for name, confidence in STAGE_PERCENTILES.items()
+    }
+
+
+@app.route("/proxy/forecast", methods=["GET"])
+def get_forecast():
+    """Monte Carlo delivery forecast from a project's weekly throughput.
+
+    ``items`` (default: the project's open issues) gives completion dates,
+    ``date`` gives how many items will be done by then, each at 50%, 85%
+    and 95% confidence. Throughput histories and forecasts are cached per
+    board per day.
+    """
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        board = request.args.get("board")
+        if not board:
+            return jsonify({"error": "Board parameter is required"}), 400
+        history_weeks = int(request.args.get("weeks", FORECAST_HISTORY_WEEKS))
+        simulations = int(request.args.get("simulations", FORECAST_SIMULATIONS))
+        if not 1 <= history_weeks <= FORECAST_MAX_HISTORY_WEEKS:
+            return (
+                jsonify(
+                    {
+                        "error": f"weeks must be between 1 and {FORECAST_MAX_HISTORY_WEEKS}"
+                    }
+                ),
+                400,
+            )
+        if not 1 <= simulations <= FORECAST_MAX_SIMULATIONS:
+            return (
+                jsonify(
+                    {
+                        "error": f"simulations must be between 1 and {FORECAST_MAX_SIMULATIONS}"
+                    }
+                ),
+                400,
+            )
+
+        now = datetime.now(timezone.utc)
+        today = now.date()
+        target_date = None
+        if request.args.get("date"):
+            try:
+                target_date = datetime.strptime(request.args["date"], "%Y-%m-%d").date()
+            except ValueError:
+                return jsonify({"error": "date must be YYYY-MM-DD"}), 400
+            if target_date < today:
+                return jsonify({"error": "date must not be in the past"}), 400
+            if target_date > today + timedelta(weeks=FORECAST_MAX_WEEKS):
+                return (
+                    jsonify(
+                        {"error": f"date must be within {FORECAST_MAX_WEEKS} weeks"}
+                    ),
+                    400,
+                )
+
+        jira_headers = get_jira_headers()
+        items = request.args.get("items")
+        if items is None:
+            # Counted once per board per day, like the throughput history
+            open_items_key = make_cache_key("open_items", board, today)
+            items = FORECAST_CACHE.get(open_items_key)
+            if items is None:
+                items = count_search_issues(
+                    jira_headers,
+                    build_project_jql("statusCategory != Done ORDER BY created", board),
+                )
+                FORECAST_CACHE.set(open_items_key, items)
+        items = int(items)
+
+        cache_key = make_cache_key(
+            "forecast", board, today, history_weeks, simulations, items, target_date
+        )
+        cached = FORECAST_CACHE.get(cache_key)
+        if cached is not None:
+            return jsonify(cached), 200
+
+        history_key = make_cache_key("throughput", board, today, history_weeks)
+        history = FORECAST_CACHE.get(history_key)
+        if history is None:
+            history = fetch_weekly_throughput(jira_headers, board, history_weeks, now)
+            if not upstream_partial():
+                FORECAST_CACHE.set(history_key, history)
+        weekly_throughput = [week["throughput"] for week in history]
+
+        result = {
+            "board": board,
+            "history": history,
+            "simulations": simulations,
+            "items": items,
+        }
+        if not any(weekly_throughput):
+            result["message"] = (
+                f"No issues were resolved in the last {history_weeks} weeks"
+            )
+            return jsonify(result), 200
+
+        # Seeded per board and day, so a day's forecasts agree with each other
+        rng = random.Random(f"{board}:{today}")
+        with server_timing("analysis"):
+            weeks_needed = forecast_completion_weeks(
+                weekly_throughput, items, simulations, rng
+            )
+            result["completion"] = {
+                name: (
+                    None
+                    if weeks is None
+                    else {
+                        "weeks": weeks,
+                        "date": (today + timedelta(weeks=weeks)).isoformat(),
+                    }
+                )
+                for name, weeks in weeks_needed.items()
+            }
+            if target_date is not None:
+                # Partial weeks count as whole ones, so a date a few days
+                # away still gets a week of throughput
+                weeks_until = -(-(target_date - today).days // 7)
+                result["by_date"] = {
+                    "date": target_date.isoformat(),
+                    "weeks": weeks_until,
+                    "items": forecast_items_by(
+                        weekly_throughput, weeks_until, simulations, rng
+                    ),
+                }
+
+        if not upstream_partial():
+            FORECAST_CACHE.set(cache_key, result)
+        return jsonify(result), 200
+
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error fetching throughput: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error in get_forecast: {str(e)}")
+        import traceback
+
+        logger.error(traceback.format_exc())
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
+def collect_stage_events(issue, status_stage_map, stage_index, events):
+    """Append an issue's (timestamp, stage, +1/-1) workflow stage events to ``events``"""
+    fields = issue.get("fields", {})
+    created_date = fields.get("created")
+    if not created_date:
+        return
+
+    status_changes = get_issue_status_changes(issue)
+    if status_changes and status_changes[0].get("from"):
+        initial_status = status_changes[0]["from"]
+    else:
+        initial_status = fields.get("status", {}).get("name", "Unknown")
+
+    stage = stage_index[map_status_to_stage(initial_status, status_stage_map)]
+    events.append((parse_jira_datetime(created_date).timestamp(), stage, 1))
+
+    for change in status_changes:
+        if not change["date"] or not change["to"]:
+            continue
+        new_stage = stage_index[map_status_to_stage(change["to"], status_stage_map)]
+        if new_stage != stage:
+            changed_at = parse_jira_datetime(change["date"]).timestamp()
+            events.append((changed_at, stage, -1))
+            events.append((changed_at, new_stage, 1))
+            stage = new_stage
+
+
+def sweep_cumulative_flow(events, stage_count, start, days, initial_counts=None):
+    """Count the issues in each stage at the end of every day with one sorted sweep.
+
+    Returns one list of daily counts per stage index. Events before ``start``
+    only contribute to the state the first day starts from.
+    """
+    events.sort(key=lambda event: event[0])
+    counts = list(initial_counts or [0] * stage_count)
+    series = [[] for _ in range(stage_count)]
+
+    position = 0
+    for day in range(days):
+        day_end = (start + timedelta(days=day + 1)).timestamp()
+        while position < len(events) and events[position][0] < day_end:
+            _, stage, delta = events[position]
+            counts[stage] += delta
+            position += 1
+        for stage in range(stage_count):
+            series[stage].append(counts[stage])
+    return series
+
+
+@app.route("/proxy/cumulative-flow", methods=["GET"])
+def get_cumulative_flow():
+    """Cumulative flow diagram: issues in each workflow stage at the end of each day"""
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        board = request.args.get("board")
+        jql = build_project_jql(request.args.get("jql", "ORDER BY created DESC"), board)
+        days = int(request.args.get("days", 90))
+        max_results = int(request.args.get("maxResults", CFD_MAX_ISSUES))
+
+        if not 1 <= days <= 3660:
+            return jsonify({"error": "days must be between 1 and 3660"}), 400
+
+        cache_key = make_cache_key("cfd", jql, days, max_results)
+        cached = CFD_CACHE.get(cache_key)
+        if cached is not None:
+            return jsonify(cached), 200
+
+        jira_headers = get_jira_headers()
+        today = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        start = today - timedelta(days=days - 1)
+        since = f"{start - timedelta(days=1):%Y/%m/%d %H:%M}"
+
+        stages = list(WORKFLOW_STAGES.keys()) + ["Other"]
+        stage_index = {stage: index for index, stage in enumerate(stages)}
+
+        # Issues that were already done before the window and haven't changed
+        # since only add a constant to the Done band: count them with a probe
+        # instead of downloading their changelogs
+        done_before_window = count_search_issues(
+            jira_headers,
+            restrict_jql(jql, f'statusCategory = Done AND updated < "{since}"'),
+        )
+
+        events = []
+        status_stage_map = {}
+        issues_analyzed = 0
+        for issue in iter_search_issues(
+            jira_headers,
+            restrict_jql(jql, f'(updated >= "{since}" OR statusCategory != Done)'),
+            METRICS_FIELDS,
+            expand=["changelog"],
+            max_issues=max_results,
+        ):
+            issues_analyzed += 1
+            collect_stage_events(issue, status_stage_map, stage_index, events)
+
+        initial_counts = [0] * len(stages)
+        initial_counts[stage_index["Done"]] = done_before_window
+        series = sweep_cumulative_flow(events, len(stages), start, days, initial_counts)
+
+        result = {
+            "dates": [
+                (start + timedelta(days=day)).date().isoformat() for day in range(days)
+            ],
+            "stages": stages,
+            "series": dict(zip(stages, series)),
+            "issues_analyzed": issues_analyzed,
+            "done_before_window": done_before_window,
+            "truncated": issues_analyzed >= max_results or upstream_partial(),
+            "status_mapping": status_stage_map,
+        }
+        if not upstream_partial():
+            CFD_CACHE.set(cache_key, result, tags=[project_cache_tag(board)])
+
+        logger.info(
+            f"Built cumulative flow for {jql} over {days} days from {issues_analyzed} issues ({len(events)} events)"
+        )
+        return jsonify(result), 200
+
+    except JiraUnavailableError as e:
+        return serve_stale_or_error(CFD_CACHE, cache_key, e)
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error fetching cumulative flow issues: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error in get_cumulative_flow: {str(e)}")
+        import traceback
+
+        logger.error(traceback.format_exc())
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
+@app.route("/proxy/transition-analysis", methods=["GET"])
+def get_transition_analysis():
+    """Ping-pong and churn scores of every issue matching a JQL query, in one response"""
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        board = request.args.get("board")
+        jql = build_project_jql(request.args.get("jql", "ORDER BY created DESC"), board)
+        max_results = int(request.args.get("maxResults", 200))
+        ping_pong_threshold = int(
+            request.args.get("pingPongThreshold", PING_PONG_THRESHOLD)
+        )
+        churn_threshold = int(request.args.get("churnThreshold", CHURN_THRESHOLD))
+
+        issues = {}
+        status_stage_map = {}
+        churn_details = new_churn_details()
+        for issue in iter_search_issues(
+            get_jira_headers(),
+            jql,
+            METRICS_FIELDS,
+            expand=["changelog"],
+            max_issues=max_results,
+        ):
+            # The search has just put the issue (and its status changes) in the store
+            stored = ISSUE_STORE.get(issue["key"])
+            status_changes = (
+                stored["status_changes"]
+                if stored is not None
+                else get_issue_status_changes(issue)
+            )
+            analysis = analyze_issue_transitions(status_changes, status_stage_map)
+            analysis["status"] = (
+                issue.get("fields", {}).get("status", {}).get("name", "Unknown")
+            )
+            analysis["is_ping_pong"] = (
+                analysis["ping_pong_score"] >= ping_pong_threshold
+            )
+            analysis["is_churn"] = analysis["churn_score"] >= churn_threshold
+            for churn_type, count in analysis["churn_details"].items():
+                churn_details[churn_type] += count
+            issues[issue["key"]] = analysis
+
+        logger.info(f"Analyzed transitions of {len(issues)} issues for {jql}")
+
+        return (
+            jsonify(
+                {
+                    "issues": issues,
+                    "summary": {
+                        "issues_analyzed": len(issues),
+                        "ping_pong_issues": sum(
+                            1 for a in issues.values() if a["is_ping_pong"]
+                        ),
+                        "churn_issues": sum(
+                            1 for a in issues.values() if a["is_churn"]
+                        ),
+                        "churn_details": churn_details,
+                    },
+                    "thresholds": {
+                        "ping_pong": ping_pong_threshold,
+                        "churn": churn_threshold,
+                    },
+                    "truncated": len(issues) >= max_results or upstream_partial(),
+                    "status_mapping": status_stage_map,
+                }
+            ),
+            200,
+        )
+
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error analyzing transitions: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error in get_transition_analysis: {str(e)}")
+        import traceback
+
+        logger.error(traceback.format_exc())
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
+def aging_risk_level(hours, threshold):
+    """Risk level of an open issue: "high" from twice its aging threshold,
+    "medium" from the threshold itself, "near" below it"""
+    if hours >= threshold * 2:
+        return "high"
+    if hours >= threshold:
+        return "medium"
+    return "near"
+
+
+def refresh_aging_index(jira_headers, board):
+    """Fetch a project's open issues (with changelog) into the issue store and aging index"""
+    open_keys = []
+    for issue in iter_search_issues(
+        jira_headers,
+        build_project_jql("statusCategory != Done ORDER BY updated DESC", board),
+        METRICS_FIELDS,
+        expand=["changelog"],
+        max_issues=AGING_MAX_ISSUES,
+    ):
+        open_keys.append(issue["key"])
+
+    # Only a complete listing shows which indexed issues are no longer open
+    complete = len(open_keys) < AGING_MAX_ISSUES and not upstream_partial()
+    AGING_INDEX.mark_refreshed(board, open_keys if complete else None)
+    logger.debug(f"Refreshed the aging index of {board} with {len(open_keys)} issues")
+
+
+@app.route("/proxy/aging", methods=["GET"])
+def get_aging_tickets():
+    """Open tickets past or near their AGING_THRESHOLDS, most overdue first"""
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
+
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
+
+        board = request.args.get("board")
+        if not board:
+            return jsonify({"error": "Board parameter is required"}), 400
+
+        near_fraction = float(request.args.get("near", AGING_NEAR_FRACTION))
+
+        refreshed = False
+        if not AGING_INDEX.is_fresh(board, AGING_INDEX_REFRESH_SECONDS):
+            try:
+                refresh_aging_index(get_jira_headers(), board)
+                refreshed = True
+            except JiraUnavailableError as e:
+                # Jira is failing: answer from the index as it stands, if anything
+                if not AGING_INDEX.project_issues(board):
+                    raise
+                logger.warning(f"Serving a stale aging index for {board}: {str(e)}")
+                current_budget().stale = True
+
+        now = datetime.now(timezone.utc)
+        indexed = AGING_INDEX.project_issues(board)
+        tickets = []
+        for record in indexed:
+            threshold = record["threshold_hours"]
+            if not threshold:
+                continue
+            hours = (now - record["entered_at"]).total_seconds() / 3600
+            if hours < threshold * near_fraction:
+                continue
+
+            risk_level = aging_risk_level(hours, threshold)
+            tickets.append(
+                {
+                    "key": record["key"],
+                    "summary": record["summary"],
+                    "status": record["status"],
+                    "stage": record["stage"],
+                    "entered_status_at": record["entered_at"].isoformat(),
+                    "hours_in_status": round(hours, 2),
+                    "threshold_hours": threshold,
+                    "overage_hours": round(hours - threshold, 2),
+                    "is_aging": hours >= threshold,
+                    "risk_level": risk_level,
+                }
+            )
+        tickets.sort(key=lambda ticket: ticket["overage_hours"], reverse=True)
+
+        counts = {"high": 0, "medium": 0, "near": 0}
+        for ticket in tickets:
+            counts[ticket["risk_level"]] += 1
+
+        return (
+            jsonify(
+                {
+                    "board": board,
+                    "tickets": tickets,
+                    "counts": counts,
+                    "open_issues_indexed": len(indexed),
+                    "near_fraction": near_fraction,
+                    "thresholds": AGING_THRESHOLDS,
+                    "index_refreshed": refreshed,
+                }
+            ),
+            200,
+        )
+
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error refreshing the aging index: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error in get_aging_tickets: {str(e)}")
         import traceback
 
-        logger.error(traceback.format_exc())  # Add stack trace for better debugging
+        logger.error(traceback.format_exc())
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
 
-@app.route("/proxy/issue-history/<issue_key>", methods=["GET"])
-def get_issue_history(issue_key):
-    """Get detailed status and transition history for a specific issue"""
+# Fields needed for the dependency graph
+DEPENDENCY_FIELDS = METRICS_FIELDS + ["issuelinks"]
+
+
+def refresh_dependency_graph(jira_headers, board):
+    """Fetch a project's issues (with links and changelog) into the issue store.
+
+    The dependency graph picks up their links from the store, and the same
+    pass works out the project's average hours per workflow stage (as the
+    resolution metrics do) for the cycle-time estimates.
+    """
+    acc = analyze_issues_for_metrics(
+        iter_search_issues(
+            jira_headers,
+            build_project_jql("ORDER BY updated DESC", board),
+            DEPENDENCY_FIELDS,
+            expand=["changelog"],
+            max_issues=DEPENDENCY_MAX_ISSUES,
+        ),
+        exclude_weekends=True,
+        min_time_threshold=0.167,
+    )
+    stage_metrics = finalize_resolution_metrics(acc, True, 0.167)["stage_metrics"]
+    stage_hours = {
+        stage: metrics["avg_per_closed_ticket"] or metrics["avg_per_ticket"]
+        for stage, metrics in stage_metrics.items()
+        if stage in CYCLE_TIME_STAGES
+    }
+    DEPENDENCY_GRAPH.mark_refreshed(board, stage_hours)
+    logger.debug(f"Refreshed the dependency graph of {board}")
+
+
+def dependency_analysis_response(part):
+    """Answer a /proxy/dependencies route with one part of the board's analysis"""
     try:
-        # Use backend credentials
-        jira_url = JIRA_CREDENTIALS["jira_url"]
-        email = JIRA_CREDENTIALS["email"]
-        api_token = JIRA_CREDENTIALS["api_token"]
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
 
         if not email or not api_token:
             logger.error("Jira credentials not configured in backend")
             return jsonify({"error": "Jira credentials not configured in backend"}), 500
 
-        # Create auth header
-        auth_header = (
-            f"Basic {base64.b64encode(f'{email}:{api_token}'.encode()).decode()}"
-        )
+        board = request.args.get("board")
+        if not board:
+            return jsonify({"error": "Board parameter is required"}), 400
+        limit = int(request.args.get("limit", 20))
+
+        refreshed = False
+        if not DEPENDENCY_GRAPH.is_fresh(board, DEPENDENCY_REFRESH_SECONDS):
+            try:
+                refresh_dependency_graph(get_jira_headers(), board)
+                refreshed = True
+            except JiraUnavailableError as e:
+                # Jira is failing: answer from the graph as it stands, if anything
+                if not DEPENDENCY_GRAPH.has_project(board):
+                    raise
+                logger.warning(
+                    f"Serving a stale dependency graph for {board}: {str(e)}"
+                )
+                current_budget().stale = True
 
-        # Prepare headers for Jira
-        jira_headers = {
-            "Authorization": auth_header,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
+        with server_timing("analysis"):
+            analysis = DEPENDENCY_GRAPH.analyze(board)
+        result = {
+            "board": board,
+            "open_issues": analysis["open_issues"],
+            "dependencies": analysis["dependencies"],
+            "cycles": analysis["cycles"],
+            "graph_refreshed": refreshed,
         }
+        if part == "critical_path":
+            result["critical_path"] = analysis["critical_path"]
+            result["stage_hours"] = analysis["stage_hours"]
+        else:
+            result[part] = analysis[part][:limit]
+            result[f"total_{part}"] = len(analysis[part])
+        return jsonify(result), 200
 
-        # Get the issue detail with changelog to analyze history
-        issue_url = f"{jira_url}/rest/api/3/issue/{issue_key}?expand=changelog"
-        logger.debug(f"Getting issue history for {issue_key} from {issue_url}")
-
-        response = requests.get(issue_url, headers=jira_headers)
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error refreshing the dependency graph: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error in dependency analysis: {str(e)}")
+        import traceback
 
-        if response.status_code >= 400:
-            logger.error(
-                f"Error fetching issue history: {response.status_code} - {response.text}"
-            )
-            return (
-                jsonify(
-                    {"error": f"Failed to fetch issue history: {response.status_code}"}
-                ),
-                response.status_code,
-            )
+        logger.error(traceback.format_exc())
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
-        issue_data = response.json()
 
-        # Extract just the status changes from the changelog
-        status_changes = []
-        status_durations = {}
-        current_status = None
-        last_status_change_date = None
+@app.route("/proxy/dependencies/chains", methods=["GET"])
+def get_blocked_chains():
+    """Chains of open issues waiting on each other, longest first"""
+    return dependency_analysis_response("chains")
 
-        # First, get creation date as the starting point
-        created_date = issue_data.get("fields", {}).get("created")
-        if created_date:
-            # Get initial status if available (usually "To Do" or equivalent)
-            initial_status = issue_data.get("fields", {}).get("status", {}).get("name")
-            if initial_status:
-                current_status = initial_status
-                last_status_change_date = created_date
 
-                # Add the initial status to the status changes
-                status_changes.append(
-                    {
-                        "date": created_date,
-                        "from": None,
-                        "to": initial_status,
-                        "fromCategory": None,
-                        "toCategory": initial_status,
-                    }
-                )
+@app.route("/proxy/dependencies/critical-path", methods=["GET"])
+def get_critical_path():
+    """The chain of open dependencies with the most estimated work left"""
+    return dependency_analysis_response("critical_path")
 
-        # Build a chronological list of all status transitions
-        all_status_transitions = []
 
-        # Go through each changelog entry to find status changes
-        changelog_entries = issue_data.get("changelog", {}).get("histories", [])
-        for entry in changelog_entries:
-            created = entry.get("created")
-            author = entry.get("author", {}).get("displayName", "Unknown")
+@app.route("/proxy/dependencies/blockers", methods=["GET"])
+def get_top_blockers():
+    """Open issues holding up the most work, most first"""
+    return dependency_analysis_response("top_blockers")
 
-            for item in entry.get("items", []):
-                field = item.get("field")
 
-                if field == "status":
-                    from_status = item.get("fromString")
-                    to_status = item.get("toString")
+# Fields behind the dashboard's ticket table
+TICKET_FIELDS = METRICS_FIELDS + ["priority", "assignee", "reporter"]
 
-                    # Add this transition to our chronological list
-                    all_status_transitions.append(
-                        {
-                            "date": created,
-                            "from": from_status,
-                            "to": to_status,
-                            "author": author,
-                        }
-                    )
+# Sort order of the aging risk levels, lowest first
+TICKET_RISK_ORDER = {"none": 0, "low": 1, "medium": 2, "high": 3}
 
-                    # Add this status change to our list
-                    status_changes.append(
-                        {
-                            "date": created,
-                            "from": from_status,
-                            "to": to_status,
-                            "author": author,
-                            "fromCategory": from_status,
-                            "toCategory": to_status,
-                        }
-                    )
 
-        # Sort transitions chronologically
-        all_status_transitions.sort(key=lambda x: x["date"])
+def ticket_key_order(issue_key):
+    """Sortable form of an issue key, ordering ABC-9 before ABC-10"""
+    project, _, number = issue_key.rpartition("-")
+    return f"{project}-{number.zfill(12)}" if number.isdigit() else issue_key
 
-        # Now process transitions to calculate durations
-        status_periods = {}  # Track periods spent in each status
-        now = datetime.now(timezone.utc)
 
-        # Initialize with the first status if we have it
-        if current_status and last_status_change_date:
-            current_period_start = datetime.fromisoformat(
-                last_status_change_date.replace("Z", "+00:00")
-            )
-            current_period_status = current_status
-        else:
-            # If we don't have initial status, we can't calculate durations accurately
-            return jsonify(
-                {
-                    "key": issue_key,
-                    "summary": issue_data.get("fields", {}).get(
-                        "summary", "No summary"
-                    ),
-                    "status_changes": status_changes,
-                    "status_durations": {},
-                    "error": "Unable to determine initial status",
-                    "current_status": issue_data.get("fields", {})
-                    .get("status", {})
-                    .get("name"),
-                    "created": created_date,
-                    "resolution_date": issue_data.get("fields", {}).get(
-                        "resolutiondate"
-                    ),
-                }
-            )
+def ticket_name(fields, field, default=""):
+    """Case-folded display name of a user or named field such as status or priority"""
+    value = fields.get(field) or {}
+    return (value.get("displayName") or value.get("name") or default).casefold()
 
-        # Process each transition to calculate time in each status
-        for transition in all_status_transitions:
-            transition_date = datetime.fromisoformat(
-                transition["date"].replace("Z", "+00:00")
-            )
-            from_status = transition["from"]
-            to_status = transition["to"]
 
-            # Calculate duration in previous status
-            duration_hours = (
-                transition_date - current_period_start
-            ).total_seconds() / 3600
+def ticket_created(row):
+    created = row["fields"].get("created")
+    return parse_jira_datetime(created).timestamp() if created else 0
 
-            # Add to periods for this status
-            if current_period_status not in status_periods:
-                status_periods[current_period_status] = []
 
-            status_periods[current_period_status].append(
-                {
-                    "start": current_period_start,
-                    "end": transition_date,
-                    "duration_hours": duration_hours,
-                }
-            )
+# Sort value of a ticket table row for each sortable column (the
+# dashboard's data-sort names); ties are broken by issue key
+TICKET_SORT_COLUMNS = {
+    "key": lambda row: ticket_key_order(row["key"]),
+    "summary": lambda row: (row["fields"].get("summary") or "").casefold(),
+    "status": lambda row: ticket_name(row["fields"], "status"),
+    "priority": lambda row: ticket_name(row["fields"], "priority"),
+    "assignee": lambda row: ticket_name(row["fields"], "assignee", "Unassigned"),
+    "author": lambda row: ticket_name(row["fields"], "reporter"),
+    "created": ticket_created,
+    "risk": lambda row: TICKET_RISK_ORDER[row["risk_level"]],
+    "pingpong": lambda row: row["ping_pong_score"],
+    "churn": lambda row: row["churn_score"],
+}
 
-            # Update for next period
-            current_period_start = transition_date
-            current_period_status = to_status
 
-        # Add the final period (from last transition to now)
-        duration_hours = (now - current_period_start).total_seconds() / 3600
-        if current_period_status not in status_periods:
-            status_periods[current_period_status] = []
+def ticket_row(issue, status_changes, status_stage_map, now):
+    """Ticket table row of an issue: its displayed fields, aging risk and transition scores"""
+    fields = issue.get("fields", {})
+    analysis = analyze_issue_transitions(status_changes, status_stage_map)
+
+    risk_level = "none"
+    hours_in_status = None
+    record = aging_record({"issue": issue, "status_changes": status_changes})
+    if record is not None and record["threshold_hours"]:
+        hours_in_status = (now - record["entered_at"]).total_seconds() / 3600
+        if hours_in_status >= record["threshold_hours"]:
+            risk_level = aging_risk_level(hours_in_status, record["threshold_hours"])
+
+    return {
+        "key": issue["key"],
+        "fields": {
+            field: fields.get(field)
+            for field in (
+                "summary",
+                "status",
+                "priority",
+                "assignee",
+                "reporter",
+                "created",
+                "updated",
+            )
+        },
+        "risk_level": risk_level,
+        "is_aging": risk_level != "none",
+        "hours_in_status": (
+            round(hours_in_status, 2) if hours_in_status is not None else None
+        ),
+        "ping_pong_score": analysis["ping_pong_score"],
+        "is_ping_pong": analysis["ping_pong_score"] >= PING_PONG_THRESHOLD,
+        "churn_score": analysis["churn_score"],
+        "is_churn": analysis["churn_score"] >= CHURN_THRESHOLD,
+    }
+
+
+class TicketTable:
+    """The ticket table rows of one query, with a sort index per column.
+
+    Each index holds every row's (sort value, key order, key) in ascending
+    order. A page starts with a bisect for its cursor, the last row of the
+    previous page, and reads on from there in either direction: keyset
+    pagination, so deep pages cost no more than the first one.
+    """
+
+    def __init__(self, rows, truncated=False):
+        self.rows = {row["key"]: row for row in rows}
+        self.truncated = truncated
+        self.indexes = {
+            column: sorted(
+                (sort_value(row), ticket_key_order(row["key"]), row["key"])
+                for row in rows
+            )
+            for column, sort_value in TICKET_SORT_COLUMNS.items()
+        }
 
-        status_periods[current_period_status].append(
-            {
-                "start": current_period_start,
-                "end": now,
-                "duration_hours": duration_hours,
-                "is_current": True,
-            }
+    def cursor(self, column, issue_key):
+        """Index entry of a row, as used to resume after it"""
+        row = self.rows[issue_key]
+        return (
+            TICKET_SORT_COLUMNS[column](row),
+            ticket_key_order(issue_key),
+            issue_key,
         )
 
-        # Calculate aggregated durations for each status
-        for status, periods in status_periods.items():
-            total_hours = sum(period["duration_hours"] for period in periods)
-            current_period = next(
-                (period for period in periods if period.get("is_current", False)), None
-            )
+    def page(self, column, descending, cursor, limit, keep):
+        """Up to ``limit`` rows passing ``keep`` after ``cursor``, and the next cursor"""
+        index = self.indexes[column]
+        if descending:
+            end = len(index) if cursor is None else bisect_left(index, cursor)
+            positions = range(end - 1, -1, -1)
+        else:
+            start = 0 if cursor is None else bisect_right(index, cursor)
+            positions = range(start, len(index))
 
-            status_durations[status] = {
-                "total_hours": total_hours,
-                "count": len(periods),
-                "average_hours": total_hours / len(periods),
-                "periods": periods,
-            }
+        rows = []
+        for position in positions:
+            row = self.rows[index[position][2]]
+            if not keep(row):
+                continue
+            if len(rows) == limit:
+                # There is at least one more row: resume after this page's last
+                return rows, self.cursor(column, rows[-1]["key"])
+            rows.append(row)
+        return rows, None
 
-            # Add current_duration only if this is the current status
-            if current_period:
-                status_durations[status]["current_duration"] = current_period[
-                    "duration_hours"
-                ]
-                status_durations[status]["continuous_time"] = current_period[
-                    "duration_hours"
-                ]
 
-                # Log especially long durations in important statuses
-                if (
-                    status in ["In Progress", "In Review", "In QA"]
-                    and current_period["duration_hours"] >= 72
-                ):
-                    logger.warning(
-                        f"Issue {issue_key} has been in {status} continuously for {round(current_period['duration_hours'], 2)} hours (3+ days)"
-                    )
+def encode_ticket_cursor(cursor):
+    """Opaque page token for a ticket table cursor"""
+    value, _, issue_key = cursor
+    return base64.urlsafe_b64encode(json.dumps([value, issue_key]).encode()).decode()
 
-        # Prepare response with relevant data
-        result = {
-            "key": issue_key,
-            "summary": issue_data.get("fields", {}).get("summary", "No summary"),
-            "status_changes": status_changes,
-            "status_durations": status_durations,
-            "current_status": current_period_status,
-            "created": created_date,
-            "resolution_date": issue_data.get("fields", {}).get("resolutiondate"),
-        }
 
-        return jsonify(result)
-    except Exception as e:
-        logger.error(f"Error processing issue history: {str(e)}")
-        return jsonify({"error": f"Error processing issue history: {str(e)}"}), 500
+def decode_ticket_cursor(token):
+    """Ticket table cursor of a page token; raises ValueError if it isn't one"""
+    try:
+        value, issue_key = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(issue_key, str) or not isinstance(value, (str, int, float)):
+        raise ValueError("Invalid cursor")
+    return (value, ticket_key_order(issue_key), issue_key)
+
+
+def ticket_filter(args):
+    """Row predicate for the ticket table filters in a request's query string"""
+    text = args.get("text", "").casefold()
+    status = args.get("status")
+    at_risk_only = args.get("atRiskOnly", "false").lower() == "true"
+    ping_pong_only = args.get("pingPongOnly", "false").lower() == "true"
+    churn_only = args.get("churnOnly", "false").lower() == "true"
+    hide_resolved = args.get("hideResolved", "false").lower() == "true"
+
+    def keep(row):
+        fields = row["fields"]
+        status_name = (fields.get("status") or {}).get("name", "")
+        if text and not (
+            text in row["key"].casefold()
+            or text in (fields.get("summary") or "").casefold()
+        ):
+            return False
+        if status and status_name != status:
+            return False
+        if at_risk_only and not row["is_aging"]:
+            return False
+        if ping_pong_only and not row["is_ping_pong"]:
+            return False
+        if churn_only and not row["is_churn"]:
+            return False
+        if hide_resolved and any(
+            word in status_name for word in ("Done", "Closed", "Resolved")
+        ):
+            return False
+        return True
+
+    return keep
+
+
+def build_ticket_table(jira_headers, jql, max_results):
+    """Fetch the issues of a query (into the issue store) and index their rows"""
+    now = datetime.now(timezone.utc)
+    status_stage_map = {}
+    rows = []
+    for issue in iter_search_issues(
+        jira_headers,
+        jql,
+        TICKET_FIELDS,
+        expand=["changelog"],
+        max_issues=max_results,
+    ):
+        # The search has just put the issue (and its status changes) in the store
+        stored = ISSUE_STORE.get(issue["key"])
+        status_changes = (
+            stored["status_changes"]
+            if stored is not None
+            else get_issue_status_changes(issue)
+        )
+        rows.append(ticket_row(issue, status_changes, status_stage_map, now))
+    return TicketTable(rows, truncated=len(rows) >= max_results or upstream_partial())
 
 
-@app.route("/proxy/resolution-metrics", methods=["GET"])
-def get_resolution_metrics():
-    """Calculate average cycle times between key workflow states for all tickets"""
+@app.route("/proxy/tickets", methods=["GET"])
+def get_tickets():
+    """One page of the ticket table for a query, filtered and sorted server-side.
+
+    Pages are requested with the ``next_cursor`` of the previous one; the
+    rows and sort indexes are built once per query and cached.
+    """
     try:
-        # Use backend credentials
-        jira_url = JIRA_CREDENTIALS["jira_url"]
-        email = JIRA_CREDENTIALS["email"]
-        api_token = JIRA_CREDENTIALS["api_token"]
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
 
         if not email or not api_token:
             logger.error("Jira credentials not configured in backend")
             return jsonify({"error": "Jira credentials not configured in backend"}), 500
 
-        # Get query parameters - we'll analyze ALL tickets now, not just done ones
-        jql = request.args.get("jql", "ORDER BY created DESC")
-        max_results = int(
-            request.args.get("maxResults", "200")
-        )  # Increased to get more data
         board = request.args.get("board")
+        jql = build_project_jql(request.args.get("jql", "ORDER BY created DESC"), board)
+        max_results = min(
+            int(request.args.get("maxResults", TICKET_TABLE_MAX_ISSUES)),
+            TICKET_TABLE_MAX_ISSUES,
+        )
 
-        # Get optional filtering parameters
-        exclude_weekends = request.args.get("excludeWeekends", "true").lower() == "true"
-        min_time_threshold = float(
-            request.args.get("minTimeThreshold", "0.167")
-        )  # Default to 10 minutes (0.167 hours)
+        sort = request.args.get("sort", "created")
+        if sort not in TICKET_SORT_COLUMNS:
+            return jsonify({"error": f"Unknown sort column: {sort}"}), 400
+        direction = request.args.get(
+            "direction", "desc" if sort == "created" else "asc"
+        )
+        if direction not in ("asc", "desc"):
+            return jsonify({"error": f"Unknown sort direction: {direction}"}), 400
+        limit = max(
+            1,
+            min(int(request.args.get("limit", TICKET_PAGE_SIZE)), TICKET_MAX_PAGE_SIZE),
+        )
 
-        # If board is specified, add it to the JQL query
-        if board:
-            logger.debug(f"Filtering by board/project: {board}")
-            if "ORDER BY" in jql:
-                order_part = jql.split("ORDER BY")
-                jql = f"project = {board} AND ({order_part[0].strip()}) ORDER BY {order_part[1].strip()}"
+        cursor = None
+        if request.args.get("cursor"):
+            try:
+                cursor = decode_ticket_cursor(request.args["cursor"])
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+        cache_key = make_cache_key("tickets", jql, max_results)
+        table = TICKET_TABLE_CACHE.get(cache_key)
+        if table is None:
+            try:
+                table = build_ticket_table(get_jira_headers(), jql, max_results)
+            except JiraUnavailableError as e:
+                table = TICKET_TABLE_CACHE.get(cache_key, allow_stale=True)
+                if table is None:
+                    raise
+                logger.warning(f"Serving a stale ticket table for {jql}: {str(e)}")
+                current_budget().stale = True
             else:
-                jql = f"project = {board} AND ({jql})"
-
-        logger.debug(f"Using JQL query for metrics: {jql}")
-        logger.debug(
-            f"Configuration: exclude_weekends={exclude_weekends}, min_time_threshold={min_time_threshold}"
-        )
+                # Tables cut short by the deadline are used but not cached
+                if not upstream_partial():
+                    TICKET_TABLE_CACHE.set(
+                        cache_key, table, tags=[project_cache_tag(board)]
+                    )
 
-        # Create auth header
-        auth_header = (
-            f"Basic {base64.b64encode(f'{email}:{api_token}'.encode()).decode()}"
-        )
+        try:
+            rows, next_cursor = table.page(
+                sort, direction == "desc", cursor, limit, ticket_filter(request.args)
+            )
+        except TypeError:
+            # A cursor from a page sorted by another column
+            return jsonify({"error": "Cursor doesn't match the sort column"}), 400
 
-        # Prepare headers for Jira
-        jira_headers = {
-            "Authorization": auth_header,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        return (
+            jsonify(
+                {
+                    "tickets": rows,
+                    "next_cursor": (
+                        encode_ticket_cursor(next_cursor) if next_cursor else None
+                    ),
+                    "sort": sort,
+                    "direction": direction,
+                    "total": len(table.rows),
+                    "truncated": table.truncated,
+                    "thresholds": {
+                        "ping_pong": PING_PONG_THRESHOLD,
+                        "churn": CHURN_THRESHOLD,
+                    },
+                }
+            ),
+            200,
+        )
 
-        # Fetch all issues with changelog to analyze status durations
-        search_url = f"{jira_url}/rest/api/3/search"
-        search_body = {
-            "jql": jql,
-            "maxResults": max_results,
-            "startAt": 0,
-            "fields": ["created", "resolutiondate", "status", "updated", "summary"],
-            "expand": ["changelog"],
-        }
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error building the ticket table: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
+    except Exception as e:
+        logger.error(f"Unexpected error in get_tickets: {str(e)}")
+        import traceback
 
-        logger.debug(f"Resolution metrics search request body: {search_body}")
-        search_response = requests.post(
-            search_url, headers=jira_headers, json=search_body
-        )
+        logger.error(traceback.format_exc())
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
-        if search_response.status_code >= 400:
-            logger.error(
-                f"Error fetching issues for metrics: {search_response.status_code} - {search_response.text}"
-            )
-            return (
-                jsonify(
-                    {"error": f"Failed to fetch issues: {search_response.status_code}"}
-                ),
-                search_response.status_code,
-            )
 
-        issues_data = search_response.json()
-        issues = issues_data.get("issues", [])
+def get_jira_fields(jira_headers, timeout=None, refresh=False):
+    """Return Jira's field definitions, fetched at most once per FIELD_CACHE_SECONDS"""
+    fields = None if refresh else FIELD_CACHE.get("fields")
+    if fields is not None:
+        return fields
 
-        logger.debug(f"Found {len(issues)} issues for analysis")
+    fields_url = f"{jira_credentials()['jira_url']}/rest/api/3/field"
+    logger.debug(f"Fetching field definitions from: {fields_url}")
+    fields_response = current_instance().session.get(
+        fields_url, headers=jira_headers, timeout=timeout
+    )
 
-        # Define workflow stages to track (meaningful states)
-        workflow_stages = {
-            "To Do": ["TO DO", "To Do", "Backlog", "Open", "New", "Product Backlog"],
-            "In Progress": [
-                "IN PROGRESS",
-                "In Progress",
-                "Development",
-                "Implementing",
-                "Dev",
-                "Coding",
-            ],
-            "Code Review": [
-                "IN REVIEW",
-                "In Review",
-                "Code Review",
-                "Review",
-                "Reviewing",
-                "PR Review",
-                "Ready for Review",
-            ],
-            "QA": ["IN QA", "In QA", "QA", "Testing", "Validation", "Test"],
-            "Done": ["DONE", "Done", "Closed", "Resolved", "Completed", "Fixed"],
-        }
+    if fields_response.status_code >= 400:
+        logger.error(
+            f"Error fetching fields: {fields_response.status_code} - {fields_response.text}"
+        )
+        raise JiraAPIError(
+            fields_response.status_code,
+            f"Failed to fetch fields: {fields_response.status_code}",
+        )
 
-        # Helper function to exclude weekends if needed
-        def calculate_working_hours(start_time, end_time):
-            """Calculate working hours between two datetime objects, optionally excluding weekends"""
-            if not exclude_weekends:
-                # Simple calculation if we don't need to exclude weekends
-                return (end_time - start_time).total_seconds() / 3600
-
-            # More efficient calculation to exclude weekends
-            total_seconds = 0
-
-            # Calculate whole days first
-            current_date = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_date = end_time.replace(hour=0, minute=0, second=0, microsecond=0)
-
-            # Add partial day at the beginning
-            if start_time.weekday() < 5:  # Weekday (0-4 is Monday to Friday)
-                # Add hours from start time until end of day
-                seconds_in_first_day = (
-                    current_date + timedelta(days=1) - start_time
-                ).total_seconds()
-                total_seconds += seconds_in_first_day
-
-            # Add whole days in between
-            current_date += timedelta(days=1)
-            while current_date < end_date:
-                if current_date.weekday() < 5:  # Weekday
-                    total_seconds += 24 * 3600  # Add full day in seconds
-                current_date += timedelta(days=1)
-
-            # Add partial day at the end
-            if end_time.weekday() < 5:  # Weekday
-                # Add hours from start of day until end time
-                seconds_in_last_day = (end_time - end_date).total_seconds()
-                total_seconds += seconds_in_last_day
-
-            return total_seconds / 3600
+    fields = decode_json_response(fields_response)
+    FIELD_CACHE.set("fields", fields)
+    logger.debug(f"Cached {len(fields)} field definitions")
+    return fields
 
-        # Track all status names encountered
-        all_status_names = set()
-        status_stage_map = {}  # Maps actual status names to our stages
 
-        # Track time spent in each stage by each issue
-        stage_data = {
-            stage: {
-                "durations": [],  # All periods in this stage
-                "open_durations": [],  # Currently open periods
-                "closed_durations": [],  # Closed periods
-                "tickets": set(),  # Unique tickets that entered this stage
-                "open_tickets": set(),  # Tickets currently in this stage
-                "closed_tickets": set(),  # Tickets that were in this stage but have moved on
-                "total_hours": 0,  # Total hours across all durations
-                "open_hours": 0,  # Hours in currently open periods
-                "closed_hours": 0,  # Hours in closed periods
-            }
-            for stage in workflow_stages.keys()
-        }
+def get_story_point_field(jira_headers, timeout=None, refresh=False):
+    """Resolve the story point field ({"id", "name"}), or None if there isn't one"""
+    if STORY_POINT_FIELD_ID:
+        return {"id": STORY_POINT_FIELD_ID, "name": "Story Points"}
 
-        # Track current status distribution
-        current_status_counts = {stage: 0 for stage in workflow_stages.keys()}
-        current_status_counts["Other"] = 0
+    # Cached as a dict so that "no such field" is remembered as well
+    cached = None if refresh else FIELD_CACHE.get("story_point_field")
+    if cached is not None:
+        return cached.get("field")
 
-        # Track churn metrics
-        churn_metrics = {
-            "total_churn": 0,  # Total number of backward transitions
-            "tickets_with_churn": 0,  # Number of tickets with any backward transitions
-            "churn_details": {  # Counts of different types of backward transitions
-                "in_progress_to_to_do": 0,
-                "in_review_to_in_progress": 0,
-                "in_qa_to_in_review": 0,
-                "in_qa_to_in_progress": 0,
-                "done_to_any": 0,
-            },
-            "tickets_by_score": {  # Tickets grouped by churn score range
-                "1-5": 0,
-                "6-10": 0,
-                "11-20": 0,
-                "21+": 0,
-            },
-            "tickets_with_scores": {},  # Dictionary of ticket keys to their churn scores
-        }
+    story_point_field = None
+    names = [name.lower() for name in STORY_POINT_FIELD_NAMES]
+    for field in get_jira_fields(jira_headers, timeout=timeout, refresh=refresh):
+        if (field.get("name") or "").lower() in names:
+            story_point_field = {"id": field.get("id"), "name": field.get("name")}
+            break
 
-        # Keep track of workflow stage order for churn detection
-        workflow_order = {
-            "To Do": 1,
-            "In Progress": 2,
-            "Code Review": 3,
-            "QA": 4,
-            "Done": 5,
-        }
+    if story_point_field:
+        logger.info(
+            f"Found Story Point field: '{story_point_field['name']}' with ID: {story_point_field['id']}"
+        )
+    else:
+        logger.warning("Could not find a Story Points field using common names")
 
-        # Current timestamp for calculating open durations
-        now = datetime.now(timezone.utc)
+    FIELD_CACHE.set("story_point_field", {"field": story_point_field})
+    return story_point_field
 
-        # Analyze each issue
-        for issue in issues:
-            issue_key = issue.get("key")
-            changelog = issue.get("changelog", {}).get("histories", [])
-            created_date = issue.get("fields", {}).get("created")
-            resolution_date = issue.get("fields", {}).get("resolutiondate")
-            current_status_name = (
-                issue.get("fields", {}).get("status", {}).get("name", "Unknown")
-            )
-            updated_date = issue.get("fields", {}).get("updated")
 
-            # Track all status names
-            all_status_names.add(current_status_name)
+@app.route("/proxy/field", methods=["GET"])
+def get_fields():
+    """Return Jira's field definitions from the field cache"""
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
 
-            # Find current workflow stage
-            current_stage = None
-            for stage, status_list in workflow_stages.items():
-                if current_status_name in status_list or any(
-                    s.lower() in current_status_name.lower() for s in status_list
-                ):
-                    current_stage = stage
-                    status_stage_map[current_status_name] = stage
-                    break
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
 
-            # Update current status counts (only if recognized)
-            if current_stage:
-                current_status_counts[current_stage] += 1
-            else:
-                # Map uncategorized current statuses to 'Other'
-                if current_status_name not in status_stage_map:
-                    status_stage_map[current_status_name] = "Other"
-                current_status_counts["Other"] += 1
-
-            # Process status changes to collect all transitions and calculate churn
-            all_issue_status_changes = []  # Store all status changes chronologically
-            status_transitions_for_churn = (
-                []
-            )  # Store stage transitions for churn calculation
-            issue_churn_count = 0
-
-            for history in changelog:
-                history_date = history.get("created")
-                for item in history.get("items", []):
-                    if item.get("field") == "status":
-                        from_status = item.get("fromString")
-                        to_status = item.get("toString")
-
-                        # Add to chronological list
-                        all_issue_status_changes.append(
-                            {"date": history_date, "from": from_status, "to": to_status}
-                        )
+        return jsonify(get_jira_fields(get_jira_headers())), 200
 
-                        # Track the status names
-                        all_status_names.add(from_status)
-                        all_status_names.add(to_status)
-
-                        # Map statuses to workflow stages for churn detection
-                        from_stage = status_stage_map.get(from_status)
-                        to_stage = status_stage_map.get(to_status)
-
-                        if not from_stage:
-                            for stage, status_list in workflow_stages.items():
-                                if from_status in status_list or any(
-                                    s.lower() in from_status.lower()
-                                    for s in status_list
-                                ):
-                                    from_stage = stage
-                                    status_stage_map[from_status] = stage
-                                    break
-                            if not from_stage:  # Still not found
-                                from_stage = "Other"
-                                status_stage_map[from_status] = "Other"
-
-                        if not to_stage:
-                            for stage, status_list in workflow_stages.items():
-                                if to_status in status_list or any(
-                                    s.lower() in to_status.lower() for s in status_list
-                                ):
-                                    to_stage = stage
-                                    status_stage_map[to_status] = stage
-                                    break
-                            if not to_stage:  # Still not found
-                                to_stage = "Other"
-                                status_stage_map[to_status] = "Other"
-
-                        # Add to churn transition list
-                        status_transitions_for_churn.append(
-                            {
-                                "from_stage": from_stage,
-                                "to_stage": to_stage,
-                                "date": history_date,
-                            }
-                        )
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error fetching fields: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
 
-                        # Detect churn (backward workflow transitions, ignoring 'Other' and same-stage)
-                        if (
-                            from_stage != to_stage
-                            and from_stage != "Other"
-                            and to_stage != "Other"
-                            and workflow_order.get(to_stage, 0)
-                            < workflow_order.get(from_stage, 0)
-                        ):
-                            issue_churn_count += 1
-                            # This is a backward transition (churn)
-                            if from_stage == "In Progress" and to_stage == "To Do":
-                                churn_metrics["churn_details"][
-                                    "in_progress_to_to_do"
-                                ] += 1
-                            elif (
-                                from_stage == "Code Review"
-                                and to_stage == "In Progress"
-                            ):
-                                churn_metrics["churn_details"][
-                                    "in_review_to_in_progress"
-                                ] += 1
-                            elif from_stage == "QA" and to_stage == "Code Review":
-                                churn_metrics["churn_details"][
-                                    "in_qa_to_in_review"
-                                ] += 1
-                            elif from_stage == "QA" and to_stage == "In Progress":
-                                churn_metrics["churn_details"][
-                                    "in_qa_to_in_progress"
-                                ] += 1
-                            elif from_stage == "Done":
-                                churn_metrics["churn_details"]["done_to_any"] += 1
-
-            # Sort all status changes by date
-            all_issue_status_changes.sort(key=lambda x: x["date"])
-
-            # Reconstruct the stage history for calculating durations
-            status_history = []
-
-            # Determine initial status and stage
-            initial_status = None
-            initial_stage = None
-
-            if not all_issue_status_changes:
-                # No status changes recorded, use the current status as the initial one
-                initial_status = current_status_name
-                initial_stage = status_stage_map.get(initial_status, "Other")
-                logger.debug(
-                    f"Issue {issue_key} has no status changes in changelog. Using current status '{initial_status}' ({initial_stage}) as initial."
-                )
-            else:
-                # Use the 'from' status of the first recorded change
-                initial_status = all_issue_status_changes[0].get("from")
-                if initial_status:
-                    initial_stage = status_stage_map.get(initial_status)
-                    if not initial_stage:  # Map if not already mapped
-                        for stage, status_list in workflow_stages.items():
-                            if initial_status in status_list or any(
-                                s.lower() in initial_status.lower() for s in status_list
-                            ):
-                                initial_stage = stage
-                                status_stage_map[initial_status] = stage
-                                break
-                        if not initial_stage:  # Still not found
-                            initial_stage = "Other"
-                            status_stage_map[initial_status] = "Other"
-                    logger.debug(
-                        f"Determined initial status for {issue_key} as '{initial_status}' ({initial_stage}) from first changelog entry."
-                    )
-                else:
-                    # Fallback if first 'from' is None (should be rare)
-                    initial_status = "Unknown Initial"
-                    initial_stage = "Other"
-                    logger.warning(
-                        f"Could not determine initial status for {issue_key} from first changelog entry (from=None). Defaulting to 'Unknown Initial'."
-                    )
 
-            # Add the initial state at creation time
-            if created_date and initial_stage:
-                status_history.append(
-                    {
-                        "stage": initial_stage,
-                        "status": initial_status,
-                        "date": created_date,
-                    }
-                )
-            elif not created_date:
-                logger.warning(
-                    f"Issue {issue_key} missing creation date. Cannot accurately track time."
-                )
-                continue  # Skip issues without creation date
+@app.route("/proxy/story-point-field", methods=["GET"])
+def get_story_point_field_route():
+    """Return the ID and name of the story point field"""
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
 
-            # Add all subsequent states from the sorted changes
-            for change in all_issue_status_changes:
-                to_status = change.get("to")
-                to_stage = status_stage_map.get(to_status)  # Should be mapped already
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
 
-                if (
-                    not to_stage
-                ):  # Should not happen if mapping logic above is correct, but handle defensively
-                    logger.warning(
-                        f"Status '{to_status}' for issue {issue_key} was not mapped to a stage earlier. Mapping to 'Other'."
-                    )
-                    to_stage = "Other"
-                    status_stage_map[to_status] = "Other"
+        story_point_field = get_story_point_field(get_jira_headers())
+        if not story_point_field:
+            return jsonify({"error": "Could not find a Story Points field"}), 404
+        return jsonify(story_point_field), 200
 
-                if to_stage:  # Only add if we have a stage
-                    status_history.append(
-                        {
-                            "stage": to_stage,
-                            "status": to_status,
-                            "date": change.get("date"),
-                        }
-                    )
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error fetching fields: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
 
-            # --- The rest of the loop calculates durations based on status_history ---
-            # Sort status history by date (redundant if built correctly, but safe)
-            # status_history.sort(key=lambda x: x['date']) # Sorting done above
 
-            # Calculate time spent in each stage
-            if len(status_history) > 0:  # Check if we have at least the initial state
-                # Track which stages this issue passed through
-                stages_visited = set()
+def fetch_sprint_points(jira_headers, sprint, points_field_id, timeout=None):
+    """Sum the committed and completed story points of one sprint.
+
+    Committed points are the points of the issues currently in the sprint
+    (Jira's public REST API doesn't expose the scope at sprint start).
+    Completed points are those of done issues resolved before the sprint ended.
+    """
+    end_date = sprint.get("completeDate") or sprint.get("endDate")
+    sprint_end = parse_jira_datetime(end_date) if end_date else None
+
+    totals = {
+        "committed_points": 0,
+        "completed_points": 0,
+        "issues": 0,
+        "completed_issues": 0,
+        "unestimated_issues": 0,
+    }
+    for issue in iter_search_issues(
+        jira_headers,
+        f"sprint = {sprint['id']}",
+        [points_field_id, "status", "resolutiondate"],
+        max_issues=VELOCITY_MAX_ISSUES_PER_SPRINT,
+        timeout=timeout,
+    ):
+        fields = issue.get("fields", {})
+        points = fields.get(points_field_id)
+        if not isinstance(points, (int, float)):
+            totals["unestimated_issues"] += 1
+            points = 0
+
+        totals["issues"] += 1
+        totals["committed_points"] += points
+
+        status_category = (
+            (fields.get("status") or {}).get("statusCategory", {}).get("key")
+        )
+        resolution_date = fields.get("resolutiondate")
+        if status_category == "done" and (
+            sprint_end is None
+            or not resolution_date
+            or parse_jira_datetime(resolution_date) <= sprint_end
+        ):
+            totals["completed_issues"] += 1
+            totals["completed_points"] += points
 
-                for i in range(len(status_history)):
-                    # Current status/stage entry
-                    entry = status_history[i]
-                    stage = entry["stage"]
+    return totals
 
-                    # Skip 'Other' stage for duration calculations
-                    if stage == "Other":
-                        logger.debug(
-                            f"Skipping duration calculation for 'Other' stage period in {issue_key}"
-                        )
-                        continue
 
-                    stages_visited.add(stage)
+@app.route("/proxy/velocity", methods=["GET"])
+def get_velocity():
+    """Committed versus completed story points for a board's most recent sprints"""
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
 
-                    # Start time is this entry's date
-                    start_time_str = entry["date"]
-                    if not start_time_str:  # Skip if date is missing
-                        logger.warning(
-                            f"Missing date for history entry in {issue_key}. Skipping duration calculation for this period."
-                        )
-                        continue
-                    start_time = datetime.fromisoformat(
-                        start_time_str.replace("Z", "+00:00")
-                    )
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
 
-                    # End time is next entry's date or current time
-                    end_time_str = None
-                    is_open = False
-                    if i < len(status_history) - 1:
-                        # Next status entry
-                        next_entry = status_history[i + 1]
-                        end_time_str = next_entry["date"]
-                    else:
-                        # Current time if this is the latest status
-                        end_time = now
-                        is_open = True
-
-                    # Parse end time string if it's not the current time
-                    if end_time_str:
-                        if not end_time_str:  # Skip if date is missing
-                            logger.warning(
-                                f"Missing date for next history entry in {issue_key}. Skipping duration calculation."
-                            )
-                            continue
-                        end_time = datetime.fromisoformat(
-                            end_time_str.replace("Z", "+00:00")
-                        )
+        board = request.args.get("board")
+        if not board:
+            return jsonify({"error": "Board parameter is required"}), 400
 
-                    # Ensure start_time and end_time are valid
-                    if not start_time or not end_time:
-                        logger.warning(
-                            f"Invalid start or end time for period in {issue_key}. Skipping calculation."
-                        )
-                        continue
+        sprint_count = int(request.args.get("sprints", 6))
+        include_active = request.args.get("includeActive", "false").lower() == "true"
 
-                    # Ensure end_time is after start_time
-                    if end_time < start_time:
-                        logger.warning(
-                            f"End time {end_time} is before start time {start_time} for stage '{stage}' in {issue_key}. Skipping duration calculation for this invalid period."
-                        )
-                        continue  # Skip this invalid period
-
-                    # Calculate duration in hours, potentially excluding weekends
-                    duration_hours = calculate_working_hours(start_time, end_time)
-
-                    # Only record if duration is positive and meets minimum threshold
-                    if duration_hours >= min_time_threshold:
-                        # This issue was in this stage
-                        stage_data[stage]["tickets"].add(issue_key)
-
-                        duration_entry = {
-                            "issue_key": issue_key,
-                            "duration_hours": duration_hours,
-                            "start_time": start_time.isoformat(),
-                            "end_time": end_time.isoformat(),
-                            "is_open": is_open,
-                        }
+        cache_key = make_cache_key("velocity", board, sprint_count, include_active)
+        cached = VELOCITY_CACHE.get(cache_key)
+        if cached is not None:
+            return jsonify(cached), 200
 
-                        # Track open vs closed periods
-                        if is_open:
-                            stage_data[stage]["open_tickets"].add(issue_key)
-                            stage_data[stage]["open_durations"].append(duration_entry)
-                            stage_data[stage]["open_hours"] += duration_hours
-                        else:
-                            stage_data[stage]["closed_tickets"].add(issue_key)
-                            stage_data[stage]["closed_durations"].append(duration_entry)
-                            stage_data[stage]["closed_hours"] += duration_hours
-
-                        # Add to all durations
-                        stage_data[stage]["durations"].append(duration_entry)
-                        stage_data[stage]["total_hours"] += duration_hours
-
-                # Update churn count based on the calculated issue_churn_count
-                if issue_churn_count > 0:
-                    churn_metrics["tickets_with_churn"] += 1
-                    churn_metrics["total_churn"] += issue_churn_count
-
-                    # Track churn score
-                    churn_metrics["tickets_with_scores"][issue_key] = {
-                        "score": issue_churn_count,
-                        "transitions": status_transitions_for_churn,  # Ensure this list is included
+        jira_headers = get_jira_headers()
+        story_point_field = get_story_point_field(jira_headers)
+        if not story_point_field:
+            return (
+                jsonify(
+                    {
+                        "error": "Could not find a Story Points field. Set STORY_POINT_FIELD_ID to configure it."
                     }
+                ),
+                404,
+            )
 
-                    # Count ticket in the appropriate score range bucket
-                    if issue_churn_count <= 5:
-                        churn_metrics["tickets_by_score"]["1-5"] += 1
-                    elif issue_churn_count <= 10:
-                        churn_metrics["tickets_by_score"]["6-10"] += 1
-                    elif issue_churn_count <= 20:
-                        churn_metrics["tickets_by_score"]["11-20"] += 1
-                    else:
-                        churn_metrics["tickets_by_score"]["21+"] += 1
-            else:  # No valid status history could be built
-                logger.warning(
-                    f"Could not build valid status history for {issue_key}. Skipping duration calculations."
-                )
+        # Sprints come back newest first
+        states = ("closed", "active") if include_active else ("closed",)
+        sprints = [
+            sprint
+            for sprint in fetch_project_sprints(jira_headers, board)["sprints"]
+            if sprint.get("state") in states
+        ][:sprint_count]
 
-        # Build a mapping of statuses found but not categorized (excluding 'Other')
-        uncategorized_statuses = [
-            status
-            for status, stage in status_stage_map.items()
-            if stage == "Other" and status != "Unknown Initial"
-        ]
+        logger.debug(
+            f"Fetching story points for {len(sprints)} sprints of {board} using field {story_point_field['id']}"
+        )
 
-        # Log all workflow steps found
-        logger.info(f"All status names found: {sorted(list(all_status_names))}")
-        logger.info(f"Final Status stage mapping: {status_stage_map}")
-        logger.info(
-            f"Uncategorized statuses mapped to 'Other': {uncategorized_statuses}"
-        )
-
-        # Calculate metrics for each stage (excluding 'Other')
-        stage_metrics = {}
-        for stage, data in stage_data.items():
-            if stage == "Other":
-                continue  # Skip 'Other' stage in final metrics
-
-            # Calculate metrics
-            metrics = {
-                # Tickets
-                "tickets_count": len(data["tickets"]),
-                "open_tickets_count": len(data["open_tickets"]),
-                "closed_tickets_count": len(data["closed_tickets"]),
-                # Hours
-                "total_hours": round(data["total_hours"], 2),
-                "open_hours": round(data["open_hours"], 2),
-                "closed_hours": round(data["closed_hours"], 2),
-                # Averages
-                "avg_per_ticket": (
-                    round(data["total_hours"] / len(data["tickets"]), 2)
-                    if data["tickets"]
-                    else 0
-                ),
-                "avg_per_closed_ticket": (
-                    round(data["closed_hours"] / len(data["closed_tickets"]), 2)
-                    if data["closed_tickets"]
-                    else 0
-                ),
-                "avg_per_open_ticket": (
-                    round(data["open_hours"] / len(data["open_tickets"]), 2)
-                    if data["open_tickets"]
-                    else 0
-                ),
-                # Occurrences
-                "count": len(data["durations"]),
-                "average_hours": (
-                    round(data["total_hours"] / len(data["durations"]), 2)
-                    if data["durations"]
-                    else 0
-                ),
-                # Include complete data counts
-                "durations_count": len(data["durations"]),
-                "open_durations_count": len(data["open_durations"]),
-                "closed_durations_count": len(data["closed_durations"]),
-            }
+        velocity = []
+        budget = current_budget()
+        if sprints:
+            with ThreadPoolExecutor(
+                max_workers=min(VELOCITY_MAX_WORKERS, len(sprints))
+            ) as executor:
+                sprint_totals = executor.map(
+                    lambda sprint: run_with_budget(
+                        budget,
+                        fetch_sprint_points,
+                        jira_headers,
+                        sprint,
+                        story_point_field["id"],
+                    ),
+                    sprints,
+                )
+                for sprint, totals in zip(sprints, sprint_totals):
+                    velocity.append({**sprint, **totals})
 
-            stage_metrics[stage] = metrics
+        # Oldest first, the way velocity charts are read
+        velocity.reverse()
 
-        # Build the complete metrics object
-        metrics = {
-            "total_issues": len(issues),
-            "current_status": current_status_counts,
-            "stage_metrics": stage_metrics,
-            "calculation_params": {
-                "exclude_weekends": exclude_weekends,
-                "min_time_threshold": min_time_threshold,
-            },
-            "workflow_info": {
-                "all_statuses": sorted(list(all_status_names)),
-                "uncategorized_statuses": uncategorized_statuses,
-                "status_mapping": status_stage_map,
-            },
-            "churn_metrics": churn_metrics,
+        closed = [sprint for sprint in velocity if sprint["state"] == "closed"]
+        result = {
+            "board": board,
+            "story_point_field": story_point_field,
+            "sprints": velocity,
+            "average_committed": (
+                round(sum(s["committed_points"] for s in closed) / len(closed), 2)
+                if closed
+                else 0
+            ),
+            "average_completed": (
+                round(sum(s["completed_points"] for s in closed) / len(closed), 2)
+                if closed
+                else 0
+            ),
         }
+        if not upstream_partial():
+            VELOCITY_CACHE.set(cache_key, result, tags=[board])
+        return jsonify(result), 200
 
-        logger.debug(f"Calculated cycle time metrics: {metrics}")
-        logger.info(f"Stage metrics data structure: {stage_metrics}")
-        # Log a sample of the data to check structure
-        if stage_metrics:
-            sample_stage = next(iter(stage_metrics))
-            logger.info(
-                f"Sample stage '{sample_stage}' data: {stage_metrics[sample_stage]}"
-            )
-
-        return jsonify(metrics), 200
-
+    except JiraUnavailableError as e:
+        return serve_stale_or_error(VELOCITY_CACHE, cache_key, e)
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
     except requests.exceptions.RequestException as e:
-        logger.error(f"Request error fetching issues: {str(e)}")
+        logger.error(f"Request error calculating velocity: {str(e)}")
         return jsonify({"error": f"Request failed: {str(e)}"}), 500
     except Exception as e:
-        logger.error(f"Unexpected error in get_resolution_metrics: {str(e)}")
+        logger.error(f"Unexpected error in get_velocity: {str(e)}")
         import traceback
 
         logger.error(traceback.format_exc())
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
 
-@app.route("/proxy/boards", methods=["GET"])
-def get_boards():
-    """Get all available boards/projects from Jira"""
+# Columns of each exportable table, with their types
+EXPORT_TABLES = {
+    "issues": [
+        ("key", "string"),
+        ("summary", "string"),
+        ("status", "string"),
+        ("stage", "string"),
+        ("priority", "string"),
+        ("assignee", "string"),
+        ("created", "timestamp"),
+        ("updated", "timestamp"),
+        ("resolutiondate", "timestamp"),
+    ],
+    "transitions": [
+        ("issue_key", "string"),
+        ("date", "timestamp"),
+        ("from_status", "string"),
+        ("to_status", "string"),
+        ("from_stage", "string"),
+        ("to_stage", "string"),
+        ("author", "string"),
+    ],
+    "stage_periods": [
+        ("issue_key", "string"),
+        ("status", "string"),
+        ("stage", "string"),
+        ("start", "timestamp"),
+        ("end", "timestamp"),
+        ("duration_hours", "float"),
+        ("is_open", "bool"),
+    ],
+}
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# Fields fetched for exports
+EXPORT_FIELDS = METRICS_FIELDS + ["priority", "assignee"]
+
+
+def iter_issue_stage_periods(issue, status_stage_map, exclude_weekends, now):
+    """Yield the periods an issue spent in each status, from creation until now"""
+    fields = issue.get("fields", {})
+    created_date = fields.get("created")
+    if not created_date:
+        return
+
+    status_changes = get_issue_status_changes(issue)
+    if status_changes and status_changes[0].get("from"):
+        status = status_changes[0]["from"]
+    else:
+        status = fields.get("status", {}).get("name", "Unknown")
+
+    start = parse_jira_datetime(created_date)
+    for change in status_changes + [None]:
+        if change is None:
+            end, is_open = now, True
+        elif change["date"]:
+            end, is_open = parse_jira_datetime(change["date"]), False
+        else:
+            continue
+
+        if end >= start:
+            yield {
+                "issue_key": issue.get("key"),
+                "status": status,
+                "stage": map_status_to_stage(status, status_stage_map),
+                "start": start,
+                "end": end,
+                "duration_hours": calculate_working_hours(start, end, exclude_weekends),
+                "is_open": is_open,
+            }
+
+        if change is not None:
+            start, status = end, change["to"]
+
+
+def iter_export_rows(table, issues, status_stage_map, exclude_weekends, now):
+    """Yield the rows of one export table for an iterable of issues"""
+    for issue in issues:
+        fields = issue.get("fields", {})
+        if table == "issues":
+            status = (fields.get("status") or {}).get("name")
+            yield {
+                "key": issue.get("key"),
+                "summary": fields.get("summary"),
+                "status": status,
+                "stage": (
+                    map_status_to_stage(status, status_stage_map) if status else None
+                ),
+                "priority": (fields.get("priority") or {}).get("name"),
+                "assignee": (fields.get("assignee") or {}).get("displayName"),
+                "created": fields.get("created"),
+                "updated": fields.get("updated"),
+                "resolutiondate": fields.get("resolutiondate"),
+            }
+        elif table == "transitions":
+            for change in get_issue_status_changes(issue):
+                yield {
+                    "issue_key": issue.get("key"),
+                    "date": change["date"],
+                    "from_status": change["from"],
+                    "to_status": change["to"],
+                    "from_stage": (
+                        map_status_to_stage(change["from"], status_stage_map)
+                        if change["from"]
+                        else None
+                    ),
+                    "to_stage": (
+                        map_status_to_stage(change["to"], status_stage_map)
+                        if change["to"]
+                        else None
+                    ),
+                    "author": change["author"],
+                }
+        else:
+            yield from iter_issue_stage_periods(
+                issue, status_stage_map, exclude_weekends, now
+            )
+
+
+class ExportSink:
+    """Write-only file object that hands written bytes back in chunks"""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_export_chunks(table, export_format, issues, exclude_weekends=True):
+    """Encode an export table as CSV, Arrow IPC stream or Parquet, one batch at a time.
+
+    ``issues`` is an iterable of issues (normally a streamed Jira search).
+    Rows are written every EXPORT_BATCH_ROWS rows, as one Parquet row group or
+    Arrow record batch, so memory use doesn't grow with the size of the export.
+    """
+    columns = EXPORT_TABLES[table]
+    names = [name for name, _ in columns]
+    status_stage_map = {}
+    now = datetime.now(timezone.utc)
+
+    def iter_row_batches():
+        batch = []
+        for row in iter_export_rows(
+            table, issues, status_stage_map, exclude_weekends, now
+        ):
+            batch.append(row)
+            if len(batch) >= EXPORT_BATCH_ROWS:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+        for batch in iter_row_batches():
+            for row in batch:
+                writer.writerow(
+                    [
+                        (
+                            row[name].isoformat()
+                            if isinstance(row[name], datetime)
+                            else row[name]
+                        )
+                        for name in names
+                    ]
+                )
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue().encode()
+        return
+
+    # Optional dependency, only needed for the columnar formats
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    arrow_types = {
+        "string": pyarrow.string(),
+        "timestamp": pyarrow.timestamp("us", tz="UTC"),
+        "float": pyarrow.float64(),
+        "bool": pyarrow.bool_(),
+    }
+    schema = pyarrow.schema([(name, arrow_types[kind]) for name, kind in columns])
+    timestamp_columns = [name for name, kind in columns if kind == "timestamp"]
+
+    sink = ExportSink()
+    if export_format == "arrow":
+        writer = pyarrow.ipc.new_stream(sink, schema)
+    else:
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+
     try:
-        # Use backend credentials
-        jira_url = JIRA_CREDENTIALS["jira_url"]
-        email = JIRA_CREDENTIALS["email"]
-        api_token = JIRA_CREDENTIALS["api_token"]
+        for batch in iter_row_batches():
+            for row in batch:
+                for name in timestamp_columns:
+                    if isinstance(row[name], str):
+                        row[name] = parse_jira_datetime(row[name])
+            record_batch = pyarrow.RecordBatch.from_pylist(batch, schema=schema)
+            if export_format == "arrow":
+                writer.write_batch(record_batch)
+            else:
+                writer.write_table(pyarrow.Table.from_batches([record_batch]))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
 
-        logger.debug(f"Fetching boards using URL: {jira_url}")
+
+def check_export_format(export_format):
+    """Return an error message if an export format can't be produced, else None"""
+    if export_format not in EXPORT_FORMATS:
+        return f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+    if export_format != "csv" and importlib.util.find_spec("pyarrow") is None:
+        return f"The {export_format} format requires pyarrow (pip install pyarrow)"
+    return None
+
+
+@app.route("/proxy/export", methods=["GET"])
+def export_issues():
+    """Stream issues, status transitions or stage periods as CSV, Arrow IPC or Parquet"""
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
 
         if not email or not api_token:
             logger.error("Jira credentials not configured in backend")
             return jsonify({"error": "Jira credentials not configured in backend"}), 500
 
-        # Create auth header
-        auth_header = (
-            f"Basic {base64.b64encode(f'{email}:{api_token}'.encode()).decode()}"
+        board = request.args.get("board")
+        jql = build_project_jql(request.args.get("jql", "ORDER BY created DESC"), board)
+        table = request.args.get("table", "issues")
+        export_format = request.args.get("format", "csv")
+        max_results = request.args.get("maxResults")
+        exclude_weekends = request.args.get("excludeWeekends", "true").lower() == "true"
+
+        if table not in EXPORT_TABLES:
+            return (
+                jsonify({"error": f"table must be one of: {', '.join(EXPORT_TABLES)}"}),
+                400,
+            )
+        format_error = check_export_format(export_format)
+        if format_error:
+            return jsonify({"error": format_error}), 400
+
+        issues = iter_sharded_search_issues(
+            get_jira_headers(),
+            jql,
+            EXPORT_FIELDS,
+            expand=["changelog"] if table != "issues" else None,
+            max_issues=int(max_results) if max_results else None,
+        )
+        # Read the first issue up front so Jira errors still get a proper
+        # error response instead of a truncated download
+        first_issue = next(issues, None)
+        if first_issue is not None:
+            issues = chain([first_issue], issues)
+
+        mimetype, extension = EXPORT_FORMATS[export_format]
+        logger.info(f"Exporting {table} as {export_format} for JQL: {jql}")
+        return Response(
+            iter_with_budget(
+                current_budget(),
+                iter_export_chunks(table, export_format, issues, exclude_weekends),
+            ),
+            mimetype=mimetype,
+            headers={
+                "Content-Disposition": f'attachment; filename="{board or "jira"}-{table}.{extension}"'
+            },
         )
 
-        # Prepare headers for Jira
-        jira_headers = {
-            "Authorization": auth_header,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-        logger.debug(f"Using headers: {jira_headers}")
+    except JiraAPIError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error exporting issues: {str(e)}")
+        return jsonify({"error": f"Request failed: {str(e)}"}), 500
 
-        # Fetch all boards with pagination
-        all_boards = []
-        start_at = 0
-        max_results = 50
-        total = None
 
-        while total is None or start_at < total:
-            # Fetch a page of boards
-            boards_url = f"{jira_url}/rest/agile/1.0/board?maxResults={max_results}&startAt={start_at}"
-            logger.debug(f"Fetching boards page from: {boards_url}")
+def fetch_board_catalog(jira_headers, timeout=None, refresh=False):
+    """Return every board as {"id", "name", "type", "location"}, sorted by name.
 
-            boards_response = requests.get(boards_url, headers=jira_headers)
+    Cached for BOARD_CACHE_SECONDS (``refresh`` fetches it regardless);
+    raises JiraAPIError if Jira refuses a page.
+    """
+    cached = None if refresh else BOARD_CACHE.get("boards")
+    if cached is not None:
+        return cached["boards"]
 
-            if boards_response.status_code >= 400:
-                logger.error(
-                    f"Error fetching boards: {boards_response.status_code} - {boards_response.text}"
-                )
-                return (
-                    jsonify(
-                        {
-                            "error": f"Failed to fetch boards: {boards_response.status_code}"
-                        }
-                    ),
-                    boards_response.status_code,
-                )
+    jira_url = jira_credentials()["jira_url"]
+    logger.debug(f"Fetching boards using URL: {jira_url}")
 
-            boards_data = boards_response.json()
+    # Fetch all boards with pagination
+    all_boards = []
+    start_at = 0
+    max_results = 50
+    total = None
 
-            # Update pagination info
-            if total is None:
-                total = boards_data.get("total", 0)
-                logger.debug(f"Total boards available: {total}")
+    while total is None or start_at < total:
+        # Fetch a page of boards
+        boards_url = f"{jira_url}/rest/agile/1.0/board?maxResults={max_results}&startAt={start_at}"
+        logger.debug(f"Fetching boards page from: {boards_url}")
 
-            # Add boards from this page
-            page_boards = boards_data.get("values", [])
-            all_boards.extend(page_boards)
-            logger.debug(
-                f"Fetched {len(page_boards)} boards (total so far: {len(all_boards)})"
+        boards_response = current_instance().session.get(
+            boards_url, headers=jira_headers, timeout=timeout
+        )
+
+        if boards_response.status_code >= 400:
+            logger.error(
+                f"Error fetching boards: {boards_response.status_code} - {boards_response.text}"
+            )
+            raise JiraAPIError(
+                boards_response.status_code,
+                f"Failed to fetch boards: {boards_response.status_code}",
             )
 
-            # Move to next page
-            start_at += max_results
+        boards_data = decode_json_response(boards_response)
 
-            # Break if no more boards or we've fetched all
-            if not page_boards or len(all_boards) >= total:
-                break
+        # Update pagination info
+        if total is None:
+            total = boards_data.get("total", 0)
+            logger.debug(f"Total boards available: {total}")
 
-        logger.debug(f"Found {len(all_boards)} boards total")
+        # Add boards from this page
+        page_boards = boards_data.get("values", [])
+        all_boards.extend(page_boards)
+        logger.debug(
+            f"Fetched {len(page_boards)} boards (total so far: {len(all_boards)})"
+        )
 
-        # Extract and format board information
-        formatted_boards = []
+        # Move to next page
+        start_at += max_results
 
-        for board in all_boards:
-            board_info = {
-                "id": board.get("id"),
-                "name": board.get("name"),
-                "type": board.get("type"),
-                "location": {},
-            }
+        # Break if no more boards or we've fetched all
+        if not page_boards or len(all_boards) >= total:
+            break
+
+    logger.debug(f"Found {len(all_boards)} boards total")
 
-            # Add project key if available
-            location = board.get("location", {})
-            if location:
-                project_key = location.get("projectKey")
-                project_name = location.get("name")
+    # Extract and format board information
+    formatted_boards = []
+
+    for board in all_boards:
+        board_info = {
+            "id": board.get("id"),
+            "name": board.get("name"),
+            "type": board.get("type"),
+            "location": {},
+        }
+
+        # Add project key if available
+        location = board.get("location", {})
+        if location:
+            project_key = location.get("projectKey")
+            project_name = location.get("name")
+
+            if project_key:
+                board_info["location"]["projectKey"] = project_key
+
+            if project_name:
+                board_info["location"]["name"] = project_name
+
+        formatted_boards.append(board_info)
+
+    # Sort boards by name (case-insensitive)
+    formatted_boards.sort(key=lambda x: x["name"].lower())
+
+    # Cached in the shape /proxy/boards returns, so it can be served stale
+    BOARD_CACHE.set("boards", {"boards": formatted_boards})
+    return formatted_boards
 
-                if project_key:
-                    board_info["location"]["projectKey"] = project_key
 
-                if project_name:
-                    board_info["location"]["name"] = project_name
+@app.route("/proxy/boards", methods=["GET"])
+def get_boards():
+    """Get all available boards/projects from Jira"""
+    try:
+        email = jira_credentials()["email"]
+        api_token = jira_credentials()["api_token"]
 
-            formatted_boards.append(board_info)
+        if not email or not api_token:
+            logger.error("Jira credentials not configured in backend")
+            return jsonify({"error": "Jira credentials not configured in backend"}), 500
 
-        # Sort boards by name (case-insensitive)
-        formatted_boards.sort(key=lambda x: x["name"].lower())
+        formatted_boards = fetch_board_catalog(get_jira_headers())
         logger.debug(f"Returning {len(formatted_boards)} formatted boards")
 
         result = {"boards": formatted_boards}
         return jsonify(result), 200
 
+    except JiraAPIError as e:
+        return serve_stale_or_error(BOARD_CACHE, "boards", e)
     except requests.exceptions.RequestException as e:
         logger.error(f"Request error fetching boards: {str(e)}")
         return jsonify({"error": f"Request failed: {str(e)}"}), 500
@@ -1433,6 +6949,226 @@ def get_boards():
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
 
+# Jira-backed parts of /bootstrap, fetched concurrently
+BOOTSTRAP_PARTS = {
+    "boards": fetch_board_catalog,
+    "story_point_field": get_story_point_field,
+    "health": check_jira_health,
+}
+
+
+@app.route("/bootstrap", methods=["GET"])
+def get_bootstrap():
+    """Everything the dashboard loads at startup, in one (gzipped) response.
+
+    Config and aging thresholds are local. The board list and story point
+    field come from their caches when warm and connection health is checked
+    live, all at the same time. A part that fails is left null with its
+    error under "errors", so page startup doesn't depend on the slowest call.
+    """
+    credentials = jira_credentials()
+    result = {
+        "config": {"jira_url": credentials["jira_url"]},
+        "aging_thresholds": AGING_THRESHOLDS,
+        "boards": None,
+        "story_point_field": None,
+        "health": None,
+        "errors": {},
+    }
+
+    if not credentials["email"] or not credentials["api_token"]:
+        logger.error("Jira credentials not configured in backend")
+        for name in BOOTSTRAP_PARTS:
+            result["errors"][name] = "Jira credentials not configured in backend"
+        return bootstrap_response(result)
+
+    jira_headers = get_jira_headers()
+    budget = current_budget()
+    executor = ThreadPoolExecutor(max_workers=len(BOOTSTRAP_PARTS))
+    futures = {
+        executor.submit(run_with_budget, budget, fetch, jira_headers): name
+        for name, fetch in BOOTSTRAP_PARTS.items()
+    }
+    timeout = None if budget.deadline is None else max(budget.remaining(), 0)
+    done, not_done = wait(futures, timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        name = futures[future]
+        try:
+            result[name] = future.result()
+        except JiraAPIError as e:
+            result["errors"][name] = str(e)
+        except (requests.exceptions.Timeout, TimeoutError):
+            result["errors"][name] = "Deadline exceeded"
+        except requests.exceptions.RequestException as e:
+            result["errors"][name] = f"Request failed: {str(e)}"
+        except Exception as e:
+            logger.error(f"Unexpected error bootstrapping {name}: {str(e)}")
+            import traceback
+
+            logger.error(traceback.format_exc())
+            result["errors"][name] = f"Unexpected error: {str(e)}"
+    for future in not_done:
+        result["errors"][futures[future]] = "Deadline exceeded"
+        budget.partial = True
+
+    if result["boards"] is None:
+        stale = BOARD_CACHE.get("boards", allow_stale=True)
+        if stale is not None:
+            logger.warning("Bootstrapping with a stale board list")
+            result["boards"] = stale["boards"]
+            budget.stale = True
+
+    return bootstrap_response(result)
+
+
+def bootstrap_response(result):
+    """jsonify the bootstrap result, gzipped if the client accepts it and it's worth it"""
+    response = jsonify(result)
+    response.headers["Vary"] = "Accept-Encoding"
+    if (
+        request.accept_encodings["gzip"]
+        and response.content_length >= BOOTSTRAP_GZIP_MIN_BYTES
+    ):
+        with server_timing("serialize"):
+            response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def invalidate_project_caches(project, include_history=False):
+    """Drop cached results that may include issues of a project.
+
+    Finished trend buckets only change when history is rewritten (an issue
+    is deleted), so they are kept unless ``include_history`` is set.
+    """
+    caches = [METRICS_CACHE, CFD_CACHE, VELOCITY_CACHE, TICKET_TABLE_CACHE]
+    if include_history:
+        caches.append(TREND_BUCKET_CACHE)
+    tags = [project_cache_tag(project), project_cache_tag(None)]
+    return sum(cache.invalidate_tags(tags) for cache in caches)
+
+
+def verify_webhook_signature(body, signature_header, token_param):
+    """Check a webhook against JIRA_WEBHOOK_SECRET or JIRA_WEBHOOK_TOKEN.
+
+    Accepts either an HMAC-SHA256 ``X-Hub-Signature`` header keyed with
+    JIRA_WEBHOOK_SECRET (as sent by Jira webhooks registered with a secret) or
+    a ``token`` query parameter equal to JIRA_WEBHOOK_TOKEN. Nothing is
+    accepted by a mode that isn't configured.
+    """
+    if token_param:
+        return bool(JIRA_WEBHOOK_TOKEN) and hmac.compare_digest(
+            token_param, JIRA_WEBHOOK_TOKEN
+        )
+    if (
+        JIRA_WEBHOOK_SECRET
+        and signature_header
+        and signature_header.startswith("sha256=")
+    ):
+        expected = hmac.new(
+            JIRA_WEBHOOK_SECRET.encode(), body, hashlib.sha256
+        ).hexdigest()
+        return hmac.compare_digest(signature_header[len("sha256=") :], expected)
+    return False
+
+
+def webhook_changelog_history(payload):
+    """Turn an issue_updated webhook's changelog into a changelog history entry"""
+    changelog = payload.get("changelog") or {}
+    if not changelog.get("items"):
+        return None
+
+    timestamp = payload.get("timestamp")
+    changed_at = (
+        datetime.fromtimestamp(timestamp / 1000, timezone.utc)
+        if timestamp
+        else datetime.now(timezone.utc)
+    )
+    return {
+        "id": changelog.get("id"),
+        # Same format as the timestamps in Jira's own changelogs
+        "created": changed_at.strftime("%Y-%m-%dT%H:%M:%S.")
+        + f"{changed_at.microsecond // 1000:03d}+0000",
+        "author": payload.get("user") or {},
+        "items": changelog.get("items", []),
+    }
+
+
+@app.route("/webhooks/jira", methods=["POST"])
+def jira_webhook():
+    """Apply Jira issue created/updated/deleted webhooks to the issue store.
+
+    Only enabled when JIRA_WEBHOOK_SECRET or JIRA_WEBHOOK_TOKEN is set, since
+    webhooks rewrite the issue store. Recorded payloads can be replayed
+    locally with e.g.
+    curl -X POST -H 'Content-Type: application/json' -d @payload.json 'localhost:5000/webhooks/jira?token=...'
+    """
+    if not JIRA_WEBHOOK_SECRET and not JIRA_WEBHOOK_TOKEN:
+        return (
+            jsonify(
+                {
+                    "error": "Webhooks are disabled; set JIRA_WEBHOOK_SECRET or JIRA_WEBHOOK_TOKEN to enable them"
+                }
+            ),
+            404,
+        )
+    if not verify_webhook_signature(
+        request.get_data(),
+        request.headers.get("X-Hub-Signature"),
+        request.args.get("token"),
+    ):
+        logger.warning("Rejected Jira webhook with a missing or invalid signature")
+        return jsonify({"error": "Invalid webhook signature"}), 401
+
+    payload = request.get_json(silent=True)
+    if not payload:
+        return jsonify({"error": "Expected a JSON webhook payload"}), 400
+
+    event = payload.get("webhookEvent", "")
+    issue = payload.get("issue") or {}
+    issue_key = issue.get("key")
+    if not issue_key:
+        return jsonify({"error": "Webhook payload has no issue key"}), 400
+
+    if event == "jira:issue_created":
+        # A new issue has no history yet, so the payload is the whole issue
+        ISSUE_STORE.upsert(
+            {**issue, "changelog": issue.get("changelog") or {"histories": []}}
+        )
+        applied = True
+    elif event == "jira:issue_updated":
+        applied = ISSUE_STORE.apply_change(issue, webhook_changelog_history(payload))
+    elif event == "jira:issue_deleted":
+        applied = ISSUE_STORE.delete(issue_key)
+    else:
+        logger.debug(f"Ignoring Jira webhook event {event} for {issue_key}")
+        return jsonify({"event": event, "issue": issue_key, "ignored": True}), 202
+
+    project = (issue.get("fields", {}).get("project") or {}).get(
+        "key"
+    ) or issue_project_key(issue_key)
+    invalidated = invalidate_project_caches(
+        project, include_history=event == "jira:issue_deleted"
+    )
+
+    logger.info(
+        f"Applied Jira webhook {event} for {issue_key}: stored={applied}, invalidated {invalidated} cached results"
+    )
+    return (
+        jsonify(
+            {
+                "event": event,
+                "issue": issue_key,
+                "applied": applied,
+                "invalidated": invalidated,
+            }
+        ),
+        200,
+    )
+
+
 @app.errorhandler(Exception)
 def handle_error(error):
     """Global error handler to provide more detailed error information"""
@@ -1456,4 +7192,9 @@ if __name__ == "__main__":
         days = round(hours / 24, 1)
         logger.info(f"  - {status}: {hours} hours ({days} days)")
 
+    # With the reloader, only the process actually serving requests keeps a
+    # snapshot
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_snapshots()
+
     app.run(host="0.0.0.0", port=5000, debug=True)
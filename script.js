@@ -8,6 +8,7 @@ class JiraMetrics {
         this.storyPointFieldId = null; // Add this property
         this.sprints = [];
         this.issues = [];
+        this.ticketRows = []; // Server-sorted ticket table rows (display only)
         this.issueData = {}; // Store supplementary issue data like status durations
         this.resolutionMetrics = null; // Store resolution time by phase metrics
         this.sortConfig = {
@@ -89,6 +90,11 @@ class JiraMetrics {
             });
         });
         
+        // Next page of the server-sorted ticket table
+        document.getElementById('loadMoreTicketsBtn').addEventListener('click', () => {
+            this.fetchTicketPage(this.ticketCursor);
+        });
+        
         // Modal close button
         document.getElementById('closeModalBtn').addEventListener('click', () => {
             // document.getElementById('statusModal').style.display = 'none'; // Old method
@@ -121,28 +127,31 @@ class JiraMetrics {
             // Load the Jira URL from backend config
             const response = await fetch(`${this.proxyUrl}/config`);
             if (response.ok) {
-                const config = await response.json();
-                this.jiraUrl = config.jira_url;
-                console.log('Using Jira URL from backend:', this.jiraUrl);
-                
-                // Update UI to show we're using backend credentials
-                document.getElementById('jiraUrl').value = this.jiraUrl;
-                document.getElementById('email').value = '*** Using backend credentials ***';
-                document.getElementById('apiToken').value = '************';
-                
-                // Read-only inputs
-                document.getElementById('jiraUrl').readOnly = true;
-                document.getElementById('email').readOnly = true;
-                document.getElementById('apiToken').readOnly = true;
-                
-                // Show a message to select a board
-                this.showBoardSelectionMessage();
+                this.applyConfig(await response.json());
             }
         } catch (error) {
             console.error('Error loading config:', error);
             this.showError('Failed to load configuration from backend');
         }
     }
+
+    applyConfig(config) {
+        this.jiraUrl = config.jira_url;
+        console.log('Using Jira URL from backend:', this.jiraUrl);
+        
+        // Update UI to show we're using backend credentials
+        document.getElementById('jiraUrl').value = this.jiraUrl;
+        document.getElementById('email').value = '*** Using backend credentials ***';
+        document.getElementById('apiToken').value = '************';
+        
+        // Read-only inputs
+        document.getElementById('jiraUrl').readOnly = true;
+        document.getElementById('email').readOnly = true;
+        document.getElementById('apiToken').readOnly = true;
+        
+        // Show a message to select a board
+        this.showBoardSelectionMessage();
+    }
     
     showBoardSelectionMessage() {
         const tbody = document.getElementById('ticketTableBody');
@@ -373,6 +382,7 @@ class JiraMetrics {
                 : 'ORDER BY created DESC';
                 
             console.log('Using JQL:', jql);
+            this.currentJql = jql;
             
             // Specific fields to request from the API
             const fields = [
@@ -400,6 +410,9 @@ class JiraMetrics {
 
             const data = await response.json();
             this.issues = data.issues || [];
+            this.ticketRows = [];
+            this.ticketCursor = null;
+            document.getElementById('loadMoreTicketsBtn').classList.add('hidden');
             
             console.log(`Received ${this.issues.length} issues from Jira API. Here's a sample:`, 
                 this.issues.length > 0 ? {key: this.issues[0].key, fields: this.issues[0].fields} : 'No issues found');
@@ -1328,43 +1341,11 @@ class JiraMetrics {
     }
 
     async analyzeAtRiskTickets(issues) {
-        // Get current time for comparison
-        const now = new Date();
+        // Ping-pong and churn flags for every ticket come precomputed in one response
+        await this.fetchTransitionAnalysis(issues);
         
-        // Process each issue
-        const promises = issues.map(async issue => {
-            const currentStatus = issue.fields.status.name;
-            
-            try {
-                // Fetch detailed history for this issue
-                const response = await fetch(`${this.proxyUrl}${this.proxyEndpoint}/issue-history/${issue.key}`);
-                
-                if (!response.ok) {
-                    console.error(`Failed to fetch history for ${issue.key}: ${response.status}`);
-                    return;
-                }
-                
-                const data = await response.json();
-                
-                // Store the full data
-                this.issueData[issue.key] = data;
-                
-                // Analyze risk level
-                this.analyzeRiskLevel(issue, data, now);
-                
-                // Analyze ping-pong transitions
-                this.analyzePingPongTransitions(issue, data);
-                
-                // Analyze ticket churn transitions
-                this.analyzeChurnTransitions(issue, data);
-                
-            } catch (error) {
-                console.error(`Error analyzing risk for ${issue.key}:`, error);
-            }
-        });
-        
-        // Wait for all the analysis to complete
-        await Promise.all(promises);
+        // Aging comes from the proxy's aging index instead of one history fetch per ticket
+        await this.fetchAgingTickets(issues);
         
         // Count aging tickets
         const atRiskCount = Object.values(this.issueData).filter(data => data.isAging).length;
@@ -1373,405 +1354,87 @@ class JiraMetrics {
         console.log(`Analysis complete: Found ${atRiskCount} aging tickets and ${pingPongCount} ticket churn tickets and ${churnCount} ticket churn tickets`);
     }
     
-    analyzeRiskLevel(issue, data, now) {
-        const currentStatus = issue.fields.status.name;
+    async fetchAgingTickets(issues) {
+        if (!this.selectedBoardId || issues.length === 0) return;
         
-        // Create a mapping of exact Jira status names to our standardized categories
-        const statusMapping = {
+        // Dashboard status categories of the workflow stages that are monitored for aging
+        const stageCategories = {
             'In Progress': 'In Progress',
-            'IN PROGRESS': 'In Progress',
-            'Development': 'In Progress',
-            'Implementing': 'In Progress',
-            'Coding': 'In Progress',
-            
-            'In Review': 'In Review',
-            'IN REVIEW': 'In Review',
             'Code Review': 'In Review',
-            'PR Review': 'In Review',
-            'Reviewing': 'In Review',
-            
-            'In QA': 'In QA',
-            'IN QA': 'In QA',
-            'QA': 'In QA',
-            'Testing': 'In QA',
-            'Validation': 'In QA',
-            
-            'To Do': 'To Do',
-            'TO DO': 'To Do',
-            'Backlog': 'To Do',
-            'Open': 'To Do',
-            'New': 'To Do',
-            
-            'Done': 'Done',
-            'DONE': 'Done',
-            'Closed': 'Done',
-            'Resolved': 'Done',
-            'Completed': 'Done',
-            'Fixed': 'Done',
-            "Closed - Won't Do": 'Done'
+            'QA': 'In QA'
         };
         
-        // Check if status matches one of our key categories (In Progress, In Review, In QA)
-        let matchedCategory = statusMapping[currentStatus];
-        
-        // If no exact match, try a case-insensitive partial match
-        if (!matchedCategory) {
-            for (const [statusName, threshold] of Object.entries(this.riskThresholds)) {
-                if (currentStatus.toLowerCase().includes(statusName.toLowerCase())) {
-                    matchedCategory = statusName;
-                    break;
-                }
-            }
-        }
-        
-        // Skip if this status isn't one we're monitoring for aging
-        if (!matchedCategory) {
-            return;
-        }
-        
-        // Skip aging calculation for To Do and Done statuses
-        if (matchedCategory === 'To Do' || matchedCategory === 'Done') {
-            this.issueData[issue.key] = this.issueData[issue.key] || {};
-            this.issueData[issue.key].currentStatusCategory = matchedCategory;
-            this.issueData[issue.key].isAging = false;
-            this.issueData[issue.key].riskLevel = 'none';
-            return;
-        }
-        
-        // Find how long the ticket has been in the current status
-        const statusChanges = data.status_changes || [];
-        if (statusChanges.length === 0) return;
-        
-        // Find the last change TO the current status
-        const currentStatusChanges = statusChanges.filter(change => 
-            change.to === currentStatus
-        );
-        
-        if (currentStatusChanges.length === 0) return;
-        
-        // Get the most recent status change to the current status
-        const lastStatusChange = currentStatusChanges[currentStatusChanges.length - 1];
-        const statusChangeDate = new Date(lastStatusChange.date);
-        
-        // Calculate hours in current status - this is the continuous time since last change to this status
-        const hoursInStatus = (now - statusChangeDate) / (1000 * 60 * 60);
-        
-        // Store this for later use
-        this.issueData[issue.key] = this.issueData[issue.key] || {};
-        this.issueData[issue.key].hoursInCurrentStatus = hoursInStatus;
-        this.issueData[issue.key].currentStatusCategory = matchedCategory;
-        
-        // Get the appropriate threshold for the matched category - use dynamic threshold
-        const threshold = this.riskThresholds[matchedCategory] || 72; // Default to 72 hours if not specified
-        
-        // Determine risk level based on the dynamic threshold
-        let isAging = false;
-        let riskLevel = 'none';
-        
-        if (hoursInStatus >= threshold) {
-            // Over threshold = aging ticket
-            isAging = true;
+        try {
+            // near=0 returns every monitored open ticket, not just the aging ones
+            const response = await fetch(`${this.proxyUrl}${this.proxyEndpoint}/aging?board=${this.selectedBoardId}&near=0`);
             
-            if (hoursInStatus >= threshold * 2) {
-                // Over 2x threshold = high risk
-                riskLevel = 'high';
-            } else {
-                // Between 1-2x threshold = medium risk
-                riskLevel = 'medium';
+            if (!response.ok) {
+                console.error(`Failed to fetch aging tickets: ${response.status}`);
+                return;
             }
-        }
-        
-        this.issueData[issue.key].isAging = isAging;
-        this.issueData[issue.key].riskLevel = riskLevel;
-        this.issueData[issue.key].timeInStatus = this.formatDuration(hoursInStatus);
-        
-        console.log(`Ticket ${issue.key} in status "${currentStatus}" (category: ${matchedCategory}) for ${this.formatDuration(hoursInStatus)} continuously - Risk Level: ${riskLevel} - Threshold: ${threshold} hours`);
-    }
-    
-    analyzePingPongTransitions(issue, data) {
-        // Extract issue key for logging
-        const issueKey = issue.key;
-        
-        // Check if we have ping-pong data from the backend
-        if (data.ping_pong_score !== undefined) {
-            // Use the backend's ping-pong score
-            this.issueData[issueKey] = this.issueData[issueKey] || {};
-            this.issueData[issueKey].pingPongScore = data.ping_pong_score;
-            this.issueData[issueKey].pingPongTransitions = data.ping_pong_transitions || [];
-            this.issueData[issueKey].isPingPong = data.ping_pong_score >= this.pingPongThreshold;
-            
-            console.log(`Using backend ping-pong score for ${issueKey}: ${data.ping_pong_score}`);
-            return;
-        }
-        
-        // No ping-pong data from backend, calculate from status changes
-        const statusChanges = data.status_changes || [];
-        if (statusChanges.length < 3) {
-            // Not enough status changes for ping-pong
-            this.issueData[issueKey] = this.issueData[issueKey] || {};
-            this.issueData[issueKey].pingPongScore = 0;
-            this.issueData[issueKey].isPingPong = false;
-            this.issueData[issueKey].statusTransitions = [];
-            return;
-        }
-        
-        // Define status categories for transition tracking
-        const statusCategories = {
-            'to_do': ['TO DO', 'To Do', 'Backlog', 'Open', 'New', 'Product Backlog'],
-            'in_progress': ['IN PROGRESS', 'In Progress', 'Development', 'Implementing', 'Dev', 'Coding'],
-            'in_review': ['IN REVIEW', 'In Review', 'Code Review', 'Review', 'Reviewing', 'PR Review'],
-            'in_qa': ['IN QA', 'In QA', 'QA', 'Testing', 'Validation', 'Test'],
-            'done': ['DONE', 'Done', 'Closed', 'Resolved', 'Completed', 'Fixed']
-        };
-        
-        // Track the sequence of status categories
-        const categorySequence = [];
-        const transitions = [];
-        let pingPongScore = 0;
-        const pingPongCounts = {
-            'in_progress_to_to_do': 0,
-            'in_review_to_in_progress': 0,
-            'in_qa_to_in_review': 0,
-            'in_qa_to_in_progress': 0,
-            'done_to_any': 0
-        };
-        
-        // Process each status change
-        for (let i = 0; i < statusChanges.length; i++) {
-            const change = statusChanges[i];
-            const statusName = change.to;
             
-            // Determine status category
-            let category = null;
-            for (const [cat, statuses] of Object.entries(statusCategories)) {
-                if (statuses.includes(statusName)) {
-                    category = cat;
-                    break;
+            const data = await response.json();
+            const tickets = new Map(data.tickets.map(ticket => [ticket.key, ticket]));
+            
+            issues.forEach(issue => {
+                const ticket = tickets.get(issue.key);
+                this.issueData[issue.key] = this.issueData[issue.key] || {};
+                if (!ticket) {
+                    this.issueData[issue.key].isAging = false;
+                    this.issueData[issue.key].riskLevel = 'none';
+                    return;
                 }
                 
-                // Try fuzzy match if exact match fails
-                if (!category && statuses.some(s => statusName.toLowerCase().includes(s.toLowerCase()))) {
-                    category = cat;
-                    break;
-                }
-            }
-            
-            // Skip if we couldn't categorize
-            if (!category) continue;
-            
-            // Add to sequence
-            categorySequence.push({
-                category,
-                date: change.date
-            });
-            
-            // Can't detect ping-pong until we have at least 2 status changes
-            if (categorySequence.length < 2) continue;
-            
-            // Get previous category
-            const previous = categorySequence[categorySequence.length - 2];
-            const current = categorySequence[categorySequence.length - 1];
-            
-            // Record the transition
-            transitions.push({
-                from: previous.category,
-                to: current.category,
-                date: current.date
+                this.issueData[issue.key].hoursInCurrentStatus = ticket.hours_in_status;
+                this.issueData[issue.key].currentStatusCategory = stageCategories[ticket.stage] || ticket.status;
+                this.issueData[issue.key].isAging = ticket.is_aging;
+                this.issueData[issue.key].riskLevel = ticket.is_aging ? ticket.risk_level : 'none';
+                this.issueData[issue.key].timeInStatus = this.formatDuration(ticket.hours_in_status);
             });
             
-            // Skip the first transition (initial status)
-            if (i > 0) {
-                // Check if this is a backward transition (ping-pong)
-                if (current.category === 'to_do' && previous.category === 'in_progress') {
-                    // Back to backlog from development
-                    pingPongCounts['in_progress_to_to_do']++;
-                    pingPongScore += 1;
-                    console.log(`Issue ${issueKey}: Ping-pong detected - returned to backlog from development`);
-                }
-                else if (current.category === 'in_progress' && previous.category === 'in_review') {
-                    // Back to development from review
-                    pingPongCounts['in_review_to_in_progress']++;
-                    pingPongScore += 1;
-                    console.log(`Issue ${issueKey}: Ping-pong detected - returned to development from review`);
-                }
-                else if (current.category === 'in_review' && previous.category === 'in_qa') {
-                    // Failed QA, back to review
-                    pingPongCounts['in_qa_to_in_review']++;
-                    pingPongScore += 1;
-                    console.log(`Issue ${issueKey}: Ping-pong detected - failed QA, returned to review`);
-                }
-                else if (current.category === 'in_progress' && previous.category === 'in_qa') {
-                    // Failed QA badly, back to development
-                    pingPongCounts['in_qa_to_in_progress']++;
-                    pingPongScore += 1;
-                    console.log(`Issue ${issueKey}: Ping-pong detected - failed QA, returned to development`);
-                }
-                else if (previous.category === 'done') {
-                    // Reopened ticket
-                    pingPongCounts['done_to_any']++;
-                    pingPongScore += 1;
-                    console.log(`Issue ${issueKey}: Ping-pong detected - reopened ticket from done state`);
-                }
-            }
-        }
-        
-        // Store the results
-        this.issueData[issueKey] = this.issueData[issueKey] || {};
-        this.issueData[issueKey].pingPongScore = pingPongScore;
-        this.issueData[issueKey].statusTransitions = transitions;
-        this.issueData[issueKey].pingPongCounts = pingPongCounts;
-        this.issueData[issueKey].isPingPong = pingPongScore >= this.pingPongThreshold;
-        
-        // Log if it's a ping-pong issue
-        if (this.issueData[issueKey].isPingPong) {
-            console.log(`Ping-pong ticket ${issueKey} detected! Score: ${pingPongScore}`);
+            console.log(`Aging index: ${data.counts.high} high and ${data.counts.medium} medium risk tickets out of ${data.open_issues_indexed} open`);
+        } catch (error) {
+            console.error('Error fetching aging tickets:', error);
         }
     }
     
-    analyzeChurnTransitions(issue, data) {
-        // Extract issue key for logging
-        const issueKey = issue.key;
-        
-        // Check if we have ticket churn data from the backend
-        if (data.ping_pong_score !== undefined) {
-            // Use the backend's ticket churn score
-            this.issueData[issueKey] = this.issueData[issueKey] || {};
-            this.issueData[issueKey].churnScore = data.ping_pong_score;
-            this.issueData[issueKey].churnTransitions = data.ping_pong_transitions || [];
-            this.issueData[issueKey].isChurn = data.ping_pong_score >= this.churnThreshold;
-            
-            console.log(`Using backend ticket churn score for ${issueKey}: ${data.ping_pong_score}`);
-            return;
-        }
-        
-        // No ticket churn data from backend, calculate from status changes
-        const statusChanges = data.status_changes || [];
-        if (statusChanges.length < 3) {
-            // Not enough status changes for ticket churn
-            this.issueData[issueKey] = this.issueData[issueKey] || {};
-            this.issueData[issueKey].churnScore = 0;
-            this.issueData[issueKey].isChurn = false;
-            this.issueData[issueKey].statusTransitions = [];
-            return;
-        }
+    async fetchTransitionAnalysis(issues) {
+        if (!this.currentJql || issues.length === 0) return;
         
-        // Define status categories for transition tracking
-        const statusCategories = {
-            'to_do': ['TO DO', 'To Do', 'Backlog', 'Open', 'New', 'Product Backlog'],
-            'in_progress': ['IN PROGRESS', 'In Progress', 'Development', 'Implementing', 'Dev', 'Coding'],
-            'in_review': ['IN REVIEW', 'In Review', 'Code Review', 'Review', 'Reviewing', 'PR Review'],
-            'in_qa': ['IN QA', 'In QA', 'QA', 'Testing', 'Validation', 'Test'],
-            'done': ['DONE', 'Done', 'Closed', 'Resolved', 'Completed', 'Fixed']
-        };
-        
-        // Track the sequence of status categories
-        const categorySequence = [];
-        const actualChurnTransitions = []; // Array to store only churn-contributing transitions
-        const transitions = []; // Add this line to define the array
-        let churnScore = 0;
-        const churnCounts = {
-            'in_progress_to_to_do': 0,
-            'in_review_to_in_progress': 0,
-            'in_qa_to_in_review': 0,
-            'in_qa_to_in_progress': 0,
-            'done_to_any': 0
-        };
-        
-        // Process each status change
-        for (let i = 0; i < statusChanges.length; i++) {
-            const change = statusChanges[i];
-            const statusName = change.to;
+        try {
+            const queryParams = `jql=${encodeURIComponent(this.currentJql)}&maxResults=${issues.length}`;
+            const response = await fetch(`${this.proxyUrl}${this.proxyEndpoint}/transition-analysis?${queryParams}`);
             
-            // Determine status category
-            let category = null;
-            for (const [cat, statuses] of Object.entries(statusCategories)) {
-                if (statuses.includes(statusName)) {
-                    category = cat;
-                    break;
-                }
-                
-                // Try fuzzy match if exact match fails
-                if (!category && statuses.some(s => statusName.toLowerCase().includes(s.toLowerCase()))) {
-                    category = cat;
-                    break;
-                }
+            if (!response.ok) {
+                console.error(`Failed to fetch transition analysis: ${response.status}`);
+                return;
             }
             
-            // Skip if we couldn't categorize
-            if (!category) continue;
-            
-            // Add to sequence
-            categorySequence.push({
-                category,
-                date: change.date
-            });
-            
-            // Can't detect ticket churn until we have at least 2 status changes
-            if (categorySequence.length < 2) continue;
-            
-            // Get previous category
-            const previous = categorySequence[categorySequence.length - 2];
-            const current = categorySequence[categorySequence.length - 1];
-            
-            // Record the transition
-            transitions.push({
-                from: previous.category,
-                to: current.category,
-                date: current.date
-            });
-            
-            // Skip the first transition (initial status)
-            if (i > 0) {
-                let isChurnTransition = false;
-                // Check if this is a backward transition (ticket churn)
-                if (current.category === 'to_do' && previous.category === 'in_progress') {
-                    isChurnTransition = true;
-                    churnCounts['in_progress_to_to_do']++;
-                    console.log(`Issue ${issueKey}: Ticket churn detected - returned to backlog from development`);
-                }
-                else if (current.category === 'in_progress' && previous.category === 'in_review') {
-                    isChurnTransition = true;
-                    churnCounts['in_review_to_in_progress']++;
-                    console.log(`Issue ${issueKey}: Ticket churn detected - returned to development from review`);
-                }
-                else if (current.category === 'in_review' && previous.category === 'in_qa') {
-                    isChurnTransition = true;
-                    churnCounts['in_qa_to_in_review']++;
-                    console.log(`Issue ${issueKey}: Ticket churn detected - failed QA, returned to review`);
-                }
-                else if (current.category === 'in_progress' && previous.category === 'in_qa') {
-                    isChurnTransition = true;
-                    churnCounts['in_qa_to_in_progress']++;
-                    console.log(`Issue ${issueKey}: Ticket churn detected - failed QA, returned to development`);
-                }
-                else if (previous.category === 'done') {
-                    isChurnTransition = true;
-                    churnCounts['done_to_any']++;
-                    console.log(`Issue ${issueKey}: Ticket churn detected - reopened ticket from done state`);
-                }
-
-                if (isChurnTransition) {
-                    churnScore += 1;
-                    // Store the actual backward transition that contributed to the score
-                    actualChurnTransitions.push({
-                        from: previous.category,
-                        to: current.category,
-                        date: current.date
-                    });
-                }
-            }
-        }
-        
-        // Store the results
-        this.issueData[issueKey] = this.issueData[issueKey] || {};
-        this.issueData[issueKey].churnScore = churnScore;
-        this.issueData[issueKey].statusTransitions = actualChurnTransitions; // Store only actual churn transitions
-        this.issueData[issueKey].churnCounts = churnCounts;
-        this.issueData[issueKey].isChurn = churnScore >= this.churnThreshold;
-        
-        // Log if it's a ticket churn issue
-        if (this.issueData[issueKey].isChurn) {
-            console.log(`Ticket churn ticket ${issueKey} detected! Score: ${churnScore}`);
+            const data = await response.json();
+            this.pingPongThreshold = data.thresholds.ping_pong;
+            this.churnThreshold = data.thresholds.churn;
+            
+            for (const [issueKey, analysis] of Object.entries(data.issues)) {
+                this.issueData[issueKey] = {
+                    ...this.issueData[issueKey],
+                    pingPongScore: analysis.ping_pong_score,
+                    pingPongTransitions: analysis.ping_pong_transitions,
+                    isPingPong: analysis.is_ping_pong,
+                    churnScore: analysis.churn_score,
+                    churnCounts: analysis.churn_details,
+                    // Only the backward transitions that contributed to the churn score
+                    statusTransitions: analysis.churn_transitions.map(t => ({
+                        from: t.from_stage,
+                        to: t.to_stage,
+                        date: t.date
+                    })),
+                    isChurn: analysis.is_churn
+                };
+            }
+            
+            console.log(`Transition analysis: ${data.summary.ping_pong_issues} ping-pong and ${data.summary.churn_issues} churn tickets out of ${data.summary.issues_analyzed}`);
+        } catch (error) {
+            console.error('Error fetching transition analysis:', error);
         }
     }
 
@@ -1980,7 +1643,7 @@ class JiraMetrics {
         return barWrapper;
     }
 
-    sortTickets(column) {
+    async sortTickets(column) {
         // Update sort direction
         if (this.sortConfig.column === column) {
             // If already sorting by this column, toggle direction
@@ -2007,6 +1670,9 @@ class JiraMetrics {
         // No need to sort if no issues
         if (!this.issues || this.issues.length === 0) return;
         
+        // With tickets loaded for a board, the proxy sorts the whole query
+        if (this.selectedBoardId && this.currentJql && await this.fetchTicketPage()) return;
+        
         // Sort the issues array
         this.issues.sort((a, b) => {
             let valueA, valueB;
@@ -2069,6 +1735,54 @@ class JiraMetrics {
         this.updateTicketTable(this.issues);
     }
 
+    async fetchTicketPage(cursor = null) {
+        // Sorted, filtered page of every ticket matching the current query
+        const params = new URLSearchParams({
+            jql: this.currentJql,
+            sort: this.sortConfig.column,
+            direction: this.sortConfig.direction,
+            limit: 100,
+            atRiskOnly: this.showingAtRiskOnly,
+            pingPongOnly: this.showingPingPongOnly
+        });
+        if (cursor) params.set('cursor', cursor);
+        
+        try {
+            const response = await fetch(`${this.proxyUrl}${this.proxyEndpoint}/tickets?${params}`);
+            
+            if (!response.ok) {
+                console.error(`Failed to fetch ticket page: ${response.status}`);
+                return false;
+            }
+            
+            const data = await response.json();
+            data.tickets.forEach(ticket => {
+                this.issueData[ticket.key] = {
+                    ...(this.issueData[ticket.key] || {}),
+                    isAging: ticket.is_aging,
+                    riskLevel: ticket.risk_level,
+                    timeInStatus: ticket.hours_in_status !== null ? this.formatDuration(ticket.hours_in_status) : '',
+                    pingPongScore: ticket.ping_pong_score,
+                    isPingPong: ticket.is_ping_pong,
+                    isChurn: ticket.is_churn
+                };
+            });
+            
+            // Table rows only carry the table's fields, so they're kept apart
+            // from this.issues, which the metrics and charts are built from
+            this.ticketRows = cursor ? [...this.ticketRows, ...data.tickets] : data.tickets;
+            this.ticketCursor = data.next_cursor;
+            document.getElementById('loadMoreTicketsBtn').classList.toggle('hidden', !data.next_cursor);
+            
+            console.log(`Showing ${this.ticketRows.length} of ${data.total} tickets sorted by ${data.sort} (${data.direction})`);
+            this.updateTicketTable(this.ticketRows);
+            return true;
+        } catch (error) {
+            console.error('Error fetching ticket page:', error);
+            return false;
+        }
+    }
+
     getRiskValue(riskLevel) {
         switch(riskLevel) {
             case 'high': return 3;
@@ -2078,7 +1792,7 @@ class JiraMetrics {
         }
     }
 
-    updateDisplayedTickets() {
+    async updateDisplayedTickets() {
         // Get the latest checkbox states
         const atRiskOnlyCheckbox = document.getElementById('atRiskOnlyCheckbox');
         const pingPongOnlyCheckbox = document.getElementById('pingPongOnlyCheckbox');
@@ -2089,6 +1803,10 @@ class JiraMetrics {
         this.showingPingPongOnly = pingPongOnlyCheckbox ? pingPongOnlyCheckbox.checked : false;
         this.showingChurnOnly = churnOnlyCheckbox ? churnOnlyCheckbox.checked : false;
         
+        // With tickets loaded for a board, the proxy filters the whole query
+        // for the table; the metrics still come from the loaded issues
+        const serverPage = this.selectedBoardId && this.currentJql && await this.fetchTicketPage();
+        
         // Filter based on current checkbox states
         let displayedIssues = [...this.issues];
         
@@ -2101,7 +1819,9 @@ class JiraMetrics {
         }
         
         // Update the table and metrics
-        this.updateTicketTable(displayedIssues);
+        if (!serverPage) {
+            this.updateTicketTable(displayedIssues);
+        }
         this.updateMetrics(displayedIssues);
     }
 
@@ -3351,6 +3071,7 @@ class JiraMetrics {
         
         const transitions = {};
         const pingPongTransitions = [];
+        const reversedPairs = new Set();
         let pingPongScore = 0;
         
         // Track transitions between statuses
@@ -3364,7 +3085,8 @@ class JiraMetrics {
             transitions[transitionKey] = (transitions[transitionKey] || 0) + 1;
             
             // Check for ping-pong - if we already saw the reverse transition
-            if (transitions[reverseKey] && !pingPongTransitions.includes(reverseKey)) {
+            if (transitions[reverseKey] && !reversedPairs.has(reverseKey)) {
+                reversedPairs.add(reverseKey);
                 pingPongTransitions.push(reverseKey);
                 pingPongScore += Math.min(transitions[transitionKey], transitions[reverseKey]);
             }
@@ -3432,6 +3154,11 @@ class JiraMetrics {
     // Update initializeApp to include ping-pong filter
     async initializeApp() {
         try {
+            // One round-trip for everything below; fall back to the separate calls
+            if (await this.loadBootstrap()) {
+                return;
+            }
+
             // Load configuration (Jira URL and backend settings)
             await this.loadConfig();
             
@@ -3449,6 +3176,53 @@ class JiraMetrics {
         }
     }
     
+    async loadBootstrap() {
+        try {
+            const response = await fetch(`${this.proxyUrl}/bootstrap`);
+            if (!response.ok) {
+                console.warn(`Bootstrap failed (${response.status}), loading startup data separately`);
+                return false;
+            }
+            const bootstrap = await response.json();
+            const errors = bootstrap.errors || {};
+
+            this.applyConfig(bootstrap.config);
+            this.riskThresholds = { ...this.riskThresholds, ...bootstrap.aging_thresholds };
+            console.log('Updated risk thresholds:', this.riskThresholds);
+
+            if (bootstrap.health && !bootstrap.health.ok) {
+                console.warn('Jira connection check failed:', bootstrap.health.error);
+            }
+
+            // Parts that failed on the server are retried on their own, which also reports the error
+            if (errors.story_point_field) {
+                await this.findStoryPointFieldId();
+            } else if (bootstrap.story_point_field) {
+                this.storyPointFieldId = bootstrap.story_point_field.id;
+                console.log(`Found Story Point field: '${bootstrap.story_point_field.name}' with ID: ${this.storyPointFieldId}`);
+            } else {
+                console.warn('Could not automatically find Story Points field ID using common names.');
+                this.showError('Could not find Story Points field. Velocity calculation will be unavailable.');
+                this.storyPointFieldId = null;
+            }
+
+            if (bootstrap.boards) {
+                console.log(`Loaded ${bootstrap.boards.length} boards from Jira`);
+                this.populateBoardDropdown(bootstrap.boards);
+                const boardSelect = document.getElementById('boardSelect');
+                if (boardSelect) {
+                    boardSelect.disabled = false;
+                }
+            } else {
+                await this.fetchBoards();
+            }
+            return true;
+        } catch (error) {
+            console.error('Error loading bootstrap data:', error);
+            return false;
+        }
+    }
+    
     async loadAgingThresholds() {
         try {
             // Fetch aging thresholds from the backend
@@ -3976,32 +3750,21 @@ class JiraMetrics {
     async findStoryPointFieldId() {
         console.log('Attempting to find Story Point field ID...');
         try {
-            const response = await fetch(`${this.proxyUrl}${this.proxyEndpoint}/field`);
+            // The proxy looks the field up once and caches Jira's field list
+            const response = await fetch(`${this.proxyUrl}${this.proxyEndpoint}/story-point-field`);
+            if (response.status === 404) {
+                console.warn('Could not automatically find Story Points field ID using common names.');
+                this.showError('Could not find Story Points field. Velocity calculation will be unavailable.');
+                this.storyPointFieldId = null;
+                return;
+            }
             if (!response.ok) {
                 throw new Error(`Failed to fetch fields: ${response.status} ${response.statusText}`);
             }
-            
-            const fields = await response.json();
-            console.log(`Received ${fields.length} fields from Jira API`);
-
-            // Common names for the Story Points field
-            const commonNames = ['Story Points', 'Story Point Estimate'];
-            let foundField = null;
-
-            for (const field of fields) {
-                if (commonNames.some(name => field.name.toLowerCase() === name.toLowerCase())) {
-                    foundField = field;
-                    break;
-                }
-            }
 
-            if (foundField) {
-                this.storyPointFieldId = foundField.id;
-                console.log(`Found Story Point field: '${foundField.name}' with ID: ${this.storyPointFieldId}`);
-            } else {
-                console.warn('Could not automatically find Story Points field ID using common names.');
-                this.showError('Could not find Story Points field. Velocity calculation will be unavailable.');
-            }
+            const foundField = await response.json();
+            this.storyPointFieldId = foundField.id;
+            console.log(`Found Story Point field: '${foundField.name}' with ID: ${this.storyPointFieldId}`);
 
         } catch (error) {
             console.error('Error fetching Jira fields:', error);
@@ -4009,6 +3772,15 @@ class JiraMetrics {
             this.storyPointFieldId = null; // Ensure it's null on error
         }
     }
+
+    async fetchVelocity(board, sprintCount = 6) {
+        // Committed vs completed story points per sprint, computed by the proxy
+        const response = await fetch(`${this.proxyUrl}${this.proxyEndpoint}/velocity?board=${encodeURIComponent(board)}&sprints=${sprintCount}`);
+        if (!response.ok) {
+            throw new Error(`Failed to fetch velocity: ${response.status} ${response.statusText}`);
+        }
+        return response.json();
+    }
 }
 
 // Initialize the application
@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import proxy  # noqa: E402
+from loadtest import FakeJira  # noqa: E402
+
+
+@pytest.fixture
+def fake_jira(monkeypatch):
+    """Start a loadtest FakeJira and point the default Jira instance at it.
+
+    Call the fixture with the projects and the number of issues per project
+    to serve; it returns the FakeJira.
+    """
+    servers = []
+
+    def start(projects, issues_per_project, latency=0.0):
+        fake = FakeJira(projects, issues_per_project, latency, 0.0)
+        server = fake.serve()
+        servers.append(server)
+        instance = proxy.JiraInstance(
+            "default",
+            {
+                "jira_url": f"http://127.0.0.1:{server.server_port}",
+                "email": "test@example.com",
+                "api_token": "test",
+            },
+        )
+        monkeypatch.setitem(proxy.JIRA_INSTANCES, "default", instance)
+        return fake
+
+    yield start
+    for server in servers:
+        server.shutdown()
@@ -0,0 +1,126 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import proxy
+
+ROUTE = "/proxy/resolution-metrics/aggregate"
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def aggregate(**query):
+    response = proxy.app.test_client().get(ROUTE, query_string=query)
+    return response.status_code, response.get_json()
+
+
+def test_projects_and_org_totals(fake_jira):
+    fake_jira(["CORE", "API"], 60)
+    status, data = aggregate(projects="API,CORE,API")
+
+    assert status == 200
+    assert data["completed"] == ["API", "CORE"]
+    assert data["failed"] == {}
+    assert not data["partial"]
+
+    projects = data["projects"]
+    assert {key: metrics["total_issues"] for key, metrics in projects.items()} == {
+        "API": 60,
+        "CORE": 60,
+    }
+    assert data["org"]["total_issues"] == 120
+    for stage, count in data["org"]["current_status"].items():
+        assert count == sum(
+            metrics["current_status"][stage] for metrics in projects.values()
+        )
+
+
+def test_project_metrics_match_the_single_project_route(fake_jira, monkeypatch):
+    # Open durations run until now, so both requests need the same now
+    monkeypatch.setattr(proxy, "datetime", FrozenDatetime)
+    fake_jira(["CORE", "API"], 60)
+    _, data = aggregate(projects="CORE")
+    single = (
+        proxy.app.test_client()
+        .get(
+            "/proxy/resolution-metrics",
+            query_string={"jql": "project = CORE ORDER BY created DESC"},
+        )
+        .get_json()
+    )
+    for section in ("current_status", "stage_metrics"):
+        assert data["projects"]["CORE"][section] == single[section]
+
+
+def test_failed_project_is_reported(fake_jira):
+    fake = fake_jira(["CORE", "API"], 60)
+    handle_post = fake.handle_post
+
+    def failing(path, body):
+        if "API" in body.get("jql", ""):
+            return 500, {"errorMessages": ["Boom"]}
+        return handle_post(path, body)
+
+    fake.handle_post = failing
+    status, data = aggregate(projects="CORE,API")
+
+    assert status == 200
+    assert data["completed"] == ["CORE"]
+    assert data["failed"]["API"]["status"] == 500
+    assert data["partial"]
+    assert data["org"]["total_issues"] == 60
+
+
+def test_portfolios(fake_jira, monkeypatch):
+    fake_jira(["CORE", "API", "WEB"], 10)
+    monkeypatch.setattr(proxy, "PORTFOLIOS", {"platform": ["CORE", "API"]})
+
+    _, data = aggregate(portfolio="platform")
+    assert data["portfolio"] == "platform"
+    assert data["completed"] == ["CORE", "API"]
+
+    status, data = aggregate(portfolio="growth")
+    assert status == 400
+    assert "growth" in data["error"]
+
+    response = proxy.app.test_client().post(
+        ROUTE, json={"portfolio": {"name": "adhoc", "projects": ["WEB", "CORE"]}}
+    )
+    assert response.get_json()["completed"] == ["WEB", "CORE"]
+
+
+@pytest.mark.parametrize("deadline", ["soon", "0", "-5"])
+def test_bad_deadlines_are_rejected(fake_jira, deadline):
+    fake_jira(["CORE"], 10)
+    status, data = aggregate(projects="CORE", deadline=deadline)
+    assert status == 400
+    assert "deadline" in data["error"]
+
+
+def test_clients_can_only_shorten_the_deadline(fake_jira):
+    fake_jira(["CORE"], 10)
+    _, data = aggregate(projects="CORE", deadline=5)
+    assert data["deadline_seconds"] == 5
+
+    _, data = aggregate(projects="CORE", deadline=proxy.AGGREGATE_DEADLINE_SECONDS * 10)
+    assert data["deadline_seconds"] == proxy.AGGREGATE_DEADLINE_SECONDS
+
+
+def test_slow_projects_miss_the_deadline(fake_jira):
+    fake_jira(["CORE"], 10, latency=1.0)
+    status, data = aggregate(projects="CORE", deadline=0.2)
+    assert status == 200
+    assert data["completed"] == []
+    assert data["failed"]["CORE"]["status"] == 504
+    assert data["partial"]
+    assert data["elapsed_seconds"] < 1.0
+
+
+def test_projects_are_required(fake_jira):
+    fake_jira(["CORE"], 10)
+    status, _ = aggregate()
+    assert status == 400
@@ -0,0 +1,123 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import proxy
+
+NOW = datetime(2025, 9, 1, tzinfo=timezone.utc)
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+@pytest.fixture
+def aging(fake_jira, monkeypatch):
+    """Frozen time and an empty issue store and aging index"""
+    monkeypatch.setattr(proxy, "datetime", FrozenDatetime)
+    store = proxy.IssueStore()
+    index = proxy.AgingIndex()
+    store.subscribe(index.on_store_event)
+    monkeypatch.setattr(proxy, "ISSUE_STORE", store)
+    monkeypatch.setattr(proxy, "AGING_INDEX", index)
+    return fake_jira(["AGE"], 300)
+
+
+def expected_tickets(fake, near_fraction):
+    """(key, hours in status) of the open, monitored issues worth listing"""
+    tickets = []
+    for issue in fake.issues["AGE"]:
+        fields = issue["fields"]
+        histories = issue["changelog"]["histories"]
+        threshold = proxy.aging_threshold_hours(fields["status"]["name"])
+        if fields["status"]["name"] == "Done" or not threshold:
+            continue
+        entered = histories[-1]["created"] if histories else fields["created"]
+        hours = (NOW - datetime.fromisoformat(entered)).total_seconds() / 3600
+        if hours >= threshold * near_fraction:
+            tickets.append((issue["key"], round(hours, 2)))
+    return sorted(tickets, key=lambda ticket: ticket[1], reverse=True)
+
+
+def get_aging(**query):
+    response = proxy.app.test_client().get("/proxy/aging", query_string=query)
+    return response, response.get_json()
+
+
+def test_aging_tickets_most_overdue_first(aging):
+    _, data = get_aging(board="AGE")
+    assert data["index_refreshed"]
+
+    tickets = data["tickets"]
+    assert [
+        (ticket["key"], ticket["hours_in_status"]) for ticket in tickets
+    ] == expected_tickets(aging, proxy.AGING_NEAR_FRACTION)
+    assert tickets
+    for ticket in tickets:
+        assert ticket["is_aging"] == (ticket["overage_hours"] >= 0)
+    assert sum(data["counts"].values()) == len(tickets)
+
+
+def test_near_fraction(aging):
+    _, data = get_aging(board="AGE", near="0.1")
+    assert [ticket["key"] for ticket in data["tickets"]] == [
+        key for key, _ in expected_tickets(aging, 0.1)
+    ]
+
+
+def test_fresh_index_is_not_refetched(aging):
+    get_aging(board="AGE")
+    calls = aging.calls
+    _, data = get_aging(board="AGE")
+    assert not data["index_refreshed"]
+    assert aging.calls == calls
+
+
+def test_issues_leave_the_index_when_done(aging):
+    _, data = get_aging(board="AGE")
+    key = data["tickets"][0]["key"]
+
+    issue = proxy.ISSUE_STORE.get(key)["issue"]
+    proxy.ISSUE_STORE.apply_change(
+        {
+            "key": key,
+            "fields": {
+                "status": {"name": "Done", "statusCategory": {"key": "done"}},
+            },
+        },
+        {
+            "id": "update",
+            "created": "2025-08-31T10:00:00.000+0000",
+            "author": {},
+            "items": [
+                {
+                    "field": "status",
+                    "fromString": issue["fields"]["status"]["name"],
+                    "toString": "Done",
+                }
+            ],
+        },
+    )
+    _, data = get_aging(board="AGE")
+    assert key not in [ticket["key"] for ticket in data["tickets"]]
+
+
+def test_stale_index_is_served_while_jira_is_down(aging, monkeypatch):
+    _, fresh = get_aging(board="AGE")
+    monkeypatch.setattr(proxy, "AGING_INDEX_REFRESH_SECONDS", 0)
+    monkeypatch.setattr(proxy.JIRA_INSTANCES["default"].circuit, "allow", lambda: False)
+
+    response, data = get_aging(board="AGE")
+    assert response.status_code == 200
+    assert response.headers["X-Served-Stale"] == "true"
+    assert data["tickets"] == fresh["tickets"]
+
+    response, _ = get_aging(board="OTHER")
+    assert response.status_code == 503
+
+
+def test_board_is_required(aging):
+    response, _ = get_aging()
+    assert response.status_code == 400
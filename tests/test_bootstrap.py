@@ -0,0 +1,150 @@
+import gzip
+import json
+import time
+
+import pytest
+
+import proxy
+
+
+@pytest.fixture
+def bootstrap(fake_jira):
+    """A fake Jira with three projects and cold board and field caches"""
+    for cache in (proxy.FIELD_CACHE, proxy.BOARD_CACHE):
+        cache.clear()
+    yield fake_jira(["WEB", "API", "CORE"], 5)
+    for cache in (proxy.FIELD_CACHE, proxy.BOARD_CACHE):
+        cache.clear()
+
+
+def get_bootstrap(accept_encoding="gzip"):
+    """(response, decoded JSON) of a /bootstrap request"""
+    response = proxy.app.test_client().get(
+        "/bootstrap", headers={"Accept-Encoding": accept_encoding}
+    )
+    body = response.get_data()
+    if response.headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return response, json.loads(body)
+
+
+def failing(fake, failing_path, status=500):
+    """Make the fake answer GET ``failing_path`` with ``status``"""
+    handle_get = fake.handle_get
+
+    def handle(path, query):
+        if path == failing_path:
+            return status, {"errorMessages": ["Boom"]}
+        return handle_get(path, query)
+
+    fake.handle_get = handle
+
+
+def test_startup_data_in_one_response(bootstrap):
+    response, data = get_bootstrap()
+    assert response.status_code == 200
+    assert data["config"] == {"jira_url": proxy.jira_credentials()["jira_url"]}
+    assert data["aging_thresholds"] == proxy.AGING_THRESHOLDS
+    assert [board["name"] for board in data["boards"]] == [
+        "API board",
+        "CORE board",
+        "WEB board",
+    ]
+    assert data["story_point_field"] == {
+        "id": "customfield_10016",
+        "name": "Story Points",
+    }
+    assert data["health"]["ok"]
+    assert data["health"]["version"] == "1001.0.0-SNAPSHOT"
+    assert data["errors"] == {}
+
+
+def test_matches_the_separate_routes(bootstrap):
+    _, data = get_bootstrap()
+    client = proxy.app.test_client()
+    assert data["boards"] == client.get("/proxy/boards").get_json()["boards"]
+    assert data["story_point_field"]["id"] == (
+        client.get("/proxy/story-point-field").get_json()["id"]
+    )
+
+
+def test_warm_caches_leave_only_the_health_check(bootstrap):
+    get_bootstrap()
+    calls = bootstrap.calls
+    _, data = get_bootstrap()
+    assert data["errors"] == {}
+    assert bootstrap.calls == calls + 1
+
+
+def test_gzipped_only_when_accepted_and_large_enough(bootstrap, monkeypatch):
+    monkeypatch.setattr(proxy, "BOOTSTRAP_GZIP_MIN_BYTES", 100)
+    response, data = get_bootstrap()
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+    plain, plain_data = get_bootstrap(accept_encoding="identity")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["Vary"] == "Accept-Encoding"
+    assert plain_data == data
+
+    monkeypatch.setattr(proxy, "BOOTSTRAP_GZIP_MIN_BYTES", len(plain.data) + 1)
+    small, small_data = get_bootstrap()
+    assert "Content-Encoding" not in small.headers
+    assert small_data == data
+
+
+def test_failed_part_is_reported_alone(bootstrap):
+    failing(bootstrap, "/rest/api/3/field")
+    response, data = get_bootstrap()
+    assert response.status_code == 200
+    assert data["story_point_field"] is None
+    assert "500" in data["errors"]["story_point_field"]
+    assert set(data["errors"]) == {"story_point_field"}
+    assert data["boards"] and data["health"]["ok"]
+
+
+def test_stale_boards_when_jira_fails(bootstrap):
+    proxy.BOARD_CACHE.set(
+        "boards", {"boards": [{"id": 1, "name": "Old board"}]}, ttl_seconds=0.01
+    )
+    time.sleep(0.02)
+    failing(bootstrap, "/rest/agile/1.0/board")
+    response, data = get_bootstrap()
+    assert data["boards"] == [{"id": 1, "name": "Old board"}]
+    assert "boards" in data["errors"]
+    assert response.headers["X-Served-Stale"] == "true"
+
+
+def test_slow_parts_miss_the_deadline(bootstrap, monkeypatch):
+    monkeypatch.setattr(proxy, "DEADLINE_MARGIN_SECONDS", 0.05)
+    monkeypatch.setitem(proxy.ROUTE_DEADLINES, "get_bootstrap", 0.5)
+    handle_get = bootstrap.handle_get
+
+    def slow_server_info(path, query):
+        if path == "/rest/api/3/serverInfo":
+            time.sleep(1.5)
+        return handle_get(path, query)
+
+    bootstrap.handle_get = slow_server_info
+    started = time.perf_counter()
+    response, data = get_bootstrap()
+    assert time.perf_counter() - started < 1.2
+    assert data["errors"] == {"health": "Deadline exceeded"}
+    assert data["health"] is None
+    assert data["boards"] and data["story_point_field"]
+    assert response.headers["X-Partial-Result"] == "deadline"
+
+
+def test_missing_credentials(monkeypatch):
+    monkeypatch.setitem(
+        proxy.JIRA_INSTANCES,
+        "default",
+        proxy.JiraInstance(
+            "default",
+            {"jira_url": "http://127.0.0.1:9", "email": "", "api_token": ""},
+        ),
+    )
+    response, data = get_bootstrap()
+    assert response.status_code == 200
+    assert data["aging_thresholds"] == proxy.AGING_THRESHOLDS
+    assert set(data["errors"]) == {"boards", "story_point_field", "health"}
@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+import proxy
+
+
+@pytest.fixture
+def budget():
+    """A request budget that leaves about 0.1s to wait for a Jira connection"""
+    proxy._upstream.budget = proxy.RequestBudget(proxy.DEADLINE_MARGIN_SECONDS + 0.1)
+    yield proxy._upstream.budget
+    proxy._upstream.budget = None
+
+
+def half_open_session():
+    circuit = proxy.CircuitBreaker(failure_threshold=1, reset_seconds=0.01)
+    circuit.record_failure()
+    time.sleep(0.02)
+    assert circuit.state == "half-open"
+    return proxy.JiraSession(circuit=circuit, max_concurrent=1)
+
+
+def test_half_open_trial_not_lost_waiting_for_a_slot(budget):
+    session = half_open_session()
+    session._slots.acquire()
+    with pytest.raises(proxy.DeadlineExceededError):
+        session.get("http://jira.invalid/rest/api/3/serverInfo")
+    session._slots.release()
+
+    # The call that timed out never claimed the trial, so one can still go through
+    assert session.circuit.allow()
+    assert not session.circuit.allow()
+
+
+def test_open_circuit_releases_the_slot(budget):
+    circuit = proxy.CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    circuit.record_failure()
+    session = proxy.JiraSession(circuit=circuit, max_concurrent=1)
+    for _ in range(3):
+        with pytest.raises(proxy.JiraUnavailableError):
+            session.get("http://jira.invalid/rest/api/3/serverInfo")
+    assert session._slots.acquire(timeout=0)
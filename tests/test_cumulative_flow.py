@@ -0,0 +1,128 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import proxy
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def day_by_day(events, stage_count, start, days, initial_counts):
+    """The counts at each day's end, summing every event up to it"""
+    series = [[] for _ in range(stage_count)]
+    for day in range(days):
+        day_end = (start + timedelta(days=day + 1)).timestamp()
+        counts = list(initial_counts)
+        for at, stage, delta in events:
+            if at < day_end:
+                counts[stage] += delta
+        for stage in range(stage_count):
+            series[stage].append(counts[stage])
+    return series
+
+
+def issue_events(rng, stage_count):
+    """Enter/leave events of one issue moving forward through the stages"""
+    at = (START + timedelta(days=rng.uniform(-10, 20))).timestamp()
+    stage = 0
+    events = [(at, stage, 1)]
+    while stage < stage_count - 1 and rng.random() < 0.7:
+        at += rng.uniform(0, 5 * 86400)
+        events.append((at, stage, -1))
+        stage += 1
+        events.append((at, stage, 1))
+    return events
+
+
+def test_sweep_matches_counting_each_day():
+    rng = random.Random(5)
+    events = [event for _ in range(300) for event in issue_events(rng, 5)]
+    initial = [0, 0, 0, 0, 12]
+    expected = day_by_day(events, 5, START, 30, initial)
+
+    rng.shuffle(events)
+    assert proxy.sweep_cumulative_flow(events, 5, START, 30, initial) == expected
+
+
+def test_events_on_a_day_boundary_count_for_the_next_day():
+    boundary = (START + timedelta(days=1)).timestamp()
+    series = proxy.sweep_cumulative_flow([(boundary, 0, 1)], 1, START, 3)
+    assert series == [[0, 1, 1]]
+
+
+def test_no_events():
+    assert proxy.sweep_cumulative_flow([], 2, START, 2, [3, 0]) == [[3, 3], [0, 0]]
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime(2025, 6, 15, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def flow(fake_jira, monkeypatch):
+    """Frozen time and a fake that only treats ``updated`` as the probe's filter"""
+    monkeypatch.setattr(proxy, "datetime", FrozenDatetime)
+    proxy.CFD_CACHE.clear()
+    fake = fake_jira(["FLOW"], 200)
+    search = fake.search
+
+    def without_done_before_window(jql):
+        # Every fake issue has been updated in the window, so none is counted
+        # by the probe and all of them come with their changelogs
+        if 'updated < "' in jql:
+            return []
+        return search(jql)
+
+    fake.search = without_done_before_window
+    yield fake
+    proxy.CFD_CACHE.clear()
+
+
+def get_flow(**query):
+    query.setdefault("jql", "project = FLOW ORDER BY created DESC")
+    response = proxy.app.test_client().get("/proxy/cumulative-flow", query_string=query)
+    return response.status_code, response.get_json()
+
+
+def test_each_day_holds_every_issue_created_by_then(flow):
+    status, data = get_flow(days=30)
+    assert status == 200
+    assert data["dates"][0] == "2025-05-17"
+    assert data["dates"][-1] == "2025-06-15"
+    assert data["issues_analyzed"] == 200
+    assert not data["truncated"]
+
+    created = sorted(
+        datetime.fromisoformat(issue["fields"]["created"])
+        for issue in flow.issues["FLOW"]
+    )
+    for day, date in enumerate(data["dates"]):
+        day_end = datetime.fromisoformat(date).replace(tzinfo=timezone.utc) + timedelta(
+            days=1
+        )
+        in_stages = sum(series[day] for series in data["series"].values())
+        assert in_stages == sum(1 for at in created if at < day_end)
+
+
+def test_done_band_only_grows(flow):
+    _, data = get_flow(days=60)
+    done = data["series"]["Done"]
+    assert done == sorted(done)
+    assert done[-1] > done[0]
+
+
+def test_flow_is_cached(flow):
+    _, first = get_flow(days=10)
+    calls = flow.calls
+    _, second = get_flow(days=10)
+    assert second == first
+    assert flow.calls == calls
+
+
+@pytest.mark.parametrize("days", [0, 4000])
+def test_days_out_of_range(flow, days):
+    status, _ = get_flow(days=days)
+    assert status == 400
@@ -0,0 +1,147 @@
+import pytest
+
+import proxy
+
+STAGE_HOURS = {"In Progress": 10, "Code Review": 5, "QA": 2}
+
+
+def issue(key, status, blocks=(), blocked_by=()):
+    """An issue listing its links on both ends, as Jira does"""
+    links = [{"type": {"name": "Blocks"}, "outwardIssue": {"key": k}} for k in blocks]
+    links += [
+        {"type": {"name": "Blocks"}, "inwardIssue": {"key": k}} for k in blocked_by
+    ]
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Issue {key}",
+            "status": {
+                "name": status,
+                "statusCategory": {
+                    "key": "done" if status == "Done" else "indeterminate"
+                },
+            },
+            "issuelinks": links,
+        },
+    }
+
+
+@pytest.fixture
+def graph():
+    """A-1 -> A-2 -> A-3 <- A-4, a cycle A-5 <-> A-6 and a done A-7 -> A-1"""
+    store = proxy.IssueStore()
+    graph = proxy.DependencyGraph()
+    store.subscribe(graph.on_store_event)
+    for stored in [
+        issue("A-1", "To Do", ["A-2"], ["A-7"]),
+        issue("A-2", "In Progress", ["A-3"], ["A-1"]),
+        issue("A-3", "In QA", [], ["A-2", "A-4"]),
+        issue("A-4", "Code Review", ["A-3"]),
+        issue("A-5", "In Progress", ["A-6"], ["A-6"]),
+        issue("A-6", "In Progress", ["A-5"], ["A-5"]),
+        issue("A-7", "Done", ["A-1"]),
+    ]:
+        store.upsert(stored)
+    graph.mark_refreshed("A", STAGE_HOURS)
+    return store, graph
+
+
+def keys(issues):
+    return [issue["key"] for issue in issues]
+
+
+def test_chains_critical_path_and_blockers(graph):
+    _, graph = graph
+    analysis = graph.analyze("A")
+
+    assert analysis["open_issues"] == 6
+    assert analysis["dependencies"] == 5
+    assert analysis["cycles"] == ["A-5", "A-6"]
+    assert [keys(chain) for chain in analysis["chains"]] == [["A-1", "A-2", "A-3"]]
+
+    # To Do counts every cycle-time stage, QA only itself
+    critical_path = analysis["critical_path"]
+    assert keys(critical_path["issues"]) == ["A-1", "A-2", "A-3"]
+    assert critical_path["estimated_hours"] == 17 + 17 + 2
+
+    assert [
+        (blocker["key"], blocker["longest_chain_behind"], blocker["hours_behind"])
+        for blocker in analysis["top_blockers"]
+    ] == [("A-1", 2, 19), ("A-2", 1, 2), ("A-4", 1, 2)]
+
+
+def test_updates_reach_the_analysis(graph):
+    store, graph = graph
+    first = graph.analyze("A")
+    assert graph.analyze("A") is first
+
+    store.upsert(issue("A-2", "Done", ["A-3"], ["A-1"]))
+    analysis = graph.analyze("A")
+    assert analysis is not first
+    assert [keys(chain) for chain in analysis["chains"]] == [["A-4", "A-3"]]
+    # A-1 on its own is still more work than A-4 and A-3 together
+    assert keys(analysis["critical_path"]["issues"]) == ["A-1"]
+    assert analysis["critical_path"]["estimated_hours"] == 17
+
+    store.delete("A-6")
+    assert graph.analyze("A")["cycles"] == []
+
+
+def test_links_to_issues_that_are_not_stored(graph):
+    store, graph = graph
+    # B-1 is in another project and only known from A-8's link
+    store.upsert(
+        {
+            "key": "A-8",
+            "fields": {
+                "summary": "Issue A-8",
+                "status": {"name": "To Do"},
+                "issuelinks": [
+                    {
+                        "type": {"name": "Blocks"},
+                        "inwardIssue": {
+                            "key": "B-1",
+                            "fields": {
+                                "summary": "Upstream work",
+                                "status": {"name": "In Progress"},
+                            },
+                        },
+                    }
+                ],
+            },
+        }
+    )
+    chains = graph.analyze("A")["chains"]
+    assert [keys(chain) for chain in chains] == [["A-1", "A-2", "A-3"], ["B-1", "A-8"]]
+    assert chains[1][0]["summary"] == "Upstream work"
+
+
+@pytest.fixture
+def linked(fake_jira, monkeypatch):
+    store = proxy.IssueStore()
+    graph = proxy.DependencyGraph()
+    store.subscribe(graph.on_store_event)
+    monkeypatch.setattr(proxy, "ISSUE_STORE", store)
+    monkeypatch.setattr(proxy, "DEPENDENCY_GRAPH", graph)
+    return fake_jira(["DEP"], 300)
+
+
+def test_routes_follow_the_fake_links(linked):
+    client = proxy.app.test_client()
+    data = client.get(
+        "/proxy/dependencies/critical-path", query_string={"board": "DEP"}
+    ).get_json()
+    assert data["graph_refreshed"]
+    path = keys(data["critical_path"]["issues"])
+    assert path
+    for blocker, blocked in zip(path, path[1:]):
+        links = linked.by_key[blocker]["fields"]["issuelinks"]
+        assert blocked in [link.get("outwardIssue", {}).get("key") for link in links]
+
+    calls = linked.calls
+    data = client.get(
+        "/proxy/dependencies/blockers", query_string={"board": "DEP", "limit": 3}
+    ).get_json()
+    assert not data["graph_refreshed"]
+    assert linked.calls == calls
+    assert len(data["top_blockers"]) == min(3, data["total_top_blockers"])
@@ -0,0 +1,124 @@
+import csv
+import io
+import sys
+
+import pytest
+
+import export
+import proxy
+
+
+@pytest.fixture
+def exported(fake_jira, monkeypatch):
+    monkeypatch.setattr(proxy, "EXPORT_BATCH_ROWS", 25)
+    return fake_jira(["EXP"], 120)
+
+
+def get_export(**query):
+    query.setdefault("jql", "project = EXP ORDER BY created DESC")
+    return proxy.app.test_client().get("/proxy/export", query_string=query)
+
+
+def read_csv(data):
+    return list(csv.DictReader(io.StringIO(data.decode())))
+
+
+def test_issues_as_csv(exported):
+    response = get_export(board="EXP")
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert 'filename="EXP-issues.csv"' in response.headers["Content-Disposition"]
+
+    rows = read_csv(response.data)
+    expected = exported.search("project = EXP ORDER BY created DESC")
+    assert [row["key"] for row in rows] == [issue["key"] for issue in expected]
+    assert rows[0]["status"] == expected[0]["fields"]["status"]["name"]
+    assert rows[0]["created"] == expected[0]["fields"]["created"]
+
+
+def test_transitions_and_stage_periods(exported):
+    histories = sum(
+        len(issue["changelog"]["histories"]) for issue in exported.issues["EXP"]
+    )
+    transitions = read_csv(get_export(table="transitions").data)
+    assert len(transitions) == histories
+    assert {row["to_status"] for row in transitions} <= {
+        "In Progress",
+        "Code Review",
+        "In QA",
+        "Done",
+    }
+
+    # One period per status an issue has been in, the last one still open
+    periods = read_csv(get_export(table="stage_periods").data)
+    assert len(periods) == histories + 120
+    assert sum(row["is_open"] == "True" for row in periods) == 120
+    assert all(float(row["duration_hours"]) >= 0 for row in periods)
+
+
+def test_rows_are_written_a_batch_at_a_time(exported):
+    issues = exported.search("project = EXP")
+    chunks = list(proxy.iter_export_chunks("issues", "csv", iter(issues)))
+    # Five batches of 25 rows, then whatever is left (nothing)
+    assert len(chunks) == 6
+    assert chunks[-1] == b""
+    assert len(read_csv(b"".join(chunks))) == 120
+
+
+def test_max_results(exported):
+    rows = read_csv(get_export(maxResults=30).data)
+    assert len(rows) == 30
+
+
+def test_errors_come_before_the_download(exported):
+    exported.handle_post = lambda path, body: (500, {"errorMessages": ["Boom"]})
+    response = get_export()
+    assert response.status_code == 500
+    assert "error" in response.get_json()
+
+
+@pytest.mark.parametrize("query", [{"table": "sprints"}, {"format": "xlsx"}])
+def test_bad_parameters(exported, query):
+    assert get_export(**query).status_code == 400
+
+
+def test_columnar_formats_need_pyarrow(exported, monkeypatch):
+    monkeypatch.setattr(proxy.importlib.util, "find_spec", lambda name: None)
+    response = get_export(format="parquet")
+    assert response.status_code == 400
+    assert "pyarrow" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("export_format", ["arrow", "parquet"])
+def test_columnar_formats(exported, export_format):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    data = get_export(format=export_format).data
+    if export_format == "arrow":
+        table = pyarrow.ipc.open_stream(data).read_all()
+    else:
+        table = pyarrow.parquet.read_table(pyarrow.BufferReader(data))
+    assert table.num_rows == 120
+    assert str(table.schema.field("created").type) == "timestamp[us, tz=UTC]"
+
+
+def test_command_line_export(exported, monkeypatch, tmp_path):
+    output = tmp_path / "out.csv"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "export.py",
+            "--board",
+            "EXP",
+            "--table",
+            "transitions",
+            "--output",
+            str(output),
+        ],
+    )
+    export.main()
+    transitions = read_csv(get_export(board="EXP", table="transitions").data)
+    assert read_csv(output.read_bytes()) == transitions
@@ -0,0 +1,145 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import proxy
+
+HISTORY = [5, 8, 3, 10, 6, 0, 7, 9, 4, 6, 5, 8]
+NOW = datetime(2025, 12, 3, 12, tzinfo=timezone.utc)
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+def week_by_week(weekly_throughput, items, simulations, rng):
+    """Weeks each simulation needs for ``items``, drawing one week at a time"""
+    needed = []
+    for _ in range(simulations):
+        done = weeks = 0
+        while done < items:
+            done += rng.choice(weekly_throughput)
+            weeks += 1
+        needed.append(weeks)
+    return sorted(needed)
+
+
+def test_constant_throughput_is_exact():
+    rng = random.Random(1)
+    assert proxy.forecast_completion_weeks([5] * 4, 20, 100, rng) == {
+        "p50": 4,
+        "p85": 4,
+        "p95": 4,
+    }
+    assert set(proxy.forecast_completion_weeks([5] * 4, 21, 100, rng).values()) == {5}
+    assert set(proxy.forecast_items_by([5] * 4, 7, 100, rng).values()) == {35}
+
+
+def test_nothing_to_do_and_never_done():
+    rng = random.Random(1)
+    assert set(proxy.forecast_completion_weeks(HISTORY, 0, 100, rng).values()) == {0}
+    assert set(proxy.forecast_items_by(HISTORY, 0, 100, rng).values()) == {0}
+    assert proxy.forecast_completion_weeks([0, 0, 1], 10000, 100, rng) == {
+        "p50": None,
+        "p85": None,
+        "p95": None,
+    }
+
+
+@pytest.mark.parametrize("items", [1, 7, 50, 400])
+def test_completion_matches_drawing_week_by_week(items):
+    simulations = 4000
+    forecast = proxy.forecast_completion_weeks(
+        HISTORY, items, simulations, random.Random(1)
+    )
+    needed = week_by_week(HISTORY, items, simulations, random.Random(2))
+    for name, confidence in proxy.STAGE_PERCENTILES.items():
+        expected = needed[int(confidence * simulations) - 1]
+        assert abs(forecast[name] - expected) <= 1
+    assert forecast["p50"] <= forecast["p85"] <= forecast["p95"]
+
+
+@pytest.mark.parametrize("weeks", [1, 2, 5, 52])
+def test_items_by_matches_drawing_week_by_week(weeks):
+    simulations = 4000
+    forecast = proxy.forecast_items_by(HISTORY, weeks, simulations, random.Random(1))
+    rng = random.Random(2)
+    done = sorted(sum(rng.choices(HISTORY, k=weeks)) for _ in range(simulations))
+    for name, confidence in proxy.STAGE_PERCENTILES.items():
+        expected = done[int((1 - confidence) * (simulations - 1))]
+        assert abs(forecast[name] - expected) <= max(2, expected * 0.03)
+    assert forecast["p50"] >= forecast["p85"] >= forecast["p95"]
+
+
+def test_largest_forecast_is_quick():
+    rng = random.Random(1)
+    started = time.perf_counter()
+    proxy.forecast_completion_weeks(HISTORY, 1000, proxy.FORECAST_MAX_SIMULATIONS, rng)
+    proxy.forecast_items_by(
+        HISTORY, proxy.FORECAST_MAX_WEEKS, proxy.FORECAST_MAX_SIMULATIONS, rng
+    )
+    assert time.perf_counter() - started < 1.0
+
+
+@pytest.fixture
+def forecasting(fake_jira, monkeypatch):
+    monkeypatch.setattr(proxy, "datetime", FrozenDatetime)
+    proxy.FORECAST_CACHE.clear()
+    yield fake_jira(["FC"], 400)
+    proxy.FORECAST_CACHE.clear()
+
+
+def get_forecast(**query):
+    response = proxy.app.test_client().get(
+        "/proxy/forecast", query_string={"board": "FC", **query}
+    )
+    return response.status_code, response.get_json()
+
+
+def test_route_forecasts_from_the_resolved_issues(forecasting):
+    status, data = get_forecast(items=30, date="2026-01-31")
+    assert status == 200
+
+    buckets = proxy.build_week_buckets(NOW, proxy.FORECAST_HISTORY_WEEKS + 1)[:-1]
+    resolved = [
+        proxy.parse_jira_datetime(issue["fields"]["resolutiondate"])
+        for issue in forecasting.issues["FC"]
+        if issue["fields"]["resolutiondate"]
+    ]
+    assert [week["throughput"] for week in data["history"]] == [
+        sum(bucket["start"] <= moment < bucket["end"] for moment in resolved)
+        for bucket in buckets
+    ]
+
+    completion = data["completion"]
+    assert completion["p50"]["weeks"] <= completion["p85"]["weeks"]
+    assert completion["p85"]["weeks"] <= completion["p95"]["weeks"]
+    weeks = completion["p50"]["weeks"]
+    assert completion["p50"]["date"] == str(NOW.date() + timedelta(weeks=weeks))
+    by_date = data["by_date"]
+    assert by_date["weeks"] == 9
+    assert by_date["items"]["p50"] >= by_date["items"]["p85"] >= by_date["items"]["p95"]
+
+    calls = forecasting.calls
+    assert get_forecast(items=30, date="2026-01-31")[1] == data
+    assert forecasting.calls == calls
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"simulations": proxy.FORECAST_MAX_SIMULATIONS + 1},
+        {"simulations": 0},
+        {"weeks": proxy.FORECAST_MAX_HISTORY_WEEKS + 1},
+        {"date": "2025-11-30"},
+        {"date": "31/12/2026"},
+    ],
+)
+def test_bad_parameters(forecasting, query):
+    status, data = get_forecast(items=30, **query)
+    assert status == 400
+    assert data["error"]
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+import proxy
+
+ISSUES = [
+    {"key": "ABC-1", "fields": {"summary": 'Quote " and backslash \\ in a summary'}},
+    {"key": "ABC-2", "fields": {"summary": "Brackets ] } [ { and , inside a string"}},
+    {"key": "ABC-3", "fields": {"summary": "Unicode: café ☃ \U0001f600"}},
+    {"key": "ABC-4", "fields": {"summary": "Escaped \\u0041 \\n and a real\nnewline"}},
+    {"key": "ABC-5", "fields": {"story_points": 12345.5, "labels": []}},
+    1234567,
+]
+
+
+def body(ensure_ascii):
+    document = {
+        "startAt": 0,
+        "names": {"summary": "Summary"},
+        "issues": ISSUES,
+        "total": 1234567,
+    }
+    return json.dumps(document, ensure_ascii=ensure_ascii).encode()
+
+
+def parse(chunks):
+    meta = {}
+    items = list(proxy.iter_json_array_items(chunks, "issues", meta))
+    return items, meta
+
+
+@pytest.fixture
+def small_reads(monkeypatch):
+    """Make the parser read one chunk at a time, as it would on a large body"""
+    monkeypatch.setattr(proxy, "STREAM_CHUNK_SIZE", 1)
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_every_split_point(small_reads, ensure_ascii):
+    raw = body(ensure_ascii)
+    for split in range(len(raw) + 1):
+        items, meta = parse([raw[:split], raw[split:]])
+        assert items == ISSUES, split
+        assert meta == {
+            "startAt": 0,
+            "names": {"summary": "Summary"},
+            "total": 1234567,
+        }, split
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_one_byte_chunks(small_reads, ensure_ascii):
+    raw = body(ensure_ascii)
+    items, meta = parse(raw[i : i + 1] for i in range(len(raw)))
+    assert items == ISSUES
+    assert meta["total"] == 1234567
+
+
+def test_items_are_yielded_before_the_body_ends(small_reads):
+    raw = json.dumps({"issues": ISSUES * 100}).encode()
+    sent = []
+
+    def chunks():
+        for i in range(len(raw)):
+            sent.append(i)
+            yield raw[i : i + 1]
+
+    items = proxy.iter_json_array_items(chunks(), "issues", {})
+    assert next(items) == ISSUES[0]
+    # Reads run at most about twice past what's been parsed
+    assert len(sent) < 3 * raw.index(b"ABC-2")
+
+
+def test_empty_array_and_object(small_reads):
+    assert parse([b'{"issues": [], "total": 0}']) == ([], {"total": 0})
+    assert parse([b"{ }"]) == ([], {})
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [b'{"issues": [1, 2', b'{"issues": [1 2]}', b'{"issues": [1], "total" 2}', b""],
+)
+def test_malformed_bodies_raise(small_reads, raw):
+    with pytest.raises(ValueError):
+        parse([raw])
+
+
+@pytest.mark.parametrize("search_api", ["jql", "offset"])
+def test_streamed_searches_match_the_decoded_issues(fake_jira, monkeypatch, search_api):
+    monkeypatch.setattr(proxy, "STREAM_CHUNK_SIZE", 97)
+    fake = fake_jira(["STREAM"], 130)
+    proxy.JIRA_INSTANCES["default"].search_api = search_api
+    jql = "project = STREAM ORDER BY created ASC"
+
+    def fetch():
+        return list(
+            proxy.iter_search_issues(
+                proxy.get_jira_headers(), jql, ["created"], expand=["changelog"]
+            )
+        )
+
+    issues = proxy.run_with_budget(
+        proxy.RequestBudget(30, proxy.JIRA_INSTANCES["default"]), fetch
+    )
+    # Round-tripped the way the fake sent them
+    assert issues == json.loads(json.dumps(fake.search(jql)))
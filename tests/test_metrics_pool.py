@@ -0,0 +1,81 @@
+from concurrent.futures import Future
+from datetime import datetime, timezone
+
+import pytest
+
+import proxy
+from loadtest import make_fake_issues
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+@pytest.fixture
+def issues(monkeypatch):
+    """Frozen time and 600 issues, analyzed in chunks of 50 and pooled after 100"""
+    monkeypatch.setattr(proxy, "datetime", FrozenDatetime)
+    monkeypatch.setattr(proxy, "METRICS_CHUNK_SIZE", 50)
+    monkeypatch.setattr(proxy, "METRICS_PARALLEL_MIN_ISSUES", 100)
+    yield make_fake_issues("POOL", 600, seed=7)
+    proxy.reset_metrics_process_pool()
+
+
+def metrics(issues, percentiles):
+    acc = proxy.analyze_issues_for_metrics(iter(issues), True, 0.167, percentiles)
+    return proxy.finalize_resolution_metrics(acc, True, 0.167)
+
+
+def serial(issues, percentiles, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(proxy, "METRICS_WORKERS", 1)
+        return metrics(issues, percentiles)
+
+
+@pytest.mark.parametrize("percentiles", [False, True])
+def test_pool_matches_serial(issues, monkeypatch, percentiles):
+    expected = serial(issues, percentiles, monkeypatch)
+    monkeypatch.setattr(proxy, "METRICS_WORKERS", 2)
+    assert metrics(issues, percentiles) == expected
+    assert proxy._metrics_pool is not None
+    assert expected["total_issues"] == 600
+
+
+def test_small_searches_stay_inline(issues, monkeypatch):
+    monkeypatch.setattr(proxy, "METRICS_WORKERS", 2)
+    monkeypatch.setattr(proxy, "METRICS_PARALLEL_MIN_ISSUES", 1000)
+    proxy.reset_metrics_process_pool()
+    metrics(issues, False)
+    assert proxy._metrics_pool is None
+
+
+class BrokenPool:
+    def __init__(self, fail_on_submit):
+        self.fail_on_submit = fail_on_submit
+        self.submitted = 0
+
+    def submit(self, *args):
+        self.submitted += 1
+        if self.fail_on_submit:
+            raise proxy.BrokenProcessPool("gone")
+        future = Future()
+        future.set_exception(proxy.BrokenProcessPool("gone"))
+        return future
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+@pytest.mark.parametrize("fail_on_submit", [True, False])
+def test_broken_pool_falls_back_to_serial(issues, monkeypatch, fail_on_submit):
+    expected = serial(issues, True, monkeypatch)
+    pool = BrokenPool(fail_on_submit)
+    monkeypatch.setattr(proxy, "METRICS_WORKERS", 2)
+    monkeypatch.setattr(proxy, "get_metrics_process_pool", lambda: pool)
+
+    assert metrics(issues, True) == expected
+    assert pool.submitted
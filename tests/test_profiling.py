@@ -0,0 +1,85 @@
+import pytest
+
+import proxy
+
+SECRET = "profile-secret"
+
+
+@pytest.fixture
+def profiling(fake_jira, monkeypatch, tmp_path):
+    monkeypatch.setattr(proxy, "PROFILE_SECRET", SECRET)
+    monkeypatch.setattr(proxy, "PROFILE_DIR", str(tmp_path))
+    return fake_jira(["PROF", "OTHER"], 50, latency=0.05)
+
+
+def aggregate(headers=None, **query):
+    return proxy.app.test_client().get(
+        "/proxy/resolution-metrics/aggregate",
+        query_string={"projects": "PROF,OTHER", **query},
+        headers=headers or {},
+    )
+
+
+def download(profile_id, profile_format="folded", secret=SECRET):
+    return proxy.app.test_client().get(
+        f"/profiles/{profile_id}",
+        query_string={"format": profile_format},
+        headers={"X-Profile": secret},
+    )
+
+
+def test_profile_covers_the_request_and_its_workers(profiling):
+    response = aggregate({"X-Profile": SECRET})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    folded = download(profile_id)
+    assert folded.status_code == 200
+    stacks = folded.data.decode().splitlines()
+    assert stacks
+    roots = {line.split(";", 1)[0] for line in stacks}
+    assert roots == {"request", "worker"}
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in stacks)
+
+    stats = download(profile_id, "json").get_json()
+    assert stats["samples"] > 0
+    assert stats["allocations"]["peak_bytes"] > 0
+    assert stats["allocations"]["top"]
+
+
+def test_allocations_can_be_left_out(profiling):
+    response = aggregate({"X-Profile": SECRET}, profileAllocations="false")
+    stats = download(response.headers["X-Profile-Id"], "json").get_json()
+    assert stats["allocations"] is None
+    assert stats["samples"] > 0
+
+
+@pytest.mark.parametrize("headers", [None, {"X-Profile": "wrong"}])
+def test_requests_without_the_secret_are_not_profiled(profiling, headers):
+    response = aggregate(headers)
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+
+
+def test_profiling_is_disabled_without_a_secret(profiling, monkeypatch):
+    monkeypatch.setattr(proxy, "PROFILE_SECRET", "")
+    assert "X-Profile-Id" not in aggregate({"X-Profile": SECRET}).headers
+    assert download("anything", secret="").status_code == 403
+
+
+def test_downloads(profiling):
+    profile_id = aggregate({"X-Profile": SECRET}).headers["X-Profile-Id"]
+    assert download(profile_id, secret="wrong").status_code == 403
+    assert download(profile_id, "svg").status_code == 400
+    assert download("no-such-profile").status_code == 404
+
+
+def test_one_request_is_profiled_at_a_time():
+    first = proxy.RequestProfile.start(allocations=False)
+    try:
+        assert proxy.RequestProfile.start(allocations=False) is None
+    finally:
+        first.stop()
+    second = proxy.RequestProfile.start(allocations=False)
+    assert second is not None
+    second.stop()
@@ -0,0 +1,65 @@
+import random
+
+import proxy
+
+FRACTIONS = [0.01, 0.1, 0.25, 0.5, 0.75, 0.85, 0.9, 0.95, 0.99]
+
+
+def rank_errors(sketch, values):
+    """Distance between each estimate's rank and the rank asked for, as a fraction"""
+    ordered = sorted(values)
+    errors = []
+    for fraction, estimate in zip(FRACTIONS, sketch.quantiles(FRACTIONS)):
+        below = sum(1 for value in ordered if value < estimate)
+        at_or_below = sum(1 for value in ordered if value <= estimate)
+        target = fraction * len(ordered)
+        if below <= target <= at_or_below:
+            errors.append(0)
+        else:
+            errors.append(min(abs(below - target), abs(at_or_below - target)))
+    return [error / len(ordered) for error in errors]
+
+
+def test_exact_until_first_compaction():
+    rng = random.Random(1)
+    values = [rng.uniform(0, 1000) for _ in range(150)]
+    sketch = proxy.QuantileSketch(k=200)
+    for value in values:
+        sketch.add(value)
+    assert sketch.exact
+    assert max(rank_errors(sketch, values)) == 0
+    assert sketch.quantiles([0, 1]) == [min(values), max(values)]
+
+
+def test_rank_error_against_exact_quantiles():
+    rng = random.Random(2)
+    # Skewed, like stage durations
+    values = [rng.lognormvariate(3, 1.5) for _ in range(50000)]
+    sketch = proxy.QuantileSketch(k=200)
+    for value in values:
+        sketch.add(value)
+    assert not sketch.exact
+    assert sketch.size <= 3 * sketch.k
+    assert max(rank_errors(sketch, values)) <= 1.7 / sketch.k
+
+
+def test_merged_sketches_keep_the_bound():
+    rng = random.Random(3)
+    parts = [[rng.expovariate(1 / 40) for _ in range(8000)] for _ in range(6)]
+    merged = proxy.QuantileSketch(k=200)
+    for part in parts:
+        sketch = proxy.QuantileSketch(k=200)
+        for value in part:
+            sketch.add(value)
+        merged.merge(sketch)
+
+    values = [value for part in parts for value in part]
+    assert merged.count == len(values)
+    assert merged.min == min(values) and merged.max == max(values)
+    assert max(rank_errors(merged, values)) <= 1.7 / merged.k
+
+
+def test_empty_sketch():
+    sketch = proxy.QuantileSketch(k=200)
+    assert sketch.quantiles([0.5]) == [None]
+    assert sketch.merge(proxy.QuantileSketch(k=200)).count == 0
@@ -0,0 +1,93 @@
+import os
+import time
+
+import pytest
+import requests
+
+import proxy
+
+
+def use_session(mode, cassette_dir, replay_latency="0"):
+    instance = proxy.JIRA_INSTANCES["default"]
+    instance.session = proxy.JiraSession(
+        mode, str(cassette_dir), replay_latency, circuit=instance.circuit
+    )
+    return instance.session
+
+
+def metrics():
+    proxy.METRICS_CACHE.clear()
+    response = proxy.app.test_client().get(
+        "/proxy/resolution-metrics",
+        query_string={"jql": "project = REC ORDER BY created DESC"},
+    )
+    proxy.METRICS_CACHE.clear()
+    return response.status_code, response.get_json()
+
+
+@pytest.fixture
+def recorded(fake_jira, tmp_path):
+    """Record the metrics of a fake project, then point the instance at a dead host"""
+    fake = fake_jira(["REC"], 150)
+    session = use_session("record", tmp_path)
+    live = metrics()
+    session.get(f"{proxy.jira_credentials()['jira_url']}/rest/api/3/field")
+    proxy.JIRA_INSTANCES["default"].credentials["jira_url"] = "http://127.0.0.1:9"
+    return fake, live
+
+
+def test_replay_serves_the_recorded_responses(recorded, tmp_path):
+    fake, live = recorded
+    assert live[0] == 200
+    assert os.listdir(tmp_path)
+
+    calls = fake.calls
+    use_session("replay", tmp_path)
+    status, replayed = metrics()
+    assert fake.calls == calls
+    assert status == 200
+    # Open durations run until now, so only the closed ones match exactly
+    assert replayed["current_status"] == live[1]["current_status"]
+    for stage, stage_metrics in replayed["stage_metrics"].items():
+        assert (
+            stage_metrics["closed_hours"]
+            == live[1]["stage_metrics"][stage]["closed_hours"]
+        )
+
+
+def test_missing_recordings_fail_like_connection_errors(recorded, tmp_path):
+    session = use_session("replay", tmp_path)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get("http://jira.example/rest/api/3/field", params={"x": "1"})
+
+
+def test_requests_match_regardless_of_host_and_query_order(tmp_path):
+    session = proxy.JiraSession("replay", str(tmp_path))
+    assert session.cassette_path(
+        "get",
+        "https://a.example/rest/agile/1.0/board?startAt=0&maxResults=50",
+        None,
+        None,
+    ) == session.cassette_path(
+        "GET",
+        "https://b.example/rest/agile/1.0/board",
+        {"maxResults": "50", "startAt": "0"},
+        None,
+    )
+    assert session.cassette_path(
+        "POST", "https://a.example/rest/api/3/search/jql", None, {"jql": "a"}
+    ) != session.cassette_path(
+        "POST", "https://a.example/rest/api/3/search/jql", None, {"jql": "b"}
+    )
+
+
+def test_replay_latency(recorded, tmp_path):
+    session = use_session("replay", tmp_path, replay_latency="0.2")
+    started = time.monotonic()
+    assert session.get("http://any/rest/api/3/field").status_code == 200
+    assert time.monotonic() - started >= 0.2
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        proxy.JiraSession("rewind")
@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+
+import proxy
+
+
+def record_searches(fake, unavailable=False):
+    """Record the path of every search the fake serves; optionally 410 the token-paged one"""
+    paths = []
+    handle_post = fake.handle_post
+
+    def recorded(path, body):
+        paths.append(path)
+        if unavailable and path == "/rest/api/3/search/jql":
+            return 410, {"errorMessages": ["Gone"]}
+        return handle_post(path, body)
+
+    fake.handle_post = recorded
+    return paths
+
+
+def search(jql, max_issues=None, consume=list):
+    def fetch():
+        return consume(
+            proxy.iter_search_issues(
+                proxy.get_jira_headers(),
+                jql,
+                ["created", "status"],
+                max_issues=max_issues,
+            )
+        )
+
+    return proxy.run_with_budget(
+        proxy.RequestBudget(30, proxy.JIRA_INSTANCES["default"]), fetch
+    )
+
+
+def keys(issues):
+    return [issue["key"] for issue in issues]
+
+
+@pytest.mark.parametrize("max_issues", [None, 100, 250, 1])
+def test_token_paging(fake_jira, max_issues):
+    fake = fake_jira(["PAGE"], 250)
+    paths = record_searches(fake)
+    jql = "project = PAGE ORDER BY created DESC"
+
+    expected = keys(fake.search(jql))[:max_issues]
+    assert keys(search(jql, max_issues)) == expected
+    assert set(paths) == {"/rest/api/3/search/jql"}
+    assert proxy.current_instance().search_api == "jql"
+
+
+def test_falls_back_to_offset_paging(fake_jira):
+    fake = fake_jira(["PAGE"], 250)
+    paths = record_searches(fake, unavailable=True)
+    jql = "project = PAGE ORDER BY created ASC"
+
+    assert keys(search(jql)) == keys(fake.search(jql))
+    assert paths[0] == "/rest/api/3/search/jql"
+    assert set(paths[1:]) == {"/rest/api/3/search"}
+    assert proxy.JIRA_INSTANCES["default"].search_api == "offset"
+
+
+def test_at_most_about_a_page_is_read_ahead(fake_jira):
+    fake = fake_jira(["PAGE"], 1000)
+    paths = record_searches(fake)
+
+    def consume_slowly(issues):
+        first = next(issues)
+        time.sleep(0.3)
+        read_ahead = len(paths)
+        issues.close()
+        return first, read_ahead
+
+    threads = threading.active_count()
+    _, read_ahead = search(
+        "project = PAGE ORDER BY created DESC", consume=consume_slowly
+    )
+    # The page being consumed and the one waiting for room in the queue
+    assert read_ahead <= 2
+    time.sleep(0.3)
+    assert len(paths) == read_ahead
+    assert threading.active_count() <= threads
+
+
+def test_errors_reach_the_consumer(fake_jira):
+    fake = fake_jira(["PAGE"], 250)
+    handle_post = fake.handle_post
+
+    def failing(path, body):
+        if body.get("nextPageToken"):
+            return 500, {"errorMessages": ["Boom"]}
+        return handle_post(path, body)
+
+    fake.handle_post = failing
+    with pytest.raises(proxy.JiraAPIError):
+        search("project = PAGE ORDER BY created DESC")
+
+
+def test_dashboard_search_pages_with_tokens(fake_jira):
+    fake = fake_jira(["PAGE"], 250)
+    paths = record_searches(fake)
+    client = proxy.app.test_client()
+    jql = "project = PAGE ORDER BY created DESC"
+
+    pages = []
+    token = None
+    while True:
+        query = {"jql": jql, "maxResults": 100}
+        if token:
+            query["nextPageToken"] = token
+        data = client.get("/proxy/search", query_string=query).get_json()
+        pages.append(keys(data["issues"]))
+        token = data.get("nextPageToken")
+        if not token:
+            break
+
+    assert [key for page in pages for key in page] == keys(fake.search(jql))
+    assert set(paths) == {"/rest/api/3/search/jql"}
+
+    data = client.get(
+        "/proxy/search", query_string={"jql": jql, "startAt": 200}
+    ).get_json()
+    assert keys(data["issues"]) == keys(fake.search(jql))[200:]
+    assert paths[-1] == "/rest/api/3/search"
+
+
+def test_dashboard_search_falls_back_to_offset(fake_jira):
+    fake = fake_jira(["PAGE"], 30)
+    paths = record_searches(fake, unavailable=True)
+    jql = "project = PAGE ORDER BY created DESC"
+
+    response = proxy.app.test_client().get("/proxy/search", query_string={"jql": jql})
+    assert response.status_code == 200
+    assert keys(response.get_json()["issues"]) == keys(fake.search(jql))
+    assert paths == ["/rest/api/3/search/jql", "/rest/api/3/search"]
+    assert proxy.JIRA_INSTANCES["default"].search_api == "offset"
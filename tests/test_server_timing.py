@@ -0,0 +1,70 @@
+import re
+
+import pytest
+
+import proxy
+
+
+def phases(header):
+    return {
+        name: float(duration)
+        for name, duration in re.findall(r"(?:^|, )([\w-]+);dur=([\d.]+)", header)
+    }
+
+
+@pytest.fixture
+def sharded(monkeypatch):
+    """Fetch searches of more than 600 issues as shards of about 300"""
+    monkeypatch.setattr(proxy, "SHARD_MIN_ISSUES", 600)
+    monkeypatch.setattr(proxy, "SHARD_TARGET_ISSUES", 300)
+    monkeypatch.setattr(proxy, "SHARD_MAX_WORKERS", 4)
+    # Small buffers, so shard threads spend time blocked on them
+    monkeypatch.setattr(proxy, "SHARD_BUFFER_ISSUES", 50)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_phases_stay_within_total(fake_jira, sharded, monkeypatch, workers):
+    fake_jira(["TIME"], 2000, latency=0.01)
+    monkeypatch.setattr(proxy, "METRICS_WORKERS", workers)
+    monkeypatch.setattr(proxy, "METRICS_PARALLEL_MIN_ISSUES", 500)
+    monkeypatch.setattr(proxy, "METRICS_CHUNK_SIZE", 250)
+
+    # A different maxResults for each case, so neither is served from cache
+    response = proxy.app.test_client().get(
+        "/proxy/resolution-metrics",
+        query_string={
+            "jql": "project = TIME ORDER BY created DESC",
+            "maxResults": 5000 + workers,
+        },
+    )
+    assert response.status_code == 200
+    assert response.get_json()["total_issues"] == 2000
+    timing = phases(response.headers["Server-Timing"])
+    assert timing["analysis"] > 0
+
+    reported = [timing.get(phase, 0) for phase in ("decode", "analysis", "serialize")]
+    assert sum(reported) <= timing["total"]
+
+
+def test_worker_threads_do_not_add_phases():
+    budget = proxy.RequestBudget()
+
+    def in_worker():
+        with proxy.server_timing("decode"):
+            pass
+
+    with proxy.ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(proxy.run_with_budget, budget, in_worker).result()
+    assert budget.timings == {}
+
+
+def test_nested_phases_count_once():
+    budget = proxy.RequestBudget()
+    proxy._upstream.budget = budget
+    try:
+        for _ in proxy.iter_timed_consumer(range(3)):
+            with proxy.server_timing("decode"):
+                pass
+    finally:
+        proxy._upstream.budget = None
+    assert list(budget.timings) == ["analysis"]
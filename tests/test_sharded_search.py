@@ -0,0 +1,142 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import proxy
+
+SHARD_BOUNDS = [
+    datetime(2025, 5, 1, tzinfo=timezone.utc),
+    datetime(2025, 10, 1, tzinfo=timezone.utc),
+    datetime(2026, 1, 1, tzinfo=timezone.utc),
+]
+SHARDS = list(zip([None] + SHARD_BOUNDS, SHARD_BOUNDS + [None]))
+
+
+@pytest.fixture
+def sharded(fake_jira, monkeypatch):
+    """A 1000-issue project, fetched as the four SHARDS"""
+    monkeypatch.setattr(proxy, "SHARD_MIN_ISSUES", 100)
+    monkeypatch.setattr(proxy, "SHARD_MAX_WORKERS", 2)
+    monkeypatch.setattr(proxy, "SHARD_BUFFER_ISSUES", 20)
+    monkeypatch.setattr(
+        proxy, "plan_search_shards", lambda *args, **kwargs: list(SHARDS)
+    )
+    return fake_jira(["SHARD"], 1000)
+
+
+def search(jql, max_issues=None, budget_seconds=30):
+    budget = proxy.RequestBudget(budget_seconds, proxy.JIRA_INSTANCES["default"])
+
+    def fetch():
+        return [
+            issue["key"]
+            for issue in proxy.iter_sharded_search_issues(
+                proxy.get_jira_headers(), jql, ["created"], max_issues=max_issues
+            )
+        ]
+
+    return proxy.run_with_budget(budget, fetch), budget
+
+
+def shard_keys(fake, jql, shard):
+    return [
+        issue["key"]
+        for issue in fake.search(proxy.restrict_jql(jql, proxy.shard_clause(*shard)))
+    ]
+
+
+@pytest.mark.parametrize("direction", ["ASC", "DESC"])
+def test_shards_come_out_in_query_order(sharded, direction):
+    jql = f"project = SHARD ORDER BY created {direction}"
+    keys, budget = search(jql)
+    assert keys == [issue["key"] for issue in sharded.search(jql)]
+    assert not budget.partial
+
+
+def test_cap_stops_after_the_first_issues(sharded):
+    jql = "project = SHARD ORDER BY created DESC"
+    keys, _ = search(jql, max_issues=150)
+    assert keys == [issue["key"] for issue in sharded.search(jql)][:150]
+
+
+def test_issues_in_two_shards_come_out_once(sharded, monkeypatch):
+    jql = "project = SHARD ORDER BY created DESC"
+    expected = [issue["key"] for issue in sharded.search(jql)]
+    newest = sharded.search(jql)[0]
+    search_fake = sharded.search
+
+    def overlapping(jql):
+        # As if the newest issue also matched every other shard's range
+        issues = search_fake(jql)
+        if newest not in issues:
+            issues = issues + [newest]
+        return issues
+
+    sharded.search = overlapping
+    keys, _ = search(jql)
+    assert keys == expected
+
+
+def test_failing_shard_fails_the_search(sharded):
+    handle_post = sharded.handle_post
+
+    def failing(path, body):
+        if path == "/rest/api/3/search/jql" and "2025/10/01" in body["jql"]:
+            return 500, {"errorMessages": ["Boom"]}
+        return handle_post(path, body)
+
+    sharded.handle_post = failing
+    with pytest.raises(proxy.JiraAPIError):
+        search("project = SHARD ORDER BY created DESC")
+
+
+@pytest.mark.parametrize("failing_shard", [1, 2])
+def test_deadline_in_a_shard_ends_the_results(sharded, monkeypatch, failing_shard):
+    jql = "project = SHARD ORDER BY created DESC"
+    newest_first = SHARDS[::-1]
+    bound = proxy.shard_clause(*newest_first[failing_shard])
+    iter_search_issues = proxy.iter_search_issues
+
+    def out_of_time(jira_headers, shard_jql, *args, **kwargs):
+        if bound in shard_jql:
+            raise proxy.DeadlineExceededError()
+        return iter_search_issues(jira_headers, shard_jql, *args, **kwargs)
+
+    monkeypatch.setattr(proxy, "iter_search_issues", out_of_time)
+    keys, budget = search(jql)
+
+    expected = [
+        key
+        for shard in newest_first[:failing_shard]
+        for key in shard_keys(sharded, jql, shard)
+    ]
+    assert keys == expected
+    assert budget.partial
+
+
+def test_deadline_before_any_issue_is_raised(sharded, monkeypatch):
+    def out_of_time(*args, **kwargs):
+        raise proxy.DeadlineExceededError()
+
+    monkeypatch.setattr(proxy, "iter_search_issues", out_of_time)
+    with pytest.raises(proxy.DeadlineExceededError):
+        search("project = SHARD ORDER BY created DESC")
+
+
+def test_deadline_within_a_shard_drops_the_later_shards(sharded, monkeypatch):
+    jql = "project = SHARD ORDER BY created DESC"
+    newest_first = SHARDS[::-1]
+    bound = proxy.shard_clause(*newest_first[1])
+    fetch_page = proxy.fetch_token_search_page
+
+    def out_of_time(jira_headers, page_jql, *args, **kwargs):
+        if bound in page_jql and args[4]:
+            raise proxy.DeadlineExceededError()
+        return fetch_page(jira_headers, page_jql, *args, **kwargs)
+
+    monkeypatch.setattr(proxy, "fetch_token_search_page", out_of_time)
+    keys, budget = search(jql)
+
+    first_page = shard_keys(sharded, jql, newest_first[1])[: proxy.SEARCH_PAGE_SIZE]
+    assert keys == shard_keys(sharded, jql, newest_first[0]) + first_page
+    assert budget.partial
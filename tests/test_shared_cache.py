@@ -0,0 +1,61 @@
+import time
+
+import proxy
+
+
+def worker_cache(path, name="metrics"):
+    """A TTLCache as one worker process would have it, over a shared file"""
+    shared = proxy.SharedCache(str(path), 10**6, recheck_seconds=0.05)
+    return proxy.TTLCache(ttl_seconds=60, shared=shared, name=name)
+
+
+def test_entries_are_shared_between_workers(tmp_path):
+    path = tmp_path / "shared.db"
+    a, b = worker_cache(path), worker_cache(path)
+    a.set("key", {"value": 1}, tags=["ABC"])
+    assert b.get("key") == {"value": 1}
+
+
+def test_invalidation_reaches_other_workers_local_copies(tmp_path):
+    path = tmp_path / "shared.db"
+    a, b = worker_cache(path), worker_cache(path)
+    a.set("abc", 1, tags=["ABC"])
+    a.set("xyz", 2, tags=["XYZ"])
+    assert b.get("abc") == 1 and b.get("xyz") == 2
+
+    a.invalidate_tags(["ABC"])
+    time.sleep(0.1)
+    assert b.get("abc") is None
+    assert b.get("xyz") == 2
+
+
+def test_clear_reaches_the_shared_tier(tmp_path):
+    path = tmp_path / "shared.db"
+    a, b = worker_cache(path), worker_cache(path)
+    other = worker_cache(path, name="velocity")
+    a.set("key", 1)
+    other.set("key", 2)
+    assert b.get("key") == 1
+
+    a.clear()
+    time.sleep(0.1)
+    assert a.get("key") is None
+    assert b.get("key") is None
+    assert worker_cache(path, name="velocity").get("key") == 2
+
+
+def test_keys_of_another_version_are_not_read(tmp_path):
+    path = tmp_path / "shared.db"
+    worker_cache(path).set("key", 1)
+    shared = proxy.SharedCache(str(path), 10**6, version=2)
+    assert proxy.TTLCache(shared=shared, name="metrics").get("key") is None
+
+
+def test_eviction_keeps_the_store_under_its_size(tmp_path):
+    shared = proxy.SharedCache(str(tmp_path / "shared.db"), 20000)
+    for i in range(100):
+        shared.set(f"key{i}", "x" * 1000)
+    assert shared.get("key99") is not None
+    assert shared.get("key0") is None
+    (total,) = shared._connection().execute("SELECT SUM(size) FROM entries").fetchone()
+    assert total <= 20000
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+import proxy
+
+METRICS_KEY = proxy.make_cache_key(
+    "metrics", "project = SNAP ORDER BY created DESC", 500, True, 0.167, False
+)
+
+
+@pytest.fixture
+def empty_caches():
+    for cache in proxy.SNAPSHOT_SECTIONS.values():
+        if isinstance(cache, proxy.TTLCache):
+            cache.clear()
+    yield
+    for cache in proxy.SNAPSHOT_SECTIONS.values():
+        if isinstance(cache, proxy.TTLCache):
+            cache.clear()
+
+
+def snapshot_with(path, ttl_seconds):
+    """Write a snapshot of placeholder fields, boards and metrics entries"""
+    proxy.FIELD_CACHE.set("fields", [{"id": "old"}], ttl_seconds=ttl_seconds)
+    proxy.BOARD_CACHE.set("boards", {"boards": []}, ttl_seconds=ttl_seconds)
+    proxy.METRICS_CACHE.set(
+        METRICS_KEY, {"total_issues": -1}, ttl_seconds=ttl_seconds, tags=["SNAP"]
+    )
+    proxy.write_snapshot(str(path))
+    for cache in (proxy.FIELD_CACHE, proxy.BOARD_CACHE, proxy.METRICS_CACHE):
+        cache.clear()
+
+
+def test_expired_entries_are_served_then_refreshed(
+    fake_jira, empty_caches, monkeypatch, tmp_path
+):
+    fake = fake_jira(["SNAP"], 40, latency=0.05)
+    path = tmp_path / "cache.snapshot"
+    snapshot_with(path, ttl_seconds=0.01)
+    time.sleep(0.05)
+
+    refreshing = proxy.threading.Event()
+    recompute = proxy.recompute_snapshot_entry
+
+    def held(*args):
+        refreshing.wait(5)
+        recompute(*args)
+
+    monkeypatch.setattr(proxy, "recompute_snapshot_entry", held)
+    assert proxy.load_snapshot(str(path)) == 3
+
+    # Served (within the grace period) while the refreshes wait
+    assert proxy.FIELD_CACHE.get("fields") == [{"id": "old"}]
+    assert proxy.METRICS_CACHE.get(METRICS_KEY) == {"total_issues": -1}
+
+    refreshing.set()
+    proxy._snapshot_refreshes.join()
+    assert proxy.FIELD_CACHE.get("fields")[0]["id"] == "summary"
+    assert [board["name"] for board in proxy.BOARD_CACHE.get("boards")["boards"]] == [
+        "SNAP board"
+    ]
+    assert proxy.METRICS_CACHE.get(METRICS_KEY)["total_issues"] == 40
+    assert fake.calls >= 3
+
+    # The refreshed metrics keep their tags
+    assert proxy.METRICS_CACHE.invalidate_tags(["SNAP"]) == 1
+
+
+def test_live_entries_are_not_refreshed(fake_jira, empty_caches, tmp_path):
+    fake = fake_jira(["SNAP"], 40)
+    path = tmp_path / "cache.snapshot"
+    snapshot_with(path, ttl_seconds=600)
+
+    assert proxy.load_snapshot(str(path)) == 3
+    proxy._snapshot_refreshes.join()
+    assert fake.calls == 0
+    assert proxy.FIELD_CACHE.get("fields") == [{"id": "old"}]
+
+
+def test_failed_refresh_keeps_the_restored_entry(fake_jira, empty_caches, tmp_path):
+    fake = fake_jira(["SNAP"], 40)
+    fake.handle_get = lambda path, query: (500, {"errorMessages": ["Boom"]})
+    fake.handle_post = lambda path, body: (500, {"errorMessages": ["Boom"]})
+    path = tmp_path / "cache.snapshot"
+    snapshot_with(path, ttl_seconds=0.01)
+    time.sleep(0.05)
+
+    proxy.load_snapshot(str(path))
+    proxy._snapshot_refreshes.join()
+    assert proxy.FIELD_CACHE.get("fields") == [{"id": "old"}]
+    assert proxy.METRICS_CACHE.get(METRICS_KEY) == {"total_issues": -1}
@@ -0,0 +1,180 @@
+import random
+
+import pytest
+
+import proxy
+
+STATUSES = ["To Do", "In Progress", "Review", "Done"]
+PEOPLE = ["Ana", "bo", "Cy", None]
+
+
+def make_rows(count=97):
+    rng = random.Random(4)
+    rows = []
+    for number in range(1, count + 1):
+        assignee = rng.choice(PEOPLE)
+        rows.append(
+            {
+                "key": f"{rng.choice(['ABC', 'XY'])}-{number}",
+                "fields": {
+                    # Few distinct values, so most pages end inside a run of ties
+                    "summary": rng.choice(["Fix", "fix", "Add", "Remove"]),
+                    "status": {"name": rng.choice(STATUSES)},
+                    "priority": {"name": rng.choice(["High", "Low"])},
+                    "assignee": assignee and {"displayName": assignee},
+                    "reporter": {"displayName": rng.choice(PEOPLE[:3])},
+                    "created": f"2026-0{rng.randint(1, 3)}-01T10:00:00.000+0000",
+                },
+                "risk_level": rng.choice(list(proxy.TICKET_RISK_ORDER)),
+                "ping_pong_score": rng.randint(0, 3),
+                "churn_score": rng.randint(0, 2),
+            }
+        )
+    return rows
+
+
+def full_sort(rows, column, descending):
+    sort_value = proxy.TICKET_SORT_COLUMNS[column]
+    return [
+        row["key"]
+        for row in sorted(
+            rows,
+            key=lambda row: (sort_value(row), proxy.ticket_key_order(row["key"])),
+            reverse=descending,
+        )
+    ]
+
+
+def walk(table, column, descending, limit, keep=lambda row: True, tokens=False):
+    """Keys of every page in order, following each page's cursor"""
+    keys, cursor = [], None
+    while True:
+        rows, cursor = table.page(column, descending, cursor, limit, keep)
+        keys.extend(row["key"] for row in rows)
+        if cursor is None:
+            return keys
+        if tokens:
+            cursor = proxy.decode_ticket_cursor(proxy.encode_ticket_cursor(cursor))
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("column", sorted(proxy.TICKET_SORT_COLUMNS))
+def test_pages_match_a_full_sort(column, descending):
+    rows = make_rows()
+    table = proxy.TicketTable(rows)
+    expected = full_sort(rows, column, descending)
+    for limit in (1, 7, 50, 97, 200):
+        assert walk(table, column, descending, limit) == expected, limit
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("column", ["key", "summary", "created", "pingpong"])
+def test_page_tokens_round_trip(column, descending):
+    rows = make_rows()
+    table = proxy.TicketTable(rows)
+    expected = full_sort(rows, column, descending)
+    assert walk(table, column, descending, 10, tokens=True) == expected
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_filtered_pages(descending):
+    rows = make_rows()
+    table = proxy.TicketTable(rows)
+
+    def keep(row):
+        return row["fields"]["status"]["name"] != "Done"
+
+    expected = [
+        key for key in full_sort(rows, "status", descending) if keep(table.rows[key])
+    ]
+    assert walk(table, "status", descending, 6, keep) == expected
+
+
+def test_last_full_page_has_no_cursor():
+    table = proxy.TicketTable(make_rows(10))
+    rows, cursor = table.page("key", False, None, 10, lambda row: True)
+    assert len(rows) == 10 and cursor is None
+
+
+@pytest.mark.parametrize("token", ["", "not base64!", "WzEsIDJd", "eyJhIjogMX0="])
+def test_invalid_tokens(token):
+    with pytest.raises(ValueError):
+        proxy.decode_ticket_cursor(token)
+
+
+@pytest.fixture
+def tickets(fake_jira, monkeypatch):
+    monkeypatch.setattr(proxy, "ISSUE_STORE", proxy.IssueStore())
+    proxy.TICKET_TABLE_CACHE.clear()
+    yield fake_jira(["TIX"], 130)
+    proxy.TICKET_TABLE_CACHE.clear()
+
+
+def get_tickets(**query):
+    query.setdefault("jql", "project = TIX ORDER BY created DESC")
+    response = proxy.app.test_client().get("/proxy/tickets", query_string=query)
+    return response.status_code, response.get_json()
+
+
+def walk_route(**query):
+    keys, cursor = [], None
+    while True:
+        if cursor:
+            query["cursor"] = cursor
+        status, data = get_tickets(**query)
+        assert status == 200
+        keys.extend(ticket["key"] for ticket in data["tickets"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return keys, data
+
+
+def test_route_pages_through_the_whole_table(tickets):
+    keys, data = walk_route(sort="key", direction="desc", limit=25)
+    assert keys == sorted(
+        (issue["key"] for issue in tickets.issues["TIX"]),
+        key=proxy.ticket_key_order,
+        reverse=True,
+    )
+    assert data["total"] == 130
+    assert not data["truncated"]
+
+
+def test_route_filters(tickets):
+    keys, _ = walk_route(sort="created", hideResolved="true", text="tix-1", limit=7)
+    open_issues = {
+        issue["key"]
+        for issue in tickets.issues["TIX"]
+        if issue["fields"]["status"]["name"] != "Done"
+    }
+    assert keys
+    assert set(keys) == {key for key in open_issues if key.startswith("TIX-1")}
+
+
+def test_the_table_is_built_once_per_query(tickets):
+    _, first = get_tickets(limit=10)
+    calls = tickets.calls
+    _, second = get_tickets(limit=10, cursor=first["next_cursor"])
+    assert tickets.calls == calls
+    assert not {t["key"] for t in first["tickets"]} & {
+        t["key"] for t in second["tickets"]
+    }
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"sort": "colour"},
+        {"direction": "sideways"},
+        {"cursor": "not base64!"},
+    ],
+)
+def test_route_rejects_bad_parameters(tickets, query):
+    status, _ = get_tickets(**query)
+    assert status == 400
+
+
+def test_cursor_from_another_sort_column(tickets):
+    _, data = get_tickets(sort="created", limit=5)
+    status, _ = get_tickets(sort="key", cursor=data["next_cursor"])
+    assert status == 400
@@ -0,0 +1,115 @@
+import pytest
+
+import proxy
+
+
+def changes(*statuses):
+    """Status changes walking through ``statuses``, a day apart"""
+    return [
+        {
+            "date": f"2026-03-{day + 1:02d}T10:00:00.000+0000",
+            "from": from_status,
+            "to": to_status,
+            "author": "Ana",
+        }
+        for day, (from_status, to_status) in enumerate(zip(statuses, statuses[1:]))
+    ]
+
+
+def analyze(*statuses):
+    return proxy.analyze_issue_transitions(changes(*statuses), {})
+
+
+def test_forward_only_workflow():
+    analysis = analyze("To Do", "In Progress", "Code Review", "In QA", "Done")
+    assert analysis["ping_pong_score"] == 0
+    assert analysis["churn_score"] == 0
+    assert analysis["transition_count"] == 4
+
+
+def test_back_and_forth_scores_each_direction_once():
+    analysis = analyze(
+        "To Do",
+        "In Progress",
+        "Code Review",
+        "In Progress",
+        "Code Review",
+        "In Progress",
+    )
+    assert analysis["ping_pong_score"] == 2
+    assert analysis["ping_pong_transitions"] == [
+        "In Progress -> Code Review",
+        "Code Review -> In Progress",
+    ]
+    assert analysis["churn_score"] == 2
+    assert analysis["churn_details"]["in_review_to_in_progress"] == 2
+    assert [c["date"] for c in analysis["churn_transitions"]] == [
+        "2026-03-03T10:00:00.000+0000",
+        "2026-03-05T10:00:00.000+0000",
+    ]
+
+
+def test_churn_types():
+    analysis = analyze(
+        "To Do", "In Progress", "In QA", "In Progress", "Done", "To Do", "Blocked"
+    )
+    details = analysis["churn_details"]
+    assert details["in_qa_to_in_progress"] == 1
+    assert details["done_to_any"] == 1
+    assert sum(details.values()) == analysis["churn_score"] == 2
+
+
+def test_statuses_outside_the_workflow_are_not_churn():
+    analysis = analyze("In Progress", "Blocked", "To Do")
+    assert analysis["churn_score"] == 0
+
+
+@pytest.fixture
+def bouncing(fake_jira, monkeypatch):
+    """A project whose first issue bounces between review and development"""
+    monkeypatch.setattr(proxy, "ISSUE_STORE", proxy.IssueStore())
+    fake = fake_jira(["PP"], 40)
+    issue = fake.by_key["PP-1"]
+    issue["changelog"]["histories"] = [
+        {
+            "id": str(number),
+            "created": change["date"],
+            "author": {"displayName": change["author"]},
+            "items": [
+                {
+                    "field": "status",
+                    "fromString": change["from"],
+                    "toString": change["to"],
+                }
+            ],
+        }
+        for number, change in enumerate(
+            changes("To Do", "In Progress", "Code Review", "In Progress", "Code Review")
+        )
+    ]
+    issue["fields"]["status"] = {"name": "Code Review"}
+    return fake
+
+
+def test_route_flags_issues_over_the_thresholds(bouncing):
+    response = proxy.app.test_client().get(
+        "/proxy/transition-analysis",
+        query_string={
+            "jql": "project = PP ORDER BY created DESC",
+            "pingPongThreshold": 2,
+            "churnThreshold": 1,
+        },
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+
+    assert data["summary"]["issues_analyzed"] == 40
+    flagged = data["issues"]["PP-1"]
+    assert flagged["status"] == "Code Review"
+    assert flagged["ping_pong_score"] == 2
+    assert flagged["is_ping_pong"] and flagged["is_churn"]
+    assert data["summary"]["ping_pong_issues"] == 1
+    assert data["summary"]["churn_issues"] == 1
+    assert data["summary"]["churn_details"]["in_review_to_in_progress"] == 1
+    assert data["thresholds"] == {"ping_pong": 2, "churn": 1}
+    assert not data["truncated"]
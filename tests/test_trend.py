@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import proxy
+
+NOW = datetime(2026, 3, 4, 12, tzinfo=timezone.utc)
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+@pytest.fixture
+def trend(fake_jira, monkeypatch):
+    monkeypatch.setattr(proxy, "datetime", FrozenDatetime)
+    proxy.TREND_BUCKET_CACHE.clear()
+    yield fake_jira(["TREND"], 300)
+    proxy.TREND_BUCKET_CACHE.clear()
+
+
+def get_trend(**query):
+    query.setdefault("jql", "project = TREND ORDER BY created DESC")
+    query.setdefault("excludeWeekends", "false")
+    response = proxy.app.test_client().get(
+        "/proxy/resolution-metrics/trend", query_string=query
+    )
+    return response.status_code, response.get_json()
+
+
+def transitions_by_week(fake, buckets):
+    """(throughput, transitions) for each week, counted straight off the changelogs"""
+    counts = []
+    for bucket in buckets:
+        start = datetime.fromisoformat(bucket["start"])
+        end = datetime.fromisoformat(bucket["end"])
+        done, moves = set(), 0
+        for issue in fake.issues["TREND"]:
+            for history in issue["changelog"]["histories"]:
+                if start <= datetime.fromisoformat(history["created"]) < end:
+                    moves += 1
+                    if history["items"][0]["toString"] == "Done":
+                        done.add(issue["key"])
+        counts.append((len(done), moves))
+    return counts
+
+
+def without_cached(buckets):
+    return [dict(bucket, cached=None) for bucket in buckets]
+
+
+def test_weekly_buckets_match_the_changelogs(trend):
+    status, data = get_trend(horizon=8)
+    assert status == 200
+    buckets = data["buckets"]
+
+    assert len(buckets) == 8
+    assert [bucket["closed"] for bucket in buckets] == [True] * 7 + [False]
+    assert datetime.fromisoformat(buckets[-1]["start"]) <= NOW
+    for earlier, later in zip(buckets, buckets[1:]):
+        assert datetime.fromisoformat(later["start"]) - datetime.fromisoformat(
+            earlier["start"]
+        ) == timedelta(weeks=1)
+
+    reported = [
+        (
+            bucket["throughput"],
+            sum(stage["count"] for stage in bucket["stage_metrics"].values()),
+        )
+        for bucket in buckets
+    ]
+    assert reported == transitions_by_week(trend, buckets)
+    assert any(throughput for throughput, _ in reported)
+
+
+def test_closed_weeks_are_served_from_cache(trend):
+    _, first = get_trend(horizon=6)
+    assert not any(bucket["cached"] for bucket in first["buckets"])
+
+    _, second = get_trend(horizon=6)
+    assert [bucket["cached"] for bucket in second["buckets"]] == [True] * 5 + [False]
+    assert without_cached(second["buckets"]) == without_cached(first["buckets"])
+
+
+def test_truncated_trends_are_not_cached(trend):
+    _, data = get_trend(horizon=4, maxResults=10)
+    assert data["truncated"]
+    assert data["issues_analyzed"] == 10
+
+    _, data = get_trend(horizon=4)
+    assert not any(bucket["cached"] for bucket in data["buckets"])
+
+
+def test_sprint_trend(trend):
+    status, data = get_trend(period="sprint", board="TREND", horizon=3)
+    assert status == 200
+    assert [bucket["label"] for bucket in data["buckets"]] == [
+        "Sprint 10",
+        "Sprint 11",
+        "Sprint 12",
+    ]
+    assert [bucket["closed"] for bucket in data["buckets"]] == [True, True, False]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [{"period": "month"}, {"period": "sprint"}, {"horizon": 0}],
+)
+def test_bad_parameters(trend, query):
+    status, data = get_trend(**query)
+    assert status == 400
+    assert "error" in data
@@ -0,0 +1,97 @@
+import re
+from datetime import datetime
+
+import pytest
+
+import proxy
+
+POINTS = "customfield_10016"
+
+
+@pytest.fixture
+def velocity(fake_jira):
+    """A board whose twelve sprints each hold every twelfth issue"""
+    for cache in (proxy.FIELD_CACHE, proxy.VELOCITY_CACHE):
+        cache.clear()
+    fake = fake_jira(["VEL"], 240)
+    search = fake.search
+
+    def by_sprint(jql):
+        sprint = re.fullmatch(r"sprint = (\d+)", jql)
+        if sprint:
+            issues = fake.issues["VEL"]
+            return issues[int(sprint.group(1)) - 1 :: 12]
+        return search(jql)
+
+    fake.search = by_sprint
+    yield fake
+    for cache in (proxy.FIELD_CACHE, proxy.VELOCITY_CACHE):
+        cache.clear()
+
+
+def expected_points(fake, sprint):
+    """(committed, completed) points of a fake sprint, counted directly"""
+    sprint_end = datetime.fromisoformat(sprint["endDate"])
+    committed = completed = 0
+    for issue in fake.search(f"sprint = {sprint['id']}"):
+        fields = issue["fields"]
+        points = fields[POINTS] or 0
+        committed += points
+        if fields["status"]["statusCategory"]["key"] == "done" and (
+            datetime.fromisoformat(fields["resolutiondate"]) <= sprint_end
+        ):
+            completed += points
+    return committed, completed
+
+
+def get_velocity(**query):
+    response = proxy.app.test_client().get("/proxy/velocity", query_string=query)
+    return response.status_code, response.get_json()
+
+
+def test_points_of_the_last_closed_sprints(velocity):
+    status, data = get_velocity(board="VEL", sprints=4)
+    assert status == 200
+    assert data["story_point_field"]["id"] == POINTS
+
+    # Sprints 8-11 are the newest closed ones; they come back oldest first
+    sprints = {sprint["id"]: sprint for sprint in velocity.sprints()}
+    assert [sprint["id"] for sprint in data["sprints"]] == [8, 9, 10, 11]
+    for sprint in data["sprints"]:
+        assert sprint["issues"] == 20
+        assert (
+            sprint["committed_points"],
+            sprint["completed_points"],
+        ) == expected_points(velocity, sprints[sprint["id"]])
+
+    committed = [sprint["committed_points"] for sprint in data["sprints"]]
+    assert data["average_committed"] == round(sum(committed) / 4, 2)
+
+
+def test_active_sprint_is_optional(velocity):
+    _, data = get_velocity(board="VEL", sprints=2, includeActive="true")
+    assert [sprint["id"] for sprint in data["sprints"]] == [11, 12]
+    assert data["sprints"][-1]["state"] == "active"
+
+    # The active sprint is left out of the averages
+    assert data["average_completed"] == data["sprints"][0]["completed_points"]
+
+
+def test_velocity_is_cached(velocity):
+    _, first = get_velocity(board="VEL", sprints=3)
+    calls = velocity.calls
+    _, second = get_velocity(board="VEL", sprints=3)
+    assert second == first
+    assert velocity.calls == calls
+
+
+def test_missing_story_point_field(velocity):
+    velocity.handle_get = lambda path, query: (200, [])
+    status, data = get_velocity(board="VEL")
+    assert status == 404
+    assert "STORY_POINT_FIELD_ID" in data["error"]
+
+
+def test_board_is_required(velocity):
+    status, _ = get_velocity()
+    assert status == 400
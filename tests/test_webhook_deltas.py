@@ -0,0 +1,178 @@
+import hashlib
+import hmac
+import json
+
+import pytest
+
+import proxy
+
+
+def status_history(history_id, created, from_status, to_status):
+    return {
+        "id": history_id,
+        "created": created,
+        "author": {"displayName": "Ana"},
+        "items": [
+            {"field": "status", "fromString": from_status, "toString": to_status}
+        ],
+    }
+
+
+def stored_issue():
+    return {
+        "key": "ABC-1",
+        "fields": {"summary": "Old summary", "status": {"name": "In Progress"}},
+        "changelog": {
+            "histories": [
+                status_history(
+                    "1", "2026-03-01T10:00:00.000+0000", "To Do", "In Progress"
+                )
+            ]
+        },
+    }
+
+
+def update_payload(history_id="2", timestamp=1772964000000):
+    return {
+        "webhookEvent": "jira:issue_updated",
+        "timestamp": timestamp,
+        "user": {"displayName": "Bo"},
+        "issue": {
+            "key": "ABC-1",
+            "fields": {"status": {"name": "Review"}},
+        },
+        "changelog": {
+            "id": history_id,
+            "items": [
+                {"field": "status", "fromString": "In Progress", "toString": "Review"}
+            ],
+        },
+    }
+
+
+def apply(store, payload):
+    return store.apply_change(
+        payload["issue"], proxy.webhook_changelog_history(payload)
+    )
+
+
+def test_update_appends_the_transition_and_merges_fields():
+    store = proxy.IssueStore()
+    store.upsert(stored_issue())
+
+    assert apply(store, update_payload())
+    entry = store.get("ABC-1")
+    assert entry["issue"]["fields"] == {
+        "summary": "Old summary",
+        "status": {"name": "Review"},
+    }
+    assert [(c["from"], c["to"], c["author"]) for c in entry["status_changes"]] == [
+        ("To Do", "In Progress", "Ana"),
+        ("In Progress", "Review", "Bo"),
+    ]
+    # Same timestamp format as Jira's own changelogs, so it parses and sorts
+    assert entry["status_changes"][1]["date"] == "2026-03-08T10:00:00.000+0000"
+    proxy.parse_jira_datetime(entry["status_changes"][1]["date"])
+
+
+def test_redelivered_webhook_is_applied_once():
+    store = proxy.IssueStore()
+    store.upsert(stored_issue())
+    apply(store, update_payload())
+    apply(store, update_payload())
+    assert len(store.get("ABC-1")["status_changes"]) == 2
+
+
+def test_update_without_changelog_only_merges_fields():
+    store = proxy.IssueStore()
+    store.upsert(stored_issue())
+    payload = update_payload()
+    del payload["changelog"]
+    assert apply(store, payload)
+    entry = store.get("ABC-1")
+    assert entry["issue"]["fields"]["status"] == {"name": "Review"}
+    assert len(entry["status_changes"]) == 1
+
+
+def test_unknown_issue_is_not_stored():
+    store = proxy.IssueStore()
+    assert not apply(store, update_payload())
+    assert store.get("ABC-1") is None
+
+
+def test_listeners_see_upserts_and_deletes():
+    store = proxy.IssueStore()
+    seen = []
+    store.subscribe(lambda event, key, entry: seen.append((event, key)))
+    store.upsert(stored_issue())
+    apply(store, update_payload())
+    assert store.delete("ABC-1")
+    assert not store.delete("ABC-1")
+    assert seen == [
+        ("upsert", "ABC-1"),
+        ("upsert", "ABC-1"),
+        ("delete", "ABC-1"),
+        ("delete", "ABC-1"),
+    ]
+
+
+def post_webhook(payload, query=None, signature=None, secret=None):
+    body = json.dumps(payload).encode()
+    headers = {"Content-Type": "application/json"}
+    if secret is not None:
+        digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        headers["X-Hub-Signature"] = f"sha256={digest}"
+    if signature is not None:
+        headers["X-Hub-Signature"] = signature
+    return proxy.app.test_client().post(
+        "/webhooks/jira", data=body, headers=headers, query_string=query
+    )
+
+
+@pytest.fixture
+def webhooks(monkeypatch):
+    store = proxy.IssueStore()
+    store.upsert(stored_issue())
+    monkeypatch.setattr(proxy, "ISSUE_STORE", store)
+    monkeypatch.setattr(proxy, "JIRA_WEBHOOK_SECRET", "signing-secret")
+    monkeypatch.setattr(proxy, "JIRA_WEBHOOK_TOKEN", "")
+    return store
+
+
+def test_signed_webhook_is_applied(webhooks):
+    response = post_webhook(update_payload(), secret="signing-secret")
+    assert response.status_code == 200
+    assert response.get_json()["applied"]
+    assert webhooks.get("ABC-1")["issue"]["fields"]["status"] == {"name": "Review"}
+
+
+@pytest.mark.parametrize(
+    "auth",
+    [
+        {},
+        {"secret": "other-secret"},
+        {"signature": "sha1=abc"},
+        # The signing secret is never accepted in the URL
+        {"query": {"token": "signing-secret"}},
+        {"query": {"secret": "signing-secret"}},
+    ],
+)
+def test_unsigned_webhooks_are_rejected(webhooks, auth):
+    assert post_webhook(update_payload(), **auth).status_code == 401
+    assert webhooks.get("ABC-1")["issue"]["fields"]["status"] == {"name": "In Progress"}
+
+
+def test_token_in_the_url(webhooks, monkeypatch):
+    monkeypatch.setattr(proxy, "JIRA_WEBHOOK_SECRET", "")
+    monkeypatch.setattr(proxy, "JIRA_WEBHOOK_TOKEN", "url-token")
+    assert (
+        post_webhook(update_payload(), query={"token": "url-token"}).status_code == 200
+    )
+    assert post_webhook(update_payload(), query={"token": "wrong"}).status_code == 401
+    # Without a secret, signatures can't be checked
+    assert post_webhook(update_payload(), secret="").status_code == 401
+
+
+def test_webhooks_are_disabled_without_a_secret_or_token(webhooks, monkeypatch):
+    monkeypatch.setattr(proxy, "JIRA_WEBHOOK_SECRET", "")
+    assert post_webhook(update_payload(), secret="").status_code == 404